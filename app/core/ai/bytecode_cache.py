@@ -0,0 +1,403 @@
+"""
+Bytecode Analysis Cache
+File: app/core/ai/bytecode_cache.py
+
+Content-addressed cache for static bytecode analysis. Token clones are
+deployed constantly with byte-identical runtime code, differing only in
+the compiler metadata trailer, so analysis results are keyed by the
+keccak hash of the runtime bytecode with that trailer stripped. Entries
+live in an in-memory LRU backed by SQLite, so a repeat bytecode is
+classified without disassembly and results survive restarts. SQLite
+writes are batched behind the analysis and, inside an event loop, committed
+from an executor thread.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+
+from eth_utils import keccak
+
+from app.core.ai.pattern_scanner import Disassembly, PatternScanner, disassemble
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Opcodes recorded in a profile (others are skipped during disassembly)
+TRACKED_OPCODES = {
+    0x32: 'ORIGIN',
+    0x55: 'SSTORE',
+    0xf0: 'CREATE',
+    0xf1: 'CALL',
+    0xf2: 'CALLCODE',
+    0xf4: 'DELEGATECALL',
+    0xf5: 'CREATE2',
+    0xfa: 'STATICCALL',
+    0xff: 'SELFDESTRUCT',
+}
+SUSPICIOUS_OPCODES = ('SELFDESTRUCT', 'DELEGATECALL', 'CALLCODE', 'CREATE2')
+
+# Anchored to the project root so every process shares one file regardless of cwd
+DEFAULT_DB_PATH = str(Path(__file__).resolve().parents[3] / 'data' / 'bytecode_analysis.db')
+
+
+def _to_bytes(bytecode: Union[str, bytes]) -> bytes:
+    """Accept hex strings (with or without 0x) or raw bytes."""
+    if isinstance(bytecode, (bytes, bytearray)):
+        return bytes(bytecode)
+    text = bytecode[2:] if bytecode[:2] in ('0x', '0X') else bytecode
+    return bytes.fromhex(text)
+
+
+def has_code(bytecode: Optional[Union[str, bytes]]) -> bool:
+    """Whether eth_getCode returned any code (EOAs and missing contracts return '0x')."""
+    return bool(bytecode) and bytecode not in ('0x', '0X', b'')
+
+
+def strip_metadata(code: bytes) -> bytes:
+    """
+    Remove the CBOR metadata trailer appended by solc/vyper.
+
+    The last two bytes hold the trailer length; the trailer itself is a
+    CBOR map (first byte 0xa0-0xbf). Code without a recognizable trailer
+    is returned unchanged.
+    """
+    if len(code) < 2:
+        return code
+    length = int.from_bytes(code[-2:], 'big')
+    start = len(code) - 2 - length
+    if 0 < length and start >= 0 and 0xa0 <= code[start] <= 0xbf:
+        return code[:start]
+    return code
+
+
+def bytecode_hash(bytecode: Union[str, bytes]) -> str:
+    """Cache key: keccak256 of the runtime bytecode without metadata."""
+    return '0x' + keccak(strip_metadata(_to_bytes(bytecode))).hex()
+
+
+def signatures_version(signatures: Mapping[str, Iterable[str]]) -> str:
+    """Fingerprint of a signature set, so stale matches can be detected."""
+    canonical = json.dumps({k: sorted(v) for k, v in signatures.items()}, sort_keys=True)
+    return keccak(text=canonical).hex()[:16]
+
+
+@dataclass
+class BytecodeProfile:
+    """Static analysis results for one runtime bytecode."""
+    code_hash: str
+    size_bytes: int
+    selectors: List[str]
+    opcode_counts: Dict[str, int]
+    signature_matches: List[str] = field(default_factory=list)
+    signatures_version: str = ''
+    pattern_matches: Dict[str, List[str]] = field(default_factory=dict)  # scanner name -> matched patterns
+    pattern_versions: Dict[str, str] = field(default_factory=dict)  # scanner name -> pattern set version
+    analyzed_at: float = field(default_factory=time.time)
+
+    def has_selector(self, selector: str) -> bool:
+        """Whether the dispatcher compares against a 4-byte selector."""
+        return selector.lower().removeprefix('0x') in self.selectors
+
+    def has_opcode(self, name: str) -> bool:
+        """Whether the code contains an opcode (by mnemonic)."""
+        return self.opcode_counts.get(name, 0) > 0
+
+    @property
+    def suspicious_opcodes(self) -> List[str]:
+        """Suspicious opcodes present in the code."""
+        return [name for name in SUSPICIOUS_OPCODES if self.has_opcode(name)]
+
+
+def analyze_bytecode(bytecode: Union[str, bytes], disassembly: Optional[Disassembly] = None) -> BytecodeProfile:
+    """
+    Profile runtime bytecode from its instruction stream.
+
+    The stream comes from pattern_scanner.disassemble(), which skips PUSH
+    data so that immediates are never misread as opcodes. Selectors are
+    PUSH4 values compared with EQ, i.e. the function dispatcher's entries.
+
+    Args:
+        bytecode: Runtime bytecode (hex string or bytes)
+        disassembly: Stream of the metadata-stripped code, if already built
+
+    Returns:
+        Profile without signature matches
+    """
+    raw = _to_bytes(bytecode)
+    code = strip_metadata(raw)
+    if disassembly is None:
+        disassembly = disassemble(code)
+
+    opcode_counts: Dict[str, int] = {}
+    for op, name in TRACKED_OPCODES.items():
+        count = disassembly.opcodes.count(op)
+        if count:
+            opcode_counts[name] = count
+
+    return BytecodeProfile(
+        code_hash='0x' + keccak(code).hex(),
+        size_bytes=len(raw),
+        selectors=sorted({selector.hex() for selector in disassembly.selectors}),
+        opcode_counts=opcode_counts,
+    )
+
+
+class BytecodeAnalysisCache:
+    """
+    Two-tier (memory LRU + SQLite) cache of bytecode profiles.
+
+    Signature matches are stored with the fingerprint of the signature set
+    they were computed against; when the set changes they are recomputed
+    from the cached selectors without disassembling again. Pattern scanner
+    results are stored per scanner and refreshed when its patterns change.
+
+    Profile writes are write-behind: a store only records the latest
+    serialized profile for its hash. Called from a running event loop, the
+    pending profiles are committed together flush_delay seconds later, in
+    one transaction on an executor thread; without a loop (or once
+    max_pending profiles are waiting) they are committed straight away.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = DEFAULT_DB_PATH,
+        memory_entries: int = 10_000,
+        flush_delay: float = 0.05,
+        max_pending: int = 512
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            db_path: SQLite file (None keeps the cache in memory only)
+            memory_entries: Profiles kept in the in-memory LRU
+            flush_delay: Seconds a write waits for others to share its commit
+            max_pending: Pending profiles that trigger an immediate commit
+        """
+        self.db_path = Path(db_path) if db_path else None
+        self.memory_entries = memory_entries
+        self.flush_delay = flush_delay
+        self.max_pending = max_pending
+        self._memory: 'OrderedDict[str, BytecodeProfile]' = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        # code_hash -> (serialized profile, updated_at) awaiting commit
+        self._pending: Dict[str, tuple] = {}
+        self._pending_lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._flush_scheduled = False
+
+        self.stats = {
+            'lookups': 0,
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'signature_rematches': 0,
+            'pattern_rescans': 0,
+            'analysis_seconds': 0.0,
+            'profiles_written': 0,
+            'write_batches': 0,
+        }
+
+        if self.db_path is not None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA mmap_size=268435456")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS bytecode_profiles ("
+                "code_hash TEXT PRIMARY KEY, profile TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._db.commit()
+            logger.info(f"[DB] Bytecode analysis cache at {self.db_path}")
+
+    def analyze(
+        self,
+        bytecode: Union[str, bytes],
+        signatures: Optional[Mapping[str, Iterable[str]]] = None,
+        scanner: Optional[PatternScanner] = None,
+        record: bool = True
+    ) -> BytecodeProfile:
+        """
+        Profile for a bytecode, from cache when its hash was seen before.
+
+        Args:
+            bytecode: Runtime bytecode (hex string or bytes)
+            signatures: pattern_id -> selectors that must all be present
+            scanner: Pattern scanner whose matches should be included
+            record: Count this lookup in the hit-rate stats
+
+        Returns:
+            The bytecode profile (with signature matches if signatures given)
+        """
+        code = strip_metadata(_to_bytes(bytecode))
+        code_hash = '0x' + keccak(code).hex()
+        disassembly: Optional[Disassembly] = None  # built at most once per call
+        if record:
+            self.stats['lookups'] += 1
+
+        profile = self._memory.get(code_hash)
+        if profile is not None:
+            self._memory.move_to_end(code_hash)
+            if record:
+                self.stats['memory_hits'] += 1
+        else:
+            profile = self._load(code_hash)
+            if profile is not None:
+                if record:
+                    self.stats['disk_hits'] += 1
+            else:
+                if record:
+                    self.stats['misses'] += 1
+                start = time.perf_counter()
+                disassembly = disassemble(code)
+                profile = analyze_bytecode(bytecode, disassembly)
+                self.stats['analysis_seconds'] += time.perf_counter() - start
+                self._store(profile)
+            self._remember(profile)
+
+        if signatures is not None:
+            version = signatures_version(signatures)
+            if profile.signatures_version != version:
+                selectors = set(profile.selectors)
+                profile.signature_matches = sorted(
+                    pattern_id for pattern_id, required in signatures.items()
+                    if required and all(s.lower().removeprefix('0x') in selectors for s in required)
+                )
+                profile.signatures_version = version
+                self.stats['signature_rematches'] += 1
+                self._store(profile)
+
+        if scanner is not None and profile.pattern_versions.get(scanner.name) != scanner.version:
+            version = scanner.version
+            if disassembly is None:
+                disassembly = disassemble(code)
+            profile.pattern_matches[scanner.name] = sorted(scanner.scan_disassembly(disassembly).all)
+            profile.pattern_versions[scanner.name] = version
+            self.stats['pattern_rescans'] += 1
+            self._store(profile)
+
+        return profile
+
+    def get(self, code_hash: str) -> Optional[BytecodeProfile]:
+        """Cached profile by hash, without analyzing."""
+        profile = self._memory.get(code_hash)
+        if profile is None:
+            profile = self._load(code_hash)
+            if profile is not None:
+                self._remember(profile)
+        return profile
+
+    def _remember(self, profile: BytecodeProfile) -> None:
+        """Insert into the memory LRU, evicting the oldest entry."""
+        self._memory[profile.code_hash] = profile
+        self._memory.move_to_end(profile.code_hash)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _load(self, code_hash: str) -> Optional[BytecodeProfile]:
+        """Read a profile from the pending writes or SQLite."""
+        if self._db is None:
+            return None
+        pending = self._pending.get(code_hash)
+        if pending is not None:
+            return BytecodeProfile(**json.loads(pending[0]))
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT profile FROM bytecode_profiles WHERE code_hash = ?", (code_hash,)
+            ).fetchone()
+        return BytecodeProfile(**json.loads(row[0])) if row else None
+
+    def _store(self, profile: BytecodeProfile) -> None:
+        """Queue a profile for the next batched SQLite write."""
+        if self._db is None:
+            return
+        with self._pending_lock:
+            self._pending[profile.code_hash] = (json.dumps(asdict(profile)), time.time())
+            pending = len(self._pending)
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()  # synchronous caller, no loop to keep free
+            return
+        if pending >= self.max_pending:
+            loop.run_in_executor(None, self.flush)
+        elif not self._flush_scheduled:
+            self._flush_scheduled = True
+            loop.call_later(self.flush_delay, self._flush_in_executor, loop)
+
+    def _flush_in_executor(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Timer callback: commit pending profiles off the event loop."""
+        self._flush_scheduled = False
+        loop.run_in_executor(None, self.flush)
+
+    def flush(self) -> int:
+        """
+        Commit all pending profiles in one transaction.
+
+        Returns:
+            Number of profiles written
+        """
+        with self._pending_lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return 0
+        with self._db_lock:
+            if self._db is None:
+                return 0
+            try:
+                with self._db:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO bytecode_profiles (code_hash, profile, updated_at) VALUES (?, ?, ?)",
+                        [(code_hash, text, updated_at) for code_hash, (text, updated_at) in batch.items()]
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"[WARN] Failed to persist {len(batch)} bytecode profiles: {e}")
+                return 0
+            self.stats['profiles_written'] += len(batch)
+            self.stats['write_batches'] += 1
+        return len(batch)
+
+    def close(self) -> None:
+        """Commit pending profiles and close the SQLite connection."""
+        self.flush()
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit rates and sizes."""
+        hits = self.stats['memory_hits'] + self.stats['disk_hits']
+        disk_entries = None
+        with self._db_lock:
+            if self._db is not None:
+                disk_entries = self._db.execute("SELECT COUNT(*) FROM bytecode_profiles").fetchone()[0]
+        return {
+            **self.stats,
+            'hit_rate': hits / self.stats['lookups'] if self.stats['lookups'] else 0.0,
+            'memory_entries': len(self._memory),
+            'disk_entries': disk_entries,
+            'pending_writes': len(self._pending),
+        }
+
+
+# Global instance shared by HoneypotDetector and ContractAnalyzer
+bytecode_cache_instance: Optional[BytecodeAnalysisCache] = None
+
+
+def get_bytecode_cache() -> BytecodeAnalysisCache:
+    """Get the global bytecode analysis cache instance."""
+    global bytecode_cache_instance
+
+    if bytecode_cache_instance is None:
+        bytecode_cache_instance = BytecodeAnalysisCache()
+
+    return bytecode_cache_instance
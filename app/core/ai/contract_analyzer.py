@@ -17,6 +17,8 @@ from enum import Enum
 
 from app.utils.logger import setup_logger
 from app.core.exceptions import ContractAnalysisError, ValidationError
+from app.core.ai.bytecode_cache import BytecodeAnalysisCache, get_bytecode_cache, has_code
+from app.core.ai.pattern_scanner import DEFAULT_OPCODE_PATTERNS, PatternScanner
 from app.core.blockchain.base_chain import BaseChain
 
 logger = setup_logger(__name__, "application")
@@ -139,11 +141,25 @@ class ContractAnalyzer:
     - Trading viability scoring
     """
     
-    def __init__(self):
-        """Initialize contract analyzer."""
+    def __init__(self, bytecode_cache: Optional[BytecodeAnalysisCache] = None):
+        """
+        Initialize contract analyzer.
+        
+        Args:
+            bytecode_cache: Bytecode profile cache (defaults to the shared instance)
+        """
+        self.bytecode_cache = bytecode_cache or get_bytecode_cache()
         self.known_signatures = self._load_function_signatures()
         self.honeypot_patterns = self._load_honeypot_patterns()
         self.suspicious_patterns = self._load_suspicious_patterns()
+        
+        # All selectors, opcode sequences and source patterns compiled once
+        self.pattern_scanner = PatternScanner(
+            name='contract_analyzer',
+            selectors={name: selector for selector, name in self.known_signatures.items()},
+            opcode_patterns=DEFAULT_OPCODE_PATTERNS,
+            source_patterns={pattern: pattern for pattern in self.suspicious_patterns + self.honeypot_patterns}
+        )
         logger.info("[OK] Contract Analyzer initialized")
     
     async def analyze_contract(
@@ -171,8 +187,10 @@ class ContractAnalyzer:
             # Get basic token information
             token_info = await chain.get_token_info(token_address)
             
-            # Get contract bytecode
+            # Get contract bytecode; clones of a seen contract resolve from cache
             bytecode = await chain.get_contract_bytecode(token_address)
+            if has_code(bytecode):
+                self.bytecode_cache.analyze(bytecode, scanner=self.pattern_scanner)
             
             # Get source code if available
             source_code = await chain.get_contract_source_code(token_address)
@@ -358,11 +376,18 @@ class ContractAnalyzer:
                 security_data['has_blacklist'] = True
                 security_data['honeypot_indicators'].append('Blacklist functionality detected')
             
-            # Check for proxy patterns
-            if 'delegatecall' in bytecode.lower():
+            # Check for proxy patterns and risky opcodes
+            opcode_patterns = self._bytecode_patterns(bytecode)
+            if 'delegatecall' in opcode_patterns:
                 security_data['is_proxy'] = True
                 security_data['rugpull_indicators'].append('Proxy contract - implementation can change')
             
+            if 'selfdestruct' in opcode_patterns:
+                security_data['rugpull_indicators'].append('Contract can self-destruct')
+            
+            if 'tx_origin_auth' in opcode_patterns:
+                security_data['honeypot_indicators'].append('tx.origin authorization check')
+            
             # Analyze source code if available
             if source_code:
                 security_data.update(self._analyze_source_code_security(source_code))
@@ -582,32 +607,32 @@ class ContractAnalyzer:
         
         return warnings, recommendations
     
+    def _bytecode_patterns(self, bytecode: str) -> Set[str]:
+        """Scanner matches for a bytecode (one pass per distinct code, then cached)."""
+        if not has_code(bytecode):
+            return set()
+        profile = self.bytecode_cache.analyze(bytecode, scanner=self.pattern_scanner, record=False)
+        return set(profile.pattern_matches.get(self.pattern_scanner.name, ()))
+    
     def _extract_function_signatures(self, bytecode: str) -> Set[str]:
         """Extract function signatures from bytecode."""
-        signatures = set()
-        
         try:
-            # Look for 4-byte function selectors
-            selectors = re.findall(r'63([a-fA-F0-9]{8})', bytecode)
-            
-            for selector in selectors:
-                if selector in self.known_signatures:
-                    signatures.add(self.known_signatures[selector])
-            
+            return self._bytecode_patterns(bytecode) & self.pattern_scanner.function_names
         except Exception as e:
             logger.warning(f"Failed to extract function signatures: {e}")
-        
-        return signatures
+            return set()
     
     def _analyze_source_code_security(self, source_code: str) -> Dict[str, Any]:
         """Analyze source code for security issues."""
         security_data = {}
         
         try:
-            # Check for suspicious patterns
-            for pattern in self.suspicious_patterns:
-                if re.search(pattern, source_code, re.IGNORECASE):
+            # Check for suspicious and honeypot patterns in one pass
+            for pattern in self.pattern_scanner.scan_source(source_code):
+                if pattern in self.suspicious_patterns:
                     security_data.setdefault('suspicious_patterns', []).append(pattern)
+                else:
+                    security_data.setdefault('honeypot_patterns', []).append(pattern)
             
             # Check for compiler version
             version_match = re.search(r'pragma solidity\s+([^\s;]+)', source_code)
@@ -13,7 +13,7 @@ from datetime import datetime, timedelta
 from decimal import Decimal
 from enum import Enum
 from typing import Dict, Any, List, Optional, Tuple, Set
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 import hashlib
 
 import numpy as np
@@ -25,6 +25,7 @@ from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.model_selection import cross_val_score
 from sklearn.metrics import classification_report, confusion_matrix
 import joblib
+from eth_utils import keccak
 
 from app.utils.logger import setup_logger
 from app.core.exceptions import (
@@ -32,6 +33,8 @@ from app.core.exceptions import (
     ContractAnalysisError,
     ModelError
 )
+from app.core.ai.bytecode_cache import BytecodeAnalysisCache, BytecodeProfile, get_bytecode_cache, has_code
+from app.core.ai.pattern_scanner import DEFAULT_OPCODE_PATTERNS, PatternScanner
 from app.core.blockchain.base_chain import BaseChain
 from app.core.cache.cache_manager import CacheManager
 from app.core.performance.circuit_breaker import CircuitBreakerManager
@@ -39,6 +42,25 @@ from app.core.performance.circuit_breaker import CircuitBreakerManager
 logger = setup_logger(__name__, "application")
 
 
+def _selectors(*signatures: str) -> Set[str]:
+    """4-byte selectors (hex, no 0x) of function signatures."""
+    return {keccak(text=signature)[:4].hex() for signature in signatures}
+
+
+# Functions whose presence in the dispatcher indicates a capability
+BLACKLIST_FUNCTIONS = (
+    "blacklist(address)", "isBlacklisted(address)", "addToBlacklist(address)", "setBlacklist(address,bool)"
+)
+MINT_FUNCTIONS = ("mint(address,uint256)", "mint(uint256)")
+OWNERSHIP_FUNCTIONS = ("owner()", "transferOwnership(address)")
+PAUSE_FUNCTIONS = ("pause()", "unpause()", "setPaused(bool)")
+PROXY_FUNCTIONS = ("upgradeTo(address)", "upgradeToAndCall(address,bytes)", "implementation()")
+CAPABILITY_FUNCTIONS = BLACKLIST_FUNCTIONS + MINT_FUNCTIONS + OWNERSHIP_FUNCTIONS + PAUSE_FUNCTIONS + PROXY_FUNCTIONS
+
+# Signatures decided by bytecode feature flags rather than by selector presence
+FLAG_MATCHED_PATTERNS = ("blacklist_trap", "hidden_mint", "ownership_trap")
+
+
 class HoneypotType(Enum):
     """Types of honeypot contracts."""
     NONE = "none"
@@ -77,6 +99,8 @@ class BytecodeFeatures:
     contract_size_bytes: int = 0
     optimizer_runs: Optional[int] = None
     compiler_version: Optional[str] = None
+    code_hash: Optional[str] = None  # Metadata-stripped keccak when real bytecode was analyzed
+    signature_matches: Optional[List[str]] = None  # Matched pattern_ids (None = not analyzed)
     
     def __post_init__(self):
         if self.suspicious_opcodes is None:
@@ -193,9 +217,15 @@ class HoneypotDetector:
     - Continuous learning capabilities
     """
     
-    def __init__(self):
-        """Initialize honeypot detector."""
+    def __init__(self, bytecode_cache: Optional[BytecodeAnalysisCache] = None):
+        """
+        Initialize honeypot detector.
+        
+        Args:
+            bytecode_cache: Bytecode profile cache (defaults to the shared instance)
+        """
         self.cache_manager = CacheManager()
+        self.bytecode_cache = bytecode_cache or get_bytecode_cache()
         self.circuit_breaker = CircuitBreakerManager()
         
         # Model configuration
@@ -222,12 +252,17 @@ class HoneypotDetector:
         # Known patterns database
         self.honeypot_signatures: List[HoneypotSignature] = []
         self.safe_patterns: List[str] = []
+        self._signature_selectors: Optional[Dict[str, List[str]]] = None
+        self.pattern_scanner = PatternScanner(name='honeypot_detector', opcode_patterns=DEFAULT_OPCODE_PATTERNS)
         
         # Detection thresholds
         self.honeypot_threshold = 0.7  # 70% probability threshold
         self.high_confidence_threshold = 0.9
         self.low_confidence_threshold = 0.3
         
+        # Rows per scaler/model call in batch_detect
+        self.inference_batch_size = 256
+        
         # Cache settings
         self.cache_ttl = 1800  # 30 minutes
         self.signature_cache_ttl = 86400  # 24 hours
@@ -289,92 +324,27 @@ class HoneypotDetector:
             cache_key = f"honeypot_detection:{network}:{token_address}:{deep_analysis}"
             
             # Check cache first
-            cached_result = await self.cache_manager.get(cache_key)
+            cached_result = self.cache_manager.get(cache_key)
             if cached_result:
                 logger.debug(f"[LOG] Using cached honeypot analysis for {token_address}")
-                return HoneypotDetectionResult(**cached_result)
+                return cached_result
             
             logger.info(f"[SEARCH] Starting honeypot detection for {token_address} on {network}")
             
             # Extract features
-            bytecode_features = await self._analyze_bytecode(token_address, network, chain)
-            behavior_features = await self._analyze_behavior(token_address, network, chain)
-            liquidity_features = await self._analyze_liquidity(token_address, network, chain)
-            ownership_features = await self._analyze_ownership(token_address, network, chain)
-            
-            # Check known signatures
-            matched_signatures = await self._check_signatures(bytecode_features)
+            features = await self._extract_features(token_address, network, chain)
             
             # ML ensemble prediction
-            ensemble_predictions = await self._predict_ensemble(
-                bytecode_features, behavior_features, liquidity_features, ownership_features
-            )
-            
-            # Calculate consensus
-            model_consensus = self._calculate_consensus(ensemble_predictions)
+            ensemble_predictions = await self._predict_ensemble(*features)
             
-            # Determine result
-            is_honeypot = model_consensus >= self.honeypot_threshold
-            honeypot_type = self._classify_honeypot_type(
-                bytecode_features, behavior_features, matched_signatures
-            )
-            
-            # Calculate confidence
-            confidence_score = self._calculate_confidence(model_consensus, ensemble_predictions)
-            confidence_level = self._classify_confidence(confidence_score)
-            
-            # Generate analysis details
-            warning_flags, safe_indicators = self._generate_indicators(
-                bytecode_features, behavior_features, liquidity_features, ownership_features
-            )
-            
-            risk_factors = self._calculate_risk_factors(
-                bytecode_features, behavior_features, liquidity_features, ownership_features
-            )
-            
-            false_positive_probability = self._estimate_false_positive_probability(
-                ensemble_predictions, matched_signatures
-            )
-            
-            # Calculate analysis duration
-            analysis_duration = int((datetime.utcnow() - start_time).total_seconds() * 1000)
-            
-            # Create result
-            result = HoneypotDetectionResult(
-                token_address=token_address,
-                network=network,
-                is_honeypot=is_honeypot,
-                honeypot_type=honeypot_type,
-                confidence_level=confidence_level,
-                confidence_score=confidence_score,
-                probability_score=model_consensus,
-                bytecode_features=bytecode_features,
-                behavior_features=behavior_features,
-                liquidity_features=liquidity_features,
-                ownership_features=ownership_features,
-                matched_signatures=matched_signatures,
-                warning_flags=warning_flags,
-                safe_indicators=safe_indicators,
-                risk_factors=risk_factors,
-                ensemble_predictions=ensemble_predictions,
-                model_consensus=model_consensus,
-                false_positive_probability=false_positive_probability,
-                analysis_version=self.model_version,
-                detection_timestamp=datetime.utcnow(),
-                analysis_duration_ms=analysis_duration,
-                models_used=list(ensemble_predictions.keys())
-            )
-            
-            # Cache result
-            await self.cache_manager.set(
-                cache_key,
-                asdict(result),
-                ttl=self.cache_ttl
+            result = await self._build_result(
+                token_address, network, features, ensemble_predictions, start_time
             )
+            self.cache_manager.set(cache_key, result, ttl=self.cache_ttl)
             
             logger.info(f"[OK] Honeypot detection complete for {token_address} - "
-                       f"Result: {'HONEYPOT' if is_honeypot else 'SAFE'} "
-                       f"({model_consensus:.1%} confidence)")
+                       f"Result: {'HONEYPOT' if result.is_honeypot else 'SAFE'} "
+                       f"({result.model_consensus:.1%} confidence)")
             
             return result
             
@@ -391,31 +361,67 @@ class HoneypotDetector:
         """
         Batch honeypot detection for multiple tokens.
         
+        Features are extracted concurrently, then stacked into one matrix so
+        the scaler and every ensemble model run once per batch instead of
+        once per token. Cached tokens skip inference entirely.
+        
         Args:
             token_addresses: List of contract addresses
             network: Network name
             chain: Blockchain instance
             
         Returns:
-            List[HoneypotDetectionResult]: Detection results
+            List[HoneypotDetectionResult]: Detection results (failed tokens omitted)
         """
         logger.info(f"[SEARCH] Starting batch honeypot detection for {len(token_addresses)} tokens")
+        start_time = datetime.utcnow()
         
-        tasks = []
-        for address in token_addresses:
-            task = self.detect_honeypot(address, network, chain, deep_analysis=False)
-            tasks.append(task)
+        results: Dict[int, HoneypotDetectionResult] = {}
+        pending: List[int] = []
+        for i, address in enumerate(token_addresses):
+            cached_result = self.cache_manager.get(f"honeypot_detection:{network}:{address}:False")
+            if cached_result:
+                results[i] = cached_result
+            else:
+                pending.append(i)
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        extracted = await asyncio.gather(
+            *(self._extract_features(token_addresses[i], network, chain) for i in pending),
+            return_exceptions=True
+        )
         
-        # Filter out exceptions
-        valid_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                logger.error(f"[ERROR] Batch detection failed for {token_addresses[i]}: {result}")
+        ready: List[Tuple[int, Tuple[Any, ...]]] = []
+        for i, features in zip(pending, extracted):
+            if isinstance(features, Exception):
+                logger.error(f"[ERROR] Batch detection failed for {token_addresses[i]}: {features}")
             else:
-                valid_results.append(result)
-        
+                ready.append((i, features))
+        
+        for offset in range(0, len(ready), self.inference_batch_size):
+            chunk = ready[offset:offset + self.inference_batch_size]
+            try:
+                chunk_predictions = await self._predict_ensemble_batch(
+                    [self._features_to_vector(*features) for _, features in chunk]
+                )
+            except Exception as e:
+                logger.error(f"[ERROR] Batch inference failed for {len(chunk)} tokens: {e}")
+                continue
+            
+            for (i, features), ensemble_predictions in zip(chunk, chunk_predictions):
+                address = token_addresses[i]
+                try:
+                    result = await self._build_result(
+                        address, network, features, ensemble_predictions, start_time
+                    )
+                except Exception as e:
+                    logger.error(f"[ERROR] Batch detection failed for {address}: {e}")
+                    continue
+                self.cache_manager.set(
+                    f"honeypot_detection:{network}:{address}:False", result, ttl=self.cache_ttl
+                )
+                results[i] = result
+        
+        valid_results = [results[i] for i in sorted(results)]
         logger.info(f"[OK] Batch detection complete - {len(valid_results)}/{len(token_addresses)} successful")
         return valid_results
     
@@ -440,6 +446,8 @@ class HoneypotDetector:
                 seen_ids.add(sig.pattern_id)
         
         self.honeypot_signatures = unique_signatures
+        self._signature_selectors = None
+        self._rebuild_pattern_scanner()
         
         # Save updated signatures
         await self._save_honeypot_signatures()
@@ -609,8 +617,15 @@ class HoneypotDetector:
     ) -> BytecodeFeatures:
         """Analyze contract bytecode for suspicious patterns."""
         try:
-            # In production, this would analyze actual bytecode
-            # For now, return mock analysis
+            get_bytecode = getattr(chain, 'get_contract_bytecode', None)
+            bytecode = await get_bytecode(token_address) if get_bytecode else None
+            if has_code(bytecode):
+                profile = self.bytecode_cache.analyze(
+                    bytecode, self._get_signature_selectors(), scanner=self.pattern_scanner
+                )
+                return self._profile_to_features(profile)
+            
+            # No bytecode available: fall back to mock analysis
             features = BytecodeFeatures(
                 has_blacklist_patterns=np.random.choice([True, False], p=[0.1, 0.9]),
                 has_hidden_mint=np.random.choice([True, False], p=[0.05, 0.95]),
@@ -739,6 +754,44 @@ class HoneypotDetector:
             return list(np.random.choice(suspicious_ops, size=np.random.randint(1, 3), replace=False))
         return []
     
+    def _get_signature_selectors(self) -> Dict[str, List[str]]:
+        """Public selectors each known signature requires, keyed by pattern_id."""
+        if self._signature_selectors is None:
+            # Internal functions (_mint, ...) are never dispatched, so they cannot be required
+            self._signature_selectors = {
+                sig.pattern_id: sorted(_selectors(*(f for f in sig.function_signatures if not f.startswith('_'))))
+                for sig in self.honeypot_signatures
+            }
+        return self._signature_selectors
+    
+    def _rebuild_pattern_scanner(self) -> None:
+        """Recompile the bytecode scanner for the current signature set (swapped in atomically)."""
+        functions = set(CAPABILITY_FUNCTIONS)
+        for sig in self.honeypot_signatures:
+            functions.update(sig.function_signatures)
+        self.pattern_scanner.update(
+            selectors={function: keccak(text=function)[:4].hex() for function in sorted(functions)}
+        )
+    
+    def _profile_to_features(self, profile: BytecodeProfile) -> BytecodeFeatures:
+        """Map a cached bytecode profile onto the model's bytecode features."""
+        matches = set(profile.pattern_matches.get(self.pattern_scanner.name, ()))
+        return BytecodeFeatures(
+            has_blacklist_patterns=bool(matches.intersection(BLACKLIST_FUNCTIONS)),
+            has_hidden_mint=bool(matches.intersection(MINT_FUNCTIONS)),
+            has_ownership_checks=bool(matches.intersection(OWNERSHIP_FUNCTIONS)),
+            has_pause_functionality=bool(matches.intersection(PAUSE_FUNCTIONS)),
+            has_unusual_modifiers='tx_origin_auth' in matches,
+            has_proxy_patterns='delegatecall' in matches or bool(matches.intersection(PROXY_FUNCTIONS)),
+            suspicious_opcodes=[
+                opcode.upper() for opcode in ('selfdestruct', 'delegatecall', 'callcode', 'create2') if opcode in matches
+            ],
+            function_signature_count=len(profile.selectors),
+            contract_size_bytes=profile.size_bytes,
+            code_hash=profile.code_hash,
+            signature_matches=list(profile.signature_matches)
+        )
+    
     async def _check_signatures(self, bytecode_features: BytecodeFeatures) -> List[HoneypotSignature]:
         """Check against known honeypot signatures."""
         matched = []
@@ -759,8 +812,105 @@ class HoneypotDetector:
             return True
         if signature.pattern_name == "ownership_trap" and features.has_ownership_checks and features.has_unusual_modifiers:
             return True
+        if signature.pattern_name in FLAG_MATCHED_PATTERNS:
+            return False
         
-        return False
+        # Other signatures: all of their public selectors are in the dispatcher
+        return signature.pattern_id in (features.signature_matches or ())
+    
+    async def _extract_features(
+        self,
+        token_address: str,
+        network: str,
+        chain: BaseChain
+    ) -> Tuple[BytecodeFeatures, BehaviorFeatures, LiquidityFeatures, OwnershipFeatures]:
+        """Run the four feature analyses for one token concurrently."""
+        bytecode, behavior, liquidity, ownership = await asyncio.gather(
+            self._analyze_bytecode(token_address, network, chain),
+            self._analyze_behavior(token_address, network, chain),
+            self._analyze_liquidity(token_address, network, chain),
+            self._analyze_ownership(token_address, network, chain)
+        )
+        return bytecode, behavior, liquidity, ownership
+    
+    async def _build_result(
+        self,
+        token_address: str,
+        network: str,
+        features: Tuple[BytecodeFeatures, BehaviorFeatures, LiquidityFeatures, OwnershipFeatures],
+        ensemble_predictions: Dict[str, Dict[str, Any]],
+        start_time: datetime
+    ) -> HoneypotDetectionResult:
+        """Combine features and model predictions into a detection result."""
+        bytecode_features, behavior_features, liquidity_features, ownership_features = features
+        
+        # Check known signatures
+        matched_signatures = await self._check_signatures(bytecode_features)
+        
+        # Calculate consensus
+        model_consensus = self._calculate_consensus(ensemble_predictions)
+        
+        # Determine result
+        is_honeypot = model_consensus >= self.honeypot_threshold
+        honeypot_type = self._classify_honeypot_type(
+            bytecode_features, behavior_features, matched_signatures
+        )
+        
+        # Calculate confidence
+        confidence_score = self._calculate_confidence(model_consensus, ensemble_predictions)
+        confidence_level = self._classify_confidence(confidence_score)
+        
+        # Generate analysis details
+        warning_flags, safe_indicators = self._generate_indicators(
+            bytecode_features, behavior_features, liquidity_features, ownership_features
+        )
+        
+        risk_factors = self._calculate_risk_factors(
+            bytecode_features, behavior_features, liquidity_features, ownership_features
+        )
+        
+        false_positive_probability = self._estimate_false_positive_probability(
+            ensemble_predictions, matched_signatures
+        )
+        
+        # Calculate analysis duration
+        analysis_duration = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+        
+        return HoneypotDetectionResult(
+            token_address=token_address,
+            network=network,
+            is_honeypot=is_honeypot,
+            honeypot_type=honeypot_type,
+            confidence_level=confidence_level,
+            confidence_score=confidence_score,
+            probability_score=model_consensus,
+            bytecode_features=bytecode_features,
+            behavior_features=behavior_features,
+            liquidity_features=liquidity_features,
+            ownership_features=ownership_features,
+            matched_signatures=matched_signatures,
+            warning_flags=warning_flags,
+            safe_indicators=safe_indicators,
+            risk_factors=risk_factors,
+            ensemble_predictions=ensemble_predictions,
+            model_consensus=model_consensus,
+            false_positive_probability=false_positive_probability,
+            analysis_version=self.model_version,
+            detection_timestamp=datetime.utcnow(),
+            analysis_duration_ms=analysis_duration,
+            models_used=list(ensemble_predictions.keys())
+        )
+    
+    def _ensemble_models(self) -> List[Tuple[str, Any, float]]:
+        """Loaded ensemble members as (name, model, default accuracy)."""
+        candidates = [
+            ("random_forest", self.random_forest, 0.9),
+            ("gradient_boosting", self.gradient_boosting, 0.9),
+            ("svm", self.svm_classifier, 0.85),
+            ("neural_network", self.neural_network, 0.88),
+            ("logistic_regression", self.logistic_regression, 0.82),
+        ]
+        return [(name, model, accuracy) for name, model, accuracy in candidates if model]
     
     async def _predict_ensemble(
         self,
@@ -770,70 +920,41 @@ class HoneypotDetector:
         ownership: OwnershipFeatures
     ) -> Dict[str, Dict[str, Any]]:
         """Run ensemble prediction using all models."""
-        # Convert features to vector
         feature_vector = self._features_to_vector(bytecode, behavior, liquidity, ownership)
+        return (await self._predict_ensemble_batch([feature_vector]))[0]
+    
+    async def _predict_ensemble_batch(self, feature_vectors: List[List[float]]) -> List[Dict[str, Dict[str, Any]]]:
+        """
+        Run ensemble prediction for many feature vectors at once.
         
-        if self.feature_scaler:
-            feature_vector_scaled = self.feature_scaler.transform([feature_vector])[0]
-        else:
-            feature_vector_scaled = feature_vector
-        
-        predictions = {}
-        
-        # Random Forest
-        if self.random_forest:
-            rf_prob = self.random_forest.predict_proba([feature_vector_scaled])[0][1]
-            rf_pred = int(rf_prob >= 0.5)
-            predictions["random_forest"] = {
-                "probability": rf_prob,
-                "prediction": rf_pred,
-                "confidence": max(rf_prob, 1 - rf_prob),
-                "accuracy": self.model_accuracies.get("random_forest", 0.9)
-            }
-        
-        # Gradient Boosting
-        if self.gradient_boosting:
-            gb_prob = self.gradient_boosting.predict_proba([feature_vector_scaled])[0][1]
-            gb_pred = int(gb_prob >= 0.5)
-            predictions["gradient_boosting"] = {
-                "probability": gb_prob,
-                "prediction": gb_pred,
-                "confidence": max(gb_prob, 1 - gb_prob),
-                "accuracy": self.model_accuracies.get("gradient_boosting", 0.9)
-            }
-        
-        # SVM
-        if self.svm_classifier:
-            svm_prob = self.svm_classifier.predict_proba([feature_vector_scaled])[0][1]
-            svm_pred = int(svm_prob >= 0.5)
-            predictions["svm"] = {
-                "probability": svm_prob,
-                "prediction": svm_pred,
-                "confidence": max(svm_prob, 1 - svm_prob),
-                "accuracy": self.model_accuracies.get("svm", 0.85)
-            }
+        The rows are stacked into one matrix, scaled once and passed to
+        each model's predict_proba once, then split back into one
+        prediction dict per row.
         
-        # Neural Network
-        if self.neural_network:
-            nn_prob = self.neural_network.predict_proba([feature_vector_scaled])[0][1]
-            nn_pred = int(nn_prob >= 0.5)
-            predictions["neural_network"] = {
-                "probability": nn_prob,
-                "prediction": nn_pred,
-                "confidence": max(nn_prob, 1 - nn_prob),
-                "accuracy": self.model_accuracies.get("neural_network", 0.88)
-            }
+        Args:
+            feature_vectors: One vector per token (see _features_to_vector)
+            
+        Returns:
+            Per-token ensemble predictions, in input order
+        """
+        if not feature_vectors:
+            return []
         
-        # Logistic Regression
-        if self.logistic_regression:
-            lr_prob = self.logistic_regression.predict_proba([feature_vector_scaled])[0][1]
-            lr_pred = int(lr_prob >= 0.5)
-            predictions["logistic_regression"] = {
-                "probability": lr_prob,
-                "prediction": lr_pred,
-                "confidence": max(lr_prob, 1 - lr_prob),
-                "accuracy": self.model_accuracies.get("logistic_regression", 0.82)
-            }
+        matrix = np.asarray(feature_vectors, dtype=np.float64)
+        if self.feature_scaler:
+            matrix = self.feature_scaler.transform(matrix)
+        
+        predictions: List[Dict[str, Dict[str, Any]]] = [{} for _ in feature_vectors]
+        for name, model, default_accuracy in self._ensemble_models():
+            probabilities = model.predict_proba(matrix)[:, 1]
+            accuracy = self.model_accuracies.get(name, default_accuracy)
+            for row, probability in zip(predictions, probabilities.tolist()):
+                row[name] = {
+                    "probability": probability,
+                    "prediction": int(probability >= 0.5),
+                    "confidence": max(probability, 1 - probability),
+                    "accuracy": accuracy
+                }
         
         return predictions
     
@@ -1136,6 +1257,9 @@ class HoneypotDetector:
             )
         ]
         
+        self._signature_selectors = None
+        self._rebuild_pattern_scanner()
+        
         logger.info(f"[LOG] Loaded {len(self.honeypot_signatures)} honeypot signatures")
     
     async def _save_honeypot_signatures(self) -> None:
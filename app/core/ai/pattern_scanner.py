@@ -0,0 +1,361 @@
+"""
+Multi-Pattern Scanner
+File: app/core/ai/pattern_scanner.py
+
+Compiled matchers for contract analysis, built once and swapped atomically
+on updates so scans in flight finish on the pattern set they started with.
+
+- Bytecode: disassemble() walks the code once into an instruction stream
+  (one byte per opcode, PUSH data dropped, so immediates never match) plus
+  the dispatcher's selectors (PUSH4 <selector> EQ). Opcode sequences are
+  substring tests on that stream and selectors are resolved with a dict
+  lookup, so the cost of a scan does not grow with the number of known
+  selectors. The bytecode cache profiles the same stream, so a contract
+  is disassembled once per analysis.
+- Source: every pattern gets a literal anchor (its leading identifier);
+  anchors are checked with substring search and only patterns whose
+  anchor occurs are run as regexes.
+"""
+
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Set, Tuple, Union
+
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+PUSH1, PUSH4, PUSH32, EQ = 0x60, 0x63, 0x7f, 0x14
+
+# Opcode sequences worth flagging, matched on the instruction stream (PUSH
+# opcodes in a sequence match whatever data they carry)
+DEFAULT_OPCODE_PATTERNS: Dict[str, Tuple[bytes, ...]] = {
+    'selfdestruct': (b'\xff',),
+    'delegatecall': (b'\xf4',),
+    'callcode': (b'\xf2',),
+    'create2': (b'\xf5',),
+    'tx_origin': (b'\x32',),
+    # require(tx.origin == msg.sender) / (msg.sender == tx.origin)
+    'tx_origin_auth': (b'\x32\x33\x14', b'\x33\x32\x14'),
+}
+
+BytePatterns = Mapping[str, Union[bytes, Sequence[bytes]]]
+
+_PUSH_OPCODE = re.compile(rb'[\x60-\x7f]')
+
+_ANCHOR = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+
+
+def _source_anchor(regex: str) -> Optional[str]:
+    """
+    Leading literal identifier every match of regex must contain.
+
+    Returns None when no safe anchor exists (alternation, or the
+    identifier's last character is quantified).
+    """
+    match = _ANCHOR.match(regex)
+    if match is None or '|' in regex:
+        return None
+    rest = regex[match.end():]
+    if rest[:1] in ('*', '+', '?', '{'):
+        return None
+    return match.group().lower()
+
+
+@dataclass
+class Disassembly:
+    """Runtime code reduced to its instruction stream."""
+    opcodes: bytes  # one byte per instruction, PUSH data removed
+    selectors: List[bytes] = field(default_factory=list)  # PUSH4 values compared with EQ
+
+
+def disassemble(code: bytes) -> Disassembly:
+    """
+    Walk bytecode once, instruction by instruction.
+
+    Non-PUSH runs are copied with slicing; only PUSH instructions are
+    visited individually, to skip their data and pick up dispatcher
+    selectors. A PUSH truncated by the end of the code ends the stream.
+
+    Args:
+        code: Runtime bytecode
+
+    Returns:
+        Instruction stream and dispatcher selectors
+    """
+    chunks: List[bytes] = []
+    selectors: List[bytes] = []
+    search = _PUSH_OPCODE.search
+    position, end = 0, len(code)
+    while position < end:
+        match = search(code, position)
+        if match is None:
+            chunks.append(code[position:])
+            break
+        start = match.start()
+        op = code[start]
+        chunks.append(code[position:start + 1])
+        position = start + 1 + op - PUSH1 + 1
+        if op == PUSH4 and position < end and code[position] == EQ:
+            selectors.append(code[start + 1:position])
+    return Disassembly(b''.join(chunks), selectors)
+
+
+def _to_code(bytecode: Union[str, bytes]) -> bytes:
+    """Accept hex strings (with or without 0x) or raw bytes."""
+    if isinstance(bytecode, str):
+        return bytes.fromhex(bytecode[2:] if bytecode[:2] in ('0x', '0X') else bytecode)
+    return bytes(bytecode)
+
+
+@dataclass
+class BytecodeScanResult:
+    """Patterns found in one bytecode."""
+    functions: Set[str] = field(default_factory=set)
+    opcode_patterns: Set[str] = field(default_factory=set)
+
+    @property
+    def all(self) -> Set[str]:
+        """Function and opcode pattern names together."""
+        return self.functions | self.opcode_patterns
+
+
+class CompiledPatternSet:
+    """Immutable compiled matchers for one version of the pattern lists."""
+
+    def __init__(
+        self,
+        selectors: Mapping[str, str],
+        opcode_patterns: BytePatterns,
+        source_patterns: Mapping[str, str]
+    ):
+        self.selectors = dict(selectors)
+        self.opcode_patterns = dict(opcode_patterns)
+        self.source_patterns = dict(source_patterns)
+        self.function_names: Set[str] = set(selectors)
+        self.selector_names: Dict[bytes, str] = {
+            bytes.fromhex(selector.removeprefix('0x')): name for name, selector in selectors.items()
+        }
+
+        # Every byte of the instruction stream starts an instruction, so a
+        # plain substring test is a boundary-respecting match
+        self.opcode_sequences: List[Tuple[bytes, str]] = sorted(
+            {(sequence, name)
+             for name, value in opcode_patterns.items()
+             for sequence in ([value] if isinstance(value, bytes) else value)}
+        )
+
+        self.source_checks: List[Tuple[Optional[str], str, 're.Pattern']] = [
+            (_source_anchor(regex), name, re.compile(regex, re.IGNORECASE))
+            for name, regex in source_patterns.items()
+        ]
+
+        # Content fingerprint: stable across restarts, so persisted results stay valid
+        canonical = repr((
+            sorted(self.selectors.items()),
+            sorted((name, [value] if isinstance(value, bytes) else sorted(value))
+                   for name, value in self.opcode_patterns.items()),
+            sorted(self.source_patterns.items()),
+        ))
+        self.version = hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+    @property
+    def pattern_count(self) -> int:
+        """Number of compiled patterns."""
+        return len(self.selectors) + len(self.opcode_patterns) + len(self.source_patterns)
+
+
+class PatternScanner:
+    """
+    Scanner for bytecode and source-code patterns.
+
+    Bytecode matches only count when they start on an instruction
+    boundary, so bytes inside PUSH data never produce matches.
+    """
+
+    def __init__(
+        self,
+        name: str = 'default',
+        selectors: Optional[Mapping[str, str]] = None,
+        opcode_patterns: Optional[BytePatterns] = None,
+        source_patterns: Optional[Mapping[str, str]] = None,
+        memo_size: int = 256
+    ):
+        """
+        Initialize scanner.
+
+        Args:
+            name: Scanner identity (results cached per scanner name)
+            selectors: Function name -> 4-byte selector hex
+            opcode_patterns: Pattern name -> opcode byte sequence(s)
+            source_patterns: Pattern name -> regex for source code
+            memo_size: Recent bytecode scans remembered per pattern version
+        """
+        self.name = name
+        self.memo_size = memo_size
+        self._memo: 'OrderedDict[Any, BytecodeScanResult]' = OrderedDict()
+        self.stats = {
+            'bytecode_scans': 0,
+            'bytes_scanned': 0,
+            'source_scans': 0,
+            'source_regex_runs': 0,
+            'memo_hits': 0,
+            'scan_seconds': 0.0,
+            'rebuilds': 0,
+        }
+        self._compiled = self._compile(selectors or {}, opcode_patterns or {}, source_patterns or {})
+
+    @property
+    def version(self) -> str:
+        """Identifier of the active pattern set."""
+        return f"{self.name}:{self._compiled.version}"
+
+    @property
+    def function_names(self) -> Set[str]:
+        """Function names in the active selector set."""
+        return self._compiled.function_names
+
+    def _compile(
+        self,
+        selectors: Mapping[str, str],
+        opcode_patterns: BytePatterns,
+        source_patterns: Mapping[str, str]
+    ) -> CompiledPatternSet:
+        """Build a compiled set from pattern lists."""
+        start = time.perf_counter()
+        compiled = CompiledPatternSet(selectors, opcode_patterns, source_patterns)
+        logger.debug(
+            f"[OK] Compiled {compiled.pattern_count} patterns for '{self.name}' "
+            f"in {(time.perf_counter() - start) * 1000:.1f}ms"
+        )
+        return compiled
+
+    def update(
+        self,
+        selectors: Optional[Mapping[str, str]] = None,
+        opcode_patterns: Optional[BytePatterns] = None,
+        source_patterns: Optional[Mapping[str, str]] = None
+    ) -> str:
+        """
+        Replace pattern lists atomically.
+
+        Lists passed as None keep their current contents. The new set is
+        fully built before it replaces the active one.
+
+        Returns:
+            The new pattern set version
+        """
+        current = self._compiled
+        compiled = self._compile(
+            current.selectors if selectors is None else selectors,
+            current.opcode_patterns if opcode_patterns is None else opcode_patterns,
+            current.source_patterns if source_patterns is None else source_patterns
+        )
+        self._compiled = compiled
+        self._memo.clear()
+        self.stats['rebuilds'] += 1
+        logger.info(
+            f"[UPDATE] Pattern scanner '{self.name}' rebuilt: {current.version} -> {compiled.version}"
+        )
+        return self.version
+
+    def scan_bytecode(self, bytecode: Union[str, bytes]) -> BytecodeScanResult:
+        """
+        Find selector and opcode patterns in one linear pass.
+
+        Args:
+            bytecode: Runtime bytecode (hex string or bytes)
+
+        Returns:
+            Matched function names and opcode pattern names
+        """
+        memo_key = (self._compiled.version, bytecode)
+        cached = self._memo.get(memo_key)
+        if cached is not None:
+            self._memo.move_to_end(memo_key)
+            self.stats['memo_hits'] += 1
+            return cached
+
+        start = time.perf_counter()
+        code = _to_code(bytecode)
+        disassembly = disassemble(code)
+        self.stats['scan_seconds'] += time.perf_counter() - start
+        self.stats['bytes_scanned'] += len(code)
+
+        result = self.scan_disassembly(disassembly)
+        self._memo[memo_key] = result
+        while len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+        return result
+
+    def scan_disassembly(self, disassembly: Disassembly) -> BytecodeScanResult:
+        """
+        Match selectors and opcode patterns against an instruction stream
+        that was already disassembled (e.g. by the bytecode cache).
+
+        Args:
+            disassembly: Output of disassemble()
+
+        Returns:
+            Matched function names and opcode pattern names
+        """
+        compiled = self._compiled
+        start = time.perf_counter()
+
+        result = BytecodeScanResult()
+        selector_names = compiled.selector_names
+        for selector in disassembly.selectors:
+            name = selector_names.get(selector)
+            if name is not None:
+                result.functions.add(name)
+        opcodes = disassembly.opcodes
+        for sequence, name in compiled.opcode_sequences:
+            if name not in result.opcode_patterns and sequence in opcodes:
+                result.opcode_patterns.add(name)
+
+        self.stats['bytecode_scans'] += 1
+        self.stats['scan_seconds'] += time.perf_counter() - start
+        return result
+
+    def scan_source(self, source_code: str) -> List[str]:
+        """
+        Source patterns matched anywhere in the code, in pattern order.
+
+        Patterns whose anchor does not occur in the source are skipped
+        without running their regex.
+
+        Args:
+            source_code: Contract source
+
+        Returns:
+            Names of matched source patterns
+        """
+        compiled = self._compiled
+        self.stats['source_scans'] += 1
+        if not source_code:
+            return []
+        lowered = source_code.lower()
+        matched = []
+        for anchor, name, regex in compiled.source_checks:
+            if anchor is not None and anchor not in lowered:
+                continue
+            self.stats['source_regex_runs'] += 1
+            if regex.search(source_code):
+                matched.append(name)
+        return matched
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Scan counts, throughput and pattern set size."""
+        compiled = self._compiled
+        seconds = self.stats['scan_seconds']
+        return {
+            **self.stats,
+            'version': self.version,
+            'selectors': len(compiled.selectors),
+            'opcode_patterns': len(compiled.opcode_patterns),
+            'source_patterns': len(compiled.source_checks),
+            'megabytes_per_second': self.stats['bytes_scanned'] / seconds / 1e6 if seconds else 0.0,
+        }
@@ -52,6 +52,19 @@ class LiquidityInfo:
     price_per_token: Decimal
     last_updated: datetime = field(default_factory=datetime.utcnow)
 
+@dataclass
+class TransactionInfo:
+    """Mined transaction information data structure."""
+    hash: str
+    block_number: int
+    timestamp: int
+    from_address: str
+    to_address: Optional[str]
+    value: Decimal
+    gas_used: int
+    gas_price: Decimal
+    status: bool
+
 
 from app.utils.logger import setup_logger
 
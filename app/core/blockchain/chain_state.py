@@ -0,0 +1,415 @@
+"""
+Chain State Cache
+File: app/core/blockchain/chain_state.py
+
+Per-network in-memory view of chain state, fed by one eth_subscribe
+("newHeads") stream (or eth_getBlockByNumber polling when no WebSocket
+endpoint is available). The current head, base fee, the EIP-1559
+prediction of the next block's base fee, chain ID and gas price are plain
+attribute reads, so hot paths never make an RPC round-trip for them.
+Listeners are notified of every new head.
+"""
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional
+
+import websockets
+
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# EIP-1559 constants
+BASE_FEE_MAX_CHANGE_DENOMINATOR = 8
+ELASTICITY_MULTIPLIER = 2
+
+# async (method, params) -> JSON-RPC result, raising on an error response
+RpcCall = Callable[[str, List[Any]], Awaitable[Any]]
+HeadListener = Callable[['ChainHead'], Any]
+
+
+def _to_int(value: Any) -> int:
+    """Parse a JSON-RPC quantity (hex string or int)."""
+    if isinstance(value, int):
+        return value
+    return int(value, 16)
+
+
+def predict_next_base_fee(base_fee: int, gas_used: int, gas_limit: int) -> int:
+    """
+    Base fee of the next block per EIP-1559.
+
+    Args:
+        base_fee: Base fee of the parent block (wei)
+        gas_used: Gas used by the parent block
+        gas_limit: Gas limit of the parent block
+
+    Returns:
+        Next block's base fee (wei)
+    """
+    gas_target = gas_limit // ELASTICITY_MULTIPLIER
+    if gas_target == 0 or gas_used == gas_target:
+        return base_fee
+    if gas_used > gas_target:
+        delta = max(base_fee * (gas_used - gas_target) // gas_target // BASE_FEE_MAX_CHANGE_DENOMINATOR, 1)
+        return base_fee + delta
+    delta = base_fee * (gas_target - gas_used) // gas_target // BASE_FEE_MAX_CHANGE_DENOMINATOR
+    return max(base_fee - delta, 0)
+
+
+@dataclass
+class ChainHead:
+    """Latest block header as seen by the cache."""
+    number: int
+    hash: str
+    parent_hash: str
+    timestamp: int
+    gas_used: int
+    gas_limit: int
+    base_fee: Optional[int] = None
+    received_at: float = 0.0
+
+    @classmethod
+    def from_header(cls, header: Mapping[str, Any]) -> 'ChainHead':
+        """Build from a newHeads notification or eth_getBlockByNumber result."""
+        base_fee = header.get('baseFeePerGas')
+        return cls(
+            number=_to_int(header['number']),
+            hash=header['hash'],
+            parent_hash=header.get('parentHash', ''),
+            timestamp=_to_int(header.get('timestamp', 0)),
+            gas_used=_to_int(header.get('gasUsed', 0)),
+            gas_limit=_to_int(header.get('gasLimit', 0)),
+            base_fee=_to_int(base_fee) if base_fee is not None else None,
+            received_at=time.monotonic(),
+        )
+
+    @property
+    def next_base_fee(self) -> Optional[int]:
+        """Predicted base fee of the block after this one."""
+        if self.base_fee is None:
+            return None
+        return predict_next_base_fee(self.base_fee, self.gas_used, self.gas_limit)
+
+
+class ChainStateCache:
+    """
+    Shared, push-driven chain state for one network.
+
+    Reads (head, block_number, base_fee, next_base_fee, chain_id,
+    gas_price) never touch the network. run() keeps them current.
+    """
+
+    def __init__(
+        self,
+        network: str,
+        rpc: RpcCall,
+        ws_url: Optional[str] = None,
+        poll_interval: float = 2.0,
+        stale_after: float = 60.0,
+        refresh_gas_price: bool = True,
+        max_reorg_depth: int = 64
+    ):
+        """
+        Initialize chain state cache.
+
+        Args:
+            network: Network name
+            rpc: Async JSON-RPC transport
+            ws_url: WebSocket endpoint for the newHeads subscription; without
+                one, run() polls the latest block
+            poll_interval: Seconds between polls (also used while the
+                subscription is reconnecting)
+            stale_after: Seconds after which the head is no longer fresh
+            refresh_gas_price: Refresh eth_gasPrice once per new head
+            max_reorg_depth: How far back a replacement head is accepted
+        """
+        self.network = network
+        self.rpc = rpc
+        self.ws_url = ws_url
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.refresh_gas_price = refresh_gas_price
+        self.max_reorg_depth = max_reorg_depth
+
+        self.head: Optional[ChainHead] = None
+        self.chain_id: Optional[int] = None
+        self.gas_price: Optional[int] = None
+
+        self._listeners: List[HeadListener] = []
+        self._recent_hashes: 'OrderedDict[int, str]' = OrderedDict()
+        self._new_head = asyncio.Event()
+        self._running = False
+        self._task: Optional[asyncio.Task] = None
+        self._gas_price_task: Optional[asyncio.Task] = None
+
+        self.stats = {
+            'heads_received': 0,
+            'heads_applied': 0,
+            'reorgs': 0,
+            'polls': 0,
+            'rpc_calls': 0,
+            'subscription_reconnects': 0,
+        }
+
+    # ==================== READS ====================
+
+    @property
+    def block_number(self) -> Optional[int]:
+        """Latest block number."""
+        return self.head.number if self.head else None
+
+    @property
+    def base_fee(self) -> Optional[int]:
+        """Base fee of the latest block (None before London / on legacy chains)."""
+        return self.head.base_fee if self.head else None
+
+    @property
+    def next_base_fee(self) -> Optional[int]:
+        """Predicted base fee of the next block."""
+        return self.head.next_base_fee if self.head else None
+
+    @property
+    def head_age(self) -> Optional[float]:
+        """Seconds since the latest head was received."""
+        return time.monotonic() - self.head.received_at if self.head else None
+
+    @property
+    def is_fresh(self) -> bool:
+        """Whether the head was received within stale_after seconds."""
+        age = self.head_age
+        return age is not None and age <= self.stale_after
+
+    # ==================== UPDATES ====================
+
+    async def _call(self, method: str, params: List[Any]) -> Any:
+        self.stats['rpc_calls'] += 1
+        return await self.rpc(method, params)
+
+    async def start(self) -> 'ChainStateCache':
+        """Load chain ID, head and gas price (concurrently), then start run()."""
+        await self.refresh(include_chain_id=True)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+        return self
+
+    async def refresh(self, include_chain_id: bool = False) -> bool:
+        """
+        Poll the latest block (and gas price) once.
+
+        Returns:
+            True if a new head was applied
+        """
+        self.stats['polls'] += 1
+        calls = [self._call('eth_getBlockByNumber', ['latest', False])]
+        if self.refresh_gas_price:
+            calls.append(self._call('eth_gasPrice', []))
+        if include_chain_id or self.chain_id is None:
+            calls.append(self._call('eth_chainId', []))
+        results = await asyncio.gather(*calls)
+
+        if self.refresh_gas_price:
+            self.gas_price = _to_int(results[1])
+        if include_chain_id or self.chain_id is None:
+            self.chain_id = _to_int(results[-1])
+        if results[0] is None:
+            return False
+        return await self.apply_head(results[0], refresh_gas_price=False)
+
+    async def apply_head(self, header: Mapping[str, Any], refresh_gas_price: bool = True) -> bool:
+        """
+        Apply a block header from either feed.
+
+        Newer heads replace the current one. A header at or below the
+        current height replaces it only when it is a reorg: a different
+        block at the current height, or a block that differs from the one
+        seen at its height but whose parent is a recently seen block.
+        Repeats and stale headers (e.g. the `latest` of a lagging RPC
+        endpoint) are ignored.
+
+        Returns:
+            True if the head changed
+        """
+        self.stats['heads_received'] += 1
+        head = ChainHead.from_header(header)
+        current = self.head
+        if current is not None:
+            if head.hash == current.hash:
+                current.received_at = head.received_at
+                return False
+            if head.number <= current.number:
+                if not self._is_reorg(head, current):
+                    return False
+                self.stats['reorgs'] += 1
+                logger.info(f"[REORG] {self.network} head {current.number} -> {head.number} ({head.hash[:10]})")
+                for number in [n for n in self._recent_hashes if n >= head.number]:
+                    del self._recent_hashes[number]
+
+        self.head = head
+        self._recent_hashes[head.number] = head.hash
+        while len(self._recent_hashes) > self.max_reorg_depth:
+            self._recent_hashes.popitem(last=False)
+        self.stats['heads_applied'] += 1
+        if refresh_gas_price and self.refresh_gas_price:
+            self._schedule_gas_price_refresh()
+
+        # Wake waiters, then arm a fresh event for the next head
+        self._new_head.set()
+        self._new_head = asyncio.Event()
+
+        for listener in list(self._listeners):
+            try:
+                result = listener(head)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.error(f"[ERROR] Head listener failed on {self.network}: {e}")
+        return True
+
+    def _is_reorg(self, head: ChainHead, current: ChainHead) -> bool:
+        """Whether a header at or below the current height replaces a seen block."""
+        if head.number < current.number - self.max_reorg_depth:
+            return False
+        if head.number == current.number:
+            return True
+        known = self._recent_hashes.get(head.number)
+        if known is None or known == head.hash:
+            return False  # stale: a block we applied, or one we cannot place
+        return self._recent_hashes.get(head.number - 1) == head.parent_hash
+
+    def _schedule_gas_price_refresh(self) -> None:
+        """Refresh gas price in the background, at most one request at a time."""
+        if self._gas_price_task is not None and not self._gas_price_task.done():
+            return
+
+        async def refresh() -> None:
+            try:
+                self.gas_price = _to_int(await self._call('eth_gasPrice', []))
+            except Exception as e:
+                logger.debug(f"Gas price refresh failed on {self.network}: {e}")
+
+        self._gas_price_task = asyncio.create_task(refresh())
+
+    async def handle_subscription_message(self, message: Mapping[str, Any]) -> bool:
+        """
+        Process one eth_subscription newHeads notification.
+
+        Returns:
+            True if the head changed
+        """
+        header = message.get('params', {}).get('result')
+        if not isinstance(header, Mapping) or 'number' not in header:
+            return False
+        return await self.apply_head(header)
+
+    def add_listener(self, listener: HeadListener) -> None:
+        """Call listener (sync or async) with every new head."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: HeadListener) -> None:
+        """Stop notifying a listener."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    async def wait_for_block(self, number: int, timeout: Optional[float] = None) -> ChainHead:
+        """
+        Wait until the head reaches a block number.
+
+        Raises:
+            asyncio.TimeoutError: If the block is not reached in time
+        """
+        async def wait() -> ChainHead:
+            while self.head is None or self.head.number < number:
+                await self._new_head.wait()
+            return self.head
+
+        return await asyncio.wait_for(wait(), timeout)
+
+    # ==================== FEEDS ====================
+
+    async def run(self) -> None:
+        """Follow new heads until stop(), polling while no subscription is up."""
+        self._running = True
+        backoff = 1.0
+        while self._running:
+            try:
+                if self.ws_url:
+                    await self._follow_subscription()
+                else:
+                    await self.refresh()
+                    await asyncio.sleep(self.poll_interval)
+                backoff = 1.0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if not self._running:
+                    break
+                logger.warning(f"Chain state feed on {self.network} interrupted: {e}; polling for {backoff:.0f}s")
+                self.stats['subscription_reconnects'] += 1
+                await self._poll_for(backoff)
+                backoff = min(backoff * 2, 60.0)
+
+    async def _poll_for(self, seconds: float) -> None:
+        """Keep the state current by polling while the subscription is down."""
+        deadline = time.monotonic() + seconds
+        while self._running and time.monotonic() < deadline:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.debug(f"Chain state poll failed on {self.network}: {e}")
+            await asyncio.sleep(min(self.poll_interval, max(0.0, deadline - time.monotonic())))
+
+    async def _follow_subscription(self) -> None:
+        """Subscribe to newHeads and apply every notification."""
+        async with websockets.connect(
+            self.ws_url, ping_interval=20, ping_timeout=10, close_timeout=10
+        ) as websocket:
+            await websocket.send(json.dumps({
+                'jsonrpc': '2.0',
+                'id': 1,
+                'method': 'eth_subscribe',
+                'params': ['newHeads'],
+            }))
+            response = json.loads(await websocket.recv())
+            if 'result' not in response:
+                raise ConnectionError(f"newHeads subscription rejected: {response.get('error')}")
+            logger.info(f"Subscribed to new heads on {self.network}")
+
+            # Heads may have been missed while disconnected
+            await self.refresh()
+
+            async for message in websocket:
+                if not self._running:
+                    break
+                await self.handle_subscription_message(json.loads(message))
+
+    async def stop(self) -> None:
+        """Stop run() and background refreshes."""
+        self._running = False
+        for task in (self._task, self._gas_price_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = None
+        self._gas_price_task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        return {
+            **self.stats,
+            'network': self.network,
+            'block_number': self.block_number,
+            'base_fee': self.base_fee,
+            'next_base_fee': self.next_base_fee,
+            'gas_price': self.gas_price,
+            'chain_id': self.chain_id,
+            'head_age_seconds': self.head_age,
+            'mode': 'subscription' if self.ws_url else 'polling',
+        }
@@ -0,0 +1,581 @@
+"""
+Confirmation Tracker
+File: app/core/blockchain/confirmation_tracker.py
+
+Shared, block-driven confirmation tracking for every in-flight transaction
+on a network. On each new head from the ChainStateCache the tracker fetches
+the new block's transaction hashes once and intersects them with the
+tracked set, so the RPC cost per block stays constant however many
+transactions are pending: receipts are fetched only for transactions that
+were actually included. A receipt a lagging endpoint has not indexed yet
+is retried on the next head. Reorgs are detected from block hashes and
+undo inclusions above the fork. Replacements are detected from sender
+nonces, read in one JSON-RPC batch, and dropped transactions from
+staggered mempool lookups.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Set, Tuple
+
+from app.core.blockchain.chain_state import ChainHead, ChainStateCache, RpcCall
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+ConfirmationCallback = Callable[['Confirmation'], Any]
+
+# async [(method, params), ...] -> results in order (failed calls as exceptions)
+BatchRpcCall = Callable[[Sequence[Tuple[str, List[Any]]]], Awaitable[List[Any]]]
+
+
+class ConfirmationStatus(Enum):
+    """Final (or current) state of a tracked transaction."""
+    PENDING = "pending"
+    INCLUDED = "included"      # Mined, waiting for confirmation depth
+    CONFIRMED = "confirmed"
+    FAILED = "failed"          # Mined but reverted
+    REPLACED = "replaced"      # Nonce used by another transaction
+    DROPPED = "dropped"        # Neither mined nor in the mempool
+    TIMEOUT = "timeout"
+
+
+@dataclass
+class Confirmation:
+    """Outcome of a tracked transaction."""
+    tx_hash: str
+    status: ConfirmationStatus
+    block_number: Optional[int] = None
+    block_hash: Optional[str] = None
+    confirmations: int = 0
+    gas_used: Optional[int] = None
+    effective_gas_price: Optional[int] = None
+    receipt: Optional[Dict[str, Any]] = None
+    error_message: Optional[str] = None
+    elapsed_seconds: float = 0.0
+
+    @property
+    def succeeded(self) -> bool:
+        """Whether the transaction was mined successfully."""
+        return self.status == ConfirmationStatus.CONFIRMED
+
+
+@dataclass(eq=False)
+class TrackedTransaction:
+    """A transaction the tracker is following."""
+    tx_hash: str
+    sender: Optional[str]
+    nonce: Optional[int]
+    confirmations: int
+    submitted_block: int
+    future: asyncio.Future
+    callbacks: List[ConfirmationCallback] = field(default_factory=list)
+    timeout_block: Optional[int] = None
+    receipt: Optional[Dict[str, Any]] = None
+    block_number: Optional[int] = None
+    block_hash: Optional[str] = None
+    submitted_at: float = field(default_factory=time.monotonic)
+
+
+def _to_int(value: Any) -> Optional[int]:
+    if value is None or isinstance(value, int):
+        return value
+    return int(value, 16)
+
+
+class ConfirmationTracker:
+    """
+    Resolves futures and callbacks for many transactions from one block feed.
+
+    Per new block: one eth_getBlockByNumber, one eth_getTransactionReceipt
+    per tracked transaction it contains (retried on the next head while the
+    node has no receipt yet), and the eth_getTransactionCount of every
+    sender with transactions still pending, as one batch when a batch
+    transport is given. Nothing is fetched while no transaction is tracked.
+    """
+
+    def __init__(
+        self,
+        chain_state: ChainStateCache,
+        rpc: Optional[RpcCall] = None,
+        batch_rpc: Optional[BatchRpcCall] = None,
+        confirmations: int = 1,
+        drop_check_blocks: int = 25,
+        max_catch_up_blocks: int = 32,
+        max_reorg_depth: int = 64,
+        max_concurrent_requests: int = 16
+    ):
+        """
+        Initialize confirmation tracker.
+
+        Args:
+            chain_state: Head feed for the network
+            rpc: JSON-RPC transport (defaults to the chain state's)
+            batch_rpc: JSON-RPC batch transport for the per-block nonce reads
+                (one call per sender without it)
+            confirmations: Default confirmation depth
+            drop_check_blocks: Check a pending transaction against the mempool
+                every this many blocks after submission
+            max_catch_up_blocks: Largest gap scanned block by block; longer
+                gaps fall back to one receipt lookup per pending transaction
+            max_reorg_depth: Block hashes remembered for reorg detection
+            max_concurrent_requests: Parallel receipt/nonce lookups
+        """
+        self.chain_state = chain_state
+        self.rpc = rpc or chain_state.rpc
+        self.batch_rpc = batch_rpc
+        self.confirmations = confirmations
+        self.drop_check_blocks = drop_check_blocks
+        self.max_catch_up_blocks = max_catch_up_blocks
+        self.max_reorg_depth = max_reorg_depth
+
+        self._pending: Dict[str, TrackedTransaction] = {}
+        self._included: Dict[str, TrackedTransaction] = {}
+        # Seen in a block (key -> block number) but the node had no receipt yet
+        self._awaiting_receipt: Dict[str, int] = {}
+        self._block_hashes: 'OrderedDict[int, str]' = OrderedDict()
+        self._last_block: Optional[int] = None
+        self._semaphore = asyncio.Semaphore(max_concurrent_requests)
+        self._lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._callback_tasks: Set[asyncio.Task] = set()
+
+        self.stats = {
+            'tracked': 0,
+            'blocks_scanned': 0,
+            'rpc_calls': 0,
+            'receipts_fetched': 0,
+            'receipt_retries': 0,
+            'batch_requests': 0,
+            'catch_up_sweeps': 0,
+            'reorgs': 0,
+            'reorged_transactions': 0,
+            'max_in_flight': 0,
+            **{f'resolved_{status.value}': 0 for status in ConfirmationStatus
+               if status not in (ConfirmationStatus.PENDING, ConfirmationStatus.INCLUDED)},
+        }
+
+    # ==================== TRACKING ====================
+
+    def track(
+        self,
+        tx_hash: str,
+        sender: Optional[str] = None,
+        nonce: Optional[int] = None,
+        confirmations: Optional[int] = None,
+        callback: Optional[ConfirmationCallback] = None,
+        timeout_blocks: Optional[int] = None
+    ) -> asyncio.Future:
+        """
+        Start tracking a sent transaction.
+
+        Args:
+            tx_hash: Transaction hash
+            sender: Sender address (enables replacement detection)
+            nonce: Transaction nonce (enables replacement detection)
+            confirmations: Blocks required on top of inclusion (default tracker-wide)
+            callback: Called (sync or async) with the Confirmation
+            timeout_blocks: Give up after this many blocks
+
+        Returns:
+            Future resolving to the Confirmation
+        """
+        key = tx_hash.lower()
+        existing = self._pending.get(key) or self._included.get(key)
+        if existing is not None:
+            if callback is not None:
+                existing.callbacks.append(callback)
+            return existing.future
+
+        head = self.chain_state.block_number or 0
+        if self._last_block is None:
+            self._last_block = head
+        tracked = TrackedTransaction(
+            tx_hash=tx_hash,
+            sender=sender,
+            nonce=nonce,
+            confirmations=max(1, confirmations or self.confirmations),
+            submitted_block=head,
+            future=asyncio.get_running_loop().create_future(),
+            callbacks=[callback] if callback is not None else [],
+            timeout_block=head + timeout_blocks if timeout_blocks else None
+        )
+        self._pending[key] = tracked
+        self.stats['tracked'] += 1
+        self.stats['max_in_flight'] = max(self.stats['max_in_flight'], self.in_flight)
+        return tracked.future
+
+    async def wait(self, tx_hash: str, timeout: Optional[float] = None, **kwargs) -> Confirmation:
+        """
+        Track a transaction (if not already) and wait for its outcome.
+
+        Returns a TIMEOUT Confirmation if timeout seconds pass first; the
+        transaction stays tracked.
+        """
+        future = self.track(tx_hash, **kwargs)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            return Confirmation(
+                tx_hash=tx_hash,
+                status=ConfirmationStatus.TIMEOUT,
+                error_message=f"Not confirmed within {timeout}s"
+            )
+
+    def untrack(self, tx_hash: str) -> bool:
+        """Stop tracking a transaction without resolving it."""
+        key = tx_hash.lower()
+        tracked = self._pending.pop(key, None) or self._included.pop(key, None)
+        if tracked is not None and not tracked.future.done():
+            tracked.future.cancel()
+        return tracked is not None
+
+    @property
+    def in_flight(self) -> int:
+        """Transactions not yet resolved."""
+        return len(self._pending) + len(self._included)
+
+    # ==================== BLOCK PROCESSING ====================
+
+    async def start(self) -> 'ConfirmationTracker':
+        """Process every new head from the chain state feed."""
+        self.chain_state.add_listener(self._on_head)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return self
+
+    def _on_head(self, head: ChainHead) -> None:
+        # Never block the head feed: processing happens in _run()
+        self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            try:
+                await self.process()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Confirmation tracking on {self.chain_state.network} failed: {e}")
+
+    async def process(self) -> int:
+        """
+        Bring tracking up to the current head.
+
+        Returns:
+            Number of transactions resolved
+        """
+        async with self._lock:
+            head = self.chain_state.head
+            if head is None:
+                return 0
+            if not self.in_flight:
+                # Idle: nothing to scan or to undo on a reorg
+                self._last_block = head.number
+                self._block_hashes.clear()
+                return 0
+
+            await self._retry_receipts()
+            start = min(self._last_block + 1, head.number)
+            if head.number - start + 1 > self.max_catch_up_blocks:
+                await self._sweep_receipts(head.number)
+            else:
+                await self._scan_blocks(start, head.number)
+
+            resolved = self._update_confirmations(head.number)
+            resolved += await self._check_senders(head.number)
+            resolved += await self._check_dropped(head.number)
+            return resolved
+
+    async def _call(self, method: str, params: List[Any]) -> Any:
+        async with self._semaphore:
+            self.stats['rpc_calls'] += 1
+            return await self.rpc(method, params)
+
+    async def _call_batch(self, method: str, params_list: List[List[Any]]) -> List[Any]:
+        """
+        Same method for many params: one JSON-RPC batch when a batch
+        transport is available, parallel calls otherwise.
+
+        Returns:
+            Results in order; a call that failed yields its exception
+        """
+        if self.batch_rpc is not None and len(params_list) > 1:
+            async with self._semaphore:
+                self.stats['rpc_calls'] += 1
+                self.stats['batch_requests'] += 1
+                return await self.batch_rpc([(method, params) for params in params_list])
+        return await asyncio.gather(*(self._call(method, params) for params in params_list),
+                                    return_exceptions=True)
+
+    async def _scan_blocks(self, start: int, end: int) -> None:
+        """Scan blocks start..end, rewinding when one no longer extends the last."""
+        number = start
+        while number <= end:
+            block = await self._call('eth_getBlockByNumber', [hex(number), False])
+            if block is None:
+                break  # node behind the head feed; retried on the next head
+            known = self._block_hashes.get(number)
+            if known == block['hash']:
+                number += 1
+                continue
+            parent = self._block_hashes.get(number - 1)
+            if known is not None or (parent is not None and block.get('parentHash') != parent):
+                number = await self._rewind(number - 1) + 1
+                continue
+
+            await self._apply_block(number, block)
+            number += 1
+
+    async def _apply_block(self, number: int, block: Mapping[str, Any]) -> None:
+        """Record a canonical block and pick up tracked transactions it contains."""
+        self._block_hashes[number] = block['hash']
+        while len(self._block_hashes) > self.max_reorg_depth:
+            self._block_hashes.popitem(last=False)
+        self._last_block = number
+        self.stats['blocks_scanned'] += 1
+
+        pending = self._pending
+        matches = [tx_hash.lower() for tx_hash in block.get('transactions', ())
+                   if isinstance(tx_hash, str) and tx_hash.lower() in pending]
+        if matches:
+            receipts = await asyncio.gather(*(
+                self._call('eth_getTransactionReceipt', [pending[key].tx_hash]) for key in matches
+            ))
+            for key, receipt in zip(matches, receipts):
+                if receipt is None:
+                    # The block is ahead of the endpoint's receipt index
+                    self._awaiting_receipt[key] = number
+                self._include(key, receipt)
+
+    async def _retry_receipts(self) -> None:
+        """Fetch receipts that were missing when their block was scanned."""
+        keys = [key for key in self._awaiting_receipt if key in self._pending]
+        self._awaiting_receipt = {key: self._awaiting_receipt[key] for key in keys}
+        if not keys:
+            return
+        self.stats['receipt_retries'] += len(keys)
+        receipts = await asyncio.gather(*(
+            self._call('eth_getTransactionReceipt', [self._pending[key].tx_hash]) for key in keys
+        ))
+        for key, receipt in zip(keys, receipts):
+            self._include(key, receipt)
+
+    def _include(self, key: str, receipt: Optional[Mapping[str, Any]]) -> None:
+        """Move a transaction from pending to included."""
+        if receipt is None:
+            return
+        self.stats['receipts_fetched'] += 1
+        self._awaiting_receipt.pop(key, None)
+        tracked = self._pending.pop(key, None)
+        if tracked is None:
+            return
+        tracked.receipt = dict(receipt)
+        tracked.block_number = _to_int(receipt.get('blockNumber'))
+        tracked.block_hash = receipt.get('blockHash')
+        self._included[key] = tracked
+
+    async def _rewind(self, number: int) -> int:
+        """
+        Walk back to the last remembered block that is still canonical.
+
+        Inclusions above it return to pending and are rescanned.
+
+        Returns:
+            Fork block number
+        """
+        while number in self._block_hashes:
+            block = await self._call('eth_getBlockByNumber', [hex(number), False])
+            if block is not None and block['hash'] == self._block_hashes[number]:
+                break
+            number -= 1
+
+        for stale in [n for n in self._block_hashes if n > number]:
+            del self._block_hashes[stale]
+        self._awaiting_receipt = {key: block for key, block in self._awaiting_receipt.items() if block <= number}
+        reverted = [key for key, tracked in self._included.items()
+                    if tracked.block_number is not None and tracked.block_number > number]
+        for key in reverted:
+            tracked = self._included.pop(key)
+            tracked.receipt = tracked.block_number = tracked.block_hash = None
+            self._pending[key] = tracked
+
+        self._last_block = number
+        self.stats['reorgs'] += 1
+        self.stats['reorged_transactions'] += len(reverted)
+        logger.info(
+            f"[REORG] {self.chain_state.network}: rewound to block {number}, "
+            f"{len(reverted)} transactions back to pending"
+        )
+        return number
+
+    async def _sweep_receipts(self, head_number: int) -> None:
+        """After a long gap, look up every pending receipt instead of every block."""
+        self.stats['catch_up_sweeps'] += 1
+        keys = list(self._pending)
+        receipts = await asyncio.gather(*(
+            self._call('eth_getTransactionReceipt', [self._pending[key].tx_hash]) for key in keys
+        ))
+        for key, receipt in zip(keys, receipts):
+            self._include(key, receipt)
+        self._block_hashes.clear()
+        self._last_block = head_number
+
+    def _update_confirmations(self, head_number: int) -> int:
+        """Resolve included transactions that reached their depth (or timed out)."""
+        resolved = 0
+        for key, tracked in list(self._included.items()):
+            depth = head_number - tracked.block_number + 1
+            if depth >= tracked.confirmations:
+                del self._included[key]
+                succeeded = _to_int(tracked.receipt.get('status', 1)) == 1
+                self._resolve(
+                    tracked,
+                    ConfirmationStatus.CONFIRMED if succeeded else ConfirmationStatus.FAILED,
+                    confirmations=depth,
+                    error_message=None if succeeded else "Transaction reverted"
+                )
+                resolved += 1
+
+        for key, tracked in list(self._pending.items()):
+            if tracked.timeout_block is not None and head_number >= tracked.timeout_block:
+                del self._pending[key]
+                self._resolve(tracked, ConfirmationStatus.TIMEOUT,
+                              error_message=f"Not mined within {tracked.timeout_block - tracked.submitted_block} blocks")
+                resolved += 1
+        return resolved
+
+    async def _check_senders(self, head_number: int) -> int:
+        """Detect replacements: a sender's mined nonce moved past a pending transaction."""
+        by_sender: Dict[str, List[str]] = {}
+        for key, tracked in self._pending.items():
+            if key in self._awaiting_receipt:
+                continue  # seen in a block; its receipt is retried on the next head
+            if tracked.sender is not None and tracked.nonce is not None:
+                by_sender.setdefault(tracked.sender, []).append(key)
+        if not by_sender:
+            return 0
+
+        senders = list(by_sender)
+        counts = await self._call_batch(
+            'eth_getTransactionCount', [[sender, hex(head_number)] for sender in senders]
+        )
+        passed = []
+        for sender, count in zip(senders, counts):
+            if isinstance(count, Exception) or count is None:
+                logger.debug(f"Nonce read for {sender} failed: {count}")
+                continue  # checked again on the next head
+            passed.extend(key for key in by_sender[sender]
+                          if key in self._pending and self._pending[key].nonce < _to_int(count))
+        if not passed:
+            return 0
+
+        # Mined before tracking started (or in a skipped block), or replaced
+        receipts = await asyncio.gather(*(
+            self._call('eth_getTransactionReceipt', [self._pending[key].tx_hash]) for key in passed
+        ))
+        resolved = 0
+        for key, receipt in zip(passed, receipts):
+            if receipt is not None:
+                self._include(key, receipt)
+                continue
+            tracked = self._pending.pop(key)
+            self._resolve(tracked, ConfirmationStatus.REPLACED,
+                          error_message=f"Nonce {tracked.nonce} used by another transaction")
+            resolved += 1
+        return resolved + self._update_confirmations(head_number)
+
+    async def _check_dropped(self, head_number: int) -> int:
+        """Look up pending transactions in the mempool every drop_check_blocks blocks."""
+        due = [key for key, tracked in self._pending.items()
+               if head_number > tracked.submitted_block
+               and (head_number - tracked.submitted_block) % self.drop_check_blocks == 0]
+        if not due:
+            return 0
+
+        found = await asyncio.gather(*(
+            self._call('eth_getTransactionByHash', [self._pending[key].tx_hash]) for key in due
+        ))
+        resolved = 0
+        mined = []
+        for key, tx in zip(due, found):
+            if key not in self._pending:
+                continue
+            if tx is None:
+                tracked = self._pending.pop(key)
+                self._resolve(tracked, ConfirmationStatus.DROPPED,
+                              error_message="Transaction no longer known to the node")
+                resolved += 1
+            elif tx.get('blockNumber') is not None:
+                mined.append(key)  # included in a block scanned before tracking
+
+        if mined:
+            receipts = await asyncio.gather(*(
+                self._call('eth_getTransactionReceipt', [self._pending[key].tx_hash]) for key in mined
+            ))
+            for key, receipt in zip(mined, receipts):
+                self._include(key, receipt)
+            resolved += self._update_confirmations(head_number)
+        return resolved
+
+    def _resolve(self, tracked: TrackedTransaction, status: ConfirmationStatus, **details) -> None:
+        """Complete the future and fire callbacks."""
+        receipt = tracked.receipt or {}
+        confirmation = Confirmation(
+            tx_hash=tracked.tx_hash,
+            status=status,
+            block_number=tracked.block_number,
+            block_hash=tracked.block_hash,
+            gas_used=_to_int(receipt.get('gasUsed')),
+            effective_gas_price=_to_int(receipt.get('effectiveGasPrice')),
+            receipt=tracked.receipt,
+            elapsed_seconds=time.monotonic() - tracked.submitted_at,
+            **details
+        )
+        self.stats[f'resolved_{status.value}'] += 1
+        if not tracked.future.done():
+            tracked.future.set_result(confirmation)
+
+        for callback in tracked.callbacks:
+            try:
+                result = callback(confirmation)
+                if asyncio.iscoroutine(result):
+                    task = asyncio.create_task(result)
+                    self._callback_tasks.add(task)
+                    task.add_done_callback(self._callback_tasks.discard)
+            except Exception as e:
+                logger.error(f"[ERROR] Confirmation callback failed for {tracked.tx_hash}: {e}")
+
+    async def stop(self) -> None:
+        """Detach from the head feed and cancel outstanding waits."""
+        self.chain_state.remove_listener(self._on_head)
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        for tracked in list(self._pending.values()) + list(self._included.values()):
+            if not tracked.future.done():
+                tracked.future.cancel()
+        self._pending.clear()
+        self._included.clear()
+        self._awaiting_receipt.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get tracker statistics."""
+        blocks = max(1, self.stats['blocks_scanned'])
+        return {
+            **self.stats,
+            'network': self.chain_state.network,
+            'pending': len(self._pending),
+            'included': len(self._included),
+            'last_block': self._last_block,
+            'rpc_calls_per_block': round(self.stats['rpc_calls'] / blocks, 2),
+        }
@@ -2,12 +2,15 @@
 File: app/core/blockchain/evm_chains/ethereum_real.py
 
 Real Ethereum blockchain implementation using Web3.py for live blockchain data.
-Replaces placeholder implementation with actual Web3 connections.
+Replaces placeholder implementation with actual Web3 connections. Token
+metadata and liquidity reads are batched through Multicall3 on the async
+provider,
+and new pairs are discovered from factory PairCreated/PoolCreated logs.
 """
 
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Set, Union
 from decimal import Decimal
-from web3 import Web3
+from web3 import AsyncWeb3, Web3
 from web3.middleware import geth_poa_middleware
 import asyncio
 import time
@@ -15,6 +18,12 @@ import time
 from app.core.blockchain.base_chain import (
     BaseChain, ChainType, TokenInfo, LiquidityInfo, TransactionInfo
 )
+from app.core.blockchain.multicall import (
+    BatchedChainReader, MulticallClient, decode_uint, encode_call
+)
+from app.core.discovery.pair_log_discovery import (
+    BlockCursorStore, PairHandler, PairLogDiscovery
+)
 from app.utils.exceptions import (
     ChainConnectionException, TokenNotFoundError, APIException
 )
@@ -34,6 +43,8 @@ class RealEthereumChain(BaseChain):
     - Actual block and transaction data
     - ERC-20 token discovery and analysis
     - DEX liquidity pool integration
+    - Multicall3-batched token and reserve reads on an async provider
+    - Factory log based new-pair discovery (eth_getLogs / eth_subscribe)
     """
     
     def __init__(self, network_name: str, rpc_urls: List[str], **kwargs):
@@ -45,100 +56,16 @@ class RealEthereumChain(BaseChain):
             rpc_urls: List of RPC endpoints
             **kwargs: Additional network configuration
         """
-        super().__init__(network_name, rpc_urls, **kwargs)
+        super().__init__(network_name)
+        self.rpc_urls = rpc_urls
+        self._connected = False
         self.w3: Optional[Web3] = None
         self._chain_id = kwargs.get('chain_id')
         self._dex_protocols = kwargs.get('dex_protocols', [])
         self._block_time = kwargs.get('block_time', 12)
         
-        # ERC-20 ABI for token interactions
-        self.erc20_abi = [
-            {
-                "constant": True,
-                "inputs": [],
-                "name": "name",
-                "outputs": [{"name": "", "type": "string"}],
-                "type": "function"
-            },
-            {
-                "constant": True,
-                "inputs": [],
-                "name": "symbol",
-                "outputs": [{"name": "", "type": "string"}],
-                "type": "function"
-            },
-            {
-                "constant": True,
-                "inputs": [],
-                "name": "decimals",
-                "outputs": [{"name": "", "type": "uint8"}],
-                "type": "function"
-            },
-            {
-                "constant": True,
-                "inputs": [],
-                "name": "totalSupply",
-                "outputs": [{"name": "", "type": "uint256"}],
-                "type": "function"
-            },
-            {
-                "constant": True,
-                "inputs": [{"name": "_owner", "type": "address"}],
-                "name": "balanceOf",
-                "outputs": [{"name": "balance", "type": "uint256"}],
-                "type": "function"
-            }
-        ]
-        
-        # Uniswap V2 Factory ABI (for finding pairs)
-        self.uniswap_v2_factory_abi = [
-            {
-                "constant": True,
-                "inputs": [
-                    {"name": "tokenA", "type": "address"},
-                    {"name": "tokenB", "type": "address"}
-                ],
-                "name": "getPair",
-                "outputs": [{"name": "pair", "type": "address"}],
-                "type": "function"
-            }
-        ]
-        
-        # Uniswap V2 Pair ABI (for liquidity data)
-        self.uniswap_v2_pair_abi = [
-            {
-                "constant": True,
-                "inputs": [],
-                "name": "getReserves",
-                "outputs": [
-                    {"name": "reserve0", "type": "uint112"},
-                    {"name": "reserve1", "type": "uint112"},
-                    {"name": "blockTimestampLast", "type": "uint32"}
-                ],
-                "type": "function"
-            },
-            {
-                "constant": True,
-                "inputs": [],
-                "name": "token0",
-                "outputs": [{"name": "", "type": "address"}],
-                "type": "function"
-            },
-            {
-                "constant": True,
-                "inputs": [],
-                "name": "token1",
-                "outputs": [{"name": "", "type": "address"}],
-                "type": "function"
-            },
-            {
-                "constant": True,
-                "inputs": [],
-                "name": "totalSupply",
-                "outputs": [{"name": "", "type": "uint256"}],
-                "type": "function"
-            }
-        ]
+        self.async_w3: Optional[AsyncWeb3] = None
+        self.reader: Optional[BatchedChainReader] = None
         
         # Common DEX factory addresses
         self.dex_factories = {
@@ -152,11 +79,39 @@ class RealEthereumChain(BaseChain):
             }
         }
         
+        # Concentrated-liquidity factories, watched for PoolCreated only
+        # (the batched reader's getPair lookups are V2-specific)
+        self.v3_factories = {
+            'ethereum': {
+                'uniswap_v3': '0x1F98431c8aD98523631AE4a59f267346ea31F984',
+            },
+            'polygon': {
+                'uniswap_v3': '0x1F98431c8aD98523631AE4a59f267346ea31F984',
+            }
+        }
+        
         # WETH addresses for price calculations
         self.weth_addresses = {
             'ethereum': '0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2',
             'polygon': '0x0d500B1d8E8eF31E21C99d1Db9A6444d3ADf1270',  # WMATIC
         }
+        
+        # Established tokens new pairs are quoted against (besides wrapped native)
+        self.quote_token_addresses = {
+            'ethereum': [
+                '0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48',  # USDC
+                '0xdAC17F958D2ee523a2206206994597C13D831ec7',  # USDT
+                '0x6B175474E89094C44Da98b954EedeAC495271d0F',  # DAI
+                '0x2260FAC5E5542a773Aa44fBCfeDf7C193bc2C599',  # WBTC
+            ],
+            'polygon': [
+                '0x3c499c542cEF5E3811e1192ce70d8cC03d5c3359',  # USDC
+                '0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174',  # USDC.e
+                '0xc2132D05D31c914a87C6611C10748AEb04B58e8F',  # USDT
+                '0x8f3Cf7ad23Cd3CaDbD9735AFf958023239c3A063',  # DAI
+                '0x7ceB23fD6bC0adD59E62ac25578270cFf1b9f619',  # WETH
+            ],
+        }
     
     @property
     def chain_type(self) -> ChainType:
@@ -168,6 +123,11 @@ class RealEthereumChain(BaseChain):
         """Get the chain ID."""
         return self._chain_id
     
+    @property
+    def is_connected(self) -> bool:
+        """Whether connect() succeeded and disconnect() has not been called."""
+        return self._connected
+    
     async def connect(self) -> bool:
         """
         Establish connection to the Ethereum network using Web3.py.
@@ -207,6 +167,9 @@ class RealEthereumChain(BaseChain):
                     f"Chain ID: {chain_id}, Latest block: {latest_block}"
                 )
                 
+                # Async provider for batched reads that must not block the event loop
+                self._attach_async_provider(AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(rpc_url)))
+                
                 self._connected = True
                 return True
                 
@@ -221,9 +184,86 @@ class RealEthereumChain(BaseChain):
     async def disconnect(self):
         """Disconnect from the Ethereum network."""
         self.w3 = None
+        self.async_w3 = None
+        self.reader = None
         self._connected = False
         logger.info(f"Disconnected from {self.network_name}")
     
+    def _attach_async_provider(self, async_w3: AsyncWeb3) -> None:
+        """Use an async provider for eth_call/getLogs and build the Multicall3 reader on it."""
+        self.async_w3 = async_w3
+        self.reader = BatchedChainReader(
+            MulticallClient(self._async_eth_call),
+            factories=self.dex_factories.get(self.network_name, {}),
+            wrapped_native=self.weth_addresses.get(self.network_name)
+        )
+    
+    async def _async_eth_call(self, tx: Dict[str, str]) -> bytes:
+        """eth_call on the async provider (transport for MulticallClient)."""
+        return await self.async_w3.eth.call(tx, 'latest')
+    
+    async def _rpc(self, method: str, params: List[Any]) -> Any:
+        """Raw JSON-RPC request on the async provider (transport for PairLogDiscovery)."""
+        response = await self.async_w3.provider.make_request(method, params)
+        if response.get('error'):
+            error = response['error']
+            message = error.get('message', error) if isinstance(error, dict) else error
+            raise APIException(f"{method} failed: {message}")
+        return response.get('result')
+    
+    @property
+    def pair_factories(self) -> Dict[str, str]:
+        """All watched factories (V2 and V3) on this network, by DEX name."""
+        return {
+            **self.dex_factories.get(self.network_name, {}),
+            **self.v3_factories.get(self.network_name, {}),
+        }
+    
+    @property
+    def quote_tokens(self) -> Set[str]:
+        """Lowercase addresses of the wrapped native and quote tokens on this network."""
+        tokens = {address.lower() for address in self.quote_token_addresses.get(self.network_name, [])}
+        weth = self.weth_addresses.get(self.network_name)
+        if weth:
+            tokens.add(weth.lower())
+        return tokens
+    
+    def create_pair_discovery(
+        self,
+        handler: Optional[PairHandler] = None,
+        ws_url: Optional[str] = None,
+        cursor_path: Optional[str] = None,
+        start_block: Optional[int] = None
+    ) -> PairLogDiscovery:
+        """
+        Build a log-driven new-pair discovery for this network.
+        
+        Args:
+            handler: Callback invoked with each PairCreatedEvent
+            ws_url: WebSocket endpoint for eth_subscribe (polls getLogs if None)
+            cursor_path: Block cursor file (settings.pair_discovery_cursor_path by default)
+            start_block: First block to scan when no cursor has been saved
+            
+        Returns:
+            PairLogDiscovery bound to this chain's async provider
+        """
+        if not self.is_connected or not self.async_w3:
+            raise ChainConnectionException("Not connected to blockchain")
+        
+        cursor_path = cursor_path or getattr(
+            settings, 'pair_discovery_cursor_path', 'data/pair_discovery_cursors.json'
+        )
+        return PairLogDiscovery(
+            network=self.network_name,
+            rpc=self._rpc,
+            factories=self.pair_factories,
+            handler=handler,
+            cursor_store=BlockCursorStore(cursor_path),
+            ws_url=ws_url,
+            start_block=start_block,
+            poll_interval=self._block_time
+        )
+    
     async def get_latest_block_number(self) -> int:
         """
         Get the latest block number from the live blockchain.
@@ -270,56 +310,59 @@ class RealEthereumChain(BaseChain):
         Returns:
             TokenInfo object or None if not found
         """
-        if not self.is_connected or not self.w3:
+        if not Web3.is_address(token_address):
+            raise TokenNotFoundError(f"Invalid token address: {token_address}")
+        
+        infos = await self.get_token_infos([token_address])
+        return infos.get(Web3.to_checksum_address(token_address))
+    
+    async def get_token_infos(self, token_addresses: List[str]) -> Dict[str, Optional[TokenInfo]]:
+        """
+        Get token information for many tokens in a few batched round trips.
+        
+        Args:
+            token_addresses: Token contract addresses
+            
+        Returns:
+            Mapping of checksum address -> TokenInfo (None for non-ERC-20 addresses)
+        """
+        if not self.is_connected or not self.reader:
             raise ChainConnectionException("Not connected to blockchain")
         
         try:
-            # Validate and checksum address
-            if not Web3.is_address(token_address):
-                raise TokenNotFoundError(f"Invalid token address: {token_address}")
-            
-            token_address = Web3.to_checksum_address(token_address)
-            
-            # Check if it's a contract
-            code = self.w3.eth.get_code(token_address)
-            if len(code) == 0:
-                logger.warning(f"Address {token_address} is not a contract")
-                return None
-            
-            # Create contract instance
-            contract = self.w3.eth.contract(
-                address=token_address,
-                abi=self.erc20_abi
-            )
-            
-            # Get token information
-            try:
-                name = contract.functions.name().call()
-                symbol = contract.functions.symbol().call()
-                decimals = contract.functions.decimals().call()
-                total_supply = contract.functions.totalSupply().call()
-            except Exception as e:
-                logger.warning(f"Failed to get token info for {token_address}: {e}")
-                return None
-            
-            # Get creation info (simplified - would need more complex logic for full implementation)
-            creation_block = None
-            creator = None
+            return await self.reader.get_token_infos(token_addresses)
+        except Exception as e:
+            logger.error(f"Failed to get token info for {len(token_addresses)} tokens: {e}")
+            return {}
+    
+    async def get_balance(self, address: str, token_address: Optional[str] = None) -> float:
+        """
+        Get the native or ERC-20 balance of an address.
+        
+        Args:
+            address: Account address
+            token_address: ERC-20 contract (native balance if None)
             
-            return TokenInfo(
-                address=token_address,
-                name=name,
-                symbol=symbol,
-                decimals=decimals,
-                total_supply=total_supply,
-                verified=False,  # Would need external API for verification
-                created_at=creation_block,
-                creator=creator
-            )
+        Returns:
+            Balance in whole units
+        """
+        if not self.is_connected or not self.async_w3:
+            raise ChainConnectionException("Not connected to blockchain")
+        
+        owner = Web3.to_checksum_address(address)
+        try:
+            if token_address is None:
+                return float(Web3.from_wei(await self.async_w3.eth.get_balance(owner), 'ether'))
             
+            token = Web3.to_checksum_address(token_address)
+            data = encode_call('balanceOf(address)', ['address'], [owner])
+            raw = decode_uint(await self._async_eth_call({'to': token, 'data': '0x' + data.hex()}))
+            info = await self.get_token_info(token)
+            decimals = info.decimals if info else 18
+            return float(Decimal(raw) / Decimal(10 ** decimals))
         except Exception as e:
-            logger.error(f"Failed to get token info for {token_address}: {e}")
-            return None
+            logger.error(f"Failed to get balance for {address}: {e}")
+            raise ChainConnectionException(f"Failed to get balance: {e}")
     
     async def get_token_liquidity(self, token_address: str) -> List[LiquidityInfo]:
         """
@@ -331,79 +374,33 @@ class RealEthereumChain(BaseChain):
         Returns:
             List of LiquidityInfo objects
         """
-        if not self.is_connected or not self.w3:
-            raise ChainConnectionException("Not connected to blockchain")
-        
-        liquidity_info = []
-        token_address = Web3.to_checksum_address(token_address)
-        weth_address = self.weth_addresses.get(self.network_name)
+        liquidity = await self.get_liquidity_many([token_address])
+        return liquidity.get(Web3.to_checksum_address(token_address), [])
+    
+    async def get_liquidity_many(self, token_addresses: List[str]) -> Dict[str, List[LiquidityInfo]]:
+        """
+        Get WETH-pair liquidity for many tokens across all configured DEXs.
         
-        if not weth_address:
-            logger.warning(f"WETH address not configured for {self.network_name}")
-            return liquidity_info
+        Pair lookups for every (token, factory) go out in one batched round
+        and reserves for the pairs that exist in a second.
         
-        # Get DEX factories for this network
-        network_factories = self.dex_factories.get(self.network_name, {})
+        Args:
+            token_addresses: Token contract addresses
+            
+        Returns:
+            Mapping of checksum token address -> LiquidityInfo list
+        """
+        if not self.is_connected or not self.reader:
+            raise ChainConnectionException("Not connected to blockchain")
         
-        for dex_name, factory_address in network_factories.items():
-            try:
-                # Get pair address
-                factory_contract = self.w3.eth.contract(
-                    address=Web3.to_checksum_address(factory_address),
-                    abi=self.uniswap_v2_factory_abi
-                )
-                
-                pair_address = factory_contract.functions.getPair(
-                    token_address, weth_address
-                ).call()
-                
-                # Check if pair exists
-                if pair_address == '0x0000000000000000000000000000000000000000':
-                    continue
-                
-                # Get pair liquidity
-                pair_contract = self.w3.eth.contract(
-                    address=pair_address,
-                    abi=self.uniswap_v2_pair_abi
-                )
-                
-                reserves = pair_contract.functions.getReserves().call()
-                token0 = pair_contract.functions.token0().call()
-                token1 = pair_contract.functions.token1().call()
-                
-                # Determine which reserve is which token
-                if token0.lower() == token_address.lower():
-                    token_reserve = reserves[0]
-                    weth_reserve = reserves[1]
-                else:
-                    token_reserve = reserves[1]
-                    weth_reserve = reserves[0]
-                
-                # Calculate price (simplified - would need WETH/USD price for accurate USD value)
-                if token_reserve > 0:
-                    price_in_weth = Decimal(str(weth_reserve)) / Decimal(str(token_reserve))
-                    # For now, assume 1 WETH = $2000 (would get real price from oracle)
-                    price_usd = price_in_weth * Decimal("2000")
-                    
-                    liquidity_usd = Decimal(str(weth_reserve)) * Decimal("2") * Decimal("2000") / Decimal("10**18")
-                    
-                    liquidity_info.append(LiquidityInfo(
-                        dex=dex_name,
-                        pair_address=pair_address,
-                        token0=token0,
-                        token1=token1,
-                        reserve0=Decimal(str(reserves[0])),
-                        reserve1=Decimal(str(reserves[1])),
-                        total_liquidity_usd=liquidity_usd,
-                        volume_24h_usd=Decimal("0"),  # Would need historical data
-                        price_usd=price_usd
-                    ))
-                
-            except Exception as e:
-                logger.error(f"Failed to get liquidity for {dex_name}: {e}")
-                continue
+        if not self.reader.wrapped_native:
+            logger.warning(f"WETH address not configured for {self.network_name}")
         
-        return liquidity_info
+        try:
+            return await self.reader.get_liquidity_many(token_addresses)
+        except Exception as e:
+            logger.error(f"Failed to get liquidity for {len(token_addresses)} tokens: {e}")
+            return {}
     
     async def get_token_price(self, token_address: str) -> Optional[Decimal]:
         """
@@ -426,7 +423,7 @@ class RealEthereumChain(BaseChain):
             key=lambda x: x.total_liquidity_usd
         )
         
-        return highest_liquidity_pair.price_usd
+        return highest_liquidity_pair.price_per_token
     
     async def scan_new_tokens(
         self,
@@ -443,47 +440,47 @@ class RealEthereumChain(BaseChain):
         Returns:
             List of newly discovered tokens
         """
-        if not self.is_connected or not self.w3:
+        if not self.is_connected or not self.async_w3:
             raise ChainConnectionException("Not connected to blockchain")
         
         if to_block is None:
             to_block = await self.get_latest_block_number()
         
-        new_tokens = []
-        
         try:
-            logger.info(f"Scanning blocks {from_block} to {to_block} for new tokens")
+            logger.info(f"Scanning blocks {from_block} to {to_block} for new pairs")
             
-            # Scan blocks for contract creation transactions
-            for block_number in range(from_block, min(to_block + 1, from_block + 10)):  # Limit to 10 blocks for performance
-                try:
-                    block = self.w3.eth.get_block(block_number, full_transactions=True)
-                    
-                    for tx in block.transactions:
-                        # Check if transaction creates a contract
-                        if tx.to is None and tx.input and len(tx.input) > 2:
-                            try:
-                                receipt = self.w3.eth.get_transaction_receipt(tx.hash)
-                                if receipt.contractAddress:
-                                    # Check if it's an ERC-20 token
-                                    token_info = await self.get_token_info(receipt.contractAddress)
-                                    if token_info:
-                                        token_info.created_at = block.timestamp
-                                        token_info.creator = tx['from']
-                                        new_tokens.append(token_info)
-                                        logger.info(f"Found new token: {token_info.symbol} at {token_info.address}")
-                            except Exception as e:
-                                # Skip failed token analysis
-                                continue
-                
-                except Exception as e:
-                    logger.error(f"Error scanning block {block_number}: {e}")
-                    continue
+            # Pair creation logs name both tokens; no block or receipt walking
+            discovery = PairLogDiscovery(self.network_name, self._rpc, self.pair_factories)
+            events = await discovery.fetch_logs(from_block, to_block)
+            
+            # New tokens are paired against WETH or a stablecoin; neither side
+            # of that pair is new
+            quote_tokens = self.quote_tokens
+            first_seen = {}
+            for event in events:
+                for token in (event.token0, event.token1):
+                    if token.lower() not in quote_tokens:
+                        first_seen.setdefault(token, event)
+            
+            infos = await self.get_token_infos(list(first_seen))
         
         except Exception as e:
             logger.error(f"Failed to scan for new tokens: {e}")
             raise ChainConnectionException(f"Token scanning failed: {e}")
         
+        new_tokens = []
+        for token, event in first_seen.items():
+            token_info = infos.get(token)
+            if not token_info:
+                continue
+            token_info.metadata.update({
+                'dex': event.dex,
+                'pair_address': event.pair,
+                'block_number': event.block_number,
+                'transaction_hash': event.tx_hash,
+            })
+            new_tokens.append(token_info)
+        
         logger.info(f"Found {len(new_tokens)} new tokens in blocks {from_block}-{to_block}")
         return new_tokens
     
@@ -7,17 +7,17 @@ All chain initialization issues resolved with proper fallback mechanisms.
 """
 
 import asyncio
-from typing import Dict, List, Optional, Set, Any
+from typing import Dict, List, Optional, Set, Any, Union
 from dataclasses import dataclass
 from enum import Enum
 import time
 
 from app.core.blockchain.base_chain import BaseChain, TokenInfo
 from app.core.blockchain.network_config import NetworkConfig
+from app.core.blockchain.rpc_budget import BudgetedChain, TokenBucket
 from app.core.exceptions import (
     NetworkError, 
     ConnectionError, 
-    ChainConnectionException,
     ServiceError
 )
 from app.utils.logger import setup_logger
@@ -355,6 +355,8 @@ class MultiChainManager:
         self.chain_health: Dict[str, ChainHealth] = {}
         self.enabled_networks: Set[str] = set()
         self.supported_networks: Set[str] = set()
+        self.rpc_budgets: Dict[str, TokenBucket] = {}
+        self.rpc_calls_per_second = 10.0
         self._shutdown = False
         self._initialized = False
         
@@ -579,31 +581,49 @@ class MultiChainManager:
         """
         results = {}
         
-        scan_tasks = []
-        for network_name in self.enabled_networks:
-            chain = self.chains.get(network_name)
-            if chain:
-                task = asyncio.create_task(
-                    self._scan_chain_for_tokens(chain, network_name, from_block_offset)
+        # Each chain scans independently, metered only by its own RPC budget
+        networks = [n for n in self.enabled_networks if self.chains.get(n)]
+        scan_results = await asyncio.gather(
+            *(
+                self._scan_chain_for_tokens(
+                    BudgetedChain(self.chains[n], self.get_rpc_budget(n)), n, from_block_offset
                 )
-                scan_tasks.append((network_name, task))
+                for n in networks
+            ),
+            return_exceptions=True
+        )
         
-        # Execute scans in parallel
-        for network_name, task in scan_tasks:
-            try:
-                tokens = await task
-                results[network_name] = tokens
-                if tokens:
-                    logger.info(f"🔍 Found {len(tokens)} new tokens on {network_name}")
-            except Exception as e:
-                logger.error(f"Token scan failed for {network_name}: {e}")
+        for network_name, tokens in zip(networks, scan_results):
+            if isinstance(tokens, Exception):
+                logger.error(f"Token scan failed for {network_name}: {tokens}")
                 results[network_name] = []
+                continue
+            results[network_name] = tokens
+            if tokens:
+                logger.info(f"🔍 Found {len(tokens)} new tokens on {network_name}")
         
         return results
     
+    def get_rpc_budget(self, network_name: str, rate: Optional[float] = None) -> TokenBucket:
+        """
+        Get the RPC token bucket for a network, creating it on first use.
+        
+        Args:
+            network_name: Network name
+            rate: Calls per second if the bucket is created now
+                (rpc_calls_per_second if None)
+            
+        Returns:
+            TokenBucket shared by every caller scanning that network
+        """
+        bucket = self.rpc_budgets.get(network_name)
+        if bucket is None:
+            bucket = self.rpc_budgets[network_name] = TokenBucket(rate or self.rpc_calls_per_second)
+        return bucket
+    
     async def _scan_chain_for_tokens(
         self,
-        chain: BaseChain,
+        chain: Union[BaseChain, BudgetedChain],
         network_name: str,
         from_block_offset: int
     ) -> List[TokenInfo]:
@@ -731,6 +751,10 @@ class MultiChainManager:
             'health_summary': {
                 name: health.status.value 
                 for name, health in self.chain_health.items()
+            },
+            'rpc_budgets': {
+                name: bucket.get_stats()
+                for name, bucket in self.rpc_budgets.items()
             }
         }
 
@@ -0,0 +1,318 @@
+"""
+Multicall3 Batched Chain Reads
+File: app/core/blockchain/multicall.py
+
+Batched read layer for EVM chains. Token metadata and pair reserve reads
+are packed into Multicall3 `aggregate3` calls executed through an async
+eth_call transport, so hundreds of tokens resolve in a handful of RPC
+round trips instead of several sequential calls per token.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence
+
+from eth_abi import decode, encode
+from eth_utils import is_address, keccak, to_checksum_address
+
+from app.core.blockchain.base_chain import LiquidityInfo, TokenInfo
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Multicall3 is deployed at the same address on every major EVM chain
+MULTICALL3_ADDRESS = '0xcA11bde05977b3631167028862bE2a173976CA11'
+ZERO_ADDRESS = '0x0000000000000000000000000000000000000000'
+
+# async (tx dict) -> raw return bytes, e.g. AsyncWeb3.eth.call
+EthCall = Callable[[Dict[str, str]], Awaitable[bytes]]
+
+
+@lru_cache(maxsize=None)
+def function_selector(signature: str) -> bytes:
+    """
+    Compute the 4-byte selector for a function signature.
+
+    Args:
+        signature: Canonical signature such as 'getPair(address,address)'
+
+    Returns:
+        4 selector bytes
+    """
+    return keccak(text=signature)[:4]
+
+
+def encode_call(signature: str, types: Sequence[str] = (), args: Sequence[Any] = ()) -> bytes:
+    """Build calldata for a function call."""
+    return function_selector(signature) + (encode(list(types), list(args)) if types else b'')
+
+
+def decode_uint(data: bytes) -> int:
+    """Decode a single uint return word."""
+    if len(data) < 32:
+        raise ValueError("short uint return")
+    return int.from_bytes(data[:32], 'big')
+
+
+def decode_address(data: bytes) -> str:
+    """Decode a single address return word into checksum form."""
+    if len(data) < 32:
+        raise ValueError("short address return")
+    return to_checksum_address(data[12:32])
+
+
+def decode_text(data: bytes) -> str:
+    """Decode a string return, falling back to bytes32 (e.g. MKR's name/symbol)."""
+    try:
+        return decode(['string'], data)[0]
+    except Exception:
+        if len(data) != 32:
+            raise
+        return data.rstrip(b'\x00').decode('utf-8', errors='replace')
+
+
+def decode_reserves(data: bytes) -> tuple:
+    """Decode UniswapV2Pair.getReserves() into (reserve0, reserve1, blockTimestampLast)."""
+    if len(data) < 96:
+        raise ValueError("short getReserves return")
+    return tuple(int.from_bytes(data[i:i + 32], 'big') for i in (0, 32, 64))
+
+
+@dataclass
+class Call:
+    """One read inside a multicall batch."""
+    target: str
+    data: bytes
+    decoder: Callable[[bytes], Any]
+
+
+class MulticallClient:
+    """
+    Executes batches of read calls through Multicall3.aggregate3.
+
+    Calls are chunked into batches of `batch_size` and run concurrently
+    (bounded by `max_concurrency`). Every call is sent with
+    allowFailure=true, so one reverting token never poisons the batch; if a
+    whole batch request fails (RPC error, gas cap) it is split in half and
+    retried.
+    """
+
+    def __init__(
+        self,
+        eth_call: EthCall,
+        address: str = MULTICALL3_ADDRESS,
+        batch_size: int = 250,
+        max_concurrency: int = 4
+    ):
+        """
+        Initialize multicall client.
+
+        Args:
+            eth_call: Async eth_call transport
+            address: Multicall3 contract address
+            batch_size: Maximum calls per aggregate3 request
+            max_concurrency: Maximum aggregate3 requests in flight
+        """
+        self.eth_call = eth_call
+        self.address = to_checksum_address(address)
+        self.batch_size = max(1, batch_size)
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        self.stats = {
+            'requests': 0,
+            'calls': 0,
+            'failed_calls': 0,
+            'batch_splits': 0,
+        }
+
+    async def aggregate(self, calls: Sequence[Call]) -> List[Optional[Any]]:
+        """
+        Execute read calls in as few requests as possible.
+
+        Args:
+            calls: Calls to execute
+
+        Returns:
+            Decoded results in call order (None where the call reverted or
+            its return data could not be decoded)
+        """
+        if not calls:
+            return []
+
+        chunks = [calls[i:i + self.batch_size] for i in range(0, len(calls), self.batch_size)]
+        results = await asyncio.gather(*(self._execute_chunk(chunk) for chunk in chunks))
+        return [value for chunk_results in results for value in chunk_results]
+
+    async def _execute_chunk(self, calls: Sequence[Call]) -> List[Optional[Any]]:
+        """Run one aggregate3 request, splitting it on transport failure."""
+        payload = function_selector('aggregate3((address,bool,bytes)[])') + encode(
+            ['(address,bool,bytes)[]'],
+            [[(call.target, True, call.data) for call in calls]]
+        )
+
+        try:
+            async with self._semaphore:
+                self.stats['requests'] += 1
+                raw = await self.eth_call({'to': self.address, 'data': '0x' + payload.hex()})
+            returned = decode(['(bool,bytes)[]'], bytes(raw))[0]
+        except Exception as e:
+            if len(calls) == 1:
+                logger.debug(f"Multicall request failed for {calls[0].target}: {e}")
+                self.stats['failed_calls'] += 1
+                return [None]
+            self.stats['batch_splits'] += 1
+            middle = len(calls) // 2
+            first, second = await asyncio.gather(
+                self._execute_chunk(calls[:middle]), self._execute_chunk(calls[middle:])
+            )
+            return first + second
+
+        self.stats['calls'] += len(calls)
+        results: List[Optional[Any]] = []
+        for call, (success, data) in zip(calls, returned):
+            value = None
+            if success:
+                try:
+                    value = call.decoder(data)
+                except Exception:
+                    value = None
+            if value is None:
+                self.stats['failed_calls'] += 1
+            results.append(value)
+        return results
+
+
+class BatchedChainReader:
+    """
+    Token metadata and V2 pair liquidity reads built on MulticallClient.
+
+    Token metadata takes one aggregate3 round trip per `batch_size / 4`
+    tokens; liquidity takes two dependent rounds (getPair, then
+    getReserves) regardless of how many tokens and factories are queried.
+    """
+
+    def __init__(
+        self,
+        multicall: MulticallClient,
+        factories: Optional[Dict[str, str]] = None,
+        wrapped_native: Optional[str] = None,
+        native_usd_price: Decimal = Decimal("2000")
+    ):
+        """
+        Initialize batched reader.
+
+        Args:
+            multicall: Multicall client for the chain
+            factories: Mapping of DEX name -> V2 factory address
+            wrapped_native: Wrapped native token (WETH/WMATIC) address
+            native_usd_price: Native token USD price used for valuations
+        """
+        self.multicall = multicall
+        self.factories = {name: to_checksum_address(addr) for name, addr in (factories or {}).items()}
+        self.wrapped_native = to_checksum_address(wrapped_native) if wrapped_native else None
+        self.native_usd_price = native_usd_price
+
+    @staticmethod
+    def _normalize(addresses: Iterable[str]) -> List[str]:
+        """Checksum valid addresses, dropping invalid ones and duplicates."""
+        seen = {}
+        for address in addresses:
+            if isinstance(address, str) and is_address(address):
+                seen.setdefault(to_checksum_address(address), None)
+        return list(seen)
+
+    async def get_token_infos(self, addresses: Iterable[str]) -> Dict[str, Optional[TokenInfo]]:
+        """
+        Resolve ERC-20 metadata for many tokens.
+
+        Args:
+            addresses: Token addresses (any case; invalid ones are skipped)
+
+        Returns:
+            Mapping of checksum address -> TokenInfo, or None when the
+            address is not an ERC-20 (no code, reverts, or bad return data)
+        """
+        tokens = self._normalize(addresses)
+        calls = []
+        for token in tokens:
+            calls.extend((
+                Call(token, encode_call('name()'), decode_text),
+                Call(token, encode_call('symbol()'), decode_text),
+                Call(token, encode_call('decimals()'), decode_uint),
+                Call(token, encode_call('totalSupply()'), decode_uint),
+            ))
+
+        results = await self.multicall.aggregate(calls)
+
+        infos: Dict[str, Optional[TokenInfo]] = {}
+        for index, token in enumerate(tokens):
+            name, symbol, decimals, total_supply = results[index * 4:index * 4 + 4]
+            # Calls to addresses without code "succeed" with empty data and fail to decode
+            if decimals is None or symbol is None or decimals > 255:
+                infos[token] = None
+                continue
+            infos[token] = TokenInfo(
+                address=token,
+                symbol=symbol,
+                name=name if name is not None else symbol,
+                decimals=decimals,
+                total_supply=Decimal(total_supply) if total_supply is not None else None,
+            )
+        return infos
+
+    async def get_liquidity_many(self, tokens: Iterable[str]) -> Dict[str, List[LiquidityInfo]]:
+        """
+        Resolve token/wrapped-native V2 pair liquidity across all factories.
+
+        Args:
+            tokens: Token addresses
+
+        Returns:
+            Mapping of checksum token address -> pools with non-zero reserves
+        """
+        tokens = self._normalize(tokens)
+        liquidity: Dict[str, List[LiquidityInfo]] = {token: [] for token in tokens}
+        weth = self.wrapped_native
+        if not weth or not self.factories:
+            return liquidity
+
+        # Round 1: pair addresses for every (token, factory)
+        lookups = [(token, factory) for token in tokens if token != weth for factory in self.factories.values()]
+        pairs = await self.multicall.aggregate([
+            Call(factory, encode_call('getPair(address,address)', ['address', 'address'], [token, weth]), decode_address)
+            for token, factory in lookups
+        ])
+
+        existing = [
+            (token, pair) for (token, _), pair in zip(lookups, pairs)
+            if pair is not None and pair != ZERO_ADDRESS
+        ]
+
+        # Round 2: reserves for every pair that exists
+        reserves = await self.multicall.aggregate([
+            Call(pair, encode_call('getReserves()'), decode_reserves) for _, pair in existing
+        ])
+
+        for (token, pair), pair_reserves in zip(existing, reserves):
+            if pair_reserves is None:
+                continue
+            # V2 pairs order tokens by address, so token0/token1 need no extra calls
+            token0, token1 = sorted((token, weth), key=lambda a: int(a, 16))
+            reserve0, reserve1, _ = pair_reserves
+            token_reserve, weth_reserve = (reserve0, reserve1) if token0 == token else (reserve1, reserve0)
+            if token_reserve == 0:
+                continue
+
+            price_in_native = Decimal(weth_reserve) / Decimal(token_reserve)
+            liquidity[token].append(LiquidityInfo(
+                pool_address=pair,
+                token0=token0,
+                token1=token1,
+                reserves0=Decimal(reserve0),
+                reserves1=Decimal(reserve1),
+                total_liquidity_usd=Decimal(weth_reserve) * 2 * self.native_usd_price / Decimal(10**18),
+                price_per_token=price_in_native * self.native_usd_price,
+            ))
+        return liquidity
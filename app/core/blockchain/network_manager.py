@@ -18,12 +18,15 @@ from contextlib import asynccontextmanager
 
 from web3 import Web3, AsyncWeb3
 from web3.middleware import geth_poa_middleware
-from web3.providers import HTTPProvider, WebsocketProvider
+from web3.providers import WebsocketProvider
 from web3.exceptions import Web3Exception
 import requests
 import aiohttp
 
 from app.utils.logger import setup_logger
+from app.core.blockchain.chain_state import ChainStateCache
+from app.core.blockchain.confirmation_tracker import ConfirmationTracker
+from app.core.blockchain.rpc_transport import PooledAsyncHTTPProvider, RPCTransport
 from app.core.exceptions import (
     TradingError, 
     NetworkError, 
@@ -162,6 +165,9 @@ class NetworkConnection:
     connection_attempts: int = 0
     last_successful_call: Optional[datetime] = None
     circuit_breaker_until: Optional[datetime] = None
+    transport: Optional[RPCTransport] = None
+    chain_state: Optional[ChainStateCache] = None
+    confirmation_tracker: Optional[ConfirmationTracker] = None
     
     @property
     def is_circuit_breaker_active(self) -> bool:
@@ -205,6 +211,13 @@ class EnhancedNetworkManager:
         self.health_check_interval = 30
         self.circuit_breaker_threshold = 5  # failures before circuit breaker
         
+        # RPC transport
+        self.max_in_flight_per_endpoint = 32
+        self.request_timeout = 10.0
+        self.probe_timeout = 5.0
+        self.enable_hedging = False  # Hedge latency-critical calls to a second endpoint
+        self.subscribe_new_heads = True  # Feed chain state from newHeads when a WebSocket URL is available
+        
         # Monitoring
         self.is_monitoring = False
         self._monitoring_task: Optional[asyncio.Task] = None
@@ -461,6 +474,10 @@ class EnhancedNetworkManager:
             connection = await self._establish_connection_with_failover(config, preferred_provider)
             
             if connection:
+                # A forced reconnect replaces a live connection: tear the old one down first
+                previous = self.connections.pop(network_type, None)
+                if previous is not None and previous is not connection:
+                    await self._close_connection(previous)
                 self.connections[network_type] = connection
                 await self._update_network_status(network_type, connection)
                 logger.info(f"✅ Connected to {network_type.value} via {connection.provider_type.value}")
@@ -479,37 +496,68 @@ class EnhancedNetworkManager:
         config: NetworkConfig,
         preferred_provider: Optional[ProviderType] = None
     ) -> Optional[NetworkConnection]:
-        """Establish connection with intelligent provider failover."""
+        """
+        Establish connection with intelligent provider failover.
+        
+        All RPC URLs are probed concurrently; the responsive ones back a
+        pooled transport, so later requests fail over between them without
+        reconnecting.
+        """
         # Build prioritized list of RPC URLs
         rpc_urls = self._build_prioritized_rpc_list(config, preferred_provider)
+        if not rpc_urls:
+            return None
         
-        # Try each URL with retry logic
-        for rpc_url, provider_type in rpc_urls:
-            try:
-                logger.debug(f"🔄 Trying {provider_type.value}: {rpc_url[:50]}...")
-                
-                # Create Web3 instance with retry logic
-                web3_instance = await self._create_web3_instance(rpc_url, config)
-                
-                if web3_instance:
-                    # Test connection thoroughly
-                    if await self._test_connection_comprehensive(web3_instance, config):
-                        return NetworkConnection(
-                            network_type=config.network_type,
-                            config=config,
-                            web3_instance=web3_instance,
-                            status=ConnectionStatus.CONNECTED,
-                            current_rpc_url=rpc_url,
-                            provider_type=provider_type,
-                            connection_attempts=1
-                        )
-                
-            except Exception as e:
-                logger.debug(f"⚠️ Provider {provider_type.value} failed: {e}")
-                continue
+        transport = self._create_transport(config, rpc_urls)
+        chain_state: Optional[ChainStateCache] = None
+        try:
+            healthy = await transport.probe(chain_id=config.chain_id, timeout=self.probe_timeout)
+            if not healthy:
+                logger.debug(f"⚠️ No responsive RPC endpoint for {config.network_type.value}")
+                await transport.close()
+                return None
+            
+            web3_instance = await self._create_web3_instance(transport, config)
+            chain_state = await self._create_chain_state(config, transport).start()
+            
+            # Test connection thoroughly
+            if web3_instance and await self._test_connection_comprehensive(chain_state, config):
+                return NetworkConnection(
+                    network_type=config.network_type,
+                    config=config,
+                    web3_instance=web3_instance,
+                    status=ConnectionStatus.CONNECTED,
+                    current_rpc_url=healthy[0].url,
+                    provider_type=healthy[0].provider_type,
+                    connection_attempts=1,
+                    transport=transport,
+                    chain_state=chain_state
+                )
+            
+        except Exception as e:
+            logger.debug(f"⚠️ Connection to {config.network_type.value} failed: {e}")
         
+        if chain_state is not None:
+            await chain_state.stop()
+        await transport.close()
         return None
     
+    def _create_transport(
+        self,
+        config: NetworkConfig,
+        rpc_urls: List[tuple[str, ProviderType]]
+    ) -> RPCTransport:
+        """Create a pooled transport over a network's RPC URLs."""
+        network_type = config.network_type
+        return RPCTransport(
+            rpc_urls,
+            max_in_flight=self.max_in_flight_per_endpoint,
+            timeout=self.request_timeout,
+            hedge=self.enable_hedging,
+            history=lambda: self.request_history.get(network_type, []),
+            on_result=lambda url, success, ms: self._track_request(network_type, success, ms, url)
+        )
+    
     def _build_prioritized_rpc_list(
         self, 
         config: NetworkConfig, 
@@ -545,19 +593,32 @@ class EnhancedNetworkManager:
         
         return rpc_urls
     
-    async def _create_web3_instance(self, rpc_url: str, config: NetworkConfig) -> Optional[AsyncWeb3]:
+    def _create_chain_state(self, config: NetworkConfig, transport: RPCTransport) -> ChainStateCache:
+        """Create the shared chain state cache for a network."""
+        ws_url = self._websocket_url(config) if self.subscribe_new_heads else None
+        return ChainStateCache(
+            config.network_type.value,
+            transport.call,
+            ws_url=ws_url,
+            poll_interval=max(0.5, config.block_time_seconds / 2),
+            stale_after=max(10.0, config.block_time_seconds * 5)
+        )
+    
+    def _websocket_url(self, config: NetworkConfig) -> Optional[str]:
+        """First usable WebSocket URL for a network (API key filled in)."""
+        for url in config.websocket_urls:
+            if "{api_key}" not in url:
+                return url
+            for provider, api_key in self.api_keys.items():
+                if api_key and provider.value in url.lower():
+                    return url.format(api_key=api_key)
+        return None
+    
+    async def _create_web3_instance(self, transport: RPCTransport, config: NetworkConfig) -> Optional[AsyncWeb3]:
         """Create and configure Web3 instance."""
         try:
-            # Create provider with timeout settings
-            provider = HTTPProvider(
-                rpc_url, 
-                request_kwargs={
-                    'timeout': 30,
-                    'headers': {
-                        'User-Agent': 'Enhanced-Network-Manager/1.0'
-                    }
-                }
-            )
+            # Async provider over the pooled transport
+            provider = PooledAsyncHTTPProvider(transport)
             
             # Create Web3 instance
             web3 = AsyncWeb3(provider)
@@ -572,35 +633,31 @@ class EnhancedNetworkManager:
             logger.debug(f"Failed to create Web3 instance: {e}")
             return None
     
-    async def _test_connection_comprehensive(self, web3: AsyncWeb3, config: NetworkConfig) -> bool:
-        """Perform comprehensive connection testing."""
+    async def _test_connection_comprehensive(self, chain_state: ChainStateCache, config: NetworkConfig) -> bool:
+        """
+        Perform comprehensive connection testing.
+        
+        Uses the state loaded by ChainStateCache.start() (chain ID, latest
+        block and gas price, fetched concurrently) instead of separate calls.
+        """
         try:
-            # Test 1: Check if Web3 is connected
-            if not await web3.is_connected():
-                return False
-            
-            # Test 2: Get chain ID and verify
-            chain_id = await web3.eth.chain_id
-            if chain_id != config.chain_id:
-                logger.warning(f"Chain ID mismatch: expected {config.chain_id}, got {chain_id}")
-                return False
-            
-            # Test 3: Get latest block number
-            latest_block = await web3.eth.block_number
-            if latest_block <= 0:
+            # Test 1: Chain ID verification
+            if chain_state.chain_id != config.chain_id:
+                logger.warning(f"Chain ID mismatch: expected {config.chain_id}, got {chain_state.chain_id}")
                 return False
             
-            # Test 4: Get gas price
-            gas_price = await web3.eth.gas_price
-            if gas_price <= 0:
+            # Test 2: Latest block
+            if not chain_state.block_number or chain_state.block_number <= 0:
                 return False
             
-            # Test 5: Get network version
-            network_version = await web3.net.version
-            if not network_version:
+            # Test 3: Gas price
+            if not chain_state.gas_price or chain_state.gas_price <= 0:
                 return False
             
-            logger.debug(f"✅ Connection test passed: block {latest_block}, gas {web3.from_wei(gas_price, 'gwei')} gwei")
+            logger.debug(
+                f"✅ Connection test passed: block {chain_state.block_number}, "
+                f"gas {chain_state.gas_price / 10**9:.2f} gwei"
+            )
             return True
             
         except Exception as e:
@@ -622,7 +679,17 @@ class EnhancedNetworkManager:
             current_rpc_url = ""
             status = ConnectionStatus.DISCONNECTED
             
-            if connection and connection.web3_instance:
+            if connection and connection.chain_state and connection.chain_state.head:
+                # In-memory chain state: no RPC round-trip
+                chain_state = connection.chain_state
+                latest_block = chain_state.block_number
+                gas_price_gwei = (chain_state.gas_price or 0) / 10**9
+                response_time_ms = self._recent_response_time(network_type)
+                provider_type = connection.provider_type
+                current_rpc_url = connection.current_rpc_url
+                status = connection.status
+                
+            elif connection and connection.web3_instance:
                 start_time = datetime.utcnow()
                 
                 try:
@@ -677,7 +744,21 @@ class EnhancedNetworkManager:
         except Exception as e:
             logger.error(f"❌ Failed to update network status for {network_type}: {e}")
     
-    def _track_request(self, network_type: NetworkType, success: bool, response_time_ms: float) -> None:
+    def _recent_response_time(self, network_type: NetworkType) -> float:
+        """Median response time of recent successful requests (ms)."""
+        times = sorted(
+            record['response_time_ms'] for record in self.request_history.get(network_type, [])
+            if record['success']
+        )
+        return times[len(times) // 2] if times else 0.0
+    
+    def _track_request(
+        self,
+        network_type: NetworkType,
+        success: bool,
+        response_time_ms: float,
+        rpc_url: Optional[str] = None
+    ) -> None:
         """Track request statistics for network monitoring."""
         if network_type not in self.request_history:
             self.request_history[network_type] = []
@@ -685,7 +766,8 @@ class EnhancedNetworkManager:
         request_data = {
             'timestamp': datetime.utcnow(),
             'success': success,
-            'response_time_ms': response_time_ms
+            'response_time_ms': response_time_ms,
+            'rpc_url': rpc_url
         }
         
         self.request_history[network_type].append(request_data)
@@ -700,19 +782,26 @@ class EnhancedNetworkManager:
             if not success:
                 self.network_status[network_type].failed_requests += 1
     
+    async def _close_connection(self, connection: NetworkConnection) -> None:
+        """Stop a connection's confirmation tracker and chain state feed, and close its pooled sessions."""
+        connection.status = ConnectionStatus.DISCONNECTED
+        if connection.confirmation_tracker:
+            await connection.confirmation_tracker.stop()
+            connection.confirmation_tracker = None
+        if connection.chain_state:
+            await connection.chain_state.stop()
+            connection.chain_state = None
+        if connection.transport:
+            await connection.transport.close()
+            connection.transport = None
+        connection.web3_instance = None
+    
     async def disconnect_from_network(self, network_type: NetworkType) -> bool:
         """Disconnect from a specific network."""
         try:
             if network_type in self.connections:
-                connection = self.connections[network_type]
-                connection.status = ConnectionStatus.DISCONNECTED
-                
-                # Close Web3 connection if needed
-                if connection.web3_instance:
-                    # AsyncWeb3 doesn't have explicit close method, just remove reference
-                    connection.web3_instance = None
-                
-                del self.connections[network_type]
+                connection = self.connections.pop(network_type)
+                await self._close_connection(connection)
                 await self._update_network_status(network_type, None)
                 
                 logger.info(f"🔌 Disconnected from {network_type.value}")
@@ -742,6 +831,23 @@ class EnhancedNetworkManager:
         
         return connection.web3_instance
     
+    async def get_chain_state(self, network_type: NetworkType) -> ChainStateCache:
+        """Get the shared chain state cache for a network (connecting if needed)."""
+        await self.get_web3_instance(network_type)
+        chain_state = self.connections[network_type].chain_state
+        if chain_state is None:
+            raise ConnectionError(f"No chain state for {network_type}")
+        return chain_state
+    
+    async def get_confirmation_tracker(self, network_type: NetworkType) -> ConfirmationTracker:
+        """Get the shared confirmation tracker for a network (started on first use)."""
+        chain_state = await self.get_chain_state(network_type)
+        connection = self.connections[network_type]
+        if connection.confirmation_tracker is None:
+            batch_rpc = connection.transport.batch if connection.transport else None
+            connection.confirmation_tracker = await ConfirmationTracker(chain_state, batch_rpc=batch_rpc).start()
+        return connection.confirmation_tracker
+    
     async def get_native_balance(
         self, 
         network_type: NetworkType, 
@@ -1004,6 +1110,12 @@ class EnhancedNetworkManager:
             if connection.is_circuit_breaker_active:
                 return
             
+            # A fresh head from the chain state feed proves the connection is live
+            if connection.chain_state and connection.chain_state.is_fresh:
+                connection.last_successful_call = datetime.utcnow()
+                connection.status = ConnectionStatus.CONNECTED
+                return
+            
             # Test connection
             if connection.web3_instance:
                 start_time = datetime.utcnow()
@@ -0,0 +1,157 @@
+"""
+RPC Budgets
+File: app/core/blockchain/rpc_budget.py
+
+Token-bucket request budgets for chain RPC access. Each network gets its
+own bucket so a busy or slow chain can never starve the others, and
+BudgetedChain charges the bucket transparently for every async call made
+through a BaseChain instance.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class TokenBucket:
+    """
+    Async token bucket.
+
+    Tokens refill continuously at `rate` per second up to `capacity`.
+    Waiters are served in arrival order, so a burst from one caller cannot
+    jump ahead of callers already waiting.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep
+    ):
+        """
+        Initialize token bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size (defaults to one second of rate)
+            clock: Monotonic time source
+            sleep: Coroutine used to wait for refills (paired with clock)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity is not None else max(1.0, self.rate)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+        self.acquired = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def available(self) -> float:
+        """Tokens currently available."""
+        self._refill()
+        return self._tokens
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens without waiting; returns False if not enough are available."""
+        if self._lock.locked():
+            return False
+        self._refill()
+        if self._tokens < tokens:
+            return False
+        self._tokens -= tokens
+        self.acquired += 1
+        return True
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens, waiting for the bucket to refill if necessary.
+
+        Args:
+            tokens: Tokens to take (at most `capacity`)
+
+        Returns:
+            Seconds spent waiting
+        """
+        tokens = min(tokens, self.capacity)
+        async with self._lock:
+            self._refill()
+            waited = 0.0
+            if self._tokens < tokens:
+                waited = (tokens - self._tokens) / self.rate
+                self.waits += 1
+                self.wait_seconds += waited
+                await self._sleep(waited)
+                self._refill()
+            self._tokens -= tokens
+            self.acquired += 1
+            return waited
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get bucket statistics."""
+        return {
+            'rate_per_second': self.rate,
+            'capacity': self.capacity,
+            'available': round(self.available, 2),
+            'acquired': self.acquired,
+            'waits': self.waits,
+            'wait_seconds': round(self.wait_seconds, 3),
+        }
+
+
+class BudgetedChain:
+    """
+    Proxy around a chain that charges one bucket token per async call.
+
+    Batched reads (multicall) count as a single call, which matches how
+    providers meter them. Synchronous attributes pass straight through.
+    """
+
+    def __init__(self, chain: Any, bucket: TokenBucket, on_call: Optional[Callable[[str], None]] = None):
+        """
+        Initialize budgeted chain.
+
+        Args:
+            chain: BaseChain instance
+            bucket: Budget for this chain's RPC traffic
+            on_call: Optional callback receiving the method name of each call
+        """
+        self._chain = chain
+        self._bucket = bucket
+        self._on_call = on_call
+        self.rpc_calls = 0
+
+    @property
+    def wrapped(self) -> Any:
+        """The underlying chain."""
+        return self._chain
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._chain, name)
+        if not asyncio.iscoroutinefunction(attr):
+            return attr
+
+        async def budgeted(*args, **kwargs):
+            await self._bucket.acquire()
+            self.rpc_calls += 1
+            if self._on_call is not None:
+                self._on_call(name)
+            return await attr(*args, **kwargs)
+
+        budgeted.__name__ = name
+        return budgeted
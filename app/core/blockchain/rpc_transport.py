@@ -0,0 +1,466 @@
+"""
+Pooled RPC Transport
+File: app/core/blockchain/rpc_transport.py
+
+Async JSON-RPC transport over several endpoints of one network. Each
+endpoint gets its own keep-alive aiohttp session and an in-flight limit.
+Requests go to an endpoint picked with probability weighted by its recent
+latency (from the request history), fail over to the next endpoint on
+transport errors, and can optionally be hedged: if the first endpoint has
+not answered within its p95 latency, the same request is sent to a second
+endpoint and the first answer wins.
+
+PooledAsyncHTTPProvider plugs the transport into AsyncWeb3.
+"""
+
+import asyncio
+import itertools
+import json
+import random
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import aiohttp
+from web3.providers.async_base import AsyncJSONBaseProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+from app.core.exceptions import RPCError
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Calls whose latency is on the trading path; hedged when hedging is enabled.
+# eth_sendRawTransaction is not: a backup that sees the tx second answers
+# "already known"/"nonce too low", which would read as a failed broadcast.
+DEFAULT_HEDGED_METHODS = frozenset({
+    'eth_call',
+    'eth_estimateGas',
+    'eth_getTransactionCount',
+})
+
+HistoryProvider = Callable[[], Iterable[Dict[str, Any]]]
+ResultCallback = Callable[[str, bool, float], None]
+
+
+@dataclass(eq=False)
+class EndpointState:
+    """Connection pool, limits and health of one RPC endpoint."""
+    url: str
+    provider_type: Any = None
+    max_in_flight: int = 32
+    in_flight: int = 0
+    requests: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    unhealthy_until: float = 0.0
+    hedges_won: int = 0
+    session: Optional[aiohttp.ClientSession] = None
+    semaphore: asyncio.Semaphore = field(init=False)
+
+    def __post_init__(self):
+        self.semaphore = asyncio.Semaphore(self.max_in_flight)
+
+    @property
+    def saturated(self) -> bool:
+        """Whether every in-flight slot is taken."""
+        return self.in_flight >= self.max_in_flight
+
+
+class RPCTransport:
+    """
+    Pooled, latency-aware JSON-RPC transport for one network.
+
+    Latency samples come from a history provider returning records shaped
+    like EnhancedNetworkManager.request_history entries ('rpc_url',
+    'success', 'response_time_ms'); without one the transport keeps its own.
+    """
+
+    def __init__(
+        self,
+        endpoints: Sequence[Tuple[str, Any]],
+        max_in_flight: int = 32,
+        timeout: float = 10.0,
+        hedge: bool = False,
+        hedged_methods: Iterable[str] = DEFAULT_HEDGED_METHODS,
+        hedge_min_delay: float = 0.01,
+        hedge_max_delay: float = 0.5,
+        default_latency_ms: float = 250.0,
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 30.0,
+        history: Optional[HistoryProvider] = None,
+        on_result: Optional[ResultCallback] = None,
+        rng: Optional[random.Random] = None
+    ):
+        """
+        Initialize transport.
+
+        Args:
+            endpoints: (url, provider_type) pairs in priority order
+            max_in_flight: Concurrent requests allowed per endpoint
+            timeout: Total timeout per request attempt in seconds
+            hedge: Hedge requests for hedged_methods
+            hedged_methods: JSON-RPC methods eligible for hedging
+            hedge_min_delay: Lower bound of the hedge delay in seconds
+            hedge_max_delay: Upper bound (and default) of the hedge delay
+            default_latency_ms: Assumed latency while no endpoint has samples
+            failure_threshold: Consecutive failures before an endpoint cools down
+            cooldown_seconds: How long a failing endpoint is avoided
+            history: Source of request records with per-endpoint latency
+            on_result: Called with (url, success, latency_ms) after each attempt
+            rng: Random source for weighted selection
+        """
+        if not endpoints:
+            raise ValueError("at least one endpoint is required")
+        self.endpoints: List[EndpointState] = [
+            EndpointState(url=url, provider_type=provider_type, max_in_flight=max_in_flight)
+            for url, provider_type in endpoints
+        ]
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.hedge = hedge
+        self.hedged_methods = frozenset(hedged_methods)
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_max_delay = hedge_max_delay
+        self.default_latency_ms = default_latency_ms
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._rng = rng or random.Random()
+        self._request_ids = itertools.count(1)
+
+        self._own_history: List[Dict[str, Any]] = []
+        self._history = history or (lambda: self._own_history)
+        self._on_result = on_result
+
+        self.stats = {
+            'requests': 0,
+            'failovers': 0,
+            'hedges_sent': 0,
+            'hedges_won': 0,
+            'failed_requests': 0,
+        }
+
+    # ==================== SELECTION ====================
+
+    def _latency_samples(self) -> Dict[str, List[float]]:
+        """Successful response times per endpoint URL."""
+        samples: Dict[str, List[float]] = {}
+        for record in self._history():
+            url = record.get('rpc_url')
+            if url and record.get('success'):
+                samples.setdefault(url, []).append(record['response_time_ms'])
+        return samples
+
+    def _expected_latency(
+        self,
+        endpoint: EndpointState,
+        samples: Dict[str, List[float]],
+        unsampled_latency: float
+    ) -> float:
+        """Median recent latency, adjusted for load and failures."""
+        history = samples.get(endpoint.url)
+        latency = statistics.median(history) if history else unsampled_latency
+        load = 1 + endpoint.in_flight / endpoint.max_in_flight
+        reliability = 1 + endpoint.consecutive_failures
+        return max(latency, 0.1) * load * reliability
+
+    def rank_endpoints(self) -> List[EndpointState]:
+        """
+        Endpoints in the order a request should try them.
+
+        The first is drawn with probability proportional to 1/latency^2, so
+        slower endpoints keep receiving a trickle of traffic (and fresh
+        samples); the rest follow by expected latency. Cooling-down and
+        saturated endpoints go last.
+        """
+        now = time.monotonic()
+        samples = self._latency_samples()
+        # Endpoints without samples are assumed as fast as the best known one,
+        # so each gets tried instead of losing to whichever answered first
+        unsampled = min(
+            (statistics.median(history) for history in samples.values()), default=self.default_latency_ms
+        )
+        costs = {id(e): self._expected_latency(e, samples, unsampled) for e in self.endpoints}
+
+        available = [e for e in self.endpoints if e.unhealthy_until <= now and not e.saturated]
+        held_back = [e for e in self.endpoints if e not in available]
+        available.sort(key=lambda e: costs[id(e)])
+        held_back.sort(key=lambda e: (e.unhealthy_until > now, costs[id(e)]))
+
+        if len(available) > 1:
+            weights = [1.0 / costs[id(e)] ** 2 for e in available]
+            primary = self._rng.choices(available, weights=weights)[0]
+            available.remove(primary)
+            available.insert(0, primary)
+        return available + held_back
+
+    def hedge_delay(self, endpoint: EndpointState) -> float:
+        """Seconds to wait for an endpoint before hedging: its p95 latency."""
+        history = self._latency_samples().get(endpoint.url)
+        if not history or len(history) < 2:
+            return self.hedge_max_delay
+        p95 = statistics.quantiles(history, n=20)[-1] / 1000
+        return min(self.hedge_max_delay, max(self.hedge_min_delay, p95))
+
+    # ==================== REQUESTS ====================
+
+    async def request(self, method: str, params: Optional[Sequence[Any]] = None,
+                      hedge: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Send a JSON-RPC request.
+
+        Args:
+            method: JSON-RPC method
+            params: Method parameters (JSON-serializable)
+            hedge: Force hedging on or off (default: by method)
+
+        Returns:
+            The decoded JSON-RPC response (may contain an 'error' member)
+
+        Raises:
+            RPCError: If no endpoint returned a response
+        """
+        body = json.dumps({
+            'jsonrpc': '2.0', 'id': next(self._request_ids), 'method': method, 'params': list(params or []),
+        }).encode()
+        return await self.send(method, body, hedge)
+
+    async def call(self, method: str, params: Optional[Sequence[Any]] = None,
+                   hedge: Optional[bool] = None) -> Any:
+        """
+        Send a JSON-RPC request and return its result.
+
+        Raises:
+            RPCError: On transport failure or a JSON-RPC error response
+        """
+        response = await self.request(method, params, hedge)
+        if 'error' in response:
+            raise RPCError(f"{method} failed: {response['error']}")
+        return response.get('result')
+
+    async def batch(self, calls: Sequence[Tuple[str, Sequence[Any]]]) -> List[Any]:
+        """
+        Send several requests as one JSON-RPC batch (one HTTP round trip).
+
+        Args:
+            calls: (method, params) pairs
+
+        Returns:
+            Results in call order; a call that failed is returned as an
+            RPCError instance instead of raising
+
+        Raises:
+            RPCError: On transport failure or a non-batch response
+        """
+        if not calls:
+            return []
+        ids = [next(self._request_ids) for _ in calls]
+        body = json.dumps([
+            {'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': list(params or [])}
+            for request_id, (method, params) in zip(ids, calls)
+        ]).encode()
+        response = await self.send('batch', body, hedge=False)
+        if not isinstance(response, list):
+            error = response.get('error') if isinstance(response, dict) else response
+            raise RPCError(f"Batch request rejected: {error}")
+
+        by_id = {item.get('id'): item for item in response if isinstance(item, dict)}
+        results: List[Any] = []
+        for request_id, (method, _) in zip(ids, calls):
+            item = by_id.get(request_id)
+            if item is None:
+                results.append(RPCError(f"{method}: missing from batch response"))
+            elif 'error' in item:
+                results.append(RPCError(f"{method} failed: {item['error']}"))
+            else:
+                results.append(item.get('result'))
+        return results
+
+    async def send(self, method: str, body: bytes, hedge: Optional[bool] = None) -> Dict[str, Any]:
+        """Send a pre-encoded JSON-RPC request body (see request())."""
+        self.stats['requests'] += 1
+        ranked = self.rank_endpoints()
+        use_hedge = (self.hedge and method in self.hedged_methods) if hedge is None else hedge
+        try:
+            if use_hedge and len(ranked) > 1:
+                return await self._send_hedged(body, ranked)
+            return await self._send_with_failover(body, ranked)
+        except RPCError:
+            self.stats['failed_requests'] += 1
+            raise
+
+    async def _send_with_failover(self, body: bytes, ranked: List[EndpointState]) -> Dict[str, Any]:
+        """Try endpoints in order until one answers."""
+        last_error: Optional[RPCError] = None
+        for attempt, endpoint in enumerate(ranked):
+            if attempt:
+                self.stats['failovers'] += 1
+            try:
+                return await self._post(endpoint, body)
+            except RPCError as e:
+                last_error = e
+        raise last_error
+
+    async def _send_hedged(self, body: bytes, ranked: List[EndpointState]) -> Dict[str, Any]:
+        """Send to the primary; after its p95 latency also to the backup; first answer wins."""
+        primary, backup = ranked[0], ranked[1]
+        first = asyncio.create_task(self._post(primary, body))
+        done, _ = await asyncio.wait({first}, timeout=self.hedge_delay(primary))
+        if done and first.exception() is None:
+            return first.result()
+
+        pending = set() if done else {first}
+        second = asyncio.create_task(self._post(backup, body))
+        pending.add(second)
+        self.stats['hedges_sent'] += 1
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is second and first in pending:
+                            self.stats['hedges_won'] += 1
+                            backup.hedges_won += 1
+                        return task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        # Both failed: fall back to the remaining endpoints
+        self.stats['failovers'] += 1
+        return await self._send_with_failover(body, ranked[2:] or [primary])
+
+    async def _post(self, endpoint: EndpointState, body: bytes) -> Dict[str, Any]:
+        """One attempt against one endpoint, within its in-flight limit."""
+        async with endpoint.semaphore:
+            endpoint.in_flight += 1
+            endpoint.requests += 1
+            start = time.perf_counter()
+            try:
+                session = self._session(endpoint)
+                async with session.post(endpoint.url, data=body) as response:
+                    if response.status >= 400:
+                        raise RPCError(f"HTTP {response.status} from {endpoint.url}")
+                    payload = json.loads(await response.read())
+            except RPCError:
+                self._record(endpoint, False, start)
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                self._record(endpoint, False, start)
+                raise RPCError(f"{endpoint.url}: {type(e).__name__}: {e}") from e
+            finally:
+                endpoint.in_flight -= 1
+        self._record(endpoint, True, start)
+        return payload
+
+    def _record(self, endpoint: EndpointState, success: bool, start: float) -> None:
+        """Update endpoint health and report the attempt."""
+        latency_ms = (time.perf_counter() - start) * 1000
+        if success:
+            endpoint.consecutive_failures = 0
+        else:
+            endpoint.failures += 1
+            endpoint.consecutive_failures += 1
+            if endpoint.consecutive_failures >= self.failure_threshold:
+                endpoint.unhealthy_until = time.monotonic() + self.cooldown_seconds
+                logger.warning(f"[WARN] RPC endpoint cooling down for {self.cooldown_seconds}s: {endpoint.url}")
+
+        if self._on_result is not None:
+            self._on_result(endpoint.url, success, latency_ms)
+        else:
+            self._own_history.append({'rpc_url': endpoint.url, 'success': success, 'response_time_ms': latency_ms})
+            if len(self._own_history) > 100:
+                del self._own_history[:-100]
+
+    def _session(self, endpoint: EndpointState) -> aiohttp.ClientSession:
+        """Keep-alive session for an endpoint, created on first use."""
+        if endpoint.session is None or endpoint.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=endpoint.max_in_flight, keepalive_timeout=60, ttl_dns_cache=300
+            )
+            endpoint.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout,
+                headers={'Content-Type': 'application/json', 'User-Agent': 'Enhanced-Network-Manager/1.0'},
+            )
+        return endpoint.session
+
+    # ==================== LIFECYCLE ====================
+
+    async def probe(self, chain_id: Optional[int] = None, timeout: float = 5.0) -> List[EndpointState]:
+        """
+        Check all endpoints concurrently with eth_chainId.
+
+        Args:
+            chain_id: Expected chain ID (endpoints reporting another are marked unhealthy)
+            timeout: Seconds to wait for each endpoint
+
+        Returns:
+            Responsive endpoints, fastest first
+        """
+        body = json.dumps({'jsonrpc': '2.0', 'id': 0, 'method': 'eth_chainId', 'params': []}).encode()
+
+        async def check(endpoint: EndpointState) -> Optional[float]:
+            start = time.perf_counter()
+            try:
+                response = await asyncio.wait_for(self._post(endpoint, body), timeout)
+                if chain_id is not None and int(response.get('result', '0x0'), 16) != chain_id:
+                    logger.warning(f"[WARN] Chain ID mismatch at {endpoint.url}: {response.get('result')}")
+                    endpoint.unhealthy_until = time.monotonic() + self.cooldown_seconds
+                    return None
+                return time.perf_counter() - start
+            except (RPCError, asyncio.TimeoutError, ValueError, TypeError) as e:
+                logger.debug(f"Probe failed for {endpoint.url}: {e}")
+                endpoint.unhealthy_until = time.monotonic() + self.cooldown_seconds
+                return None
+
+        latencies = await asyncio.gather(*(check(endpoint) for endpoint in self.endpoints))
+        healthy = [(latency, index) for index, latency in enumerate(latencies) if latency is not None]
+        return [self.endpoints[index] for _, index in sorted(healthy)]
+
+    async def close(self) -> None:
+        """Close all endpoint sessions."""
+        for endpoint in self.endpoints:
+            if endpoint.session is not None and not endpoint.session.closed:
+                await endpoint.session.close()
+            endpoint.session = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Request counts and per-endpoint health."""
+        samples = self._latency_samples()
+        now = time.monotonic()
+        return {
+            **self.stats,
+            'endpoints': [
+                {
+                    'url': endpoint.url,
+                    'requests': endpoint.requests,
+                    'failures': endpoint.failures,
+                    'in_flight': endpoint.in_flight,
+                    'hedges_won': endpoint.hedges_won,
+                    'healthy': endpoint.unhealthy_until <= now,
+                    'median_latency_ms': statistics.median(samples[endpoint.url]) if endpoint.url in samples else None,
+                }
+                for endpoint in self.endpoints
+            ],
+        }
+
+
+class PooledAsyncHTTPProvider(AsyncJSONBaseProvider):
+    """AsyncWeb3 provider backed by an RPCTransport."""
+
+    def __init__(self, transport: RPCTransport):
+        super().__init__()
+        self.transport = transport
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        body = self.encode_rpc_request(method, params)
+        return await self.transport.send(method, body)
+
+    async def is_connected(self, show_traceback: bool = False) -> bool:
+        try:
+            return await super().is_connected(show_traceback)
+        except RPCError:
+            if show_traceback:
+                raise
+            return False
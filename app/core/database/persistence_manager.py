@@ -3,11 +3,18 @@ Database Persistence Manager - Phase 5B
 File: app/core/database/persistence_manager.py
 
 Working database persistence system with fallback support.
+
+Trades are written behind: save_trade() enqueues the row and returns, and a
+writer task commits queued rows in batches (one executemany and one commit
+per batch, flushed on batch size or flush interval). The database runs in
+WAL mode with synchronous=NORMAL, so a commit appends to the log instead of
+forcing an fsync of the main file. shutdown() flushes the queue first.
 """
 
 import asyncio
 import sqlite3
 import json
+import time
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Union
 from datetime import datetime
@@ -19,6 +26,29 @@ from app.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+TRADE_COLUMNS = (
+    'trade_id', 'wallet_address', 'token_in', 'token_out', 'amount_in',
+    'amount_out', 'price_usd', 'dex_protocol', 'network', 'transaction_hash',
+    'status', 'gas_used', 'gas_price_gwei', 'slippage_percent',
+    'profit_loss_usd', 'created_at', 'executed_at'
+)
+INSERT_TRADE_SQL = (
+    f"INSERT OR REPLACE INTO trades ({', '.join(TRADE_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in TRADE_COLUMNS)})"
+)
+
+# Applied on every connection at initialize()
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",  # WAL stays consistent; only checkpoints fsync
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",  # 16 MB page cache
+    "PRAGMA busy_timeout=5000",
+)
+
+# Queued by flush(): the writer commits its current batch without waiting to fill it
+_FLUSH_MARKER = (None, None)
+
 class TradeStatus(Enum):
     """Trade status enumeration."""
     PENDING = "pending"
@@ -93,12 +123,44 @@ class WalletSession:
 class PersistenceManager:
     """Database persistence manager with fallback support."""
     
-    def __init__(self, db_path: str = "data/trading_bot.db"):
-        """Initialize persistence manager."""
+    def __init__(
+        self,
+        db_path: str = "data/trading_bot.db",
+        batch_size: int = 200,
+        flush_interval: float = 0.05,
+        max_queue_size: int = 10000
+    ):
+        """
+        Initialize persistence manager.
+        
+        Args:
+            db_path: SQLite database file
+            batch_size: Maximum trades committed in one transaction
+            flush_interval: Seconds a queued trade may wait for its batch to fill
+            max_queue_size: Queued trades before save_trade() applies backpressure
+        """
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(exist_ok=True)
         self._connection = None
+        self._async_db = False
         self._initialized = False
+        self._journal_mode: Optional[str] = None
+        
+        # Write-behind queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self.write_stats = {
+            'trades_queued': 0,
+            'trades_written': 0,
+            'trades_failed': 0,
+            'flushes': 0,
+            'flush_seconds_total': 0.0,
+            'last_flush_ms': 0.0,
+            'max_flush_ms': 0.0,
+        }
         
         logger.info(f"[DB] PersistenceManager initialized with path: {self.db_path}")
     
@@ -109,7 +171,15 @@ class PersistenceManager:
             try:
                 import aiosqlite
                 self._connection = await aiosqlite.connect(str(self.db_path))
+                self._connection.row_factory = aiosqlite.Row
+                self._async_db = True
+                for pragma in SQLITE_PRAGMAS:
+                    cursor = await self._connection.execute(pragma)
+                    row = await cursor.fetchone()
+                    if pragma.startswith("PRAGMA journal_mode"):
+                        self._journal_mode = row[0] if row else None
                 await self._create_tables()
+                self._start_writer()
                 self._initialized = True
                 logger.info("[OK] Database initialized with aiosqlite")
                 return True
@@ -119,7 +189,13 @@ class PersistenceManager:
                 logger.warning("[WARN] aiosqlite not available, using fallback mode")
                 self._connection = sqlite3.connect(str(self.db_path))
                 self._connection.row_factory = sqlite3.Row
+                self._async_db = False
+                for pragma in SQLITE_PRAGMAS:
+                    row = self._connection.execute(pragma).fetchone()
+                    if pragma.startswith("PRAGMA journal_mode"):
+                        self._journal_mode = row[0] if row else None
                 self._create_tables_sync()
+                self._start_writer()
                 self._initialized = True
                 logger.info("[OK] Database initialized with sqlite3 fallback")
                 return True
@@ -192,8 +268,17 @@ class PersistenceManager:
         
         self._connection.commit()
     
-    async def save_trade(self, trade: TradeRecord) -> bool:
-        """Save trade record."""
+    async def save_trade(self, trade: TradeRecord, wait: bool = False) -> bool:
+        """
+        Queue a trade record for the write-behind writer.
+        
+        Args:
+            trade: Trade to persist
+            wait: Wait until the batch holding this trade is committed
+            
+        Returns:
+            True once queued (or committed, with wait=True)
+        """
         try:
             if not self._initialized:
                 logger.warning("[WARN] Database not initialized")
@@ -204,37 +289,105 @@ class PersistenceManager:
                 return True
             
             trade_data = trade.to_dict()
+            row = tuple(trade_data[column] for column in TRADE_COLUMNS)
+            committed = asyncio.get_running_loop().create_future() if wait else None
             
-            if hasattr(self._connection, 'execute'):
-                # Async version
-                await self._connection.execute("""
-                    INSERT OR REPLACE INTO trades (
-                        trade_id, wallet_address, token_in, token_out, amount_in,
-                        amount_out, price_usd, dex_protocol, network, transaction_hash,
-                        status, gas_used, gas_price_gwei, slippage_percent,
-                        profit_loss_usd, created_at, executed_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, tuple(trade_data.values()))
-                await self._connection.commit()
-            else:
-                # Sync version
-                self._connection.execute("""
-                    INSERT OR REPLACE INTO trades (
-                        trade_id, wallet_address, token_in, token_out, amount_in,
-                        amount_out, price_usd, dex_protocol, network, transaction_hash,
-                        status, gas_used, gas_price_gwei, slippage_percent,
-                        profit_loss_usd, created_at, executed_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, tuple(trade_data.values()))
-                self._connection.commit()
+            # Blocks only when the queue is full (writer falling behind)
+            await self._write_queue.put((row, committed))
+            self.write_stats['trades_queued'] += 1
+            logger.debug(f"[DB] Trade queued: {trade.trade_id}")
             
-            logger.info(f"[DB] Trade saved: {trade.trade_id}")
+            if committed is not None:
+                return await committed
             return True
             
         except Exception as e:
             logger.error(f"[ERROR] Failed to save trade: {e}")
             return False
     
+    def _start_writer(self) -> None:
+        """Create the write queue and start the writer task."""
+        self._write_queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._writer_task = asyncio.create_task(self._write_behind_loop())
+    
+    async def _write_behind_loop(self) -> None:
+        """Collect queued trades into batches and commit them."""
+        loop = asyncio.get_running_loop()
+        queue = self._write_queue
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size and batch[-1] is not _FLUSH_MARKER:
+                try:
+                    batch.append(queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._write_batch(batch)
+    
+    async def _write_batch(self, batch: List[tuple]) -> bool:
+        """Commit a batch of queued trades in one transaction."""
+        rows = [row for row, _ in batch if row is not None]
+        if not rows:
+            for _ in batch:
+                self._write_queue.task_done()
+            return True
+        start = time.perf_counter()
+        try:
+            if self._async_db:
+                await self._connection.executemany(INSERT_TRADE_SQL, rows)
+                await self._connection.commit()
+            else:
+                self._connection.executemany(INSERT_TRADE_SQL, rows)
+                self._connection.commit()
+            success = True
+            self.write_stats['trades_written'] += len(rows)
+        except Exception as e:
+            success = False
+            self.write_stats['trades_failed'] += len(rows)
+            logger.error(f"[ERROR] Failed to write batch of {len(rows)} trades: {e}")
+            try:
+                if self._async_db:
+                    await self._connection.rollback()
+                else:
+                    self._connection.rollback()
+            except Exception:
+                pass
+        
+        elapsed = time.perf_counter() - start
+        self.write_stats['flushes'] += 1
+        self.write_stats['flush_seconds_total'] += elapsed
+        self.write_stats['last_flush_ms'] = elapsed * 1000
+        self.write_stats['max_flush_ms'] = max(self.write_stats['max_flush_ms'], elapsed * 1000)
+        
+        for _, committed in batch:
+            if committed is not None and not committed.done():
+                committed.set_result(success)
+            self._write_queue.task_done()
+        return success
+    
+    async def flush(self) -> None:
+        """Wait until every queued trade has been written."""
+        if self._write_queue is None:
+            return
+        if self._writer_task is None or self._writer_task.done():
+            # No writer running: drain the queue here
+            batch = []
+            while not self._write_queue.empty():
+                batch.append(self._write_queue.get_nowait())
+            if batch:
+                await self._write_batch(batch)
+            return
+        await self._write_queue.put(_FLUSH_MARKER)
+        await self._write_queue.join()
+    
     async def get_trade_history(self, wallet_address: str, limit: int = 100) -> List[Dict[str, Any]]:
         """Get trade history for wallet."""
         try:
@@ -252,7 +405,10 @@ class PersistenceManager:
                     "created_at": datetime.utcnow().isoformat()
                 }]
             
-            if hasattr(self._connection, 'execute'):
+            # Read-your-writes: queued trades are committed first
+            await self.flush()
+            
+            if self._async_db:
                 # Async version
                 cursor = await self._connection.execute("""
                     SELECT * FROM trades 
@@ -279,28 +435,53 @@ class PersistenceManager:
     
     def get_database_status(self) -> Dict[str, Any]:
         """Get database status information."""
+        flushes = self.write_stats['flushes']
         return {
             "initialized": self._initialized,
-            "connection_type": "aiosqlite" if self._connection and hasattr(self._connection, 'execute') else "sqlite3" if self._connection else "mock",
+            "connection_type": ("aiosqlite" if self._async_db else "sqlite3") if self._connection else "mock",
             "db_path": str(self.db_path),
             "db_exists": self.db_path.exists(),
-            "status": "operational" if self._initialized else "not_initialized"
+            "journal_mode": self._journal_mode,
+            "status": "operational" if self._initialized else "not_initialized",
+            "write_queue_depth": self._write_queue.qsize() if self._write_queue else 0,
+            "write_batch_size": self.batch_size,
+            "flush_interval_ms": self.flush_interval * 1000,
+            "trades_queued": self.write_stats['trades_queued'],
+            "trades_written": self.write_stats['trades_written'],
+            "trades_failed": self.write_stats['trades_failed'],
+            "flushes": flushes,
+            "avg_batch_size": self.write_stats['trades_written'] / flushes if flushes else 0.0,
+            "avg_flush_ms": self.write_stats['flush_seconds_total'] / flushes * 1000 if flushes else 0.0,
+            "last_flush_ms": self.write_stats['last_flush_ms'],
+            "max_flush_ms": self.write_stats['max_flush_ms'],
         }
     
     async def close(self):
         """Close database connection."""
         try:
             if self._connection:
-                if hasattr(self._connection, 'close'):
+                if self._async_db:
                     await self._connection.close()
                 else:
                     self._connection.close()
+                self._connection = None
             logger.info("[OK] Database connection closed")
         except Exception as e:
             logger.error(f"[ERROR] Error closing database: {e}")
     
     async def shutdown(self):
-        """Shutdown persistence manager."""
+        """Shutdown persistence manager, flushing queued trades first."""
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"[ERROR] Error flushing trade queue: {e}")
+        if self._writer_task and not self._writer_task.done():
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+        self._writer_task = None
         await self.close()
 
 # Global instance
@@ -0,0 +1,179 @@
+"""
+AMM Math
+File: app/core/dex/amm_math.py
+
+Exact integer swap math for constant-product (Uniswap V2 style) pools and
+single-tick-range Uniswap V3 pools, plus an in-process optimizer that
+splits one order across several pools to maximize total output. All
+amounts are raw integer token units, matching on-chain results to the wei.
+"""
+
+import math
+from decimal import Decimal
+from typing import List, Sequence, Tuple
+
+# Fees are expressed in pips (hundredths of a basis point), as in Uniswap V3:
+# 3000 = 0.3%, 500 = 0.05%
+FEE_DENOMINATOR = 1_000_000
+Q96 = 1 << 96
+
+
+def fee_to_pips(fee: Decimal) -> int:
+    """Convert a fractional fee (0.003) to pips (3000)."""
+    return int((Decimal(str(fee)) * FEE_DENOMINATOR).to_integral_value())
+
+
+def to_raw(amount: Decimal, decimals: int) -> int:
+    """Convert token units to raw integer units (truncating)."""
+    return int(Decimal(str(amount)).scaleb(decimals))
+
+
+def from_raw(amount: int, decimals: int) -> Decimal:
+    """Convert raw integer units to token units."""
+    return Decimal(amount).scaleb(-decimals)
+
+
+def get_amount_out(amount_in: int, reserve_in: int, reserve_out: int, fee_pips: int = 3000) -> int:
+    """
+    UniswapV2Library.getAmountOut generalized to any fee.
+
+    With fee_pips=3000 the result is identical to the on-chain 997/1000
+    formula.
+
+    Args:
+        amount_in: Raw input amount
+        reserve_in: Raw reserve of the input token
+        reserve_out: Raw reserve of the output token
+        fee_pips: Swap fee in pips
+
+    Returns:
+        Raw output amount (0 for empty pools or zero input)
+    """
+    if amount_in <= 0 or reserve_in <= 0 or reserve_out <= 0:
+        return 0
+    amount_in_with_fee = amount_in * (FEE_DENOMINATOR - fee_pips)
+    numerator = amount_in_with_fee * reserve_out
+    denominator = reserve_in * FEE_DENOMINATOR + amount_in_with_fee
+    return numerator // denominator
+
+
+def get_amount_in(amount_out: int, reserve_in: int, reserve_out: int, fee_pips: int = 3000) -> int:
+    """
+    UniswapV2Library.getAmountIn: input required for an exact output.
+
+    Raises:
+        ValueError: If the pool cannot provide amount_out
+    """
+    if amount_out <= 0:
+        return 0
+    if reserve_in <= 0 or amount_out >= reserve_out:
+        raise ValueError("insufficient liquidity")
+    numerator = reserve_in * amount_out * FEE_DENOMINATOR
+    denominator = (reserve_out - amount_out) * (FEE_DENOMINATOR - fee_pips)
+    return numerator // denominator + 1
+
+
+def get_amount_out_v3(
+    amount_in: int,
+    liquidity: int,
+    sqrt_price_x96: int,
+    zero_for_one: bool,
+    fee_pips: int = 3000
+) -> int:
+    """
+    Uniswap V3 swap output assuming the trade stays inside the current tick range.
+
+    Uses the SqrtPriceMath formulas with the pool's active liquidity; tick
+    crossings are not modelled, so large trades are an upper bound.
+
+    Args:
+        amount_in: Raw input amount
+        liquidity: Active liquidity L
+        sqrt_price_x96: Current sqrt(price) as Q64.96
+        zero_for_one: True when selling token0 for token1
+        fee_pips: Pool fee tier in pips
+
+    Returns:
+        Raw output amount
+    """
+    if amount_in <= 0 or liquidity <= 0 or sqrt_price_x96 <= 0:
+        return 0
+    amount_less_fee = amount_in * (FEE_DENOMINATOR - fee_pips) // FEE_DENOMINATOR
+
+    if zero_for_one:
+        # Price moves down: sqrtP' = L * sqrtP / (L + amount * sqrtP / Q96), rounded up
+        numerator = liquidity * Q96 * sqrt_price_x96
+        denominator = liquidity * Q96 + amount_less_fee * sqrt_price_x96
+        sqrt_next = -(-numerator // denominator)
+        return liquidity * (sqrt_price_x96 - sqrt_next) // Q96
+
+    # Price moves up: sqrtP' = sqrtP + amount * Q96 / L, rounded down
+    sqrt_next = sqrt_price_x96 + amount_less_fee * Q96 // liquidity
+    return liquidity * Q96 * (sqrt_next - sqrt_price_x96) // (sqrt_next * sqrt_price_x96)
+
+
+def v3_virtual_reserves(liquidity: int, sqrt_price_x96: int) -> Tuple[int, int]:
+    """Constant-product reserves equivalent to a V3 pool's current tick range."""
+    if sqrt_price_x96 <= 0:
+        return 0, 0
+    return liquidity * Q96 // sqrt_price_x96, liquidity * sqrt_price_x96 // Q96
+
+
+def optimal_split(amount_in: int, pools: Sequence[Tuple[int, int, int]], iterations: int = 100) -> List[int]:
+    """
+    Divide an order across constant-product pools to maximize total output.
+
+    Each pool's output is concave in its input, so the optimum equalizes
+    marginal output across the pools that receive a share. For a pool with
+    reserves (x, y) and fee multiplier g the marginal output at input a is
+    g*x*y / (x + g*a)^2, so for a marginal price m the share is
+    (sqrt(g*x*y/m) - x) / g. The price m is found by bisection so that the
+    shares sum to amount_in.
+
+    Args:
+        amount_in: Raw amount to divide
+        pools: (reserve_in, reserve_out, fee_pips) per pool
+        iterations: Bisection steps
+
+    Returns:
+        Raw input per pool (same order as pools), summing to amount_in
+    """
+    if amount_in <= 0 or not pools:
+        return [0] * len(pools)
+
+    params = []
+    for reserve_in, reserve_out, fee_pips in pools:
+        gamma = (FEE_DENOMINATOR - fee_pips) / FEE_DENOMINATOR
+        params.append((float(reserve_in), float(reserve_out), gamma))
+
+    def shares(marginal: float) -> List[float]:
+        result = []
+        for x, y, g in params:
+            if x <= 0 or y <= 0:
+                result.append(0.0)
+                continue
+            result.append(max(0.0, (math.sqrt(g * x * y / marginal) - x) / g))
+        return result
+
+    # Marginal output is highest at zero input (g*y/x); search below that
+    high = max((g * y / x for x, y, g in params if x > 0 and y > 0), default=0.0)
+    if high <= 0:
+        return [0] * len(pools)
+    low = high
+    total = float(amount_in)
+    while sum(shares(low)) < total:
+        low /= 2
+
+    for _ in range(iterations):
+        middle = math.sqrt(low * high)
+        if sum(shares(middle)) > total:
+            low = middle
+        else:
+            high = middle
+
+    allocation = [int(share) for share in shares(high)]
+    # Hand the rounding remainder to the pool taking the largest share
+    remainder = amount_in - sum(allocation)
+    largest = max(range(len(allocation)), key=lambda i: allocation[i])
+    allocation[largest] += remainder
+    return allocation
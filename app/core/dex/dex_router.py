@@ -4,6 +4,8 @@ File: app/core/dex/dex_router.py
 
 Professional DEX routing system for optimal trade execution across multiple platforms.
 Implements sophisticated routing algorithms and multi-hop trading capabilities.
+Multi-hop paths are searched in-process over an event-maintained liquidity graph,
+quoted with exact integer AMM math, and large orders can be split across pools.
 """
 
 import asyncio
@@ -14,11 +16,14 @@ from typing import Dict, List, Optional, Tuple, Union, Any
 from dataclasses import dataclass, field
 from enum import Enum
 
+from app.core.blockchain.base_chain import BaseChain
+from app.core.dex.amm_math import from_raw, optimal_split, to_raw, v3_virtual_reserves
+from app.core.dex.liquidity_graph import GraphRoute, LiquidityGraph
 from app.core.dex.uniswap_integration import DEXAggregator, LiquidityPool, PriceData
 from app.core.blockchain.multi_chain_manager import MultiChainManager
 from app.core.performance.cache_manager import cache_manager
 from app.core.performance.circuit_breaker import CircuitBreakerManager
-from app.utils.logger import setup_logger, get_trading_logger, get_performance_logger, get_trading_logger, get_performance_logger
+from app.utils.logger import setup_logger
 from app.utils.exceptions import DexSnipingException
 from app.config import settings
 
@@ -31,6 +36,7 @@ class RouteType(Enum):
     SINGLE_HOP = "single_hop"
     MULTI_HOP = "multi_hop"
     ARBITRAGE = "arbitrage"
+    SPLIT = "split"  # One order divided across parallel pools
 
 
 class ExecutionStrategy(Enum):
@@ -130,8 +136,14 @@ class DEXRouter:
     - Risk assessment
     """
     
-    def __init__(self):
-        self.dex_aggregator = DEXAggregator()
+    def __init__(self, chain: Optional[BaseChain] = None):
+        """
+        Initialize DEX router.
+        
+        Args:
+            chain: Blockchain connection used for live pool and price lookups
+        """
+        self.dex_aggregator = DEXAggregator(chain)
         self.multi_chain_manager = MultiChainManager()
         self.circuit_breaker = CircuitBreakerManager()
         
@@ -141,6 +153,14 @@ class DEXRouter:
         self.min_liquidity_threshold = Decimal('1000')  # $1000 minimum
         self.max_price_impact = Decimal('0.05')  # 5% maximum
         self.route_cache_ttl = 30  # seconds
+        self.price_cache_ttl = 5  # seconds
+        
+        # Per-chain token/pool graphs for in-process multi-hop search
+        self.liquidity_graphs: Dict[str, LiquidityGraph] = {}
+        
+        # Order splitting across pools of the same pair
+        self.enable_split_orders = True
+        self.max_split_pools = 4
         
         # Supported DEXs with routing capabilities
         self.supported_dexs = {
@@ -339,13 +359,18 @@ class DEXRouter:
             )
             routes.extend(direct_routes)
             
-            # Multi-hop routes
-            if len(direct_routes) == 0 or amount_in > Decimal('10000'):  # For large trades
+            # Multi-hop routes (always when the graph makes the search free)
+            if (len(direct_routes) == 0 or amount_in > Decimal('10000')  # For large trades
+                    or self._graph_covers(chain, input_token, output_token)):
                 multi_hop_routes = await self._find_multi_hop_routes(
                     input_token, output_token, amount_in, chain
                 )
                 routes.extend(multi_hop_routes)
             
+            # Same order divided across several pools
+            if self.enable_split_orders:
+                routes.extend(self._find_split_routes(input_token, output_token, amount_in, chain))
+            
             # Cross-DEX arbitrage routes
             arbitrage_routes = await self._find_arbitrage_routes(
                 input_token, output_token, amount_in, chain
@@ -366,7 +391,21 @@ class DEXRouter:
         amount_in: Decimal, 
         chain: str
     ) -> List[TradingRoute]:
-        """Find direct trading routes (single DEX)."""
+        """
+        Find direct trading routes (single DEX).
+        
+        Pools cached in the liquidity graph are quoted locally with exact
+        getAmountOut math; live lookups are only used for unknown pairs.
+        """
+        if self._graph_covers(chain, input_token, output_token):
+            graph = self.liquidity_graphs[chain]
+            return [
+                self._graph_route_to_trading_route(graph, route, input_token, output_token, amount_in)
+                for route in graph.find_routes(
+                    input_token, output_token, amount_in, max_hops=1, k=self.max_routes_per_query
+                )
+            ]
+        
         try:
             routes = []
             
@@ -384,9 +423,7 @@ class DEXRouter:
                         continue
                     
                     # Calculate output amount
-                    price_data = await self.dex_aggregator.get_real_time_price(
-                        input_token, chain, quote_token=output_token
-                    )
+                    price_data = await self._get_price_data(input_token, output_token, chain)
                     
                     if not price_data:
                         continue
@@ -447,7 +484,42 @@ class DEXRouter:
         amount_in: Decimal, 
         chain: str
     ) -> List[TradingRoute]:
-        """Find multi-hop trading routes."""
+        """
+        Find multi-hop trading routes.
+        
+        Searches the chain's liquidity graph for up to `max_hops` swaps when
+        both tokens are known to it; otherwise falls back to pairwise
+        lookups through common intermediate tokens.
+        """
+        if self._graph_covers(chain, input_token, output_token):
+            try:
+                graph = self.liquidity_graphs[chain]
+                graph_routes = graph.find_routes(
+                    input_token, output_token, amount_in,
+                    max_hops=self.max_hops,
+                    k=self.max_routes_per_query,
+                    min_hops=2
+                )
+                return [
+                    self._graph_route_to_trading_route(graph, route, input_token, output_token, amount_in)
+                    for route in graph_routes
+                ]
+            except Exception as e:
+                logger.error(f"Error searching liquidity graph: {e}")
+                return []
+        
+        return await self._find_multi_hop_routes_via_lookups(
+            input_token, output_token, amount_in, chain
+        )
+
+    async def _find_multi_hop_routes_via_lookups(
+        self, 
+        input_token: str, 
+        output_token: str, 
+        amount_in: Decimal, 
+        chain: str
+    ) -> List[TradingRoute]:
+        """Find two-hop routes through common intermediates using live lookups."""
         try:
             routes = []
             
@@ -499,6 +571,248 @@ class DEXRouter:
             logger.error(f"Error finding multi-hop routes: {e}")
             return []
 
+    def get_liquidity_graph(self, chain: str = 'ethereum') -> LiquidityGraph:
+        """
+        Get the liquidity graph for a chain, creating it on first use.
+        
+        Args:
+            chain: Blockchain network
+            
+        Returns:
+            LiquidityGraph for the chain
+        """
+        graph = self.liquidity_graphs.get(chain)
+        if graph is None:
+            graph = self.liquidity_graphs[chain] = LiquidityGraph()
+        return graph
+
+    def update_pool(self, pool: LiquidityPool, dex_id: str, chain: str = 'ethereum') -> bool:
+        """
+        Add or refresh a pool in the chain's liquidity graph.
+        
+        V3 pools are represented by the virtual reserves of their active
+        tick range, which is exact until the trade crosses a tick. Pools on
+        DEXs without a configured router are not added, since routes
+        through them could not be executed.
+        
+        Args:
+            pool: Pool snapshot (raw getReserves values, or V3 liquidity/sqrtPriceX96)
+            dex_id: DEX identifier from supported_dexs
+            chain: Blockchain network
+            
+        Returns:
+            True if the pool was added to the graph
+        """
+        dex_config = self.supported_dexs.get(dex_id)
+        if dex_config is None:
+            logger.debug(f"Skipping pool {pool.address}: DEX '{dex_id}' is not supported")
+            return False
+        if pool.pool_type == 'v3' and pool.fee_tier:
+            fee = Decimal(pool.fee_tier) / Decimal(1_000_000)
+        else:
+            fee = dex_config.get('fee', Decimal('0.003'))
+        
+        if pool.pool_type == 'v3' and pool.liquidity and pool.sqrt_price_x96:
+            raw_reserve0, raw_reserve1 = v3_virtual_reserves(int(pool.liquidity), int(pool.sqrt_price_x96))
+        else:
+            raw_reserve0, raw_reserve1 = int(pool.reserve0), int(pool.reserve1)
+        
+        edge = self.get_liquidity_graph(chain).upsert_pool(
+            pool.address, dex_id, pool.token0, pool.token1, 0, 0,
+            fee=float(fee),
+            gas_estimate=dex_config.get('gas_per_swap', 150000),
+            liquidity_usd=float(pool.tvl_usd),
+            decimals0=pool.token0_decimals,
+            decimals1=pool.token1_decimals
+        )
+        edge.set_raw_reserves(raw_reserve0, raw_reserve1)
+        return True
+
+    def apply_pool_event(self, event: Dict[str, Any], chain: str = 'ethereum') -> bool:
+        """
+        Apply a decoded Sync/Swap pool event to the chain's liquidity graph.
+        
+        Args:
+            event: Decoded event (see LiquidityGraph.apply_event)
+            chain: Blockchain network
+            
+        Returns:
+            True if a tracked pool was updated
+        """
+        graph = self.liquidity_graphs.get(chain)
+        return graph.apply_event(event) if graph is not None else False
+
+    def _graph_covers(self, chain: str, input_token: str, output_token: str) -> bool:
+        """Whether the chain's liquidity graph knows both tokens."""
+        graph = self.liquidity_graphs.get(chain)
+        return graph is not None and graph.has_token(input_token) and graph.has_token(output_token)
+
+    def _graph_route_to_trading_route(
+        self,
+        graph: LiquidityGraph,
+        graph_route: GraphRoute,
+        input_token: str,
+        output_token: str,
+        amount_in: Decimal
+    ) -> TradingRoute:
+        """
+        Convert a liquidity graph path into a TradingRoute.
+        
+        The path found by the float search is re-quoted hop by hop with
+        exact integer getAmountOut math on the pools' raw reserves.
+        """
+        steps = []
+        remaining_after_fees = Decimal('1')
+        first = graph_route.hops[0]
+        raw_amount = to_raw(amount_in, first.pool.decimals_of(first.token_in))
+        last_index = len(graph_route.hops) - 1
+        
+        for index, hop in enumerate(graph_route.hops):
+            fee = Decimal(str(hop.pool.fee))
+            remaining_after_fees *= 1 - fee
+            raw_out = hop.pool.exact_amount_out(hop.token_in, raw_amount)
+            steps.append(RouteStep(
+                dex_name=hop.pool.dex,
+                pool_address=hop.pool.pool_address,
+                token_in=input_token if index == 0 else graph.address(hop.token_in),
+                token_out=output_token if index == last_index else graph.address(hop.token_out),
+                amount_in=from_raw(raw_amount, hop.pool.decimals_of(hop.token_in)),
+                amount_out=from_raw(raw_out, hop.pool.decimals_of(hop.token_out)),
+                fee=fee,
+                slippage=Decimal(str(hop.price_impact)),
+                gas_estimate=hop.pool.gas_estimate,
+                confidence=0.95,
+                execution_time_ms=5000
+            ))
+            raw_amount = raw_out
+        
+        price_impact = Decimal(str(graph_route.price_impact))
+        is_direct = len(steps) == 1
+        
+        return TradingRoute(
+            route_id=("direct_" if is_direct else "graph_") + "_".join(
+                hop.pool.pool_address[:10] for hop in graph_route.hops
+            ),
+            route_type=RouteType.DIRECT if is_direct else RouteType.MULTI_HOP,
+            steps=steps,
+            total_amount_in=amount_in,
+            total_amount_out=steps[-1].amount_out,
+            total_fees=amount_in * (1 - remaining_after_fees),
+            total_slippage=price_impact,
+            total_gas=graph_route.total_gas,
+            price_impact=price_impact,
+            efficiency_score=max(0.1, 1.0 - (len(steps) * 0.1)),
+            execution_probability=0.95,
+            estimated_execution_time=5000 * len(steps),
+            complexity_score=len(steps),
+            liquidity_risk=self._graph_liquidity_risk(
+                [hop.pool.liquidity_usd for hop in graph_route.hops], price_impact
+            ),
+            mev_risk="low" if is_direct else "medium"  # Higher for multi-hop
+        )
+
+    def _graph_liquidity_risk(self, pool_liquidity_usd: List[float], price_impact: Decimal) -> str:
+        """Liquidity risk from pool TVL when known, otherwise from price impact."""
+        if pool_liquidity_usd and all(pool_liquidity_usd):
+            return self._assess_liquidity_risk(Decimal(str(min(pool_liquidity_usd))))
+        if price_impact < Decimal('0.005'):
+            return "low"
+        return "medium" if price_impact < Decimal('0.02') else "high"
+
+    def _find_split_routes(
+        self,
+        input_token: str,
+        output_token: str,
+        amount_in: Decimal,
+        chain: str
+    ) -> List[TradingRoute]:
+        """
+        Split one order across the pair's pools to maximize total output.
+        
+        Shares are solved in-process (equal marginal output across pools,
+        see amm_math.optimal_split) and every leg is quoted with exact
+        integer math, so no candidate split needs an on-chain quote.
+        
+        Returns:
+            A single SPLIT route, or an empty list when splitting does not
+            use more than one pool
+        """
+        graph = self.liquidity_graphs.get(chain)
+        if graph is None:
+            return []
+        
+        source, target = input_token.lower(), output_token.lower()
+        pools = [
+            edge for edge in graph.pools_between(source, target)
+            if edge.raw_reserve0 > 0 and edge.raw_reserve1 > 0
+        ]
+        if len(pools) < 2:
+            return []
+        
+        # Consider the deepest pools on the output side
+        pools.sort(key=lambda edge: edge.reserves_for(source)[1], reverse=True)
+        pools = pools[:self.max_split_pools]
+        
+        raw_in = to_raw(amount_in, pools[0].decimals_of(source))
+        raw_reserves = [
+            (edge.raw_reserve0, edge.raw_reserve1) if edge.token0 == source
+            else (edge.raw_reserve1, edge.raw_reserve0)
+            for edge in pools
+        ]
+        allocation = optimal_split(
+            raw_in,
+            [(reserve_in, reserve_out, edge.fee_pips) for edge, (reserve_in, reserve_out) in zip(pools, raw_reserves)]
+        )
+        legs = [(edge, reserves, share) for edge, reserves, share in zip(pools, raw_reserves, allocation) if share > 0]
+        if len(legs) < 2:
+            return []
+        
+        steps = []
+        total_fees = Decimal('0')
+        spot_out_after_fees = Decimal('0')
+        for edge, (reserve_in, reserve_out), share in legs:
+            raw_out = edge.exact_amount_out(source, share)
+            fee = Decimal(str(edge.fee))
+            leg_in = from_raw(share, edge.decimals_of(source))
+            leg_out = from_raw(raw_out, edge.decimals_of(target))
+            leg_spot = from_raw(share * reserve_out // reserve_in, edge.decimals_of(target)) * (1 - fee)
+            spot_out_after_fees += leg_spot
+            total_fees += leg_in * fee
+            steps.append(RouteStep(
+                dex_name=edge.dex,
+                pool_address=edge.pool_address,
+                token_in=input_token,
+                token_out=output_token,
+                amount_in=leg_in,
+                amount_out=leg_out,
+                fee=fee,
+                slippage=1 - leg_out / leg_spot if leg_spot > 0 else Decimal('1'),
+                gas_estimate=edge.gas_estimate,
+                confidence=0.95,
+                execution_time_ms=5000
+            ))
+        
+        total_out = sum((step.amount_out for step in steps), Decimal('0'))
+        price_impact = 1 - total_out / spot_out_after_fees if spot_out_after_fees > 0 else Decimal('1')
+        
+        return [TradingRoute(
+            route_id="split_" + "_".join(edge.pool_address[:10] for edge, _, _ in legs),
+            route_type=RouteType.SPLIT,
+            steps=steps,
+            total_amount_in=amount_in,
+            total_amount_out=total_out,
+            total_fees=total_fees,
+            total_slippage=price_impact,
+            total_gas=sum(step.gas_estimate for step in steps),
+            price_impact=price_impact,
+            efficiency_score=max(0.1, 1.0 - (len(steps) * 0.1)),
+            execution_probability=0.95,
+            estimated_execution_time=5000 * len(steps),  # One swap transaction per leg, sent in order
+            complexity_score=len(steps),
+            liquidity_risk=self._graph_liquidity_risk([edge.liquidity_usd for edge, _, _ in legs], price_impact),
+            mev_risk="low"
+        )]
+
     async def _find_arbitrage_routes(
         self, 
         input_token: str, 
@@ -517,9 +831,7 @@ class DEXRouter:
                     continue
                 
                 try:
-                    price_data = await self.dex_aggregator.get_real_time_price(
-                        input_token, chain, quote_token=output_token, dex_preference=dex_id
-                    )
+                    price_data = await self._get_price_data(input_token, output_token, chain, dex_id)
                     
                     if price_data:
                         dex_prices[dex_id] = price_data
@@ -734,6 +1046,44 @@ class DEXRouter:
             logger.error(f"Error creating route quote: {e}")
             raise DexRouterException(f"Quote creation failed: {e}")
 
+    async def _get_price_data(
+        self,
+        input_token: str,
+        output_token: str,
+        chain: str,
+        dex_id: Optional[str] = None
+    ) -> Optional[PriceData]:
+        """
+        Get price data, sharing one aggregator lookup across concurrent callers.
+
+        Args:
+            input_token: Token being priced
+            output_token: Quote token
+            chain: Blockchain network
+            dex_id: Preferred DEX (default: aggregated across DEXs)
+
+        Returns:
+            Optional[PriceData]: Price data, or None if unavailable
+        """
+        async def load() -> Optional[Dict[str, Any]]:
+            if dex_id is None:
+                price_data = await self.dex_aggregator.get_real_time_price(
+                    input_token, chain, quote_token=output_token
+                )
+            else:
+                price_data = await self.dex_aggregator.get_real_time_price(
+                    input_token, chain, quote_token=output_token, dex_preference=dex_id
+                )
+            return price_data.__dict__ if price_data else None
+
+        cached = await cache_manager.get_or_compute(
+            f"{chain}:{input_token}:{output_token}:{dex_id or 'any'}",
+            load,
+            ttl=self.price_cache_ttl,
+            namespace='dex_prices'
+        )
+        return PriceData(**cached) if cached else None
+
     def _calculate_slippage(self, amount: Decimal, liquidity: Decimal) -> Decimal:
         """Calculate estimated slippage based on trade size and liquidity."""
         try:
@@ -832,6 +1182,11 @@ class DEXRouter:
                 'execution_order': []
             }
             
+            # Every step needs a router to send its swap to
+            unsupported = {step.dex_name for step in route_quote.route.steps} - self.supported_dexs.keys()
+            if unsupported:
+                raise DexRouterException(f"Route uses unsupported DEX(s): {', '.join(sorted(unsupported))}")
+            
             # Process each route step
             for i, step in enumerate(route_quote.route.steps):
                 step_plan = {
@@ -847,7 +1202,8 @@ class DEXRouter:
                 }
                 
                 # Check if token approval is needed
-                if i == 0:  # First step needs approval for input token
+                # (first step, or every leg of a split order since each spends the input token)
+                if i == 0 or route_quote.route.route_type == RouteType.SPLIT:
                     approval_needed = await self._check_token_approval(
                         step.token_in, wallet_address, 
                         self.supported_dexs[step.dex_name]['router_address'],
@@ -890,14 +1246,20 @@ class DEXRouter:
             }
             
             # Simulate each step
-            cumulative_output = execution_plan['route_quote'].input_amount
+            # (a split order's legs all spend the input token, so their outputs add up;
+            # otherwise each hop consumes the previous one and the last output is final)
+            is_split = execution_plan['route_quote'].route.route_type == RouteType.SPLIT
+            cumulative_output = Decimal('0') if is_split else execution_plan['route_quote'].input_amount
             
             for step_plan in execution_plan['execution_steps']:
                 # Simulate price impact and slippage
                 expected_output = step_plan['amount_out_min']
                 actual_output = expected_output * Decimal('0.98')  # 2% simulation buffer
                 
-                cumulative_output = actual_output
+                if is_split:
+                    cumulative_output += actual_output
+                else:
+                    cumulative_output = actual_output
                 
                 # Check for potential issues
                 if actual_output < step_plan['amount_out_min']:
@@ -0,0 +1,499 @@
+"""
+Liquidity Graph
+File: app/core/dex/liquidity_graph.py
+
+In-memory token/pool graph for multi-hop route search. Tokens are nodes and
+pools are edges carrying reserves and fee; reserves are kept current from
+pool Sync/Swap events so route search runs entirely in-process without a
+single RPC round trip. Pools also keep raw integer reserves so chosen
+routes can be re-quoted exactly with on-chain integer math.
+"""
+
+import heapq
+import itertools
+import time
+from collections import deque
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from app.core.dex.amm_math import from_raw, get_amount_out, to_raw
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class PoolEdge:
+    """
+    A constant-product pool between two tokens.
+
+    Reserves are held twice: as raw integers (the on-chain values, used for
+    exact quotes) and as float token units for search, which compares
+    thousands of candidate amounts per query.
+    """
+
+    __slots__ = (
+        'pool_address', 'dex', 'token0', 'token1', 'decimals0', 'decimals1',
+        'raw_reserve0', 'raw_reserve1', 'reserve0', 'reserve1',
+        'fee', 'fee_pips', 'fee_multiplier', 'gas_estimate', 'liquidity_usd', 'updated_at'
+    )
+
+    def __init__(
+        self,
+        pool_address: str,
+        dex: str,
+        token0: str,
+        token1: str,
+        reserve0: float,
+        reserve1: float,
+        fee: float = 0.003,
+        gas_estimate: int = 150000,
+        liquidity_usd: float = 0.0,
+        decimals0: int = 18,
+        decimals1: int = 18
+    ):
+        self.pool_address = pool_address
+        self.dex = dex
+        self.token0 = token0.lower()
+        self.token1 = token1.lower()
+        self.decimals0 = decimals0
+        self.decimals1 = decimals1
+        self.fee = float(fee)
+        self.fee_pips = int(round(self.fee * 1_000_000))
+        self.fee_multiplier = 1.0 - self.fee
+        self.gas_estimate = gas_estimate
+        self.liquidity_usd = float(liquidity_usd)
+        self.set_reserves(reserve0, reserve1)
+
+    def set_reserves(self, reserve0: Any, reserve1: Any) -> None:
+        """Set reserves from token units."""
+        self.set_raw_reserves(to_raw(reserve0, self.decimals0), to_raw(reserve1, self.decimals1))
+
+    def set_raw_reserves(self, raw_reserve0: int, raw_reserve1: int) -> None:
+        """Set reserves from raw on-chain integers (e.g. a Sync event)."""
+        self.raw_reserve0 = max(0, int(raw_reserve0))
+        self.raw_reserve1 = max(0, int(raw_reserve1))
+        self.reserve0 = self.raw_reserve0 / 10 ** self.decimals0
+        self.reserve1 = self.raw_reserve1 / 10 ** self.decimals1
+        self.updated_at = time.time()
+
+    def decimals_of(self, token: str) -> int:
+        """Decimals of one of the pool's tokens."""
+        return self.decimals0 if token == self.token0 else self.decimals1
+
+    def other(self, token: str) -> str:
+        """The token on the opposite side of the pool."""
+        return self.token1 if token == self.token0 else self.token0
+
+    def reserves_for(self, token_in: str) -> Tuple[float, float]:
+        """(reserve_in, reserve_out) when selling token_in."""
+        if token_in == self.token0:
+            return self.reserve0, self.reserve1
+        return self.reserve1, self.reserve0
+
+    def amount_out(self, token_in: str, amount_in: float) -> float:
+        """Output amount for selling amount_in of token_in (x*y=k with fee)."""
+        reserve_in, reserve_out = self.reserves_for(token_in)
+        if reserve_in <= 0 or reserve_out <= 0 or amount_in <= 0:
+            return 0.0
+        effective_in = amount_in * self.fee_multiplier
+        return reserve_out * effective_in / (reserve_in + effective_in)
+
+    def exact_amount_out(self, token_in: str, raw_amount_in: int) -> int:
+        """Exact raw output for a raw input (getAmountOut integer math)."""
+        if token_in == self.token0:
+            return get_amount_out(raw_amount_in, self.raw_reserve0, self.raw_reserve1, self.fee_pips)
+        return get_amount_out(raw_amount_in, self.raw_reserve1, self.raw_reserve0, self.fee_pips)
+
+    def quote(self, token_in: str, amount_in: Decimal) -> Decimal:
+        """Exact output in token units for an input in token units."""
+        raw_out = self.exact_amount_out(token_in, to_raw(amount_in, self.decimals_of(token_in)))
+        return from_raw(raw_out, self.decimals_of(self.other(token_in)))
+
+    def __repr__(self) -> str:
+        return f"PoolEdge({self.dex}:{self.pool_address} {self.token0}/{self.token1})"
+
+
+@dataclass
+class RouteHop:
+    """One swap along a graph route."""
+    pool: PoolEdge
+    token_in: str
+    token_out: str
+    amount_in: float
+    amount_out: float
+
+    @property
+    def price_impact(self) -> float:
+        """Fraction of the spot price lost to this swap's size."""
+        reserve_in, _ = self.pool.reserves_for(self.token_in)
+        effective_in = self.amount_in * self.pool.fee_multiplier
+        return effective_in / (reserve_in + effective_in) if reserve_in > 0 else 1.0
+
+
+@dataclass
+class GraphRoute:
+    """A path through the liquidity graph with simulated amounts."""
+    hops: List[RouteHop]
+    amount_in: float
+    amount_out: float
+
+    @property
+    def tokens(self) -> List[str]:
+        """Token path including both endpoints."""
+        return [self.hops[0].token_in] + [hop.token_out for hop in self.hops]
+
+    @property
+    def price_impact(self) -> float:
+        """Compounded price impact across all hops."""
+        remaining = 1.0
+        for hop in self.hops:
+            remaining *= 1.0 - hop.price_impact
+        return 1.0 - remaining
+
+    @property
+    def total_gas(self) -> int:
+        """Summed gas estimate for every hop."""
+        return sum(hop.pool.gas_estimate for hop in self.hops)
+
+
+class LiquidityGraph:
+    """
+    Token graph with bounded k-best route search.
+
+    Search propagates the actual trade amount hop by hop (a Bellman-Ford
+    relaxation over at most `max_hops` layers) instead of summing
+    -log(price) weights, so price impact is accounted for on every edge.
+    Each layer keeps only the best `beam_width` partial paths per token, and
+    tokens that cannot reach the destination in the remaining hops are
+    never expanded.
+    """
+
+    def __init__(self):
+        """Initialize an empty graph."""
+        self._pools: Dict[str, PoolEdge] = {}
+        self._adjacency: Dict[str, Dict[str, PoolEdge]] = {}
+        self._addresses: Dict[str, str] = {}
+
+        self.version = 0
+        self.stats = {
+            'pool_updates': 0,
+            'events_applied': 0,
+            'unknown_pool_events': 0,
+            'searches': 0,
+            'search_seconds': 0.0,
+            'paths_evaluated': 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._pools)
+
+    @property
+    def token_count(self) -> int:
+        """Number of tokens with at least one pool."""
+        return len(self._adjacency)
+
+    def has_token(self, token: str) -> bool:
+        """Whether the token has any pool in the graph."""
+        return token.lower() in self._adjacency
+
+    def address(self, token: str) -> str:
+        """Original-case address for a token key."""
+        return self._addresses.get(token, token)
+
+    def get_pool(self, pool_address: str) -> Optional[PoolEdge]:
+        """Look up a pool by address."""
+        return self._pools.get(pool_address.lower())
+
+    def pools_between(self, token_a: str, token_b: str) -> List[PoolEdge]:
+        """All pools directly pairing two tokens."""
+        token_a, token_b = token_a.lower(), token_b.lower()
+        return [edge for edge in self._adjacency.get(token_a, {}).values() if edge.other(token_a) == token_b]
+
+    def upsert_pool(
+        self,
+        pool_address: str,
+        dex: str,
+        token0: str,
+        token1: str,
+        reserve0: float,
+        reserve1: float,
+        fee: float = 0.003,
+        gas_estimate: int = 150000,
+        liquidity_usd: float = 0.0,
+        decimals0: int = 18,
+        decimals1: int = 18
+    ) -> PoolEdge:
+        """
+        Add a pool or replace its state.
+
+        Args:
+            pool_address: Pool contract address
+            dex: DEX identifier
+            token0: First pool token
+            token1: Second pool token
+            reserve0: token0 reserve in token units
+            reserve1: token1 reserve in token units
+            fee: Swap fee as a fraction (0.003 = 0.3%)
+            gas_estimate: Gas for one swap through the pool
+            liquidity_usd: Pool TVL if known (0 = unknown)
+            decimals0: token0 decimals
+            decimals1: token1 decimals
+
+        Returns:
+            The pool edge
+        """
+        key = pool_address.lower()
+        existing = self._pools.get(key)
+        if existing is not None:
+            self._unlink(existing)
+
+        edge = PoolEdge(
+            pool_address, dex, token0, token1, reserve0, reserve1,
+            fee, gas_estimate, liquidity_usd, decimals0, decimals1
+        )
+        self._pools[key] = edge
+        self._addresses.setdefault(edge.token0, token0)
+        self._addresses.setdefault(edge.token1, token1)
+        self._adjacency.setdefault(edge.token0, {})[key] = edge
+        self._adjacency.setdefault(edge.token1, {})[key] = edge
+
+        self.version += 1
+        self.stats['pool_updates'] += 1
+        return edge
+
+    def remove_pool(self, pool_address: str) -> bool:
+        """Remove a pool; returns False if it was not present."""
+        edge = self._pools.pop(pool_address.lower(), None)
+        if edge is None:
+            return False
+        self._unlink(edge)
+        self.version += 1
+        return True
+
+    def _unlink(self, edge: PoolEdge) -> None:
+        key = edge.pool_address.lower()
+        for token in (edge.token0, edge.token1):
+            pools = self._adjacency.get(token)
+            if pools is not None:
+                pools.pop(key, None)
+                if not pools:
+                    del self._adjacency[token]
+
+    def apply_sync(self, pool_address: str, reserve0: Any, reserve1: Any, raw: bool = False) -> bool:
+        """
+        Apply a Sync event (absolute reserves).
+
+        Args:
+            pool_address: Pool address
+            reserve0: New token0 reserve
+            reserve1: New token1 reserve
+            raw: Reserves are raw integers rather than token units
+
+        Returns:
+            False if the pool is not tracked
+        """
+        edge = self._pools.get(pool_address.lower())
+        if edge is None:
+            self.stats['unknown_pool_events'] += 1
+            return False
+        if raw:
+            edge.set_raw_reserves(reserve0, reserve1)
+        else:
+            edge.set_reserves(reserve0, reserve1)
+        self.version += 1
+        self.stats['events_applied'] += 1
+        return True
+
+    def apply_swap(
+        self,
+        pool_address: str,
+        amount0_in: Any,
+        amount1_in: Any,
+        amount0_out: Any,
+        amount1_out: Any,
+        raw: bool = False
+    ) -> bool:
+        """
+        Apply a Swap event (reserve deltas).
+
+        Args:
+            pool_address: Pool address
+            amount0_in: token0 paid in
+            amount1_in: token1 paid in
+            amount0_out: token0 paid out
+            amount1_out: token1 paid out
+            raw: Amounts are raw integers rather than token units
+
+        Returns:
+            False if the pool is not tracked
+        """
+        edge = self._pools.get(pool_address.lower())
+        if edge is None:
+            self.stats['unknown_pool_events'] += 1
+            return False
+        if not raw:
+            amount0_in, amount0_out = to_raw(amount0_in, edge.decimals0), to_raw(amount0_out, edge.decimals0)
+            amount1_in, amount1_out = to_raw(amount1_in, edge.decimals1), to_raw(amount1_out, edge.decimals1)
+        edge.set_raw_reserves(
+            edge.raw_reserve0 + int(amount0_in) - int(amount0_out),
+            edge.raw_reserve1 + int(amount1_in) - int(amount1_out)
+        )
+        self.version += 1
+        self.stats['events_applied'] += 1
+        return True
+
+    def apply_event(self, event: Mapping[str, Any]) -> bool:
+        """
+        Apply a decoded pool event.
+
+        Args:
+            event: Mapping with 'event' ('Sync' or 'Swap'), 'pool' and the
+                event's fields (reserve0/reserve1, or amount0In/amount1In/
+                amount0Out/amount1Out); amounts are token units unless
+                the event sets 'raw': True
+
+        Returns:
+            True if the graph changed
+        """
+        kind = event.get('event')
+        pool = event.get('pool') or event.get('address')
+        if not pool:
+            return False
+        if kind == 'Sync':
+            return self.apply_sync(pool, event['reserve0'], event['reserve1'], raw=event.get('raw', False))
+        if kind == 'Swap':
+            return self.apply_swap(
+                pool,
+                event.get('amount0In', 0), event.get('amount1In', 0),
+                event.get('amount0Out', 0), event.get('amount1Out', 0),
+                raw=event.get('raw', False)
+            )
+        return False
+
+    def _distances_to(self, target: str, max_depth: int) -> Dict[str, int]:
+        """Hop distance of every token within max_depth of target."""
+        distances = {target: 0}
+        queue = deque([target])
+        while queue:
+            token = queue.popleft()
+            depth = distances[token]
+            if depth >= max_depth:
+                continue
+            for edge in self._adjacency.get(token, {}).values():
+                neighbour = edge.other(token)
+                if neighbour not in distances:
+                    distances[neighbour] = depth + 1
+                    queue.append(neighbour)
+        return distances
+
+    def find_routes(
+        self,
+        token_in: str,
+        token_out: str,
+        amount_in: float,
+        max_hops: int = 3,
+        k: int = 5,
+        min_hops: int = 1,
+        beam_width: Optional[int] = None
+    ) -> List[GraphRoute]:
+        """
+        Find the k routes with the highest output amount.
+
+        Args:
+            token_in: Token sold
+            token_out: Token bought
+            amount_in: Amount sold, in token units
+            max_hops: Maximum swaps per route
+            k: Number of routes to return
+            min_hops: Minimum swaps per route (2 excludes direct pools)
+            beam_width: Partial paths kept per token per layer (defaults to k)
+
+        Returns:
+            Routes sorted by amount_out, best first
+        """
+        started = time.perf_counter()
+        source, target = token_in.lower(), token_out.lower()
+        beam = max(1, beam_width or k)
+        amount_in = float(amount_in)
+
+        if source == target or source not in self._adjacency or target not in self._adjacency:
+            return []
+
+        # Tokens further than the remaining hop budget from the target are dead ends
+        reachable = self._distances_to(target, max_hops - 1)
+        counter = itertools.count()
+        evaluated = 0
+
+        # Partial path: (amount, tiebreak, hops tuple, visited tokens)
+        frontier: Dict[str, List[tuple]] = {source: [(amount_in, next(counter), (), (source,))]}
+        best: List[tuple] = []
+
+        for hop_number in range(1, max_hops + 1):
+            remaining = max_hops - hop_number
+            next_frontier: Dict[str, List[tuple]] = {}
+
+            for token, partials in frontier.items():
+                for edge in self._adjacency.get(token, {}).values():
+                    neighbour = edge.other(token)
+                    distance = reachable.get(neighbour)
+                    if distance is None or distance > remaining:
+                        continue
+
+                    for amount, _, hops, visited in partials:
+                        if neighbour in visited:
+                            continue
+                        out = edge.amount_out(token, amount)
+                        evaluated += 1
+                        if out <= 0:
+                            continue
+
+                        path = hops + ((edge, token, neighbour, amount, out),)
+                        if neighbour == target:
+                            if hop_number >= min_hops:
+                                entry = (out, next(counter), path)
+                                if len(best) < k:
+                                    heapq.heappush(best, entry)
+                                elif out > best[0][0]:
+                                    heapq.heapreplace(best, entry)
+                            continue
+
+                        bucket = next_frontier.setdefault(neighbour, [])
+                        entry = (out, next(counter), path, visited + (neighbour,))
+                        if len(bucket) < beam:
+                            heapq.heappush(bucket, entry)
+                        elif out > bucket[0][0]:
+                            heapq.heapreplace(bucket, entry)
+
+            frontier = next_frontier
+            if not frontier:
+                break
+
+        routes = [
+            GraphRoute(
+                hops=[RouteHop(edge, t_in, t_out, a_in, a_out) for edge, t_in, t_out, a_in, a_out in path],
+                amount_in=amount_in,
+                amount_out=out,
+            )
+            for out, _, path in sorted(best, key=lambda entry: entry[0], reverse=True)
+        ]
+
+        self.stats['searches'] += 1
+        self.stats['search_seconds'] += time.perf_counter() - started
+        self.stats['paths_evaluated'] += evaluated
+        return routes
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get graph statistics."""
+        searches = self.stats['searches']
+        return {
+            'tokens': self.token_count,
+            'pools': len(self._pools),
+            'version': self.version,
+            'pool_updates': self.stats['pool_updates'],
+            'events_applied': self.stats['events_applied'],
+            'unknown_pool_events': self.stats['unknown_pool_events'],
+            'searches': searches,
+            'avg_search_ms': self.stats['search_seconds'] / searches * 1000 if searches else 0.0,
+            'avg_paths_evaluated': self.stats['paths_evaluated'] / searches if searches else 0.0,
+        }
@@ -54,7 +54,8 @@ from app.core.wallet.wallet_connection_manager import (
     NetworkType, 
     get_wallet_connection_manager
 )
-from app.utils.logger import setup_logger, get_trading_logger, get_performance_logger, get_trading_logger, get_performance_logger
+from app.utils.logger import setup_logger
+from app.core.performance.cache_manager import cache_manager
 from app.core.exceptions import (
     DEXError, 
     NetworkError, 
@@ -171,7 +172,6 @@ class LiveDEXIntegration:
         self.wallet_manager = wallet_manager or get_wallet_connection_manager()
         self.dex_contracts: Dict[Tuple[NetworkType, DEXProtocol], Dict[str, Contract]] = {}
         self.token_cache: Dict[Tuple[NetworkType, str], TokenInfo] = {}
-        self.price_cache: Dict[str, Tuple[Decimal, datetime]] = {}
         self.active_quotes: Dict[str, SwapQuote] = {}
         self.pending_transactions: Dict[str, SwapTransaction] = {}
         
@@ -343,41 +343,60 @@ class LiveDEXIntegration:
             DEXError: If price retrieval fails
         """
         try:
-            # Check cache first
             cache_key = f"{network.value}:{token_address}:{base_token or 'native'}"
-            if cache_key in self.price_cache:
-                price, timestamp = self.price_cache[cache_key]
-                if (datetime.utcnow() - timestamp).seconds < self.price_cache_ttl_seconds:
-                    return price, timestamp
-            
-            # Determine base token
-            if base_token is None:
-                if network == NetworkType.ETHEREUM:
-                    base_token = self.common_tokens[(network, "WETH")]
-                elif network == NetworkType.POLYGON:
-                    base_token = self.common_tokens[(network, "WMATIC")]
-                elif network == NetworkType.BSC:
-                    base_token = self.common_tokens[(network, "WBNB")]
-                else:
-                    raise DEXError(f"No default base token for {network.value}")
-            
-            # Get price from DEX
-            price = await self._fetch_price_from_dex(
-                token_address, base_token, network, dex_protocol
-            )
-            
-            # Cache result
-            timestamp = datetime.utcnow()
-            self.price_cache[cache_key] = (price, timestamp)
-            
-            logger.debug(f"[PROFIT] Price fetched: {token_address[:10]}... = {price} on {network.value}")
             
-            return price, timestamp
+            # Concurrent callers asking for the same price share one DEX query
+            return await cache_manager.get_or_compute(
+                cache_key,
+                lambda: self._load_live_price(token_address, network, base_token, dex_protocol),
+                ttl=self.price_cache_ttl_seconds,
+                namespace='live_prices'
+            )
             
         except Exception as e:
             logger.error(f"[ERROR] Failed to get live price: {e}")
             raise DEXError(f"Price retrieval failed: {e}")
     
+    async def _load_live_price(
+        self,
+        token_address: str,
+        network: NetworkType,
+        base_token: Optional[str],
+        dex_protocol: Optional[DEXProtocol]
+    ) -> Tuple[Decimal, datetime]:
+        """
+        Fetch a live price from the DEX (cache-miss path of get_live_price).
+        
+        Args:
+            token_address: Token contract address
+            network: Blockchain network
+            base_token: Base token for price (default: network native wrapper)
+            dex_protocol: Specific DEX to query
+            
+        Returns:
+            Tuple[Decimal, datetime]: Price and timestamp
+        """
+        # Determine base token
+        if base_token is None:
+            if network == NetworkType.ETHEREUM:
+                base_token = self.common_tokens[(network, "WETH")]
+            elif network == NetworkType.POLYGON:
+                base_token = self.common_tokens[(network, "WMATIC")]
+            elif network == NetworkType.BSC:
+                base_token = self.common_tokens[(network, "WBNB")]
+            else:
+                raise DEXError(f"No default base token for {network.value}")
+        
+        # Get price from DEX
+        price = await self._fetch_price_from_dex(
+            token_address, base_token, network, dex_protocol
+        )
+        
+        timestamp = datetime.utcnow()
+        logger.debug(f"[PROFIT] Price fetched: {token_address[:10]}... = {price} on {network.value}")
+        
+        return price, timestamp
+    
     async def _fetch_price_from_dex(
         self,
         token_address: str,
@@ -25,7 +25,7 @@ from web3.exceptions import ContractLogicError
 from app.core.blockchain.base_chain import BaseChain
 from app.core.performance.cache_manager import cache_manager
 from app.core.performance.circuit_breaker import CircuitBreakerManager
-from app.utils.logger import setup_logger, get_trading_logger, get_performance_logger, get_trading_logger, get_performance_logger
+from app.utils.logger import setup_logger
 from app.utils.exceptions import DexSnipingException
 from app.config import settings
 
@@ -505,13 +505,25 @@ class DEXAggregator:
         if not self._initialized:
             await self.initialize()
         
-        cache_key = f"aggregated_price_{token_address}"
-        
-        # Check cache first
-        cached_price = await cache_manager.get(cache_key, namespace='dex_prices')
-        if cached_price:
-            return PriceData(**cached_price)
+        # Concurrent callers asking for the same token share one pool scan
+        cached_price = await cache_manager.get_or_compute(
+            f"aggregated_price_{token_address}",
+            lambda: self._load_aggregated_price(token_address),
+            ttl=30,  # 30 seconds cache
+            namespace='dex_prices'
+        )
+        return PriceData(**cached_price) if cached_price else None
+    
+    async def _load_aggregated_price(self, token_address: str) -> Optional[Dict[str, Any]]:
+        """
+        Compute aggregated price data (cache-miss path of get_aggregated_price).
         
+        Args:
+            token_address: Token to get price for
+            
+        Returns:
+            Optional[Dict[str, Any]]: PriceData fields, or None if unavailable
+        """
         try:
             # Get prices from all sources
             v2_pools = await self.uniswap_v2.monitor_token_pools(token_address)
@@ -545,15 +557,7 @@ class DEXAggregator:
                     price_confidence=min(len(v2_pools) / 5.0, 1.0)
                 )
                 
-                # Cache price data
-                await cache_manager.set(
-                    cache_key,
-                    price_data.__dict__,
-                    ttl=30,  # 30 seconds cache
-                    namespace='dex_prices'
-                )
-                
-                return price_data
+                return price_data.__dict__
             
             return None
             
@@ -0,0 +1,591 @@
+"""
+Log-Based Pair Discovery
+File: app/core/discovery/pair_log_discovery.py
+
+New-pair discovery driven by factory event logs instead of walking blocks
+and receipts. Historical ranges are read with chunked eth_getLogs calls
+whose block span adapts to provider "too many results" limits; live pairs
+arrive through an eth_subscribe("logs") feed filtered to the factories'
+PairCreated/PoolCreated topics. A persisted block cursor lets a restarted
+scanner resume exactly where it stopped without rescanning any range.
+"""
+
+import asyncio
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+import websockets
+from eth_utils import keccak, to_checksum_address
+
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# topic0 of UniswapV2Factory.PairCreated and UniswapV3Factory.PoolCreated
+PAIR_CREATED_TOPIC = '0x' + keccak(text='PairCreated(address,address,address,uint256)').hex()
+POOL_CREATED_TOPIC = '0x' + keccak(text='PoolCreated(address,address,uint24,int24,address)').hex()
+
+# Provider errors meaning a getLogs range returned too much data. Matched on
+# the specific wording so that rate-limit errors are never mistaken for them
+RANGE_TOO_LARGE_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'query returned more than \d+ results',          # geth, Infura (-32005)
+    r'log response size exceeded',                     # Alchemy
+    r'block range (is )?too (large|wide)',             # Ankr, Chainstack
+    r'exceed(s|ed)? (the )?max(imum)? block range',    # BSC/Polygon nodes
+    r'eth_getlogs is limited to',                      # QuickNode
+    r'ranges over \d+ blocks are not supported',       # Cloudflare
+    r'query timeout exceeded',                         # geth log filter timeout
+))
+
+# Errors meaning the provider is throttling us: back off, keep the range
+RATE_LIMIT_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'rate.?limit',
+    r'too many requests',
+    r'\b429\b',
+    r'request count exceeded',
+    r'exceeded .*(capacity|compute units)',
+    r'throttl',
+))
+RATE_LIMIT_CODES = {429, -32029}
+
+# async (method, params) -> JSON-RPC result, raising on an error response
+RpcCall = Callable[[str, List[Any]], Awaitable[Any]]
+PairHandler = Callable[['PairCreatedEvent'], Any]
+
+
+@dataclass
+class PairCreatedEvent:
+    """A pair or pool created by a watched factory."""
+    dex: str
+    factory: str
+    token0: str
+    token1: str
+    pair: str
+    block_number: int
+    tx_hash: str
+    log_index: int
+    fee: Optional[int] = None
+
+    @property
+    def key(self) -> Tuple[str, int]:
+        """Identity of the log that produced the event."""
+        return self.tx_hash, self.log_index
+
+
+def _to_int(value: Any) -> int:
+    """Parse a JSON-RPC quantity (hex string or int)."""
+    if isinstance(value, int):
+        return value
+    return int(value, 16)
+
+
+def _to_bytes(value: Any) -> bytes:
+    """Parse JSON-RPC data (hex string or bytes)."""
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    return bytes.fromhex(value[2:] if value.startswith('0x') else value)
+
+
+def _error_code(error: Exception) -> Optional[int]:
+    """JSON-RPC or HTTP status code carried by an exception, if any."""
+    for candidate in (getattr(error, 'code', None), getattr(error, 'status', None)):
+        if isinstance(candidate, int):
+            return candidate
+    if error.args and isinstance(error.args[0], Mapping):
+        code = error.args[0].get('code')
+        if isinstance(code, int):
+            return code
+    return None
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """Whether an RPC error means the provider is throttling requests."""
+    if _error_code(error) in RATE_LIMIT_CODES:
+        return True
+    message = str(error).lower()
+    return any(pattern.search(message) for pattern in RATE_LIMIT_PATTERNS)
+
+
+def is_range_too_large(error: Exception) -> bool:
+    """Whether an eth_getLogs error means the block range should shrink."""
+    if is_rate_limited(error):
+        return False
+    message = str(error).lower()
+    return any(pattern.search(message) for pattern in RANGE_TOO_LARGE_PATTERNS)
+
+
+def decode_pair_created_log(log: Mapping[str, Any], factories: Mapping[str, str]) -> Optional[PairCreatedEvent]:
+    """
+    Decode a PairCreated (V2) or PoolCreated (V3) log.
+
+    Args:
+        log: Raw JSON-RPC log object
+        factories: Mapping of lowercase factory address -> DEX name
+
+    Returns:
+        Decoded event, or None if the log is not a pair creation from a
+        watched factory
+    """
+    try:
+        factory = log['address'].lower()
+        dex = factories.get(factory)
+        topics = [_to_bytes(topic) for topic in log.get('topics', [])]
+        if dex is None or not topics:
+            return None
+
+        data = _to_bytes(log.get('data', '0x'))
+        topic0 = '0x' + topics[0].hex()
+        if topic0 == PAIR_CREATED_TOPIC and len(topics) >= 3 and len(data) >= 32:
+            pair, fee = data[12:32], None
+        elif topic0 == POOL_CREATED_TOPIC and len(topics) >= 4 and len(data) >= 64:
+            pair, fee = data[44:64], int.from_bytes(topics[3], 'big')
+        else:
+            return None
+
+        return PairCreatedEvent(
+            dex=dex,
+            factory=to_checksum_address(factory),
+            token0=to_checksum_address(topics[1][12:]),
+            token1=to_checksum_address(topics[2][12:]),
+            pair=to_checksum_address(pair),
+            block_number=_to_int(log['blockNumber']),
+            tx_hash=log['transactionHash'] if isinstance(log['transactionHash'], str)
+            else '0x' + bytes(log['transactionHash']).hex(),
+            log_index=_to_int(log['logIndex']),
+            fee=fee,
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        logger.debug(f"Skipping undecodable factory log: {e}")
+        return None
+
+
+class BlockCursorStore:
+    """
+    Last fully processed block per network, persisted as a JSON file.
+
+    Alongside each cursor the store keeps the log indexes already delivered
+    from the block right after it, so a live feed that stops part-way
+    through a block resumes without handing those pairs out again.
+
+    Writes go to a temporary file that is atomically renamed over the
+    store, so a crash never leaves a truncated cursor behind. The file I/O
+    runs in the default executor, off the event loop.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize cursor store.
+
+        Args:
+            path: JSON file holding {network: block_number} or
+                {network: {"block": n, "delivered": [log_index, ...]}}
+        """
+        self.path = Path(path)
+        self._cursors: Dict[str, int] = {}
+        self._delivered: Dict[str, List[int]] = {}
+        self._write_lock = asyncio.Lock()
+        self.writes = 0
+        if self.path.exists():
+            try:
+                for network, value in json.loads(self.path.read_text()).items():
+                    if isinstance(value, dict):
+                        self._cursors[network] = int(value['block'])
+                        self._delivered[network] = [int(i) for i in value.get('delivered', [])]
+                    else:
+                        self._cursors[network] = int(value)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Ignoring unreadable cursor file {self.path}: {e}")
+
+    def load(self, network: str) -> Optional[int]:
+        """Get the last processed block for a network."""
+        return self._cursors.get(network)
+
+    def load_delivered(self, network: str) -> Set[int]:
+        """Get the log indexes already delivered from the block after the cursor."""
+        return set(self._delivered.get(network, ()))
+
+    async def save(self, network: str, block_number: int, delivered: Iterable[int] = ()) -> None:
+        """
+        Persist the last processed block for a network.
+
+        Args:
+            network: Network name
+            block_number: Last fully processed block
+            delivered: Log indexes already delivered from block_number + 1
+        """
+        self._cursors[network] = block_number
+        self._delivered[network] = sorted(delivered)
+        text = json.dumps({
+            name: {'block': block, 'delivered': self._delivered[name]} if self._delivered.get(name) else block
+            for name, block in self._cursors.items()
+        }, sort_keys=True)
+        async with self._write_lock:
+            await asyncio.get_running_loop().run_in_executor(None, self._write, text)
+            self.writes += 1
+
+    def _write(self, text: str) -> None:
+        """Atomically replace the cursor file (runs in an executor thread)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        tmp_path.write_text(text)
+        os.replace(tmp_path, self.path)
+
+
+class PairLogDiscovery:
+    """
+    Discovers new pairs from factory logs for one network.
+
+    Every block up to the cursor has been delivered to the handler exactly
+    once. Events are recorded as delivered only after the handler has
+    finished with them: the cursor moves up to the block before each event
+    and the event's log index is kept with it. The cursor is persisted once
+    per getLogs chunk and, while streaming, at most every persist_interval
+    seconds (and on stop), so a crash replays at most the events delivered
+    since the last save.
+
+    Rate-limited requests are retried with exponential backoff; only the
+    providers' "range too large" errors shrink the getLogs span.
+    """
+
+    def __init__(
+        self,
+        network: str,
+        rpc: RpcCall,
+        factories: Mapping[str, str],
+        handler: Optional[PairHandler] = None,
+        cursor_store: Optional[BlockCursorStore] = None,
+        ws_url: Optional[str] = None,
+        start_block: Optional[int] = None,
+        initial_chunk_size: int = 2000,
+        max_chunk_size: int = 10000,
+        poll_interval: float = 12.0,
+        persist_interval: float = 1.0,
+        rate_limit_backoff: float = 1.0,
+        max_rate_limit_retries: int = 6
+    ):
+        """
+        Initialize pair discovery.
+
+        Args:
+            network: Network name (cursor key)
+            rpc: Async JSON-RPC transport
+            factories: Mapping of DEX name -> factory address (V2 and V3)
+            handler: Sync or async callback invoked for every new pair
+            cursor_store: Persistent cursor store (in-memory cursor if None)
+            ws_url: WebSocket endpoint for live log subscriptions; without
+                one, run() tails the chain with eth_getLogs polling
+            start_block: First block to scan when no cursor exists (defaults
+                to the current head, i.e. only new pairs)
+            initial_chunk_size: Initial eth_getLogs block span
+            max_chunk_size: Upper bound for the adaptive block span
+            poll_interval: Seconds between polls when no ws_url is set
+            persist_interval: Minimum seconds between cursor writes for
+                live events
+            rate_limit_backoff: First delay after a rate-limited request
+            max_rate_limit_retries: Rate-limited attempts per request
+                before the error is raised
+        """
+        self.network = network
+        self.rpc = rpc
+        self.factories = {addr.lower(): dex for dex, addr in factories.items()}
+        self.handler = handler
+        self.cursor_store = cursor_store
+        self.ws_url = ws_url
+        self.start_block = start_block
+        self.max_chunk_size = max(1, max_chunk_size)
+        self.chunk_size = min(max(1, initial_chunk_size), self.max_chunk_size)
+        self.poll_interval = poll_interval
+        self.persist_interval = persist_interval
+        self.rate_limit_backoff = rate_limit_backoff
+        self.max_rate_limit_retries = max_rate_limit_retries
+
+        self._cursor: Optional[int] = cursor_store.load(network) if cursor_store else None
+        # Log indexes already delivered from block cursor + 1
+        self._delivered: Set[int] = cursor_store.load_delivered(network) if cursor_store else set()
+        self._seen: 'OrderedDict[Tuple[str, int], None]' = OrderedDict()
+        self._seen_limit = 10000
+        self._running = False
+        self._dirty = False
+        self._last_persist = 0.0
+
+        self.stats = {
+            'get_logs_requests': 0,
+            'chunk_shrinks': 0,
+            'rate_limit_backoffs': 0,
+            'logs_received': 0,
+            'pairs_discovered': 0,
+            'duplicates_skipped': 0,
+            'removed_logs_skipped': 0,
+            'subscription_reconnects': 0,
+        }
+
+    @property
+    def cursor(self) -> Optional[int]:
+        """Last fully processed block."""
+        return self._cursor
+
+    def log_filter(self, from_block: Optional[int] = None, to_block: Optional[int] = None) -> Dict[str, Any]:
+        """Build the factory log filter, optionally bounded to a block range."""
+        log_filter: Dict[str, Any] = {
+            'address': [to_checksum_address(addr) for addr in self.factories],
+            'topics': [[PAIR_CREATED_TOPIC, POOL_CREATED_TOPIC]],
+        }
+        if from_block is not None:
+            log_filter['fromBlock'] = hex(from_block)
+        if to_block is not None:
+            log_filter['toBlock'] = hex(to_block)
+        return log_filter
+
+    async def get_head(self) -> int:
+        """Get the latest block number."""
+        return _to_int(await self.rpc('eth_blockNumber', []))
+
+    async def _get_logs_chunk(self, from_block: int, to_block: int) -> Tuple[int, List[PairCreatedEvent]]:
+        """
+        Fetch one chunk starting at from_block, shrinking the span until the
+        provider accepts it.
+
+        Returns:
+            Tuple of (last block covered, decoded events)
+        """
+        rate_limited = 0
+        while True:
+            chunk_end = min(to_block, from_block + self.chunk_size - 1)
+            try:
+                self.stats['get_logs_requests'] += 1
+                logs = await self.rpc('eth_getLogs', [self.log_filter(from_block, chunk_end)])
+            except Exception as e:
+                if is_rate_limited(e) and rate_limited < self.max_rate_limit_retries:
+                    delay = min(60.0, self.rate_limit_backoff * 2 ** rate_limited)
+                    rate_limited += 1
+                    self.stats['rate_limit_backoffs'] += 1
+                    logger.debug(f"getLogs rate limited on {self.network}, retrying in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+                    continue
+                if not is_range_too_large(e) or self.chunk_size == 1:
+                    raise
+                self.chunk_size = max(1, (chunk_end - from_block + 1) // 2)
+                self.stats['chunk_shrinks'] += 1
+                logger.debug(f"getLogs range too large on {self.network}, chunk size -> {self.chunk_size}")
+                continue
+
+            # Grow back gradually once the provider is accepting ranges again
+            if chunk_end - from_block + 1 == self.chunk_size:
+                self.chunk_size = min(self.max_chunk_size, self.chunk_size * 2)
+
+            self.stats['logs_received'] += len(logs)
+            events = [
+                event for event in (decode_pair_created_log(log, self.factories) for log in logs
+                                    if not log.get('removed'))
+                if event is not None
+            ]
+            events.sort(key=lambda event: (event.block_number, event.log_index))
+            return chunk_end, events
+
+    async def fetch_logs(self, from_block: int, to_block: int) -> List[PairCreatedEvent]:
+        """
+        Read pair creations in a block range without touching the cursor.
+
+        Args:
+            from_block: First block (inclusive)
+            to_block: Last block (inclusive)
+
+        Returns:
+            Events in chain order
+        """
+        events: List[PairCreatedEvent] = []
+        block = from_block
+        while block <= to_block:
+            chunk_end, chunk_events = await self._get_logs_chunk(block, to_block)
+            events.extend(chunk_events)
+            block = chunk_end + 1
+        return events
+
+    async def backfill(self, to_block: Optional[int] = None) -> int:
+        """
+        Deliver every pair created between the cursor and to_block.
+
+        The cursor is persisted once after each chunk.
+
+        Args:
+            to_block: Last block to scan (latest if None)
+
+        Returns:
+            Number of pairs delivered
+        """
+        if to_block is None:
+            to_block = await self.get_head()
+
+        if self._cursor is None:
+            if self.start_block is None:
+                # Nothing to catch up on: start discovering from the head
+                self._advance_cursor(to_block)
+                await self._persist_cursor()
+                return 0
+            self._cursor = self.start_block - 1
+
+        delivered = 0
+        block = self._cursor + 1
+        while block <= to_block:
+            chunk_end, events = await self._get_logs_chunk(block, to_block)
+            for event in events:
+                delivered += await self._deliver(event, persist=False)
+            self._advance_cursor(chunk_end)
+            await self._persist_cursor()
+            block = chunk_end + 1
+        return delivered
+
+    async def run(self) -> None:
+        """Catch up from the cursor, then follow new pairs until stop()."""
+        self._running = True
+        backoff = 1.0
+        while self._running:
+            try:
+                if self.ws_url:
+                    await self._follow_subscription()
+                else:
+                    await self.backfill()
+                    await asyncio.sleep(self.poll_interval)
+                backoff = 1.0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if not self._running:
+                    break
+                logger.warning(f"Pair discovery on {self.network} interrupted: {e}; retrying in {backoff:.0f}s")
+                self.stats['subscription_reconnects'] += 1
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 60.0)
+        await self.flush()
+
+    def stop(self) -> None:
+        """Stop run() after the current step."""
+        self._running = False
+
+    async def flush(self) -> None:
+        """Persist the cursor if live events moved it since the last save."""
+        if self._dirty:
+            await self._persist_cursor()
+
+    async def _follow_subscription(self) -> None:
+        """Subscribe to factory logs, close the gap with getLogs, then stream."""
+        async with websockets.connect(
+            self.ws_url, ping_interval=20, ping_timeout=10, close_timeout=10
+        ) as websocket:
+            await websocket.send(json.dumps({
+                'jsonrpc': '2.0',
+                'id': 1,
+                'method': 'eth_subscribe',
+                'params': ['logs', self.log_filter()],
+            }))
+            response = json.loads(await websocket.recv())
+            if 'result' not in response:
+                raise ConnectionError(f"Log subscription rejected: {response.get('error')}")
+            logger.info(f"Subscribed to pair creation logs on {self.network}")
+
+            # Logs arriving meanwhile are buffered by the connection and
+            # skipped below if the backfill already covered their block
+            await self.backfill()
+
+            try:
+                async for message in websocket:
+                    if not self._running:
+                        break
+                    await self.handle_subscription_message(json.loads(message))
+            finally:
+                await self.flush()
+
+    async def handle_subscription_message(self, message: Mapping[str, Any]) -> int:
+        """
+        Process one eth_subscription notification.
+
+        Args:
+            message: Decoded notification
+
+        Returns:
+            Number of pairs delivered (0 or 1)
+        """
+        log = message.get('params', {}).get('result')
+        if not isinstance(log, Mapping):
+            return 0
+        self.stats['logs_received'] += 1
+        if log.get('removed'):
+            # Reorged out; the replacement block's logs arrive separately
+            self.stats['removed_logs_skipped'] += 1
+            return 0
+
+        event = decode_pair_created_log(log, self.factories)
+        if event is None or (self._cursor is not None and event.block_number <= self._cursor):
+            return 0
+
+        return await self._deliver(event)
+
+    async def _deliver(self, event: PairCreatedEvent, persist: bool = True) -> int:
+        """
+        Hand an event to the handler unless it was already delivered, then
+        record it in the cursor.
+
+        Events must arrive in chain order, so every block before the
+        event's block is complete once it is reached. With persist, the
+        cursor is written if persist_interval has passed since the last
+        write; otherwise the caller persists it.
+        """
+        if event.key in self._seen or self._is_delivered(event):
+            self.stats['duplicates_skipped'] += 1
+            return 0
+        self._seen[event.key] = None
+        if len(self._seen) > self._seen_limit:
+            self._seen.popitem(last=False)
+
+        self.stats['pairs_discovered'] += 1
+        if self.handler is not None:
+            result = self.handler(event)
+            if asyncio.iscoroutine(result):
+                await result
+
+        self._advance_cursor(event.block_number - 1)
+        self._delivered.add(event.log_index)
+        self._dirty = True
+        if persist and time.monotonic() - self._last_persist >= self.persist_interval:
+            await self._persist_cursor()
+        return 1
+
+    def _is_delivered(self, event: PairCreatedEvent) -> bool:
+        """Whether the persisted cursor already covers an event."""
+        if self._cursor is None:
+            return False
+        if event.block_number <= self._cursor:
+            return True
+        return event.block_number == self._cursor + 1 and event.log_index in self._delivered
+
+    def _advance_cursor(self, block_number: int) -> None:
+        """Move the cursor forward (in memory)."""
+        if self._cursor is not None and block_number <= self._cursor:
+            return
+        self._cursor = block_number
+        self._delivered = set()
+        self._dirty = True
+
+    async def _persist_cursor(self) -> None:
+        """Write the cursor and the delivered log indexes to the store."""
+        self._dirty = False
+        self._last_persist = time.monotonic()
+        if self.cursor_store is not None and self._cursor is not None:
+            await self.cursor_store.save(self.network, self._cursor, self._delivered)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get discovery statistics."""
+        return {
+            **self.stats,
+            'network': self.network,
+            'cursor': self._cursor,
+            'chunk_size': self.chunk_size,
+            'factories': len(self.factories),
+            'mode': 'subscription' if self.ws_url else 'polling',
+        }
@@ -0,0 +1,286 @@
+"""
+Multi-Chain Scan Scheduler
+File: app/core/discovery/scan_scheduler.py
+
+Runs each chain's token scan as an independent task. Every chain has its
+own RPC token bucket and a polling interval derived from its block time,
+so a dozen chains with very different block rates (Arbitrum at 0.25s,
+Ethereum at 12s) are scanned side by side without one chain's backlog or
+slow RPC holding up the rest.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from app.core.blockchain.network_config import NetworkConfig
+from app.core.blockchain.rpc_budget import BudgetedChain, TokenBucket
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+DEFAULT_BLOCK_TIME = 12.0
+
+
+@dataclass
+class ChainScanStats:
+    """Per-chain scan progress and cost."""
+    network: str
+    block_time: float
+    confirmations: int = 0
+    interval: float = 0.0
+    scans: int = 0
+    errors: int = 0
+    consecutive_errors: int = 0
+    blocks_scanned: int = 0
+    tokens_found: int = 0
+    rpc_calls: int = 0
+    scan_seconds: float = 0.0
+    head_block: Optional[int] = None
+    last_scanned_block: Optional[int] = None
+    first_scan_at: Optional[float] = None
+    last_scan_at: Optional[float] = None
+    rpc_methods: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def lag_blocks(self) -> Optional[int]:
+        """Blocks between the chain head and the last scanned block."""
+        if self.head_block is None or self.last_scanned_block is None:
+            return None
+        return max(0, self.head_block - self.last_scanned_block)
+
+    @property
+    def blocks_per_second(self) -> float:
+        """Scan throughput since the first scan."""
+        if self.first_scan_at is None or self.last_scan_at is None:
+            return 0.0
+        elapsed = self.last_scan_at - self.first_scan_at
+        return self.blocks_scanned / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def rpc_calls_per_token(self) -> Optional[float]:
+        """RPC cost of each discovered token."""
+        return self.rpc_calls / self.tokens_found if self.tokens_found else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a stats dict."""
+        return {
+            'block_time': self.block_time,
+            'poll_interval': round(self.interval, 3),
+            'scans': self.scans,
+            'errors': self.errors,
+            'blocks_scanned': self.blocks_scanned,
+            'tokens_found': self.tokens_found,
+            'rpc_calls': self.rpc_calls,
+            'blocks_per_second': round(self.blocks_per_second, 3),
+            'lag_blocks': self.lag_blocks,
+            'rpc_calls_per_token': (
+                round(self.rpc_calls_per_token, 2) if self.rpc_calls_per_token is not None else None
+            ),
+            'average_scan_seconds': self.scan_seconds / self.scans if self.scans else 0.0,
+            'head_block': self.head_block,
+            'last_scanned_block': self.last_scanned_block,
+            'rpc_methods': dict(self.rpc_methods),
+        }
+
+
+class ChainScanScheduler:
+    """
+    Independent, rate-limited scan loops for many chains.
+
+    The scan callback does the actual work for one network and reports its
+    progress through record_scan(); the scheduler only decides when each
+    chain runs next:
+
+    - behind the head: run again immediately to catch up
+    - caught up: wait one block time
+    - no new block yet: wait half a block time (the next one is due)
+    - failing: back off exponentially
+    """
+
+    def __init__(
+        self,
+        scan_fn: Callable[[str], Awaitable[Any]],
+        default_rpc_rate: float = 10.0,
+        min_interval: float = 0.05,
+        max_error_backoff: float = 60.0,
+        budget_source: Optional[Callable[[str, float], TokenBucket]] = None
+    ):
+        """
+        Initialize scheduler.
+
+        Args:
+            scan_fn: Coroutine scanning one network
+            default_rpc_rate: RPC calls per second allowed per chain
+            min_interval: Shortest pause between scans of one chain
+            max_error_backoff: Longest pause after repeated failures
+            budget_source: Returns the network's shared RPC bucket given
+                (network, rate); the scheduler owns private buckets if None
+        """
+        self.scan_fn = scan_fn
+        self.default_rpc_rate = default_rpc_rate
+        self.budget_source = budget_source
+        self.min_interval = min_interval
+        self.max_error_backoff = max_error_backoff
+
+        self.chains: Dict[str, ChainScanStats] = {}
+        self.budgets: Dict[str, TokenBucket] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def register(
+        self,
+        network: str,
+        block_time: Optional[float] = None,
+        rpc_rate: Optional[float] = None,
+        confirmations: int = 0
+    ) -> ChainScanStats:
+        """
+        Register a network (idempotent).
+
+        Args:
+            network: Network name
+            block_time: Seconds per block (NetworkConfig value if None)
+            rpc_rate: RPC calls per second for this chain
+            confirmations: Blocks the scan intentionally stays behind the head
+
+        Returns:
+            The network's stats record
+        """
+        if network in self.chains:
+            return self.chains[network]
+
+        if block_time is None:
+            try:
+                block_time = float(NetworkConfig.get_network_config(network).get('block_time', DEFAULT_BLOCK_TIME))
+            except ValueError:
+                block_time = DEFAULT_BLOCK_TIME
+
+        stats = ChainScanStats(
+            network=network,
+            block_time=block_time,
+            confirmations=confirmations,
+            interval=block_time,
+        )
+        self.chains[network] = stats
+        rate = rpc_rate or self.default_rpc_rate
+        if self.budget_source is not None:
+            self.budgets[network] = self.budget_source(network, rate)
+        else:
+            self.budgets[network] = TokenBucket(rate)
+        return stats
+
+    def wrap(self, network: str, chain: Any) -> BudgetedChain:
+        """Route a chain's calls through the network's RPC budget."""
+        stats = self.register(network)
+
+        def count(method: str) -> None:
+            stats.rpc_calls += 1
+            stats.rpc_methods[method] = stats.rpc_methods.get(method, 0) + 1
+
+        return BudgetedChain(chain, self.budgets[network], on_call=count)
+
+    def record_scan(
+        self,
+        network: str,
+        head_block: int,
+        to_block: Optional[int],
+        blocks_scanned: int,
+        tokens_found: int,
+        duration: float
+    ) -> float:
+        """
+        Record a completed scan and compute the next polling interval.
+
+        Args:
+            network: Network name
+            head_block: Latest block seen during the scan
+            to_block: Last block covered (None if nothing new was scanned)
+            blocks_scanned: Blocks covered by this scan
+            tokens_found: Tokens discovered
+            duration: Scan wall time in seconds
+
+        Returns:
+            Seconds until the next scan
+        """
+        stats = self.register(network)
+        now = time.monotonic()
+        if stats.first_scan_at is None:
+            stats.first_scan_at = now - duration
+        stats.last_scan_at = now
+        stats.scans += 1
+        stats.consecutive_errors = 0
+        stats.blocks_scanned += blocks_scanned
+        stats.tokens_found += tokens_found
+        stats.scan_seconds += duration
+        stats.head_block = head_block
+        if to_block is not None:
+            stats.last_scanned_block = to_block
+
+        lag = stats.lag_blocks or 0
+        if lag > stats.confirmations:
+            stats.interval = self.min_interval
+        elif blocks_scanned > 0:
+            stats.interval = stats.block_time
+        else:
+            stats.interval = stats.block_time / 2
+        stats.interval = max(self.min_interval, stats.interval)
+        return stats.interval
+
+    def record_error(self, network: str) -> float:
+        """Record a failed scan; returns the backoff before the next attempt."""
+        stats = self.register(network)
+        stats.errors += 1
+        stats.consecutive_errors += 1
+        stats.interval = min(
+            self.max_error_backoff,
+            max(stats.block_time, 1.0) * (2 ** (stats.consecutive_errors - 1))
+        )
+        return stats.interval
+
+    @property
+    def is_running(self) -> bool:
+        """Whether any chain loop is active."""
+        return any(not task.done() for task in self._tasks.values())
+
+    def start(self, networks: Iterable[str]) -> None:
+        """Start a scan loop for each network not already running."""
+        for network in networks:
+            self.register(network)
+            task = self._tasks.get(network)
+            if task is None or task.done():
+                self._tasks[network] = asyncio.create_task(self._run_chain(network))
+        logger.info(f"Scan scheduler running for: {', '.join(sorted(self._tasks))}")
+
+    async def stop(self) -> None:
+        """Cancel every chain loop and wait for them to exit."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def _run_chain(self, network: str) -> None:
+        """Scan loop for one network."""
+        stats = self.chains[network]
+        while True:
+            try:
+                await self.scan_fn(network)
+                delay = stats.interval
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                delay = self.record_error(network)
+                logger.warning(f"Scheduled scan failed for {network}: {e}; next attempt in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-chain scan statistics including RPC budget usage."""
+        return {
+            network: {
+                **stats.to_dict(),
+                'running': network in self._tasks and not self._tasks[network].done(),
+                'rpc_budget': self.budgets[network].get_stats(),
+            }
+            for network, stats in self.chains.items()
+        }
@@ -16,9 +16,7 @@ import aiohttp
 
 from app.utils.logger import setup_logger
 from app.core.exceptions import TokenDiscoveryError, ValidationError
-from app.core.ai.risk_assessor import AIRiskAssessor
 from app.core.ai.honeypot_detector import HoneypotDetector
-from app.core.database import get_db_session
 
 logger = setup_logger(__name__, "application")
 
@@ -83,7 +81,7 @@ class TokenDiscovery:
         self.discovery_stats = DiscoveryStats()
         
         # AI components
-        self.risk_assessor: Optional[AIRiskAssessor] = None
+        self.risk_assessor: Optional[Any] = None  # AIRiskAssessor, loaded in initialize()
         self.honeypot_detector: Optional[HoneypotDetector] = None
         
         # Configuration
@@ -293,24 +291,17 @@ class TokenDiscovery:
             # Get DEX sources for this network
             dex_list = self.dex_sources.get(network, [])
             
-            for dex_name in dex_list:
-    async def _scan_network_for_new_tokens(self, network: str) -> List[Dict[str, Any]]:
-        """Scan network DEXs for new token pairs."""
-        new_tokens = []
-        
-        try:
-            # Get DEX sources for this network
-            dex_list = self.dex_sources.get(network, [])
+            # Scan every DEX concurrently; one slow source no longer delays the rest
+            dex_results = await asyncio.gather(
+                *(self._scan_dex_for_new_pairs(dex_name, network) for dex_name in dex_list),
+                return_exceptions=True
+            )
             
-            for dex_name in dex_list:
-                try:
-                    # Scan specific DEX for new pairs
-                    dex_tokens = await self._scan_dex_for_new_pairs(dex_name, network)
-                    new_tokens.extend(dex_tokens)
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to scan {dex_name} on {network}: {e}")
+            for dex_name, dex_tokens in zip(dex_list, dex_results):
+                if isinstance(dex_tokens, Exception):
+                    logger.warning(f"Failed to scan {dex_name} on {network}: {dex_tokens}")
                     continue
+                new_tokens.extend(dex_tokens)
             
             # Remove duplicates and return
             unique_tokens = self._deduplicate_tokens(new_tokens)
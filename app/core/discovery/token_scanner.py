@@ -3,6 +3,8 @@ File: app/core/discovery/token_scanner.py
 
 Core token discovery engine for scanning blockchain networks and finding new ERC-20 tokens.
 Integrates with performance infrastructure for optimal scanning and caching.
+Each chain is scanned independently under its own RPC budget and block-time
+driven polling interval (see scan_scheduler).
 """
 
 import asyncio
@@ -13,6 +15,7 @@ import time
 
 from app.core.blockchain.base_chain import BaseChain, TokenInfo
 from app.core.blockchain.multi_chain_manager import MultiChainManager
+from app.core.discovery.scan_scheduler import ChainScanScheduler
 from app.core.performance.cache_manager import cache_manager
 from app.core.performance.circuit_breaker import CircuitBreakerManager
 from app.utils.logger import setup_logger
@@ -31,7 +34,7 @@ class TokenScannerError(DexSnipingException):
 class ScanConfig:
     """Configuration for token scanning operations."""
     max_blocks_per_scan: int = 10
-    parallel_chains: int = 3
+    rpc_calls_per_second_per_chain: float = 10.0
     min_liquidity_usd: float = 1000.0
     cache_ttl_seconds: int = 300
     retry_attempts: int = 3
@@ -74,7 +77,8 @@ class TokenScanner:
     Advanced token discovery engine with performance optimization.
     
     Features:
-    - Multi-chain parallel scanning
+    - Multi-chain parallel scanning with per-chain RPC budgets
+    - Continuous per-chain scan loops paced by block time
     - Intelligent block range optimization
     - Performance caching with TTL
     - Circuit breaker protection
@@ -98,11 +102,18 @@ class TokenScanner:
         self.config = ScanConfig(
             max_blocks_per_scan=getattr(settings, 'max_blocks_per_scan', 10),
             min_liquidity_usd=getattr(settings, 'min_liquidity_usd_int', 1000),
-            cache_ttl_seconds=getattr(settings, 'cache_ttl_seconds', 300)
+            cache_ttl_seconds=getattr(settings, 'cache_ttl_seconds', 300),
+            rpc_calls_per_second_per_chain=getattr(settings, 'scan_rpc_calls_per_second', 10.0)
         )
         self.stats = DiscoveryStats()
         self._scanning = False
         self._last_scanned_blocks: Dict[str, int] = {}
+        self._network_locks: Dict[str, asyncio.Lock] = {}
+        self.scheduler = ChainScanScheduler(
+            self._scheduled_scan,
+            default_rpc_rate=self.config.rpc_calls_per_second_per_chain,
+            budget_source=getattr(multi_chain_manager, 'get_rpc_budget', None)
+        )
     
     async def scan_all_networks(
         self,
@@ -142,13 +153,13 @@ class TokenScanner:
             if not valid_networks:
                 raise TokenScannerError(f"No valid networks to scan from: {networks}")
             
-            # Parallel scanning with semaphore for resource management
-            semaphore = asyncio.Semaphore(self.config.parallel_chains)
+            # Every chain scans concurrently; RPC pressure is bounded per chain
+            # by its token bucket rather than by a global concurrency cap
             scan_tasks = []
             
             for network in valid_networks:
                 task = self._scan_network_with_protection(
-                    semaphore, network, block_offset, filters
+                    self._network_lock(network), network, block_offset, filters
                 )
                 scan_tasks.append(task)
             
@@ -221,14 +232,49 @@ class TokenScanner:
         Returns:
             ScanResult or None if scan failed
         """
-        semaphore = asyncio.Semaphore(1)  # Single network scan
         return await self._scan_network_with_protection(
-            semaphore, network, block_offset, filters
+            self._network_lock(network), network, block_offset, filters
+        )
+    
+    async def start_continuous_scanning(self, networks: Optional[List[str]] = None) -> None:
+        """
+        Start an independent scan loop for each network.
+        
+        Args:
+            networks: Networks to scan (all enabled networks if None)
+        """
+        enabled_networks = await self.multi_chain_manager.get_enabled_networks()
+        targets = [n for n in (networks or enabled_networks) if n in enabled_networks]
+        if not targets:
+            raise TokenScannerError(f"No valid networks to scan from: {networks}")
+        
+        for network in targets:
+            self.scheduler.register(network, confirmations=self.config.block_confirmation_delay)
+        self.scheduler.start(targets)
+    
+    async def stop_continuous_scanning(self) -> None:
+        """Stop all continuous scan loops."""
+        await self.scheduler.stop()
+    
+    async def _scheduled_scan(self, network: str) -> ScanResult:
+        """One scheduler tick for a network."""
+        result = await self._scan_network_with_protection(
+            self._network_lock(network), network, self.config.max_blocks_per_scan, None
         )
+        if result is None:
+            raise TokenScannerError(f"Scan failed for {network}")
+        return result
+    
+    def _network_lock(self, network: str) -> asyncio.Lock:
+        """Lock keeping scans of the same network from overlapping."""
+        lock = self._network_locks.get(network)
+        if lock is None:
+            lock = self._network_locks[network] = asyncio.Lock()
+        return lock
     
     async def _scan_network_with_protection(
         self,
-        semaphore: asyncio.Semaphore,
+        semaphore: asyncio.Lock,
         network: str,
         block_offset: int,
         filters: Optional[Dict[str, Any]]
@@ -237,7 +283,7 @@ class TokenScanner:
         Scan network with circuit breaker protection and resource limiting.
         
         Args:
-            semaphore: Asyncio semaphore for resource limiting
+            semaphore: Per-network lock serializing scans of one chain
             network: Network name
             block_offset: Block offset from latest
             filters: Filtering criteria
@@ -247,7 +293,7 @@ class TokenScanner:
         """
         async with semaphore:
             # Circuit breaker protection
-            breaker = self.circuit_breaker_manager.get_breaker(f"token_scan_{network}")
+            breaker = self.circuit_breaker_manager.get_circuit_breaker(f"token_scan_{network}")
             
             try:
                 return await breaker.call(
@@ -279,22 +325,35 @@ class TokenScanner:
         """
         start_time = time.time()
         
-        # Get chain instance
+        # Get chain instance, metered by this network's RPC budget
         chain = await self.multi_chain_manager.get_chain(network)
         if not chain:
             raise TokenScannerError(f"Chain {network} not available")
+        self.scheduler.register(network, confirmations=self.config.block_confirmation_delay)
+        chain = self.scheduler.wrap(network, chain)
         
-        # Determine scan range
+        # Determine scan range: continue after the last scanned block
         latest_block = await chain.get_latest_block_number()
-        from_block = max(
-            latest_block - block_offset,
-            self._last_scanned_blocks.get(network, latest_block - block_offset)
-        )
+        last_scanned = self._last_scanned_blocks.get(network)
+        from_block = latest_block - block_offset
+        if last_scanned is not None:
+            from_block = max(from_block, last_scanned + 1)
         to_block = latest_block - self.config.block_confirmation_delay  # Wait for confirmations
         
-        # Limit scan range
-        if to_block - from_block > self.config.max_blocks_per_scan:
-            from_block = to_block - self.config.max_blocks_per_scan
+        # Limit scan range; oldest blocks first so a lagging chain catches up
+        to_block = min(to_block, from_block + self.config.max_blocks_per_scan - 1)
+        
+        if to_block < from_block:
+            # No new confirmed blocks since the last scan
+            self.scheduler.record_scan(network, latest_block, None, 0, 0, time.time() - start_time)
+            return ScanResult(
+                network=network,
+                tokens_found=[],
+                blocks_scanned=0,
+                scan_duration_seconds=time.time() - start_time,
+                from_block=from_block,
+                to_block=to_block
+            )
         
         logger.info(f"Scanning {network} blocks {from_block} to {to_block}")
         
@@ -328,7 +387,7 @@ class TokenScanner:
         
         # Create result
         scan_duration = time.time() - start_time
-        blocks_scanned = max(1, to_block - from_block + 1)
+        blocks_scanned = to_block - from_block + 1
         
         result = ScanResult(
             network=network,
@@ -349,9 +408,9 @@ class TokenScanner:
                     "symbol": token.symbol,
                     "decimals": token.decimals,
                     "total_supply": token.total_supply,
-                    "verified": token.verified,
+                    "is_verified": token.is_verified,
                     "created_at": token.created_at,
-                    "creator": token.creator
+                    "creator_address": token.creator_address
                 }
                 for token in result.tokens_found
             ],
@@ -374,6 +433,9 @@ class TokenScanner:
         
         # Update stats
         self.stats.total_blocks_scanned += blocks_scanned
+        self.scheduler.record_scan(
+            network, latest_block, to_block, blocks_scanned, len(filtered_tokens), scan_duration
+        )
         
         return result
     
@@ -488,7 +550,7 @@ class TokenScanner:
                 return False
         
         # Verified contracts only filter
-        if filters.get('verified_only', False) and not token.verified:
+        if filters.get('verified_only', False) and not token.is_verified:
             return False
         
         return True
@@ -504,7 +566,7 @@ class TokenScanner:
         cache_stats = await cache_manager.get_stats()
         
         # Get circuit breaker stats
-        breaker_stats = await self.circuit_breaker_manager.get_all_stats()
+        breaker_stats = self.circuit_breaker_manager.get_all_states()
         discovery_breakers = {
             name: stats for name, stats in breaker_stats.items()
             if name.startswith('token_scan_')
@@ -540,11 +602,12 @@ class TokenScanner:
             "circuit_breakers": discovery_breakers,
             "configuration": {
                 "max_blocks_per_scan": self.config.max_blocks_per_scan,
-                "parallel_chains": self.config.parallel_chains,
+                "rpc_calls_per_second_per_chain": self.config.rpc_calls_per_second_per_chain,
                 "min_liquidity_usd": self.config.min_liquidity_usd,
                 "cache_ttl_seconds": self.config.cache_ttl_seconds
             },
-            "last_scanned_blocks": self._last_scanned_blocks.copy()
+            "last_scanned_blocks": self._last_scanned_blocks.copy(),
+            "chains": self.scheduler.get_stats()
         }
     
     async def health_check(self) -> Dict[str, Any]:
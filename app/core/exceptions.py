@@ -348,6 +348,11 @@ class DiscoveryError(DEXSniperError):
     pass
 
 
+class TokenDiscoveryError(DiscoveryError):
+    """Exception for token discovery service failures."""
+    pass
+
+
 class AnalysisError(DEXSniperError):
     """Exception for analysis processing errors."""
     pass
@@ -373,6 +378,21 @@ class IndicatorError(AnalysisError):
     pass
 
 
+class HoneypotDetectionError(AnalysisError):
+    """Exception for honeypot detection failures."""
+    pass
+
+
+class ContractAnalysisError(AnalysisError):
+    """Exception for contract analysis failures."""
+    pass
+
+
+class ModelError(AnalysisError):
+    """Exception for ML model loading, training or inference errors."""
+    pass
+
+
 # ==================== TOKEN AND CONTRACT EXCEPTIONS ====================
 
 class TokenError(DEXSniperError):
@@ -52,6 +52,7 @@ except ImportError:
     class PortfolioManager:
         def __init__(self): pass
 
+from app.core.integration.update_conflator import UpdateConflator
 from app.utils.logger import setup_logger
 from app.utils.exceptions import DexSnipingException
 
@@ -89,6 +90,7 @@ class LiveDashboardUpdate:
     change_magnitude: float = 0.0
     affected_metrics: List[str] = field(default_factory=list)
     source_component: Optional[str] = None
+    entity: Optional[str] = None
     update_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     requires_acknowledgment: bool = False
     
@@ -102,6 +104,7 @@ class LiveDashboardUpdate:
             'change_magnitude': self.change_magnitude,
             'affected_metrics': self.affected_metrics,
             'source_component': self.source_component,
+            'entity': self.entity,
             'update_id': self.update_id,
             'requires_acknowledgment': self.requires_acknowledgment
         }
@@ -442,7 +445,15 @@ class LiveDashboardService:
             },
             'max_history_length': 1440,   # 24 hours of minute data
             'performance_window': 100,     # Performance metrics window
-            'batch_update_size': 10        # Batch size for bulk updates
+            'batch_update_size': 10,       # Batch size for bulk updates
+            'conflation': {
+                'enabled': True,
+                # Snapshot-style topics where only the newest value matters
+                'update_types': ['portfolio_update', 'system_health', 'predictive_insights'],
+                'max_updates_per_second': 4.0,   # Per (topic, entity) key, shared by all dashboard clients
+                'send_deltas': False,
+                'delta_keyframe_interval': 20
+            }
         }
         
         # Enhanced metrics tracking
@@ -478,6 +489,15 @@ class LiveDashboardService:
             'low': asyncio.Queue(maxsize=1000)
         }
         
+        # Latest-value conflation for snapshot topics
+        conflation_config = self.config['conflation']
+        self.conflator = UpdateConflator(
+            max_rate_per_second=conflation_config['max_updates_per_second'],
+            send_deltas=conflation_config['send_deltas'],
+            keyframe_interval=conflation_config['delta_keyframe_interval']
+        )
+        self._conflation_wakeup = asyncio.Event()
+        
         # Performance tracking
         self.performance_stats = {
             'updates_sent': 0,
@@ -538,6 +558,7 @@ class LiveDashboardService:
                 asyncio.create_task(self._system_health_monitor_loop()),
                 asyncio.create_task(self._performance_monitor_loop()),
                 asyncio.create_task(self._update_queue_processor()),
+                asyncio.create_task(self._conflation_flusher()),
                 asyncio.create_task(self._data_change_detector()),
                 asyncio.create_task(self._analytics_engine_loop())
             ]
@@ -577,6 +598,7 @@ class LiveDashboardService:
                     logger.warning("Some background tasks didn't finish within timeout")
             
             # Clear queues
+            self.conflator.reset()
             for queue in self.update_queues.values():
                 while not queue.empty():
                     try:
@@ -696,7 +718,8 @@ class LiveDashboardService:
                 priority=priority.name.lower(),
                 change_magnitude=change_magnitude,
                 affected_metrics=['portfolio_value', 'pnl', 'risk_score'],
-                source_component='portfolio_manager'
+                source_component='portfolio_manager',
+                entity=self._snapshot_entity(portfolio_data, 'portfolio')
             )
             
             # Queue for processing
@@ -745,7 +768,8 @@ class LiveDashboardService:
                 timestamp=datetime.utcnow(),
                 data=update_data,
                 priority=priority.name.lower(),
-                source_component='system_monitor'
+                source_component='system_monitor',
+                entity=self._snapshot_entity(system_data, 'system')
             )
             
             await self._queue_update(update, priority)
@@ -916,6 +940,44 @@ class LiveDashboardService:
                 logger.error(f"Error in update queue processor: {e}")
                 await asyncio.sleep(1.0)
     
+    async def _conflation_flusher(self) -> None:
+        """Flush conflated updates as their per-key rate limit allows."""
+        while self.is_running:
+            try:
+                self._conflation_wakeup.clear()
+                await self.flush_conflated_updates()
+                
+                deadline = self.conflator.next_due()
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    await asyncio.wait_for(self._conflation_wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                
+            except Exception as e:
+                logger.error(f"Error in conflation flusher: {e}")
+                await asyncio.sleep(1.0)
+    
+    async def flush_conflated_updates(self, now: Optional[float] = None) -> int:
+        """
+        Move due conflated updates onto the priority queues.
+        
+        Args:
+            now: Monotonic time to evaluate rate limits against
+            
+        Returns:
+            Number of updates queued
+        """
+        queued = 0
+        for key, update, priority in self.conflator.pop_due(now):
+            payload = self.conflator.encode(key, update.data)
+            if payload is None:
+                continue  # Delta mode: only volatile fields changed since the last send
+            update.data = payload
+            await self._enqueue_update(update, UpdatePriority(priority))
+            queued += 1
+        return queued
+    
     async def _data_change_detector(self) -> None:
         """Monitor data changes and trigger updates accordingly."""
         while self.is_running:
@@ -976,7 +1038,52 @@ class LiveDashboardService:
     
     # Enhanced helper methods
     async def _queue_update(self, update: LiveDashboardUpdate, priority: UpdatePriority) -> None:
-        """Queue update for processing based on priority."""
+        """
+        Queue update for processing based on priority.
+        
+        Snapshot topics listed in config['conflation']['update_types'] go
+        through the conflator, so a burst of updates for the same
+        (topic, entity) collapses to the newest one.
+        """
+        conflation_config = self.config['conflation']
+        if conflation_config['enabled'] and update.update_type in conflation_config['update_types']:
+            self.conflator.offer((update.update_type, update.entity), update, priority.value)
+            self._conflation_wakeup.set()
+            return
+        
+        await self._enqueue_update(update, priority)
+    
+    @staticmethod
+    def _snapshot_entity(data: Dict[str, Any], default: str) -> str:
+        """
+        Conflation entity for a snapshot: the wallet, portfolio or component
+        it describes, so snapshots of different entities never replace
+        each other.
+        """
+        for field_name in ('wallet_address', 'portfolio_id', 'component'):
+            value = data.get(field_name)
+            if value:
+                return str(value)
+        return default
+    
+    def get_latest_snapshot(self, update_type: str, entity: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get the last full snapshot flushed for a conflated topic.
+        
+        Subscribers that join after a snapshot went out use this to
+        resynchronise instead of waiting for the next change.
+        
+        Args:
+            update_type: Conflated topic (e.g. 'portfolio_update')
+            entity: Entity the snapshot describes
+            
+        Returns:
+            Snapshot data, or None if nothing was sent yet
+        """
+        return self.conflator.last_snapshot((update_type, entity))
+    
+    async def _enqueue_update(self, update: LiveDashboardUpdate, priority: UpdatePriority) -> None:
+        """Put an update on its priority queue."""
         try:
             queue_name = priority.name.lower()
             queue = self.update_queues[queue_name]
@@ -1358,7 +1465,8 @@ class LiveDashboardService:
             timestamp=datetime.utcnow(),
             data=data,
             priority='normal',
-            source_component='analytics_engine'
+            source_component='analytics_engine',
+            entity=self._snapshot_entity(data, 'analytics')
         )
         await self._queue_update(update, UpdatePriority.NORMAL)
     
@@ -1427,6 +1535,7 @@ class LiveDashboardService:
                 (self.performance_stats['cache_hits'] + self.performance_stats['cache_misses'])
             ) if (self.performance_stats['cache_hits'] + self.performance_stats['cache_misses']) > 0 else 0,
             'queue_sizes': {name: queue.qsize() for name, queue in self.update_queues.items()},
+            'conflation': self.conflator.get_stats(),
             'current_metrics': {
                 'portfolio': self.portfolio_metrics.to_dict(),
                 'trading': self.trading_metrics.to_dict(),
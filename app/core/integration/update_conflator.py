@@ -0,0 +1,234 @@
+"""
+Dashboard Update Conflator
+File: app/core/integration/update_conflator.py
+
+Latest-value conflation for high-frequency dashboard topics. Pending
+updates are keyed by (topic, entity); a newer update replaces the pending
+one instead of queueing behind it, each key is flushed at most
+`max_rate_per_second` times, and payloads can be sent as deltas against
+the last snapshot that actually went out.
+"""
+
+import time
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+# Sentinel distinguishing "key absent" from a stored None
+_ABSENT = object()
+
+
+def compute_json_delta(
+    previous: Dict[str, Any],
+    current: Dict[str, Any],
+    ignore_keys: Sequence[str] = ()
+) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Diff two JSON-like dicts.
+
+    Nested dicts are diffed recursively; any other value (including
+    lists) is replaced wholesale when it differs.
+
+    Args:
+        previous: Last-sent snapshot
+        current: New snapshot
+        ignore_keys: Top-level keys excluded from the diff (e.g. timestamps)
+
+    Returns:
+        Tuple of (changed values, removed dotted key paths)
+    """
+    changes: Dict[str, Any] = {}
+    removed: List[str] = []
+    _diff_into(previous, current, changes, removed, '', frozenset(ignore_keys))
+    return changes, removed
+
+
+def _diff_into(previous, current, changes, removed, prefix, ignore) -> None:
+    for key, value in current.items():
+        if key in ignore:
+            continue
+        old = previous.get(key, _ABSENT)
+        if old is _ABSENT:
+            changes[key] = value
+        elif isinstance(value, dict) and isinstance(old, dict):
+            nested_changes: Dict[str, Any] = {}
+            _diff_into(old, value, nested_changes, removed, f"{prefix}{key}.", frozenset())
+            if nested_changes:
+                changes[key] = nested_changes
+        elif old != value:
+            changes[key] = value
+
+    for key in previous:
+        if key not in current and key not in ignore:
+            removed.append(f"{prefix}{key}")
+
+
+class _PendingUpdate:
+    """Newest pending update for one conflation key."""
+
+    __slots__ = ('item', 'priority', 'superseded')
+
+    def __init__(self, item: Any, priority: int):
+        self.item = item
+        self.priority = priority
+        self.superseded = 0
+
+
+class UpdateConflator:
+    """
+    Keep-latest buffer with a per-key flush rate limit.
+
+    Priorities are ints where lower is more urgent; a pending update keeps
+    the most urgent priority of everything it superseded.
+    """
+
+    def __init__(
+        self,
+        max_rate_per_second: float = 4.0,
+        send_deltas: bool = False,
+        keyframe_interval: int = 20,
+        volatile_keys: Sequence[str] = ('timestamp',)
+    ):
+        """
+        Initialize conflator.
+
+        Args:
+            max_rate_per_second: Maximum flushes per key per second
+            send_deltas: Encode payloads as deltas against the last-sent snapshot
+            keyframe_interval: Send a full snapshot every N flushes per key so
+                late subscribers can resynchronise
+            volatile_keys: Top-level keys ignored when deciding whether
+                anything changed
+        """
+        self.min_interval = 1.0 / max_rate_per_second if max_rate_per_second > 0 else 0.0
+        self.send_deltas = send_deltas
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.volatile_keys = tuple(volatile_keys)
+
+        self._pending: Dict[Hashable, _PendingUpdate] = {}
+        self._next_allowed: Dict[Hashable, float] = {}
+        self._last_sent: Dict[Hashable, Dict[str, Any]] = {}
+        self._sequence: Dict[Hashable, int] = {}
+
+        self.offered = 0
+        self.superseded = 0
+        self.flushed = 0
+        self.deltas_sent = 0
+        self.unchanged_suppressed = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def offer(self, key: Hashable, item: Any, priority: int) -> bool:
+        """
+        Buffer an update, replacing any pending update for the same key.
+
+        Args:
+            key: (topic, entity) conflation key
+            item: Update object
+            priority: Priority level (lower is more urgent)
+
+        Returns:
+            True if a pending update was superseded
+        """
+        self.offered += 1
+        pending = self._pending.get(key)
+        if pending is None:
+            self._pending[key] = _PendingUpdate(item, priority)
+            return False
+
+        pending.item = item
+        pending.priority = min(pending.priority, priority)
+        pending.superseded += 1
+        self.superseded += 1
+        return True
+
+    def next_due(self) -> Optional[float]:
+        """Monotonic time at which the earliest pending key may flush, or None."""
+        if not self._pending:
+            return None
+        return min(self._next_allowed.get(key, 0.0) for key in self._pending)
+
+    def pop_due(self, now: Optional[float] = None) -> List[Tuple[Hashable, Any, int]]:
+        """
+        Take every pending update whose key is outside its rate-limit window.
+
+        Args:
+            now: Current monotonic time (defaults to time.monotonic())
+
+        Returns:
+            List of (key, update, priority)
+        """
+        now = time.monotonic() if now is None else now
+        due = []
+        for key, pending in list(self._pending.items()):
+            if self._next_allowed.get(key, 0.0) <= now:
+                del self._pending[key]
+                self._next_allowed[key] = now + self.min_interval
+                due.append((key, pending.item, pending.priority))
+        self.flushed += len(due)
+        return due
+
+    def encode(self, key: Hashable, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Prepare the outgoing payload for a key and record it as last sent.
+
+        Args:
+            key: Conflation key
+            data: Full snapshot
+
+        Returns:
+            The full snapshot, a delta envelope, or None in delta mode if
+            nothing but volatile keys changed since the last send. Without
+            deltas every snapshot is sent, so each one is self-contained
+            for clients that joined in between.
+        """
+        previous = self._last_sent.get(key)
+        changes, removed = None, None
+        if previous is not None and self.send_deltas:
+            changes, removed = compute_json_delta(previous, data, self.volatile_keys)
+            if not changes and not removed:
+                self.unchanged_suppressed += 1
+                return None
+
+        sequence = self._sequence.get(key, 0) + 1
+        self._sequence[key] = sequence
+        self._last_sent[key] = data
+
+        if not self.send_deltas:
+            return data
+
+        if previous is None or sequence % self.keyframe_interval == 0:
+            return {'delta': False, 'sequence': sequence, 'snapshot': data}
+
+        self.deltas_sent += 1
+        volatile = {k: data[k] for k in self.volatile_keys if k in data}
+        return {
+            'delta': True,
+            'sequence': sequence,
+            'base_sequence': sequence - 1,
+            'changes': {**changes, **volatile},
+            'removed': removed,
+        }
+
+    def last_snapshot(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """Get the last full snapshot sent for a key (for resyncing new subscribers)."""
+        return self._last_sent.get(key)
+
+    def reset(self) -> None:
+        """Drop pending updates and last-sent snapshots."""
+        self._pending.clear()
+        self._next_allowed.clear()
+        self._last_sent.clear()
+        self._sequence.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get conflation counters."""
+        return {
+            'pending': len(self._pending),
+            'offered': self.offered,
+            'superseded': self.superseded,
+            'flushed': self.flushed,
+            'deltas_sent': self.deltas_sent,
+            'unchanged_suppressed': self.unchanged_suppressed,
+            'max_rate_per_second': 1.0 / self.min_interval if self.min_interval else None,
+            'send_deltas': self.send_deltas,
+        }
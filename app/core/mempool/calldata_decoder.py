@@ -0,0 +1,308 @@
+"""
+File: app/core/mempool/calldata_decoder.py
+
+Selector-keyed calldata decoders for liquidity transactions.
+Decodes addLiquidity, addLiquidityETH, V3 mint/increaseLiquidity and
+createPair calldata without ABI round trips, and derives pair/pool
+addresses locally via CREATE2 so no RPC call is needed to find them.
+"""
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from eth_utils import keccak, to_checksum_address
+
+
+# Canonical signatures with parameter names. Tuple arguments made only of
+# static types are ABI-encoded inline, so they are flattened here.
+LIQUIDITY_FUNCTIONS: Dict[str, Tuple[str, List[Tuple[str, str]]]] = {
+    'addLiquidity': (
+        'addLiquidity(address,address,uint256,uint256,uint256,uint256,address,uint256)',
+        [('tokenA', 'address'), ('tokenB', 'address'),
+         ('amountADesired', 'uint256'), ('amountBDesired', 'uint256'),
+         ('amountAMin', 'uint256'), ('amountBMin', 'uint256'),
+         ('to', 'address'), ('deadline', 'uint256')]
+    ),
+    'addLiquidityETH': (
+        'addLiquidityETH(address,uint256,uint256,uint256,address,uint256)',
+        [('token', 'address'), ('amountTokenDesired', 'uint256'),
+         ('amountTokenMin', 'uint256'), ('amountETHMin', 'uint256'),
+         ('to', 'address'), ('deadline', 'uint256')]
+    ),
+    'mint': (
+        'mint((address,address,uint24,int24,int24,uint256,uint256,uint256,uint256,address,uint256))',
+        [('token0', 'address'), ('token1', 'address'), ('fee', 'uint24'),
+         ('tickLower', 'int24'), ('tickUpper', 'int24'),
+         ('amount0Desired', 'uint256'), ('amount1Desired', 'uint256'),
+         ('amount0Min', 'uint256'), ('amount1Min', 'uint256'),
+         ('recipient', 'address'), ('deadline', 'uint256')]
+    ),
+    'increaseLiquidity': (
+        'increaseLiquidity((uint256,uint256,uint256,uint256,uint256,uint256))',
+        [('tokenId', 'uint256'), ('amount0Desired', 'uint256'),
+         ('amount1Desired', 'uint256'), ('amount0Min', 'uint256'),
+         ('amount1Min', 'uint256'), ('deadline', 'uint256')]
+    ),
+    'createPair': (
+        'createPair(address,address)',
+        [('tokenA', 'address'), ('tokenB', 'address')]
+    ),
+}
+
+# Pair factories per network: dex -> (factory, init code hash, kind).
+# DEXes without an entry resolve to an empty pair address.
+PAIR_FACTORIES: Dict[str, Dict[str, Tuple[str, str, str]]] = {
+    'ethereum': {
+        'uniswap_v2': (
+            '0x5C69bEe701ef814a2B6a3EDD4B1652CB9cc5aA6f',
+            '0x96e8ac4277198ff8b6f785478aa9a39f403cb768dd02cbee326c3e7da348845f',
+            'v2'
+        ),
+        'uniswap_v3': (
+            '0x1F98431c8aD98523631AE4a59f267346ea31F984',
+            '0xe34f199b19b2b4f47f68442619d555527d244f78a3297ea89325f843f87b8b54',
+            'v3'
+        ),
+    },
+    'polygon': {
+        'quickswap': (
+            '0x5757371414417b8C6CAad45bAeF941aBc7d3Ab32',
+            '0x96e8ac4277198ff8b6f785478aa9a39f403cb768dd02cbee326c3e7da348845f',
+            'v2'
+        ),
+        'uniswap_v3': (
+            '0x1F98431c8aD98523631AE4a59f267346ea31F984',
+            '0xe34f199b19b2b4f47f68442619d555527d244f78a3297ea89325f843f87b8b54',
+            'v3'
+        ),
+    },
+    'bsc': {
+        'pancakeswap': (
+            '0xcA143Ce32Fe78f1f7019d7d551a6402fC5350c73',
+            '0x00fb7f630766e6a796048ea87d01acd3068e8ff67d078148a3fa3f4a84f69bd5',
+            'v2'
+        ),
+    },
+}
+
+# Wrapped native token per network (the counterpart of addLiquidityETH)
+WRAPPED_NATIVE: Dict[str, str] = {
+    'ethereum': '0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2',
+    'polygon': '0x0d500B1d8E8eF31E21C99d1Db9A6444d3ADf1270',
+    'bsc': '0xbb4CdB9CBd36B01bD1cBaEBF2De08d9173bc095c',
+}
+
+MINIMUM_LIQUIDITY = 1000
+_WORD = 32
+
+# Word converters resolved at compile time
+_ADDRESS, _SIGNED, _UNSIGNED = 0, 1, 2
+
+
+@dataclass
+class DecodedCall:
+    """Fully decoded liquidity call."""
+    function_name: str
+    selector: int
+    args: Dict[str, Any] = field(default_factory=dict)
+
+
+class CompiledDecoder:
+    """
+    Decoder for one function whose arguments are all static words.
+
+    Argument offsets and converters are resolved once; decoding is one
+    bytes.fromhex plus a slice per argument.
+    """
+
+    __slots__ = ('function_name', 'signature', 'selector', 'fields', 'min_length')
+
+    def __init__(self, function_name: str, signature: str, params: List[Tuple[str, str]]):
+        """
+        Compile decoder.
+
+        Args:
+            function_name: Short function name
+            signature: Canonical signature used for the selector
+            params: Ordered (name, abi type) pairs of static arguments
+        """
+        self.function_name = function_name
+        self.signature = signature
+        self.selector = int.from_bytes(keccak(text=signature)[:4], 'big')
+        self.fields = tuple(
+            (name, _ADDRESS if abi_type == 'address' else _SIGNED if abi_type.startswith('int') else _UNSIGNED, i * _WORD)
+            for i, (name, abi_type) in enumerate(params)
+        )
+        self.min_length = len(params) * _WORD
+
+    def decode(self, input_data: str) -> Optional[DecodedCall]:
+        """
+        Decode 0x-prefixed calldata.
+
+        Args:
+            input_data: Transaction input including the selector
+
+        Returns:
+            DecodedCall, or None if calldata is too short or malformed
+        """
+        try:
+            raw = bytes.fromhex(input_data[10:])
+        except ValueError:
+            return None
+        if len(raw) < self.min_length:
+            return None
+
+        args: Dict[str, Any] = {}
+        for name, kind, offset in self.fields:
+            if kind == _ADDRESS:
+                args[name] = '0x' + raw[offset + 12:offset + _WORD].hex()
+            elif kind == _SIGNED:
+                args[name] = int.from_bytes(raw[offset:offset + _WORD], 'big', signed=True)
+            else:
+                args[name] = int.from_bytes(raw[offset:offset + _WORD], 'big')
+
+        return DecodedCall(self.function_name, self.selector, args)
+
+
+class DecoderRegistry:
+    """Compiled decoders keyed by 4-byte selector int."""
+
+    def __init__(self, functions: Dict[str, Tuple[str, List[Tuple[str, str]]]] = LIQUIDITY_FUNCTIONS):
+        """
+        Compile all decoders.
+
+        Args:
+            functions: Mapping of name -> (signature, params)
+        """
+        self.decoders: Dict[int, CompiledDecoder] = {}
+        for name, (signature, params) in functions.items():
+            decoder = CompiledDecoder(name, signature, params)
+            self.decoders[decoder.selector] = decoder
+
+    @property
+    def signatures(self) -> Dict[str, str]:
+        """Function name -> 0x selector, in the format MempoolScanner uses."""
+        return {d.function_name: f"0x{d.selector:08x}" for d in self.decoders.values()}
+
+    def decode(self, input_data: str) -> Optional[DecodedCall]:
+        """
+        Decode calldata with the decoder registered for its selector.
+
+        Args:
+            input_data: 0x-prefixed calldata
+
+        Returns:
+            DecodedCall, or None if the selector is unknown or decoding fails
+        """
+        if not input_data or len(input_data) < 10:
+            return None
+        try:
+            selector = int(input_data[2:10], 16)
+        except ValueError:
+            return None
+
+        decoder = self.decoders.get(selector)
+        return decoder.decode(input_data) if decoder else None
+
+
+@lru_cache(maxsize=1)
+def get_decoder_registry() -> DecoderRegistry:
+    """Get the process-wide compiled decoder registry."""
+    return DecoderRegistry()
+
+
+def sort_tokens(token_a: str, token_b: str) -> Tuple[str, str]:
+    """Sort two token addresses the way Uniswap factories do."""
+    a, b = token_a.lower(), token_b.lower()
+    return (a, b) if a < b else (b, a)
+
+
+@lru_cache(maxsize=65536)
+def compute_v2_pair_address(factory: str, token_a: str, token_b: str, init_code_hash: str) -> str:
+    """
+    Compute a Uniswap V2-style pair address via CREATE2.
+
+    Args:
+        factory: Factory address
+        token_a: Either token of the pair
+        token_b: The other token
+        init_code_hash: Pair contract init code hash
+
+    Returns:
+        Checksummed pair address
+    """
+    token0, token1 = sort_tokens(token_a, token_b)
+    salt = keccak(bytes.fromhex(token0[2:]) + bytes.fromhex(token1[2:]))
+    return _create2_address(factory, salt, init_code_hash)
+
+
+@lru_cache(maxsize=65536)
+def compute_v3_pool_address(factory: str, token_a: str, token_b: str, fee: int, init_code_hash: str) -> str:
+    """
+    Compute a Uniswap V3 pool address via CREATE2.
+
+    Args:
+        factory: V3 factory address
+        token_a: Either token of the pool
+        token_b: The other token
+        fee: Fee tier in hundredths of a bip
+        init_code_hash: Pool init code hash
+
+    Returns:
+        Checksummed pool address
+    """
+    token0, token1 = sort_tokens(token_a, token_b)
+    salt = keccak(
+        bytes(12) + bytes.fromhex(token0[2:]) +
+        bytes(12) + bytes.fromhex(token1[2:]) +
+        fee.to_bytes(_WORD, 'big')
+    )
+    return _create2_address(factory, salt, init_code_hash)
+
+
+def _create2_address(deployer: str, salt: bytes, init_code_hash: str) -> str:
+    """Derive a CREATE2 address from deployer, salt and init code hash."""
+    digest = keccak(b'\xff' + bytes.fromhex(deployer[2:]) + salt + bytes.fromhex(init_code_hash[2:]))
+    return to_checksum_address(digest[12:])
+
+
+def estimate_initial_liquidity(amount0: int, amount1: int) -> int:
+    """
+    Liquidity minted by the first deposit into a V2 pair.
+
+    Args:
+        amount0: Deposit of token0
+        amount1: Deposit of token1
+
+    Returns:
+        sqrt(amount0 * amount1) - MINIMUM_LIQUIDITY, floored at zero
+    """
+    from math import isqrt
+    return max(0, isqrt(amount0 * amount1) - MINIMUM_LIQUIDITY)
+
+
+def resolve_pair_address(network: str, dex: str, token_a: str, token_b: str, fee: Optional[int] = None) -> str:
+    """
+    Resolve a pair/pool address locally for a DEX on a network.
+
+    Args:
+        network: Network name
+        dex: DEX name as produced by MempoolScanner._identify_dex
+        token_a: Either token
+        token_b: The other token
+        fee: V3 fee tier (required for V3 pools)
+
+    Returns:
+        Checksummed address, or '' if the DEX factory is not configured
+    """
+    factory_info = PAIR_FACTORIES.get(network, {}).get(dex)
+    if not factory_info:
+        return ''
+
+    factory, init_code_hash, kind = factory_info
+    if kind == 'v3':
+        if fee is None:
+            return ''
+        return compute_v3_pool_address(factory, token_a.lower(), token_b.lower(), fee, init_code_hash)
+    return compute_v2_pair_address(factory, token_a.lower(), token_b.lower(), init_code_hash)
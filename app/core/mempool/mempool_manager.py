@@ -7,13 +7,16 @@ Implements strategic partnerships and community features.
 """
 
 import asyncio
-from typing import Dict, List, Optional, Set, Any, Callable
+from typing import Dict, List, Optional, Set, Any, Callable, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 import json
 
 from app.core.mempool.mempool_scanner import MempoolScanner, LiquidityAddEvent
 from app.core.sniping.block_zero_sniper import BlockZeroSniper, SnipeResult
+from app.core.blockchain import network_manager as shared_network
+from app.core.blockchain.chain_state import ChainStateCache
+from app.core.blockchain.confirmation_tracker import ConfirmationTracker
 from app.core.blockchain.multi_chain_manager import MultiChainManager
 from app.core.performance.cache_manager import cache_manager
 from app.core.performance.circuit_breaker import CircuitBreakerManager
@@ -146,6 +149,7 @@ class MempoolManager:
         # State management
         self._running = False
         self._shutdown = False
+        self._prepare_tasks: Set[asyncio.Task] = set()
         
         logger.info("MempoolManager initialized with multi-chain coordination")
     
@@ -399,8 +403,13 @@ class MempoolManager:
                 logger.warning(f"No trading private key configured for {network}")
                 return
             
-            # Create sniper instance
-            sniper = BlockZeroSniper(network, chain.w3, private_key)
+            # Create sniper instance on the network's shared head-driven state
+            chain_state, confirmation_tracker = await self._shared_chain_services(network)
+            sniper = BlockZeroSniper(
+                network, chain.w3, private_key,
+                chain_state=chain_state,
+                confirmation_tracker=confirmation_tracker
+            )
             self.block_zero_snipers[network] = sniper
             self.global_stats.active_snipers += 1
             
@@ -409,6 +418,42 @@ class MempoolManager:
         except Exception as e:
             logger.error(f"Failed to initialize sniper for {network}: {e}")
     
+    async def _shared_chain_services(
+        self,
+        network: str
+    ) -> Tuple[Optional[ChainStateCache], Optional[ConfirmationTracker]]:
+        """
+        Get the enhanced network manager's chain state and confirmation tracker.
+        
+        Without them the sniper falls back to reading the latest block and
+        polling receipts per snipe.
+        
+        Args:
+            network: Network name
+            
+        Returns:
+            (chain_state, confirmation_tracker), either None if unavailable
+        """
+        try:
+            network_type = shared_network.NetworkType(network)
+        except ValueError:
+            return None, None
+        
+        manager = shared_network.get_network_manager()
+        try:
+            chain_state = await manager.get_chain_state(network_type)
+        except Exception as e:
+            logger.warning(f"Shared chain state unavailable for {network}, sniper will poll: {e}")
+            return None, None
+        
+        try:
+            confirmation_tracker = await manager.get_confirmation_tracker(network_type)
+        except Exception as e:
+            logger.warning(f"Confirmation tracker unavailable for {network}, sniper will poll: {e}")
+            confirmation_tracker = None
+        
+        return chain_state, confirmation_tracker
+    
     async def _start_global_coordination(self) -> None:
         """Start global coordination and monitoring tasks."""
         try:
@@ -466,7 +511,20 @@ class MempoolManager:
             liquidity_event: Detected liquidity addition event
         """
         try:
-            network = liquidity_event.pending_tx.transaction_hash[:2]  # Simplified network detection
+            network = self._get_network_from_event(liquidity_event)
+            
+            # Pre-sign snipe transactions in the background while the launch is still pending
+            sniper = self.block_zero_snipers.get(network)
+            if (
+                sniper is not None
+                and sniper.config.use_hot_path
+                and getattr(settings, 'enable_auto_sniping', False)
+            ):
+                task = asyncio.create_task(sniper.prepare_snipe(
+                    liquidity_event, getattr(settings, 'auto_snipe_eth_amount', 0.05)
+                ))
+                self._prepare_tasks.add(task)
+                task.add_done_callback(self._prepare_tasks.discard)
             
             logger.info(
                 f"[START] NEW TOKEN DETECTED: {liquidity_event.token_address} "
@@ -928,6 +986,9 @@ class MempoolManager:
         for scanner in self.mempool_scanners.values():
             await scanner.stop_scanning()
         
+        for task in list(self._prepare_tasks):
+            task.cancel()
+        
         # Clear all connections
         self.mempool_scanners.clear()
         self.block_zero_snipers.clear()
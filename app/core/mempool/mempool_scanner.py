@@ -14,12 +14,21 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from decimal import Decimal
 import websockets
-from web3 import Web3
+from eth_utils import to_checksum_address
 from web3.middleware import geth_poa_middleware
-from eth_abi import decode_abi
 import re
 
 from app.core.blockchain.base_chain import BaseChain
+from app.core.mempool.tx_prefilter import MempoolPrefilter
+from app.core.mempool.tx_dedup import SeenHashSet, extract_tx_hash
+from app.core.mempool.message_pipeline import BackpressurePolicy, MempoolMessagePipeline, RawFrame
+from app.core.mempool.calldata_decoder import (
+    WRAPPED_NATIVE,
+    DecodedCall,
+    estimate_initial_liquidity,
+    get_decoder_registry,
+    resolve_pair_address,
+)
 from app.core.performance.cache_manager import cache_manager
 from app.core.performance.circuit_breaker import CircuitBreakerManager
 from app.utils.logger import setup_logger
@@ -46,6 +55,7 @@ class PendingTransaction:
     input_data: str
     timestamp: float
     block_number: Optional[int] = None
+    function_name: Optional[str] = None
     
     @property
     def gas_price_gwei(self) -> float:
@@ -66,6 +76,8 @@ class LiquidityAddEvent:
     liquidity: int
     pending_tx: PendingTransaction
     detected_at: float = field(default_factory=time.time)
+    fee: Optional[int] = None
+    call_args: Dict[str, Any] = field(default_factory=dict)
     
     @property
     def is_new_token(self) -> bool:
@@ -90,6 +102,7 @@ class LiquidityAddEvent:
 class MempoolStats:
     """Statistics for mempool scanning operations."""
     total_transactions_scanned: int = 0
+    transactions_prefiltered: int = 0
     liquidity_adds_detected: int = 0
     new_tokens_detected: int = 0
     snipe_opportunities: int = 0
@@ -140,8 +153,30 @@ class MempoolScanner:
         self.min_liquidity_value = getattr(settings, 'min_liquidity_usd_int', 1000)
         
         # DEX contract addresses and function signatures
+        self.decoder_registry = get_decoder_registry()
+        self.wrapped_native = WRAPPED_NATIVE.get(network, WRAPPED_NATIVE['ethereum'])
         self.dex_contracts = self._load_dex_contracts()
         self.liquidity_signatures = self._load_liquidity_signatures()
+        self.prefilter = MempoolPrefilter(network, self.dex_contracts, self.liquidity_signatures)
+        
+        # Shared across all endpoint connections so each pending tx is handled once
+        self.seen_hashes = SeenHashSet(
+            capacity=getattr(settings, 'mempool_dedup_capacity', 100_000),
+            window_seconds=getattr(settings, 'mempool_dedup_window_seconds', 120)
+        )
+        
+        # Reader -> decode workers -> dispatcher, so slow handlers never stall socket reads
+        self.pipeline = MempoolMessagePipeline(
+            decoder=self._decode_frame,
+            dispatcher=self._handle_liquidity_event,
+            ingest_queue_size=getattr(settings, 'mempool_ingest_queue_size', 10_000),
+            dispatch_queue_size=getattr(settings, 'mempool_dispatch_queue_size', 1_000),
+            decode_workers=getattr(settings, 'mempool_decode_workers', 4),
+            policy=BackpressurePolicy(
+                getattr(settings, 'mempool_backpressure_policy', BackpressurePolicy.DROP_OLDEST.value)
+            ),
+            name=network
+        )
         
         # State tracking
         self._scanning = False
@@ -158,11 +193,13 @@ class MempoolScanner:
                 'sushiswap_router': '0xd9e1cE17f2641f24aE83637ab66a2cca9C378B9F',
                 'uniswap_v2_factory': '0x5C69bEe701ef814a2B6a3EDD4B1652CB9cc5aA6f',
                 'uniswap_v3_factory': '0x1F98431c8aD98523631AE4a59f267346ea31F984',
+                'uniswap_v3_position_manager': '0xC36442b4a4522E871399CD717aBDD847Ab11FE88',
             },
             'polygon': {
                 'quickswap_router': '0xa5E0829CaCEd8fFDD4De3c43696c57F7D7A678ff',
                 'sushiswap_router': '0x1b02dA8Cb0d097eB8D57A175b88c7D8b47997506',
                 'uniswap_v3_router': '0xE592427A0AEce92De3Edee1F18E0157C05861564',
+                'uniswap_v3_position_manager': '0xC36442b4a4522E871399CD717aBDD847Ab11FE88',
             },
             'bsc': {
                 'pancakeswap_router': '0x10ED43C718714eb63d5aA57B78B54704E256024E',
@@ -173,18 +210,9 @@ class MempoolScanner:
     
     def _load_liquidity_signatures(self) -> Dict[str, str]:
         """Load function signatures for liquidity operations."""
-        return {
-            # Uniswap V2 style
-            'addLiquidity': '0xe8e33700',
-            'addLiquidityETH': '0xf305d719',
-            
-            # Uniswap V3 style
-            'mint': '0x6a761202',
-            'increaseLiquidity': '0x219f5d17',
-            
-            # Factory contract
-            'createPair': '0xc9c65396',
-        }
+        # Selectors come from the compiled decoder registry so the prefilter
+        # and the decoders can never disagree
+        return self.decoder_registry.signatures
     
     async def start_scanning(self) -> None:
         """
@@ -202,6 +230,9 @@ class MempoolScanner:
             self._scanning = True
             self._shutdown = False
             
+            # Decode workers and dispatcher must be running before frames arrive
+            await self.pipeline.start()
+            
             # Start WebSocket connections
             connection_tasks = []
             for url in self.websocket_urls:
@@ -223,6 +254,7 @@ class MempoolScanner:
             
         except Exception as e:
             self._scanning = False
+            await self.pipeline.stop()
             logger.error(f"Failed to start mempool scanning: {e}")
             raise MempoolScannerError(f"Scanning startup failed: {e}")
     
@@ -242,6 +274,7 @@ class MempoolScanner:
         
         self.websockets.clear()
         self.active_connections.clear()
+        await self.pipeline.stop()
         logger.info("Mempool scanning stopped")
     
     async def _maintain_websocket_connection(self, url: str) -> None:
@@ -328,14 +361,13 @@ class MempoolScanner:
                 if self._shutdown:
                     break
                 
-                try:
-                    data = json.loads(message)
-                    await self._process_websocket_message(data, url)
-                    
-                except json.JSONDecodeError as e:
-                    logger.warning(f"Invalid JSON from {url}: {e}")
-                except Exception as e:
-                    logger.error(f"Error processing message from {url}: {e}")
+                # Drop hashes another endpoint already delivered before parsing the body
+                tx_hash = extract_tx_hash(message)
+                if tx_hash is not None and not self.seen_hashes.check_and_add(tx_hash, url):
+                    continue
+                
+                # Only enqueue here; decoding and handlers run in the pipeline stages
+                await self.pipeline.submit(message, url, deduplicated=tx_hash is not None)
                     
         except websockets.exceptions.ConnectionClosed:
             logger.warning(f"WebSocket connection closed: {url}")
@@ -344,34 +376,68 @@ class MempoolScanner:
         finally:
             self.active_connections.discard(url)
     
-    async def _process_websocket_message(self, data: Dict[str, Any], url: str) -> None:
+    async def _decode_frame(self, frame: RawFrame) -> Optional[LiquidityAddEvent]:
+        """
+        Decode stage of the message pipeline.
+        
+        Args:
+            frame: Raw frame queued by the socket reader
+            
+        Returns:
+            LiquidityAddEvent to dispatch, or None
+        """
+        try:
+            data = json.loads(frame.payload)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Invalid JSON from {frame.source}: {e}")
+            return None
+        
+        return await self._process_websocket_message(data, frame.source, frame.deduplicated)
+    
+    async def _process_websocket_message(
+        self,
+        data: Dict[str, Any],
+        url: str,
+        deduplicated: bool = False
+    ) -> Optional[LiquidityAddEvent]:
         """
         Process incoming WebSocket message.
         
         Args:
             data: Message data
             url: Source WebSocket URL
+            deduplicated: Whether the raw frame already passed the seen-hash check
+            
+        Returns:
+            Detected LiquidityAddEvent, or None
         """
         # Skip subscription confirmations and errors
         if "method" not in data or data["method"] != "eth_subscription":
-            return
+            return None
         
         # Extract transaction data
         if "params" not in data or "result" not in data["params"]:
-            return
+            return None
         
         tx_data = data["params"]["result"]
         if not isinstance(tx_data, dict):
-            return
+            return None
+        
+        # Fallback for frames the raw hash extraction could not handle
+        if not deduplicated and tx_data.get('hash'):
+            if not self.seen_hashes.check_and_add(tx_data['hash'].lower(), url):
+                return None
         
         # Create pending transaction object
         try:
             pending_tx = self._parse_pending_transaction(tx_data)
             if pending_tx:
-                await self._analyze_pending_transaction(pending_tx)
+                return await self._analyze_pending_transaction(pending_tx)
                 
         except Exception as e:
             logger.warning(f"Error parsing transaction: {e}")
+        
+        return None
     
     def _parse_pending_transaction(self, tx_data: Dict[str, Any]) -> Optional[PendingTransaction]:
         """
@@ -389,6 +455,14 @@ class MempoolScanner:
             if not all(field in tx_data for field in required_fields):
                 return None
             
+            self.stats.total_transactions_scanned += 1
+            
+            # Cheap destination/selector check before any hex conversion
+            function_name = self.prefilter.match(tx_data['to'], tx_data['input'])
+            if function_name is None:
+                self.stats.transactions_prefiltered += 1
+                return None
+            
             # Convert hex values to integers
             value = int(tx_data['value'], 16) if tx_data['value'] else 0
             gas = int(tx_data['gas'], 16)
@@ -408,39 +482,41 @@ class MempoolScanner:
                 gas=gas,
                 gas_price=gas_price,
                 input_data=tx_data['input'],
-                timestamp=time.time()
+                timestamp=time.time(),
+                function_name=function_name
             )
             
-            self.stats.total_transactions_scanned += 1
             return pending_tx
             
         except (ValueError, KeyError) as e:
             logger.debug(f"Error parsing transaction: {e}")
             return None
     
-    async def _analyze_pending_transaction(self, pending_tx: PendingTransaction) -> None:
+    async def _analyze_pending_transaction(self, pending_tx: PendingTransaction) -> Optional[LiquidityAddEvent]:
         """
         Analyze pending transaction for liquidity addition patterns.
         
         Args:
             pending_tx: Pending transaction to analyze
+            
+        Returns:
+            LiquidityAddEvent for the dispatcher, or None
         """
         try:
-            # Check if transaction is to a known DEX contract
-            if pending_tx.to_address.lower() not in [addr.lower() for addr in self.dex_contracts.values()]:
-                return
-            
-            # Check if transaction contains liquidity-related function calls
-            if not self._is_liquidity_transaction(pending_tx.input_data):
-                return
+            # Transactions built by _parse_pending_transaction already passed the prefilter
+            if pending_tx.function_name is None:
+                pending_tx.function_name = self.prefilter.match(
+                    pending_tx.to_address, pending_tx.input_data
+                )
+                if pending_tx.function_name is None:
+                    return None
             
             # Decode and analyze transaction data
-            liquidity_event = await self._decode_liquidity_transaction(pending_tx)
-            if liquidity_event:
-                await self._handle_liquidity_event(liquidity_event)
+            return await self._decode_liquidity_transaction(pending_tx)
                 
         except Exception as e:
             logger.warning(f"Error analyzing transaction {pending_tx.hash[:10]}: {e}")
+            return None
     
     def _is_liquidity_transaction(self, input_data: str) -> bool:
         """
@@ -455,11 +531,7 @@ class MempoolScanner:
         if not input_data or len(input_data) < 10:
             return False
         
-        # Extract function selector (first 4 bytes)
-        function_selector = input_data[:10].lower()
-        
-        # Check against known liquidity function signatures
-        return function_selector in [sig.lower() for sig in self.liquidity_signatures.values()]
+        return self.prefilter.function_name(input_data) is not None
     
     async def _decode_liquidity_transaction(self, pending_tx: PendingTransaction) -> Optional[LiquidityAddEvent]:
         """
@@ -472,78 +544,185 @@ class MempoolScanner:
             LiquidityAddEvent or None if decoding fails
         """
         try:
-            # This is a simplified decoder - in production, you'd use proper ABI decoding
-            function_selector = pending_tx.input_data[:10].lower()
+            call = self.decoder_registry.decode(pending_tx.input_data)
+            if call is None:
+                return None
             
             # Handle addLiquidityETH (most common for new tokens)
-            if function_selector == self.liquidity_signatures['addLiquidityETH'].lower():
-                return await self._decode_add_liquidity_eth(pending_tx)
+            if call.function_name == 'addLiquidityETH':
+                return await self._decode_add_liquidity_eth(pending_tx, call)
             
             # Handle addLiquidity
-            elif function_selector == self.liquidity_signatures['addLiquidity'].lower():
-                return await self._decode_add_liquidity(pending_tx)
+            elif call.function_name == 'addLiquidity':
+                return await self._decode_add_liquidity(pending_tx, call)
+            
+            # Handle V3 position mint
+            elif call.function_name == 'mint':
+                return await self._decode_v3_mint(pending_tx, call)
             
+            # Handle factory pair creation
+            elif call.function_name == 'createPair':
+                return await self._decode_create_pair(pending_tx, call)
+            
+            # increaseLiquidity only references an existing position by tokenId
             return None
             
         except Exception as e:
             logger.debug(f"Error decoding liquidity transaction: {e}")
             return None
     
-    async def _decode_add_liquidity_eth(self, pending_tx: PendingTransaction) -> Optional[LiquidityAddEvent]:
+    def _build_liquidity_event(
+        self,
+        pending_tx: PendingTransaction,
+        call: DecodedCall,
+        token_a: str,
+        token_b: str,
+        amount_a: int,
+        amount_b: int,
+        liquidity: int = 0,
+        fee: Optional[int] = None
+    ) -> LiquidityAddEvent:
+        """
+        Build a LiquidityAddEvent in pair order with a locally computed pair address.
+        
+        Args:
+            pending_tx: Source transaction
+            call: Decoded calldata
+            token_a: First token as passed in calldata
+            token_b: Second token as passed in calldata
+            amount_a: Amount of token_a
+            amount_b: Amount of token_b
+            liquidity: Liquidity minted, if known
+            fee: V3 fee tier, if any
+            
+        Returns:
+            LiquidityAddEvent
+        """
+        dex = self._identify_dex(pending_tx.to_address)
+        
+        # Pair contracts order tokens by address; keep amounts aligned with that order
+        if token_a.lower() < token_b.lower():
+            token0, token1, amount0, amount1 = token_a, token_b, amount_a, amount_b
+        else:
+            token0, token1, amount0, amount1 = token_b, token_a, amount_b, amount_a
+        
+        # The launched token is whichever side is not the wrapped native token
+        token_address = token_b if token_a.lower() == self.wrapped_native.lower() else token_a
+        
+        return LiquidityAddEvent(
+            token_address=to_checksum_address(token_address),
+            pair_address=resolve_pair_address(self.network, dex, token0, token1, fee),
+            dex=dex,
+            token0=to_checksum_address(token0),
+            token1=to_checksum_address(token1),
+            amount0=amount0,
+            amount1=amount1,
+            liquidity=liquidity,
+            pending_tx=pending_tx,
+            fee=fee,
+            call_args=call.args
+        )
+    
+    async def _decode_add_liquidity_eth(
+        self,
+        pending_tx: PendingTransaction,
+        call: DecodedCall
+    ) -> Optional[LiquidityAddEvent]:
         """
         Decode addLiquidityETH transaction.
         
         Args:
             pending_tx: Pending transaction
+            call: Decoded calldata (token, amountTokenDesired, amountTokenMin,
+                amountETHMin, to, deadline)
             
         Returns:
             LiquidityAddEvent or None
         """
-        try:
-            # addLiquidityETH parameters:
-            # address token, uint amountTokenDesired, uint amountTokenMin, 
-            # uint amountETHMin, address to, uint deadline
-            
-            input_data = pending_tx.input_data[10:]  # Remove function selector
-            
-            # Simplified decoding - extract token address (first parameter)
-            if len(input_data) >= 64:
-                token_address = '0x' + input_data[24:64]  # Extract address from first 32 bytes
-                
-                # Create liquidity event
-                liquidity_event = LiquidityAddEvent(
-                    token_address=Web3.toChecksumAddress(token_address),
-                    pair_address='',  # Would need to calculate or query
-                    dex=self._identify_dex(pending_tx.to_address),
-                    token0=token_address,
-                    token1='0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2',  # WETH
-                    amount0=0,  # Would decode from parameters
-                    amount1=pending_tx.value,  # ETH amount
-                    liquidity=0,  # Would calculate
-                    pending_tx=pending_tx
-                )
-                
-                return liquidity_event
+        args = call.args
+        amount_token = args['amountTokenDesired']
+        amount_eth = pending_tx.value  # ETH side is the attached value
+        
+        return self._build_liquidity_event(
+            pending_tx, call,
+            args['token'], self.wrapped_native,
+            amount_token, amount_eth,
+            liquidity=estimate_initial_liquidity(amount_token, amount_eth)
+        )
+    
+    async def _decode_add_liquidity(
+        self,
+        pending_tx: PendingTransaction,
+        call: DecodedCall
+    ) -> Optional[LiquidityAddEvent]:
+        """
+        Decode addLiquidity transaction.
+        
+        Args:
+            pending_tx: Pending transaction
+            call: Decoded calldata (tokenA, tokenB, amountADesired, amountBDesired,
+                amountAMin, amountBMin, to, deadline)
             
-            return None
+        Returns:
+            LiquidityAddEvent or None
+        """
+        args = call.args
+        amount_a = args['amountADesired']
+        amount_b = args['amountBDesired']
+        
+        return self._build_liquidity_event(
+            pending_tx, call,
+            args['tokenA'], args['tokenB'],
+            amount_a, amount_b,
+            liquidity=estimate_initial_liquidity(amount_a, amount_b)
+        )
+    
+    async def _decode_v3_mint(
+        self,
+        pending_tx: PendingTransaction,
+        call: DecodedCall
+    ) -> Optional[LiquidityAddEvent]:
+        """
+        Decode NonfungiblePositionManager.mint transaction.
+        
+        Liquidity depends on the pool price and is left at zero.
+        
+        Args:
+            pending_tx: Pending transaction
+            call: Decoded MintParams
             
-        except Exception as e:
-            logger.debug(f"Error decoding addLiquidityETH: {e}")
-            return None
+        Returns:
+            LiquidityAddEvent or None
+        """
+        args = call.args
+        
+        return self._build_liquidity_event(
+            pending_tx, call,
+            args['token0'], args['token1'],
+            args['amount0Desired'], args['amount1Desired'],
+            fee=args['fee']
+        )
     
-    async def _decode_add_liquidity(self, pending_tx: PendingTransaction) -> Optional[LiquidityAddEvent]:
+    async def _decode_create_pair(
+        self,
+        pending_tx: PendingTransaction,
+        call: DecodedCall
+    ) -> Optional[LiquidityAddEvent]:
         """
-        Decode addLiquidity transaction.
+        Decode factory createPair transaction (no amounts yet).
         
         Args:
             pending_tx: Pending transaction
+            call: Decoded calldata (tokenA, tokenB)
             
         Returns:
             LiquidityAddEvent or None
         """
-        # Similar to addLiquidityETH but for token-token pairs
-        # Implementation would be similar but handle two token addresses
-        return None
+        return self._build_liquidity_event(
+            pending_tx, call,
+            call.args['tokenA'], call.args['tokenB'],
+            0, 0
+        )
     
     def _identify_dex(self, contract_address: str) -> str:
         """
@@ -555,13 +734,7 @@ class MempoolScanner:
         Returns:
             DEX name
         """
-        address_lower = contract_address.lower()
-        
-        for dex_name, dex_address in self.dex_contracts.items():
-            if dex_address.lower() == address_lower:
-                return dex_name.replace('_router', '').replace('_factory', '')
-        
-        return 'unknown'
+        return self.prefilter.identify_dex(contract_address)
     
     async def _handle_liquidity_event(self, liquidity_event: LiquidityAddEvent) -> None:
         """
@@ -697,6 +870,9 @@ class MempoolScanner:
             'active_connections': len(self.active_connections),
             'total_connections': len(self.websocket_urls),
             'total_transactions_scanned': self.stats.total_transactions_scanned,
+            'transactions_prefiltered': self.stats.transactions_prefiltered,
+            'prefilter': self.prefilter.get_stats(),
+            'deduplication': self.seen_hashes.get_stats(),
             'liquidity_adds_detected': self.stats.liquidity_adds_detected,
             'new_tokens_detected': self.stats.new_tokens_detected,
             'snipe_opportunities': self.stats.snipe_opportunities,
@@ -707,7 +883,8 @@ class MempoolScanner:
             ),
             'websocket_reconnections': self.stats.websocket_reconnections,
             'last_activity': self.stats.last_activity.isoformat() if self.stats.last_activity else None,
-            'scanning_active': self._scanning
+            'scanning_active': self._scanning,
+            'pipeline': self.pipeline.get_stats()
         }
     
     async def health_check(self) -> Dict[str, Any]:
@@ -0,0 +1,257 @@
+"""
+File: app/core/mempool/message_pipeline.py
+
+Staged ingest/decode/dispatch pipeline for mempool WebSocket frames.
+The socket reader only enqueues raw frames; a pool of decode workers turns
+them into events and a separate dispatcher runs the (possibly slow) event
+handlers, so handler latency never stalls the socket read loop.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.utils.latency import LatencyTracker
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__, "application")
+
+
+class BackpressurePolicy(str, Enum):
+    """What the reader does when the ingest queue is full."""
+    DROP_NEWEST = "drop_newest"   # Discard the incoming frame
+    DROP_OLDEST = "drop_oldest"   # Discard the oldest queued frame
+    BLOCK = "block"               # Await space (pauses the socket read loop)
+
+
+@dataclass
+class RawFrame:
+    """Raw WebSocket frame queued for decoding."""
+    payload: Any
+    source: str
+    received_at: float
+    deduplicated: bool = False
+
+
+@dataclass
+class DecodedEvent:
+    """Decoded event queued for dispatch."""
+    event: Any
+    source: str
+    received_at: float
+    decoded_at: float
+
+
+class MempoolMessagePipeline:
+    """
+    Bounded reader -> decode workers -> dispatcher pipeline.
+
+    Features:
+    - Bounded ingest queue with explicit drop/backpressure policy
+    - Configurable pool of decode workers
+    - Single dispatcher task so handlers see events in decode order
+    - Queue depth and per-stage latency metrics
+    """
+
+    def __init__(
+        self,
+        decoder: Callable[[RawFrame], Awaitable[Optional[Any]]],
+        dispatcher: Callable[[Any], Awaitable[None]],
+        ingest_queue_size: int = 10_000,
+        dispatch_queue_size: int = 1_000,
+        decode_workers: int = 4,
+        policy: BackpressurePolicy = BackpressurePolicy.DROP_OLDEST,
+        name: str = "mempool"
+    ):
+        """
+        Initialize pipeline.
+
+        Args:
+            decoder: Coroutine turning a RawFrame into an event (or None to skip)
+            dispatcher: Coroutine handling a decoded event
+            ingest_queue_size: Capacity of the raw frame queue
+            dispatch_queue_size: Capacity of the decoded event queue
+            decode_workers: Number of concurrent decode workers
+            policy: Behaviour when the ingest queue is full
+            name: Name used in logs
+        """
+        self.decoder = decoder
+        self.dispatcher = dispatcher
+        self.decode_worker_count = max(1, decode_workers)
+        self.policy = BackpressurePolicy(policy)
+        self.name = name
+
+        self.ingest_queue: asyncio.Queue = asyncio.Queue(maxsize=ingest_queue_size)
+        self.dispatch_queue: asyncio.Queue = asyncio.Queue(maxsize=dispatch_queue_size)
+
+        self._tasks: List[asyncio.Task] = []
+        self._running = False
+
+        # Metrics
+        self.frames_received = 0
+        self.frames_dropped = 0
+        self.frames_decoded = 0
+        self.decode_errors = 0
+        self.events_dispatched = 0
+        self.dispatch_errors = 0
+        self.max_ingest_depth = 0
+        self.max_dispatch_depth = 0
+
+        self.ingest_wait = LatencyTracker()
+        self.decode_latency = LatencyTracker()
+        self.dispatch_wait = LatencyTracker()
+        self.dispatch_latency = LatencyTracker()
+        self.end_to_end = LatencyTracker()
+
+    @property
+    def is_running(self) -> bool:
+        """Whether worker tasks are running."""
+        return self._running
+
+    async def start(self) -> None:
+        """Start decode workers and the dispatcher."""
+        if self._running:
+            return
+
+        self._running = True
+        for i in range(self.decode_worker_count):
+            self._tasks.append(asyncio.create_task(self._decode_worker(i)))
+        self._tasks.append(asyncio.create_task(self._dispatch_worker()))
+
+        logger.info(
+            f"Mempool pipeline [{self.name}] started: {self.decode_worker_count} decode workers, "
+            f"policy={self.policy.value}"
+        )
+
+    async def stop(self) -> None:
+        """Cancel worker tasks; queued items are discarded."""
+        self._running = False
+        for task in self._tasks:
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def submit(self, payload: Any, source: str, deduplicated: bool = False) -> bool:
+        """
+        Enqueue a raw frame from the socket reader.
+
+        Only the BLOCK policy ever awaits; the drop policies return immediately.
+
+        Args:
+            payload: Raw frame
+            source: Endpoint URL that delivered it
+            deduplicated: Whether the frame already passed the seen-hash check
+
+        Returns:
+            True if the frame was queued, False if it was dropped
+        """
+        self.frames_received += 1
+        frame = RawFrame(payload, source, time.perf_counter(), deduplicated)
+        queue = self.ingest_queue
+
+        if self.policy is BackpressurePolicy.BLOCK:
+            await queue.put(frame)
+        elif queue.full():
+            self.frames_dropped += 1
+            if self.policy is BackpressurePolicy.DROP_NEWEST:
+                return False
+            try:
+                queue.get_nowait()
+                queue.task_done()
+            except asyncio.QueueEmpty:
+                pass
+            queue.put_nowait(frame)
+        else:
+            queue.put_nowait(frame)
+
+        depth = queue.qsize()
+        if depth > self.max_ingest_depth:
+            self.max_ingest_depth = depth
+        return True
+
+    async def _decode_worker(self, worker_id: int) -> None:
+        """Decode frames into events and hand them to the dispatcher."""
+        while True:
+            frame: RawFrame = await self.ingest_queue.get()
+            started = time.perf_counter()
+            self.ingest_wait.record(started - frame.received_at)
+
+            try:
+                try:
+                    event = await self.decoder(frame)
+                    self.frames_decoded += 1
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.decode_errors += 1
+                    logger.debug(f"Decode worker {worker_id} error: {e}")
+                    event = None
+
+                decoded_at = time.perf_counter()
+                self.decode_latency.record(decoded_at - started)
+
+                if event is not None:
+                    await self.dispatch_queue.put(DecodedEvent(event, frame.source, frame.received_at, decoded_at))
+                    depth = self.dispatch_queue.qsize()
+                    if depth > self.max_dispatch_depth:
+                        self.max_dispatch_depth = depth
+            finally:
+                # Marked done only once the event is queued, so drain() cannot miss it
+                self.ingest_queue.task_done()
+
+    async def _dispatch_worker(self) -> None:
+        """Run event handlers one event at a time."""
+        while True:
+            item: DecodedEvent = await self.dispatch_queue.get()
+            started = time.perf_counter()
+            self.dispatch_wait.record(started - item.decoded_at)
+
+            try:
+                await self.dispatcher(item.event)
+                self.events_dispatched += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.dispatch_errors += 1
+                logger.error(f"Mempool pipeline [{self.name}] dispatch error: {e}")
+            finally:
+                self.dispatch_queue.task_done()
+
+            finished = time.perf_counter()
+            self.dispatch_latency.record(finished - started)
+            self.end_to_end.record(finished - item.received_at)
+
+    async def drain(self) -> None:
+        """Wait until every queued frame and event has been processed."""
+        await self.ingest_queue.join()
+        await self.dispatch_queue.join()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth, drop counts and per-stage latency."""
+        return {
+            'running': self._running,
+            'policy': self.policy.value,
+            'decode_workers': self.decode_worker_count,
+            'ingest_queue_depth': self.ingest_queue.qsize(),
+            'ingest_queue_capacity': self.ingest_queue.maxsize,
+            'max_ingest_queue_depth': self.max_ingest_depth,
+            'dispatch_queue_depth': self.dispatch_queue.qsize(),
+            'dispatch_queue_capacity': self.dispatch_queue.maxsize,
+            'max_dispatch_queue_depth': self.max_dispatch_depth,
+            'frames_received': self.frames_received,
+            'frames_dropped': self.frames_dropped,
+            'frames_decoded': self.frames_decoded,
+            'decode_errors': self.decode_errors,
+            'events_dispatched': self.events_dispatched,
+            'dispatch_errors': self.dispatch_errors,
+            'latency': {
+                'ingest_wait': self.ingest_wait.summary(),
+                'decode': self.decode_latency.summary(),
+                'dispatch_wait': self.dispatch_wait.summary(),
+                'dispatch': self.dispatch_latency.summary(),
+                'end_to_end': self.end_to_end.summary(),
+            },
+        }
@@ -0,0 +1,155 @@
+"""
+File: app/core/mempool/tx_dedup.py
+
+Cross-endpoint pending transaction deduplication.
+Every WebSocket endpoint delivers the same pending hashes; a shared,
+bounded and time-windowed seen-set lets the scanner drop repeats before
+the frame body is JSON-parsed and records which endpoint delivered first.
+"""
+
+import re
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple, Union
+
+
+# Matches the transaction hash key only ("blockHash" is not preceded by a quote)
+_TX_HASH_PATTERN = re.compile(rb'"hash"\s*:\s*"(0x[0-9a-fA-F]{64})"')
+# Hash-only subscriptions deliver the hash directly as the result
+_RESULT_HASH_PATTERN = re.compile(rb'"result"\s*:\s*"(0x[0-9a-fA-F]{64})"')
+
+
+def extract_tx_hash(frame: Union[str, bytes]) -> Optional[str]:
+    """
+    Pull the pending transaction hash out of a raw subscription frame.
+
+    Args:
+        frame: Raw WebSocket message (str or bytes)
+
+    Returns:
+        Lowercased transaction hash, or None if not found
+    """
+    raw = frame.encode() if isinstance(frame, str) else frame
+
+    match = _TX_HASH_PATTERN.search(raw) or _RESULT_HASH_PATTERN.search(raw)
+    if match is None:
+        return None
+    return match.group(1).decode().lower()
+
+
+class SeenHashSet:
+    """
+    Fixed-capacity ring of recently seen transaction hashes.
+
+    Membership is a dict lookup; insertion order is kept in a deque so the
+    oldest entry is evicted in O(1) once capacity is reached or once it
+    falls outside the time window. Shared by all connections of a scanner
+    (they run on one event loop, so no locking is needed).
+    """
+
+    def __init__(self, capacity: int = 100_000, window_seconds: float = 120.0):
+        """
+        Initialize seen-hash set.
+
+        Args:
+            capacity: Maximum number of hashes remembered
+            window_seconds: How long a hash is remembered
+        """
+        self.capacity = max(1, capacity)
+        self.window_seconds = window_seconds
+
+        self._seen: Dict[str, Tuple[float, str]] = {}
+        self._order: Deque[Tuple[str, float]] = deque()
+
+        self.first_delivery: Dict[str, int] = {}
+        self.duplicate_delivery: Dict[str, int] = {}
+        self.unique_count = 0
+        self.duplicate_count = 0
+        self.evictions = 0
+
+    def check_and_add(self, tx_hash: str, source: str, now: Optional[float] = None) -> bool:
+        """
+        Record a delivery of a hash from a source.
+
+        Args:
+            tx_hash: Transaction hash (lowercased by the caller)
+            source: Endpoint URL that delivered it
+            now: Current time (defaults to time.monotonic())
+
+        Returns:
+            True if this is the first delivery inside the window
+        """
+        now = time.monotonic() if now is None else now
+        self._expire(now)
+
+        entry = self._seen.get(tx_hash)
+        if entry is not None:
+            self.duplicate_count += 1
+            self.duplicate_delivery[source] = self.duplicate_delivery.get(source, 0) + 1
+            return False
+
+        if len(self._order) >= self.capacity:
+            old_hash, _ = self._order.popleft()
+            self._seen.pop(old_hash, None)
+            self.evictions += 1
+
+        self._seen[tx_hash] = (now, source)
+        self._order.append((tx_hash, now))
+
+        self.unique_count += 1
+        self.first_delivery[source] = self.first_delivery.get(source, 0) + 1
+        return True
+
+    def first_source(self, tx_hash: str) -> Optional[str]:
+        """Return the endpoint that delivered a hash first, if still remembered."""
+        entry = self._seen.get(tx_hash)
+        return entry[1] if entry else None
+
+    def __contains__(self, tx_hash: str) -> bool:
+        return tx_hash in self._seen
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def _expire(self, now: float) -> None:
+        """Drop entries older than the time window from the head of the ring."""
+        cutoff = now - self.window_seconds
+        order = self._order
+        while order and order[0][1] < cutoff:
+            old_hash, _ = order.popleft()
+            self._seen.pop(old_hash, None)
+
+    def get_endpoint_ranking(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Rank endpoints by how often they delivered a hash first.
+
+        Returns:
+            Mapping of endpoint -> first/duplicate counts and first-delivery share
+        """
+        sources = set(self.first_delivery) | set(self.duplicate_delivery)
+        ranked = sorted(sources, key=lambda s: self.first_delivery.get(s, 0), reverse=True)
+
+        return {
+            source: {
+                'first_deliveries': self.first_delivery.get(source, 0),
+                'duplicate_deliveries': self.duplicate_delivery.get(source, 0),
+                'first_delivery_share': (
+                    self.first_delivery.get(source, 0) / max(1, self.unique_count)
+                ),
+            }
+            for source in ranked
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get deduplication statistics."""
+        total = self.unique_count + self.duplicate_count
+        return {
+            'tracked_hashes': len(self._seen),
+            'capacity': self.capacity,
+            'window_seconds': self.window_seconds,
+            'unique_transactions': self.unique_count,
+            'duplicates_dropped': self.duplicate_count,
+            'duplicate_rate': self.duplicate_count / max(1, total),
+            'capacity_evictions': self.evictions,
+            'endpoints': self.get_endpoint_ranking(),
+        }
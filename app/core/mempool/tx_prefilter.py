@@ -0,0 +1,161 @@
+"""
+File: app/core/mempool/tx_prefilter.py
+
+Compiled prefilter for the mempool scanner hot path.
+Rejects pending transactions that are not liquidity calls to a known DEX
+contract using only set/dict lookups, before any hex-to-int conversion.
+"""
+
+from typing import Any, Dict, FrozenSet, Mapping, Optional
+
+
+def address_to_bytes(address: str) -> Optional[bytes]:
+    """
+    Convert a hex address string into its raw 20-byte form.
+
+    Args:
+        address: Hex address with or without 0x prefix
+
+    Returns:
+        20 raw bytes, or None if the address is malformed
+    """
+    if not address:
+        return None
+
+    try:
+        raw = bytes.fromhex(address[2:] if address[:2] in ('0x', '0X') else address)
+    except ValueError:
+        return None
+
+    return raw if len(raw) == 20 else None
+
+
+def selector_to_int(selector: str) -> Optional[int]:
+    """
+    Convert a 4-byte function selector (0x-prefixed hex) into an int key.
+
+    Args:
+        selector: Function selector such as '0xf305d719'
+
+    Returns:
+        Selector as an unsigned 32-bit int, or None if malformed
+    """
+    if not selector or len(selector) < 10:
+        return None
+
+    try:
+        return int(selector[2:10], 16)
+    except ValueError:
+        return None
+
+
+class MempoolPrefilter:
+    """
+    Precompiled address/selector filter built once per network.
+
+    Router and factory addresses are held as a frozenset of raw 20-byte
+    values and liquidity function selectors as a dict keyed by the 4-byte
+    int, so a pending transaction is classified with one bytes.fromhex,
+    one int() on 8 hex chars and two hash lookups.
+    """
+
+    __slots__ = ('network', 'addresses', 'selectors', 'dex_names', 'checked', 'matched')
+
+    def __init__(
+        self,
+        network: str,
+        dex_contracts: Mapping[str, str],
+        liquidity_signatures: Mapping[str, str]
+    ):
+        """
+        Compile prefilter tables.
+
+        Args:
+            network: Network name the tables were built for
+            dex_contracts: Mapping of contract name -> address
+            liquidity_signatures: Mapping of function name -> 0x selector
+        """
+        self.network = network
+
+        dex_names: Dict[bytes, str] = {}
+        for name, address in dex_contracts.items():
+            raw = address_to_bytes(address)
+            if raw is not None:
+                dex_names[raw] = (
+                    name.replace('_router', '').replace('_factory', '').replace('_position_manager', '')
+                )
+
+        selectors: Dict[int, str] = {}
+        for name, selector in liquidity_signatures.items():
+            key = selector_to_int(selector)
+            if key is not None:
+                selectors[key] = name
+
+        self.addresses: FrozenSet[bytes] = frozenset(dex_names)
+        self.selectors: Dict[int, str] = selectors
+        self.dex_names: Dict[bytes, str] = dex_names
+
+        self.checked = 0
+        self.matched = 0
+
+    def match(self, to_address: Optional[str], input_data: Optional[str]) -> Optional[str]:
+        """
+        Classify a transaction by destination and calldata selector.
+
+        Args:
+            to_address: Transaction 'to' field (hex string or None)
+            input_data: Transaction calldata (0x-prefixed hex)
+
+        Returns:
+            Liquidity function name if the transaction passes, otherwise None
+        """
+        self.checked += 1
+
+        if not input_data or len(input_data) < 10:
+            return None
+
+        raw = address_to_bytes(to_address) if to_address else None
+        if raw is None or raw not in self.addresses:
+            return None
+
+        key = selector_to_int(input_data)
+        if key is None:
+            return None
+
+        function_name = self.selectors.get(key)
+        if function_name is not None:
+            self.matched += 1
+        return function_name
+
+    def match_tx(self, tx_data: Mapping[str, Any]) -> Optional[str]:
+        """
+        Classify a raw pending transaction dict from eth_subscribe.
+
+        Args:
+            tx_data: Raw transaction object
+
+        Returns:
+            Liquidity function name if the transaction passes, otherwise None
+        """
+        return self.match(tx_data.get('to'), tx_data.get('input'))
+
+    def function_name(self, input_data: str) -> Optional[str]:
+        """Return the liquidity function name for calldata, ignoring the destination."""
+        key = selector_to_int(input_data)
+        return self.selectors.get(key) if key is not None else None
+
+    def identify_dex(self, contract_address: str) -> str:
+        """Return the DEX name for a contract address, or 'unknown'."""
+        raw = address_to_bytes(contract_address)
+        return self.dex_names.get(raw, 'unknown') if raw is not None else 'unknown'
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get prefilter counters."""
+        return {
+            'network': self.network,
+            'addresses': len(self.addresses),
+            'selectors': len(self.selectors),
+            'checked': self.checked,
+            'matched': self.matched,
+            'pass_rate': self.matched / max(1, self.checked)
+        }
@@ -6,16 +6,26 @@ Add CacheManager alias to fix import issues while maintaining backward compatibi
 """
 
 import asyncio
+import inspect
 import json
 import time
-from typing import Any, Optional, Dict, List
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Awaitable, Callable, Optional, Dict, List, Union
 from dataclasses import dataclass
 
 from app.utils.logger import setup_logger
 from app.core.exceptions import ServiceError
+from app.core.performance.memory_cache import MISSING, NamespaceLimits, ShardedMemoryCache
 
 logger = setup_logger(__name__)
 
+# Marker key for values stored by get_or_compute with stale-while-revalidate
+_FRESH_UNTIL = "__fresh_until__"
+
+# Type tag for values _serialize cannot express as plain JSON
+_TYPE_TAG = "__type__"
+
 
 class CacheError(ServiceError):
     """Exception raised when cache operations fail."""
@@ -37,33 +47,63 @@ class CacheManager:
     Enhanced cache manager with in-memory storage and optional Redis support.
     
     Features:
-    - In-memory caching with TTL support
+    - Sharded in-memory caching with per-shard locks and TTL heaps
+    - LRU eviction with per-namespace entry and byte budgets
     - Optional Redis support (when available)
+    - Single-flight get_or_compute with stale-while-revalidate
     - Key namespacing
     - Cache statistics
     - Async operations
     """
     
-    def __init__(self, redis_url: Optional[str] = None):
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        shards: int = 16,
+        default_max_entries: int = 100_000,
+        default_max_bytes: int = 64 * 1024 * 1024,
+        cleanup_interval: float = 60.0
+    ):
         """
         Initialize cache manager.
         
         Args:
             redis_url: Redis connection URL (optional)
+            shards: Number of in-memory shards
+            default_max_entries: Per-namespace entry budget unless configured
+            default_max_bytes: Per-namespace byte budget unless configured
+            cleanup_interval: Seconds between sweeps of expired entries from all shards
         """
         self.redis_url = redis_url
         self.redis_client = None
         self.use_redis = False
-        self._cache: Dict[str, CacheEntry] = {}
-        self._lock = asyncio.Lock()
+        self._memory = ShardedMemoryCache(
+            shards=shards,
+            default_limits=NamespaceLimits(max_entries=default_max_entries, max_bytes=default_max_bytes)
+        )
+        # A shard only expires entries lazily when it is written to, so
+        # reads and writes sweep every shard at most once per interval
+        self.cleanup_interval = cleanup_interval
+        self._last_cleanup = time.monotonic()
         self._stats = {
             "hits": 0,
             "misses": 0,
+            "stale_reads": 0,
             "sets": 0,
             "deletes": 0,
             "errors": 0
         }
         
+        # In-flight loads for get_or_compute, keyed by namespaced key
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._flight_stats = {
+            "loads": 0,
+            "load_errors": 0,
+            "coalesced": 0,
+            "stale_served": 0,
+            "background_refreshes": 0
+        }
+        
         logger.info("[OK] Cache Manager initialized")
     
     async def connect(self) -> None:
@@ -87,6 +127,17 @@ class CacheManager:
             logger.error(f"❌ Cache manager initialization failed: {e}")
             # Continue with in-memory cache only
     
+    def configure_namespace(self, namespace: str, max_entries: int, max_bytes: int) -> None:
+        """
+        Set the in-memory budget for a namespace.
+        
+        Args:
+            namespace: Key namespace
+            max_entries: Maximum number of entries
+            max_bytes: Maximum estimated size in bytes
+        """
+        self._memory.configure_namespace(namespace, max_entries, max_bytes)
+    
     async def set(
         self,
         key: str,
@@ -107,29 +158,17 @@ class CacheManager:
             True if value was set successfully
         """
         try:
-            namespaced_key = f"{namespace}:{key}"
-            current_time = time.time()
-            expires_at = current_time + ttl if ttl else None
-            
             if self.use_redis and self.redis_client:
+                namespaced_key = f"{namespace}:{key}"
                 serialized_value = self._serialize(value)
                 if ttl:
                     await self.redis_client.setex(namespaced_key, ttl, serialized_value)
                 else:
                     await self.redis_client.set(namespaced_key, serialized_value)
             else:
-                # Use in-memory cache
-                async with self._lock:
-                    entry = CacheEntry(
-                        value=value,
-                        created_at=current_time,
-                        expires_at=expires_at
-                    )
-                    self._cache[namespaced_key] = entry
-                    
-                    # Cleanup expired entries occasionally
-                    if len(self._cache) % 100 == 0:
-                        await self._cleanup_expired()
+                # Use in-memory cache (expiry and eviction happen inside the shard)
+                self._memory.set(key, value, ttl=ttl, namespace=namespace)
+                await self._maybe_cleanup_expired()
             
             self._stats["sets"] += 1
             return True
@@ -156,39 +195,164 @@ class CacheManager:
         Returns:
             Cached value or default
         """
-        try:
-            namespaced_key = f"{namespace}:{key}"
+        value = await self._get_raw(key, namespace)
+        if value is MISSING:
+            return default
+        
+        if self._is_swr_value(value):
+            # Values written by get_or_compute are only fresh until their soft TTL
+            if time.time() > value[_FRESH_UNTIL]:
+                self._stats["stale_reads"] += 1
+                return default
+            value = value["value"]
+        self._stats["hits"] += 1
+        return value
+    
+    async def _get_raw(self, key: str, namespace: str) -> Any:
+        """
+        Get the stored value without unwrapping, or MISSING.
+        
+        Only misses are counted here; callers count a found value as a hit
+        or, for an expired stale-while-revalidate value, a stale read.
+        
+        Args:
+            key: Cache key
+            namespace: Key namespace
             
+        Returns:
+            Stored value or MISSING
+        """
+        try:
             if self.use_redis and self.redis_client:
-                serialized_value = await self.redis_client.get(namespaced_key)
+                serialized_value = await self.redis_client.get(f"{namespace}:{key}")
                 if serialized_value:
-                    value = self._deserialize(serialized_value)
-                    self._stats["hits"] += 1
-                    return value
+                    return self._deserialize(serialized_value)
             else:
                 # Use in-memory cache
-                async with self._lock:
-                    if namespaced_key in self._cache:
-                        entry = self._cache[namespaced_key]
-                        current_time = time.time()
-                        
-                        # Check if expired
-                        if entry.expires_at and current_time > entry.expires_at:
-                            del self._cache[namespaced_key]
-                        else:
-                            # Update access statistics
-                            entry.access_count += 1
-                            entry.last_accessed = current_time
-                            self._stats["hits"] += 1
-                            return entry.value
+                await self._maybe_cleanup_expired()
+                value = self._memory.get_entry(key, namespace)
+                if value is not MISSING:
+                    return value
             
             self._stats["misses"] += 1
-            return default
+            return MISSING
             
         except Exception as e:
             self._stats["errors"] += 1
             logger.error(f"Cache get failed for key {key}: {e}")
-            return default
+            return MISSING
+    
+    async def get_or_compute(
+        self,
+        key: str,
+        loader: Callable[[], Union[Any, Awaitable[Any]]],
+        ttl: Optional[int] = None,
+        namespace: str = "default",
+        stale_ttl: Optional[int] = None
+    ) -> Any:
+        """
+        Get a value, loading it at most once across concurrent callers.
+        
+        Concurrent misses for the same key share one in-flight load. With
+        stale_ttl, a value older than ttl but younger than ttl + stale_ttl is
+        returned immediately while a single background load refreshes it.
+        
+        Args:
+            key: Cache key
+            loader: Zero-argument callable (sync or async) producing the value
+            ttl: Freshness lifetime in seconds
+            namespace: Key namespace
+            stale_ttl: Extra seconds a stale value may be served while refreshing
+            
+        Returns:
+            Cached or freshly loaded value (None results are not cached)
+            
+        Raises:
+            Exception: Whatever the loader raised, for callers awaiting that load
+        """
+        flight_key = f"{namespace}:{key}"
+        cached = await self._get_raw(key, namespace)
+        
+        if cached is not MISSING:
+            if not self._is_swr_value(cached):
+                self._stats["hits"] += 1
+                return cached
+            if time.time() <= cached[_FRESH_UNTIL]:
+                self._stats["hits"] += 1
+                return cached["value"]
+            
+            # Stale: serve it now, refresh once in the background
+            self._stats["stale_reads"] += 1
+            if flight_key not in self._inflight:
+                self._flight_stats["background_refreshes"] += 1
+                self._start_load(flight_key, key, loader, ttl, namespace, stale_ttl)
+            self._flight_stats["stale_served"] += 1
+            return cached["value"]
+        
+        task = self._inflight.get(flight_key)
+        if task is not None:
+            self._flight_stats["coalesced"] += 1
+        else:
+            task = self._start_load(flight_key, key, loader, ttl, namespace, stale_ttl)
+        
+        # Shield so one cancelled caller does not cancel the shared load
+        return await asyncio.shield(task)
+    
+    def _start_load(
+        self,
+        flight_key: str,
+        key: str,
+        loader: Callable[[], Union[Any, Awaitable[Any]]],
+        ttl: Optional[int],
+        namespace: str,
+        stale_ttl: Optional[int]
+    ) -> asyncio.Task:
+        """Start a shared load task and register it as in flight."""
+        task = asyncio.ensure_future(self._load_and_store(key, loader, ttl, namespace, stale_ttl))
+        self._inflight[flight_key] = task
+        
+        def _done(finished: asyncio.Task) -> None:
+            if self._inflight.get(flight_key) is finished:
+                del self._inflight[flight_key]
+            # Retrieve the exception so background refresh failures are not reported as unhandled
+            if not finished.cancelled() and finished.exception() is not None:
+                logger.debug(f"Cache load failed for {flight_key}: {finished.exception()}")
+        
+        task.add_done_callback(_done)
+        return task
+    
+    async def _load_and_store(
+        self,
+        key: str,
+        loader: Callable[[], Union[Any, Awaitable[Any]]],
+        ttl: Optional[int],
+        namespace: str,
+        stale_ttl: Optional[int]
+    ) -> Any:
+        """Run the loader and cache a non-None result."""
+        try:
+            value = loader()
+            if inspect.isawaitable(value):
+                value = await value
+        except Exception:
+            self._flight_stats["load_errors"] += 1
+            raise
+        
+        self._flight_stats["loads"] += 1
+        if value is None:
+            return None
+        
+        if ttl and stale_ttl:
+            wrapped = {_FRESH_UNTIL: time.time() + ttl, "value": value}
+            await self.set(key, wrapped, ttl=ttl + stale_ttl, namespace=namespace)
+        else:
+            await self.set(key, value, ttl=ttl, namespace=namespace)
+        return value
+    
+    @staticmethod
+    def _is_swr_value(value: Any) -> bool:
+        """Check whether a stored value is a stale-while-revalidate wrapper."""
+        return isinstance(value, dict) and _FRESH_UNTIL in value
     
     async def delete(self, key: str, namespace: str = "default") -> bool:
         """
@@ -202,17 +366,12 @@ class CacheManager:
             True if key was deleted
         """
         try:
-            namespaced_key = f"{namespace}:{key}"
-            
             if self.use_redis and self.redis_client:
-                result = await self.redis_client.delete(namespaced_key)
+                result = await self.redis_client.delete(f"{namespace}:{key}")
                 deleted = result > 0
             else:
                 # Use in-memory cache
-                async with self._lock:
-                    deleted = namespaced_key in self._cache
-                    if deleted:
-                        del self._cache[namespaced_key]
+                deleted = self._memory.delete(key, namespace)
             
             if deleted:
                 self._stats["deletes"] += 1
@@ -236,23 +395,11 @@ class CacheManager:
             True if key exists
         """
         try:
-            namespaced_key = f"{namespace}:{key}"
-            
             if self.use_redis and self.redis_client:
-                return await self.redis_client.exists(namespaced_key) > 0
+                return await self.redis_client.exists(f"{namespace}:{key}") > 0
             else:
                 # Use in-memory cache
-                async with self._lock:
-                    if namespaced_key in self._cache:
-                        entry = self._cache[namespaced_key]
-                        current_time = time.time()
-                        
-                        # Check if expired
-                        if entry.expires_at and current_time > entry.expires_at:
-                            del self._cache[namespaced_key]
-                            return False
-                        return True
-                    return False
+                return self._memory.exists(key, namespace)
                 
         except Exception as e:
             logger.error(f"Cache exists check failed for key {key}: {e}")
@@ -277,13 +424,7 @@ class CacheManager:
                     await self.redis_client.delete(*keys)
             else:
                 # Clear in-memory cache
-                async with self._lock:
-                    keys_to_delete = [
-                        key for key in self._cache.keys() 
-                        if key.startswith(f"{namespace}:")
-                    ]
-                    for key in keys_to_delete:
-                        del self._cache[key]
+                self._memory.clear_namespace(namespace)
             
             return True
             
@@ -299,16 +440,20 @@ class CacheManager:
             Cache statistics
         """
         stats = self._stats.copy()
+        stats.update(self._flight_stats)
+        stats["inflight_loads"] = len(self._inflight)
         stats["cache_type"] = "redis" if self.use_redis else "memory"
-        stats["hit_rate"] = (
-            stats["hits"] / (stats["hits"] + stats["misses"])
-            if (stats["hits"] + stats["misses"]) > 0 else 0
-        )
+        reads = stats["hits"] + stats["misses"] + stats["stale_reads"]
+        stats["hit_rate"] = stats["hits"] / reads if reads > 0 else 0
         
         if not self.use_redis:
-            async with self._lock:
-                stats["total_entries"] = len(self._cache)
-                stats["memory_usage"] = len(self._cache)
+            namespaces = self._memory.get_namespace_stats()
+            stats["total_entries"] = sum(ns["entries"] for ns in namespaces.values())
+            stats["memory_usage"] = sum(ns["bytes"] for ns in namespaces.values())
+            stats["shards"] = self._memory.shard_count
+            stats["evictions"] = sum(ns["evictions"] for ns in namespaces.values())
+            stats["expirations"] = sum(ns["expirations"] for ns in namespaces.values())
+            stats["namespaces"] = namespaces
         
         return stats
     
@@ -319,32 +464,33 @@ class CacheManager:
                 await self.redis_client.close()
             
             # Clear in-memory cache
-            async with self._lock:
-                self._cache.clear()
+            self._memory.clear()
             
             logger.info("Cache manager closed")
         except Exception as e:
             logger.error(f"Error closing cache manager: {e}")
     
+    async def _maybe_cleanup_expired(self) -> None:
+        """Run _cleanup_expired if cleanup_interval has passed since the last sweep."""
+        now = time.monotonic()
+        if now - self._last_cleanup >= self.cleanup_interval:
+            self._last_cleanup = now
+            await self._cleanup_expired()
+    
     async def _cleanup_expired(self) -> None:
-        """Clean up expired entries from in-memory cache."""
-        current_time = time.time()
-        expired_keys = []
-        
-        for key, entry in self._cache.items():
-            if entry.expires_at and current_time > entry.expires_at:
-                expired_keys.append(key)
+        """Pop all due entries from the in-memory TTL heaps."""
+        expired = self._memory.purge_expired()
         
-        for key in expired_keys:
-            del self._cache[key]
-        
-        if expired_keys:
-            logger.debug(f"Cleaned up {len(expired_keys)} expired cache entries")
+        if expired:
+            logger.debug(f"Cleaned up {expired} expired cache entries")
     
     def _serialize(self, value: Any) -> str:
         """
         Serialize value for storage.
         
+        Decimal, datetime and tuple values are tagged so they round-trip
+        through Redis with their original types.
+        
         Args:
             value: Value to serialize
             
@@ -352,7 +498,7 @@ class CacheManager:
             Serialized string
         """
         try:
-            return json.dumps(value, default=str)
+            return json.dumps(_encode_typed(value), default=str)
         except (TypeError, ValueError):
             # Fallback to string representation
             return str(value)
@@ -368,11 +514,38 @@ class CacheManager:
             Deserialized value
         """
         try:
-            return json.loads(value)
-        except (json.JSONDecodeError, ValueError):
+            return json.loads(value, object_hook=_decode_typed)
+        except (json.JSONDecodeError, ValueError, InvalidOperation):
             return value
 
 
+def _encode_typed(value: Any) -> Any:
+    """Replace Decimal, datetime and tuple values with tagged JSON objects."""
+    if isinstance(value, Decimal):
+        return {_TYPE_TAG: "decimal", "value": str(value)}
+    if isinstance(value, datetime):
+        return {_TYPE_TAG: "datetime", "value": value.isoformat()}
+    if isinstance(value, tuple):
+        return {_TYPE_TAG: "tuple", "value": [_encode_typed(item) for item in value]}
+    if isinstance(value, list):
+        return [_encode_typed(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _encode_typed(item) for key, item in value.items()}
+    return value
+
+
+def _decode_typed(obj: Dict[str, Any]) -> Any:
+    """Restore a tagged JSON object written by _encode_typed."""
+    tag = obj.get(_TYPE_TAG)
+    if tag == "decimal":
+        return Decimal(obj["value"])
+    if tag == "datetime":
+        return datetime.fromisoformat(obj["value"])
+    if tag == "tuple":
+        return tuple(obj["value"])
+    return obj
+
+
 # Create aliases for backward compatibility
 SimpleCacheManager = CacheManager
 
@@ -0,0 +1,416 @@
+"""
+Sharded In-Memory Cache Backend
+File: app/core/performance/memory_cache.py
+
+Lock-striped in-process cache used by CacheManager when Redis is not in use.
+Keys are spread across N shards, each with its own lock, per-namespace LRU
+ordering, entry/byte budgets and a TTL min-heap, so no operation ever scans
+the whole cache.
+"""
+
+import heapq
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Returned by get_entry on a miss so cached None values stay distinguishable
+MISSING = object()
+
+
+@dataclass
+class NamespaceLimits:
+    """Memory budget for one cache namespace (across all shards)."""
+    max_entries: int = 100_000
+    max_bytes: int = 64 * 1024 * 1024
+
+
+@dataclass
+class NamespaceStats:
+    """Per-namespace cache counters."""
+    hits: int = 0
+    misses: int = 0
+    sets: int = 0
+    deletes: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+
+class _Entry:
+    """Stored value with TTL and size bookkeeping."""
+
+    __slots__ = ('value', 'expires_at', 'size', 'created_at', 'access_count')
+
+    def __init__(self, value: Any, expires_at: Optional[float], size: int, created_at: float):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+        self.created_at = created_at
+        self.access_count = 0
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """
+    Cheap recursive size estimate in bytes.
+
+    Args:
+        value: Value to measure
+        _depth: Recursion depth (containers deeper than 3 levels are not walked)
+
+    Returns:
+        Approximate memory footprint
+    """
+    size = sys.getsizeof(value)
+    if _depth >= 3:
+        return size
+
+    if isinstance(value, dict):
+        for k, v in value.items():
+            size += estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += estimate_size(item, _depth + 1)
+    return size
+
+
+class _Shard:
+    """One lock stripe: per-namespace LRU dicts plus a TTL heap."""
+
+    __slots__ = ('lock', 'namespaces', 'namespace_bytes', 'expiry_heap')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.namespaces: Dict[str, "OrderedDict[str, _Entry]"] = {}
+        self.namespace_bytes: Dict[str, int] = {}
+        self.expiry_heap: List[Tuple[float, str, str]] = []
+
+
+class ShardedMemoryCache:
+    """
+    N-way sharded in-memory cache with LRU eviction and heap-based TTL expiry.
+
+    Features:
+    - Per-shard locks; operations on different shards never contend
+    - O(1) LRU eviction per namespace using OrderedDict ordering
+    - Max-entries and max-bytes budgets per namespace
+    - TTL expiry driven by a min-heap (expired heads popped on each write)
+    - Hit/miss/eviction/expiration stats per namespace
+    """
+
+    def __init__(
+        self,
+        shards: int = 16,
+        default_limits: Optional[NamespaceLimits] = None,
+        namespace_limits: Optional[Dict[str, NamespaceLimits]] = None
+    ):
+        """
+        Initialize sharded cache.
+
+        Args:
+            shards: Number of shards (rounded up to a power of two)
+            default_limits: Budget for namespaces without explicit limits
+            namespace_limits: Explicit budgets per namespace
+        """
+        count = 1
+        while count < max(1, shards):
+            count <<= 1
+
+        self._shards = [_Shard() for _ in range(count)]
+        self._mask = count - 1
+        self.default_limits = default_limits or NamespaceLimits()
+        self.namespace_limits: Dict[str, NamespaceLimits] = dict(namespace_limits or {})
+        self._stats: Dict[str, NamespaceStats] = {}
+        self._stats_lock = threading.Lock()
+
+    @property
+    def shard_count(self) -> int:
+        """Number of shards."""
+        return len(self._shards)
+
+    def configure_namespace(self, namespace: str, max_entries: int, max_bytes: int) -> None:
+        """
+        Set the memory budget for a namespace.
+
+        Args:
+            namespace: Namespace name
+            max_entries: Maximum entries across all shards
+            max_bytes: Maximum estimated bytes across all shards
+        """
+        self.namespace_limits[namespace] = NamespaceLimits(max_entries=max_entries, max_bytes=max_bytes)
+
+    def _shard_for(self, namespace: str, key: str) -> _Shard:
+        return self._shards[hash((namespace, key)) & self._mask]
+
+    def _stats_for(self, namespace: str) -> NamespaceStats:
+        stats = self._stats.get(namespace)
+        if stats is None:
+            with self._stats_lock:
+                stats = self._stats.setdefault(namespace, NamespaceStats())
+        return stats
+
+    def _shard_budget(self, namespace: str) -> Tuple[int, int]:
+        """Per-shard share of a namespace budget."""
+        limits = self.namespace_limits.get(namespace, self.default_limits)
+        count = len(self._shards)
+        return max(1, -(-limits.max_entries // count)), max(1, -(-limits.max_bytes // count))
+
+    def get(self, key: str, namespace: str = "default", default: Any = None) -> Any:
+        """
+        Get a value and mark it most recently used.
+
+        Args:
+            key: Cache key
+            namespace: Key namespace
+            default: Returned on miss
+
+        Returns:
+            Cached value or default
+        """
+        value = self.get_entry(key, namespace)
+        return default if value is MISSING else value
+
+    def get_entry(self, key: str, namespace: str = "default") -> Any:
+        """
+        Get a value and mark it most recently used.
+
+        Args:
+            key: Cache key
+            namespace: Key namespace
+
+        Returns:
+            The value, or MISSING on miss
+        """
+        stats = self._stats_for(namespace)
+        shard = self._shard_for(namespace, key)
+
+        with shard.lock:
+            entries = shard.namespaces.get(namespace)
+            entry = entries.get(key) if entries is not None else None
+            if entry is None:
+                stats.misses += 1
+                return MISSING
+
+            if entry.expires_at is not None and time.monotonic() > entry.expires_at:
+                self._remove(shard, namespace, entries, key, entry, stats)
+                stats.expirations += 1
+                stats.misses += 1
+                return MISSING
+
+            entries.move_to_end(key)
+            entry.access_count += 1
+            stats.hits += 1
+            return entry.value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None, namespace: str = "default") -> None:
+        """
+        Store a value, evicting least recently used entries past the budget.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Time to live in seconds
+            namespace: Key namespace
+        """
+        now = time.monotonic()
+        expires_at = now + ttl if ttl else None
+        size = estimate_size(value)
+        stats = self._stats_for(namespace)
+        shard = self._shard_for(namespace, key)
+        max_entries, max_bytes = self._shard_budget(namespace)
+
+        with shard.lock:
+            self._expire_due(shard, now)
+
+            entries = shard.namespaces.get(namespace)
+            if entries is None:
+                entries = shard.namespaces[namespace] = OrderedDict()
+
+            old = entries.get(key)
+            if old is not None:
+                self._remove(shard, namespace, entries, key, old, stats)
+
+            entries[key] = _Entry(value, expires_at, size, now)
+            shard_bytes = shard.namespace_bytes.get(namespace, 0) + size
+            stats.entries += 1
+            stats.bytes += size
+            stats.sets += 1
+
+            if expires_at is not None:
+                heapq.heappush(shard.expiry_heap, (expires_at, namespace, key))
+                if len(shard.expiry_heap) > 1024:
+                    self._compact_heap(shard)
+
+            # O(1) per eviction: least recently used entry is at the front
+            while len(entries) > 1 and (len(entries) > max_entries or shard_bytes > max_bytes):
+                old_key, old_entry = entries.popitem(last=False)
+                shard_bytes -= old_entry.size
+                stats.entries -= 1
+                stats.bytes -= old_entry.size
+                stats.evictions += 1
+
+            shard.namespace_bytes[namespace] = shard_bytes
+
+    def delete(self, key: str, namespace: str = "default") -> bool:
+        """
+        Delete a key.
+
+        Args:
+            key: Cache key
+            namespace: Key namespace
+
+        Returns:
+            True if the key existed
+        """
+        stats = self._stats_for(namespace)
+        shard = self._shard_for(namespace, key)
+
+        with shard.lock:
+            entries = shard.namespaces.get(namespace)
+            entry = entries.get(key) if entries is not None else None
+            if entry is None:
+                return False
+            self._remove(shard, namespace, entries, key, entry, stats)
+            stats.deletes += 1
+            return True
+
+    def exists(self, key: str, namespace: str = "default") -> bool:
+        """Check whether a non-expired key exists without touching LRU order or stats."""
+        shard = self._shard_for(namespace, key)
+        with shard.lock:
+            entries = shard.namespaces.get(namespace)
+            entry = entries.get(key) if entries is not None else None
+            if entry is None:
+                return False
+            return entry.expires_at is None or time.monotonic() <= entry.expires_at
+
+    def clear_namespace(self, namespace: str) -> int:
+        """
+        Drop every key in a namespace.
+
+        Args:
+            namespace: Namespace to clear
+
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        for shard in self._shards:
+            with shard.lock:
+                entries = shard.namespaces.pop(namespace, None)
+                shard.namespace_bytes.pop(namespace, None)
+                if entries:
+                    removed += len(entries)
+
+        stats = self._stats_for(namespace)
+        stats.entries = 0
+        stats.bytes = 0
+        return removed
+
+    def clear(self) -> None:
+        """Drop everything."""
+        for shard in self._shards:
+            with shard.lock:
+                shard.namespaces.clear()
+                shard.namespace_bytes.clear()
+                shard.expiry_heap.clear()
+        for stats in self._stats.values():
+            stats.entries = 0
+            stats.bytes = 0
+
+    def purge_expired(self) -> int:
+        """
+        Pop every due entry from the TTL heaps.
+
+        Returns:
+            Number of entries expired
+        """
+        now = time.monotonic()
+        expired = 0
+        for shard in self._shards:
+            with shard.lock:
+                expired += self._expire_due(shard, now)
+        return expired
+
+    def __len__(self) -> int:
+        return sum(stats.entries for stats in self._stats.values())
+
+    def _expire_due(self, shard: _Shard, now: float) -> int:
+        """Pop heap heads whose deadline has passed (caller holds shard lock)."""
+        heap = shard.expiry_heap
+        expired = 0
+        while heap and heap[0][0] <= now:
+            expires_at, namespace, key = heapq.heappop(heap)
+            entries = shard.namespaces.get(namespace)
+            entry = entries.get(key) if entries is not None else None
+            # Skip stale heap records for keys that were overwritten or deleted
+            if entry is None or entry.expires_at != expires_at:
+                continue
+            stats = self._stats_for(namespace)
+            self._remove(shard, namespace, entries, key, entry, stats)
+            stats.expirations += 1
+            expired += 1
+        return expired
+
+    @staticmethod
+    def _compact_heap(shard: _Shard) -> None:
+        """Rebuild the TTL heap once stale records from overwrites dominate it."""
+        live = sum(len(entries) for entries in shard.namespaces.values())
+        if len(shard.expiry_heap) <= 4 * live:
+            return
+
+        shard.expiry_heap = [
+            (entry.expires_at, namespace, key)
+            for namespace, entries in shard.namespaces.items()
+            for key, entry in entries.items()
+            if entry.expires_at is not None
+        ]
+        heapq.heapify(shard.expiry_heap)
+
+    @staticmethod
+    def _remove(
+        shard: _Shard,
+        namespace: str,
+        entries: "OrderedDict[str, _Entry]",
+        key: str,
+        entry: _Entry,
+        stats: NamespaceStats
+    ) -> None:
+        """Remove one entry and update byte/entry accounting (caller holds shard lock)."""
+        del entries[key]
+        shard.namespace_bytes[namespace] = shard.namespace_bytes.get(namespace, 0) - entry.size
+        stats.entries -= 1
+        stats.bytes -= entry.size
+
+    def get_namespace_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get hit/miss/eviction stats per namespace.
+
+        Returns:
+            Mapping of namespace -> counters and budget
+        """
+        result = {}
+        for namespace, stats in list(self._stats.items()):
+            limits = self.namespace_limits.get(namespace, self.default_limits)
+            lookups = stats.hits + stats.misses
+            result[namespace] = {
+                'hits': stats.hits,
+                'misses': stats.misses,
+                'hit_rate': stats.hits / lookups if lookups else 0,
+                'sets': stats.sets,
+                'deletes': stats.deletes,
+                'evictions': stats.evictions,
+                'expirations': stats.expirations,
+                'entries': stats.entries,
+                'bytes': stats.bytes,
+                'max_entries': limits.max_entries,
+                'max_bytes': limits.max_bytes,
+            }
+        return result
@@ -7,6 +7,7 @@ Implements sophisticated stop-loss strategies for optimal risk management.
 """
 
 import asyncio
+import itertools
 import logging
 from datetime import datetime, timedelta
 from decimal import Decimal, ROUND_DOWN
@@ -16,7 +17,8 @@ from enum import Enum
 import math
 
 from app.core.performance.cache_manager import cache_manager
-from app.utils.logger import setup_logger, get_trading_logger, get_performance_logger, get_trading_logger, get_performance_logger
+from app.core.risk.trigger_book import TriggerBook
+from app.utils.logger import setup_logger
 from app.utils.exceptions import DexSnipingException
 from app.config import settings
 
@@ -129,6 +131,11 @@ class StopLossManager:
     - Time-based stop adjustments
     - Automated execution with slippage protection
     - Real-time monitoring and alerts
+    
+    Price-below stops are indexed in a TriggerBook, so a price pushed via
+    update_price_feed() only touches orders whose stop it crosses. The
+    monitoring loop polls the remaining orders (other trigger conditions,
+    or tokens with no pushed price).
     """
     
     def __init__(self):
@@ -142,6 +149,13 @@ class StopLossManager:
         self.is_monitoring = False
         self.check_interval = 1.0  # Check every second
         
+        # Event-driven triggering
+        self.trigger_book = TriggerBook()
+        self._pending_triggers: List[Tuple[str, Decimal]] = []
+        self._pending_adjustments: Dict[str, Decimal] = {}  # order_id -> stop before adjustment
+        self._trigger_task: Optional[asyncio.Task] = None
+        self._order_sequence = itertools.count(1)
+        
         # Execution callbacks
         self.execution_callbacks: List[Callable] = []
         self.price_update_callbacks: List[Callable] = []
@@ -182,7 +196,8 @@ class StopLossManager:
         """
         try:
             # Generate order ID
-            order_id = f"sl_{token_address[:8]}_{int(datetime.utcnow().timestamp())}"
+            order_id = (f"sl_{token_address[:8]}_{int(datetime.utcnow().timestamp())}"
+                        f"_{next(self._order_sequence)}")
             
             # Calculate stop price if not provided
             if stop_price is None:
@@ -212,10 +227,11 @@ class StopLossManager:
             # Initialize trailing stop parameters
             if stop_type == StopLossType.TRAILING:
                 stop_order.highest_price = entry_price
-                stop_order.trail_activation_price = entry_price * (1 + trail_distance)
+                stop_order.trail_activation_price = entry_price * (1 + stop_order.trail_distance)
             
             # Add to active orders
             self.active_orders[order_id] = stop_order
+            self._index_order(stop_order)
             
             # Start monitoring if not already running
             if not self.is_monitoring:
@@ -281,6 +297,7 @@ class StopLossManager:
                     old_stop = stop_order.stop_price
                     stop_order.stop_price = new_stop_price
                     stop_order.updated_at = datetime.utcnow()
+                    self.trigger_book.reprice(stop_order)
                     
                     # Update cache
                     await self._cache_stop_order(stop_order)
@@ -293,6 +310,8 @@ class StopLossManager:
                     await self._trigger_adjustment_callbacks(stop_order, old_stop, new_stop_price)
                     
                     return True
+                
+                self.trigger_book.reprice(stop_order)
             
             return False
             
@@ -330,6 +349,7 @@ class StopLossManager:
             # Update order status
             stop_order.status = StopLossStatus.TRIGGERED
             stop_order.triggered_at = datetime.utcnow()
+            self.trigger_book.remove(order_id)
             
             # Execute the trade
             execution_result = await self._execute_stop_trade(stop_order, trigger_price)
@@ -360,6 +380,7 @@ class StopLossManager:
                 # Execution failed
                 stop_order.status = StopLossStatus.ACTIVE  # Revert to active
                 stop_order.triggered_at = None
+                self._index_order(stop_order)
                 
                 logger.error(f"[ERROR] Stop-loss execution failed: {order_id}")
             
@@ -408,6 +429,7 @@ class StopLossManager:
                 old_stop = stop_order.stop_price
                 stop_order.stop_price = new_stop_price
                 stop_order.updated_at = datetime.utcnow()
+                self.trigger_book.reprice(stop_order)
                 
                 await self._cache_stop_order(stop_order)
                 
@@ -437,6 +459,7 @@ class StopLossManager:
             # Move to executed orders (for history)
             self.executed_orders[order_id] = stop_order
             del self.active_orders[order_id]
+            self.trigger_book.remove(order_id)
             
             # Update cache
             await self._cache_executed_order(stop_order)
@@ -473,10 +496,11 @@ class StopLossManager:
         """Main monitoring loop for stop-loss orders."""
         while self.is_monitoring:
             try:
-                # Check all active orders
-                orders_to_check = list(self.active_orders.values())
+                # Execute triggers pushed by price ticks
+                await self.process_pending_triggers()
                 
-                for stop_order in orders_to_check:
+                # Poll only the orders price ticks cannot reach
+                for stop_order in self._orders_to_poll():
                     await self._check_stop_order(stop_order)
                 
                 # Remove expired orders
@@ -491,6 +515,87 @@ class StopLossManager:
                 logger.error(f"Error in monitoring loop: {e}")
                 await asyncio.sleep(self.check_interval)
 
+    def _index_order(self, stop_order: StopLossOrder) -> bool:
+        """Add an order to the trigger book if a price tick can trigger it."""
+        if (stop_order.status != StopLossStatus.ACTIVE or
+                stop_order.trigger_condition != TriggerCondition.PRICE_BELOW):
+            return False
+        self.trigger_book.add(stop_order, trailing=stop_order.stop_type == StopLossType.TRAILING)
+        return True
+
+    def _orders_to_poll(self) -> List[StopLossOrder]:
+        """Active orders not covered by pushed prices."""
+        orders = [order for order_id, order in self.active_orders.items()
+                  if order_id not in self.trigger_book]
+        for token_address in self.trigger_book.tokens():
+            if token_address not in self.price_feeds:
+                orders.extend(self.trigger_book.orders(token_address))
+        # Dynamic stops are re-derived from volatility, not from ticks
+        orders.extend(order for order in self.active_orders.values()
+                      if order.stop_type == StopLossType.DYNAMIC and
+                      order.token_address in self.price_feeds and
+                      order.order_id in self.trigger_book)
+        return orders
+
+    async def process_pending_triggers(self) -> int:
+        """
+        Execute orders triggered by price ticks and persist trailing adjustments.
+        
+        Method: process_pending_triggers()
+        
+        Returns:
+            Number of stop-loss orders executed
+            
+        Raises:
+            Exception: From the failing item; items not yet processed are
+                put back in the queues first
+        """
+        adjustments, self._pending_adjustments = self._pending_adjustments, {}
+        remaining = list(adjustments.items())
+        while remaining:
+            order_id, old_stop = remaining.pop(0)
+            stop_order = self.active_orders.get(order_id)
+            if stop_order is None:
+                continue
+            try:
+                stop_order.updated_at = datetime.utcnow()
+                await self._cache_stop_order(stop_order)
+                await self._trigger_adjustment_callbacks(stop_order, old_stop, stop_order.stop_price)
+            except Exception:
+                # Earlier stops win over adjustments queued meanwhile
+                self._pending_adjustments = {**self._pending_adjustments, **dict(remaining)}
+                raise
+        
+        triggers, self._pending_triggers = self._pending_triggers, []
+        executed = 0
+        for i, (order_id, trigger_price) in enumerate(triggers):
+            try:
+                execution = await self.execute_stop_loss(order_id, trigger_price, "price_trigger")
+            except Exception:
+                self._pending_triggers = triggers[i + 1:] + self._pending_triggers
+                raise
+            if execution and execution.success:
+                executed += 1
+        return executed
+
+    def _schedule_pending_triggers(self) -> None:
+        """Process pending triggers on the running event loop, if any."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Picked up by the monitoring loop or process_pending_triggers()
+        if self._trigger_task is None or self._trigger_task.done():
+            self._trigger_task = loop.create_task(self._drain_pending_triggers())
+
+    async def _drain_pending_triggers(self) -> None:
+        """Process pending triggers until none are left, including ticks that fired meanwhile."""
+        while self._pending_triggers or self._pending_adjustments:
+            try:
+                await self.process_pending_triggers()
+            except Exception as e:
+                # The failing item is dropped; the rest were requeued
+                logger.error(f"Error processing pending triggers: {e}")
+
     async def _check_stop_order(self, stop_order: StopLossOrder) -> None:
         """Check individual stop-loss order for triggers."""
         try:
@@ -751,8 +856,12 @@ class StopLossManager:
     async def _update_performance_metrics(self) -> None:
         """Update performance metrics for all orders."""
         try:
+            prices: Dict[str, Optional[Decimal]] = {}
             for stop_order in self.active_orders.values():
-                current_price = await self._get_current_price(stop_order.token_address)
+                token_address = stop_order.token_address
+                if token_address not in prices:
+                    prices[token_address] = await self._get_current_price(token_address)
+                current_price = prices[token_address]
                 if current_price:
                     stop_order.unrealized_pnl = (current_price - stop_order.entry_price) * stop_order.position_size
                     stop_order.max_profit = max(stop_order.max_profit, stop_order.unrealized_pnl)
@@ -797,9 +906,31 @@ class StopLossManager:
         except Exception as e:
             logger.error(f"Error triggering execution callbacks: {e}")
 
-    def update_price_feed(self, token_address: str, price: Decimal) -> None:
-        """Update price feed for real-time monitoring."""
+    def update_price_feed(self, token_address: str, price: Decimal) -> List[str]:
+        """
+        Update price feed for real-time monitoring.
+        
+        Only orders on this token whose stop the price crosses (or whose
+        trailing stop it raises) are touched. Triggered orders are executed
+        on the running event loop, or by the next process_pending_triggers().
+        
+        Args:
+            token_address: Token contract address
+            price: Current token price
+            
+        Returns:
+            IDs of stop-loss orders triggered by this price
+        """
         self.price_feeds[token_address] = price
+        tick = self.trigger_book.on_price(token_address, price)
+        if not tick:
+            return []
+        
+        for stop_order, old_stop in tick.adjusted:
+            self._pending_adjustments.setdefault(stop_order.order_id, old_stop)
+        self._pending_triggers.extend((stop_order.order_id, price) for stop_order in tick.triggered)
+        self._schedule_pending_triggers()
+        return [stop_order.order_id for stop_order in tick.triggered]
 
     def add_execution_callback(self, callback: Callable) -> None:
         """Add callback for stop-loss executions."""
@@ -857,7 +988,8 @@ class StopLossManager:
                 'trigger_rate': (triggered_orders / total_orders * 100) if total_orders > 0 else 0,
                 'total_realized_pnl': total_realized_pnl,
                 'total_unrealized_pnl': total_unrealized_pnl,
-                'is_monitoring': self.is_monitoring
+                'is_monitoring': self.is_monitoring,
+                'trigger_book': self.trigger_book.get_stats()
             }
             
         except Exception as e:
@@ -868,9 +1000,14 @@ class StopLossManager:
         """Clean up resources."""
         try:
             await self.stop_monitoring()
+            if self._trigger_task and not self._trigger_task.done():
+                self._trigger_task.cancel()
             self.active_orders.clear()
             self.executed_orders.clear()
             self.price_feeds.clear()
+            self.trigger_book = TriggerBook()
+            self._pending_triggers.clear()
+            self._pending_adjustments.clear()
             logger.info("[OK] StopLossManager cleanup completed")
             
         except Exception as e:
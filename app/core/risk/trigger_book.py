@@ -0,0 +1,243 @@
+"""
+Stop-Loss Trigger Book
+File: app/core/risk/trigger_book.py
+
+Price-indexed book of stop levels, one per token, driven by price ticks.
+Each token keeps a max-heap of stop prices, so a tick pops exactly the
+orders whose stop was crossed, and a min-heap of trailing-stop raise
+thresholds, so only trailing orders that reached a new high are re-keyed
+(O(log n) each). Re-keyed orders leave stale heap entries behind; those are
+skipped by sequence number and compacted away when they pile up.
+"""
+
+import heapq
+import itertools
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Rebuild a token's heaps once stale entries outnumber live ones by this much
+COMPACTION_SLACK = 64
+
+
+@dataclass
+class _IndexedOrder:
+    """Book bookkeeping for one order."""
+    order: Any
+    trailing: bool
+    stop_seq: int = 0
+    raise_seq: Optional[int] = None
+
+
+@dataclass
+class _TokenBook:
+    """Heaps for one token."""
+    # (-stop_price, seq, order_id): largest stop on top
+    stops: List[Tuple[Decimal, int, str]] = field(default_factory=list)
+    # (threshold, exclusive, seq, order_id): lowest trailing raise threshold on top
+    raises: List[Tuple[Decimal, int, int, str]] = field(default_factory=list)
+    order_ids: set = field(default_factory=set)
+    trailing_count: int = 0
+
+
+@dataclass
+class TickResult:
+    """Orders touched by one price tick."""
+    triggered: List[Any] = field(default_factory=list)
+    adjusted: List[Tuple[Any, Decimal]] = field(default_factory=list)  # (order, old stop price)
+
+    def __bool__(self) -> bool:
+        return bool(self.triggered or self.adjusted)
+
+
+def _raise_threshold(order: Any) -> Tuple[Decimal, int]:
+    """
+    Price at which a trailing stop next moves up.
+
+    Before activation the stop moves once the price reaches the activation
+    price; afterwards, once it exceeds the highest price seen.
+    """
+    highest = order.highest_price or order.entry_price
+    activation = order.trail_activation_price
+    if activation is not None and activation > highest:
+        return activation, 0
+    return highest, 1
+
+
+class TriggerBook:
+    """
+    Per-token index of long stop-loss levels (trigger when price <= stop).
+
+    Orders are duck-typed: they need order_id, token_address and
+    stop_price, and trailing orders also entry_price, highest_price,
+    trail_distance and trail_activation_price. Trailing adjustments are
+    applied to the order objects in place.
+    """
+
+    def __init__(self):
+        self._books: Dict[str, _TokenBook] = {}
+        self._orders: Dict[str, _IndexedOrder] = {}
+        self._sequence = itertools.count()
+        self.stats = {
+            'ticks': 0,
+            'ticks_without_orders': 0,
+            'orders_triggered': 0,
+            'trailing_adjustments': 0,
+            'stale_entries_skipped': 0,
+            'compactions': 0,
+        }
+
+    def __contains__(self, order_id: str) -> bool:
+        return order_id in self._orders
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def tokens(self) -> List[str]:
+        """Tokens with indexed orders."""
+        return list(self._books)
+
+    def orders(self, token_address: str) -> List[Any]:
+        """Indexed orders for a token."""
+        book = self._books.get(token_address)
+        if book is None:
+            return []
+        return [self._orders[order_id].order for order_id in book.order_ids]
+
+    def add(self, order: Any, trailing: bool = False) -> None:
+        """
+        Index an order (re-indexes it if already present).
+
+        Args:
+            order: Stop-loss order
+            trailing: Whether the stop trails new highs
+        """
+        self.remove(order.order_id)
+        book = self._books.setdefault(order.token_address, _TokenBook())
+        entry = _IndexedOrder(order=order, trailing=trailing and order.trail_distance is not None)
+        self._orders[order.order_id] = entry
+        book.order_ids.add(order.order_id)
+        self._push_stop(book, entry)
+        if entry.trailing:
+            book.trailing_count += 1
+            self._push_raise(book, entry)
+
+    def remove(self, order_id: str) -> bool:
+        """Drop an order; its heap entries become stale."""
+        entry = self._orders.pop(order_id, None)
+        if entry is None:
+            return False
+        token = entry.order.token_address
+        book = self._books[token]
+        book.order_ids.discard(order_id)
+        if entry.trailing:
+            book.trailing_count -= 1
+        if not book.order_ids:
+            del self._books[token]
+        return True
+
+    def reprice(self, order: Any) -> None:
+        """Re-key an order whose stop or trailing state was changed outside the book."""
+        entry = self._orders.get(order.order_id)
+        if entry is None:
+            return
+        book = self._books[order.token_address]
+        self._push_stop(book, entry)
+        if entry.trailing:
+            self._push_raise(book, entry)
+        self._maybe_compact(book)
+
+    def on_price(self, token_address: str, price: Decimal) -> TickResult:
+        """
+        Apply a price tick to one token.
+
+        Trailing stops are raised first (as a polling check would do),
+        then every order with stop >= price is removed and returned.
+
+        Args:
+            token_address: Token the price is for
+            price: New price
+
+        Returns:
+            Triggered orders and trailing adjustments
+        """
+        self.stats['ticks'] += 1
+        result = TickResult()
+        book = self._books.get(token_address)
+        if book is None:
+            self.stats['ticks_without_orders'] += 1
+            return result
+
+        raises = book.raises
+        while raises and (raises[0][0] < price or (raises[0][0] == price and not raises[0][1])):
+            _, _, seq, order_id = heapq.heappop(raises)
+            entry = self._orders.get(order_id)
+            if entry is None or entry.raise_seq != seq:
+                self.stats['stale_entries_skipped'] += 1
+                continue
+            order = entry.order
+            order.highest_price = price
+            new_stop = price * (1 - order.trail_distance)
+            if new_stop > order.stop_price:
+                result.adjusted.append((order, order.stop_price))
+                order.stop_price = new_stop
+                self._push_stop(book, entry)
+                self.stats['trailing_adjustments'] += 1
+            self._push_raise(book, entry)
+
+        stops = book.stops
+        while stops and -stops[0][0] >= price:
+            _, seq, order_id = heapq.heappop(stops)
+            entry = self._orders.get(order_id)
+            if entry is None or entry.stop_seq != seq:
+                self.stats['stale_entries_skipped'] += 1
+                continue
+            result.triggered.append(entry.order)
+            self.remove(order_id)
+
+        self.stats['orders_triggered'] += len(result.triggered)
+        if token_address in self._books:
+            self._maybe_compact(book)
+        return result
+
+    def _push_stop(self, book: _TokenBook, entry: _IndexedOrder) -> None:
+        """Push the order's current stop price."""
+        entry.stop_seq = next(self._sequence)
+        heapq.heappush(book.stops, (-entry.order.stop_price, entry.stop_seq, entry.order.order_id))
+
+    def _push_raise(self, book: _TokenBook, entry: _IndexedOrder) -> None:
+        """Push the price at which the trailing stop next moves."""
+        threshold, exclusive = _raise_threshold(entry.order)
+        entry.raise_seq = next(self._sequence)
+        heapq.heappush(book.raises, (threshold, exclusive, entry.raise_seq, entry.order.order_id))
+
+    def _maybe_compact(self, book: _TokenBook) -> None:
+        """Rebuild heaps without stale entries when they dominate."""
+        live = len(book.order_ids)
+        if len(book.stops) <= 2 * live + COMPACTION_SLACK and \
+                len(book.raises) <= 2 * book.trailing_count + COMPACTION_SLACK:
+            return
+        book.stops = [
+            item for item in book.stops
+            if item[2] in self._orders and self._orders[item[2]].stop_seq == item[1]
+        ]
+        book.raises = [
+            item for item in book.raises
+            if item[3] in self._orders and self._orders[item[3]].raise_seq == item[2]
+        ]
+        heapq.heapify(book.stops)
+        heapq.heapify(book.raises)
+        self.stats['compactions'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Tick counts and book sizes."""
+        return {
+            **self.stats,
+            'tokens': len(self._books),
+            'orders': len(self._orders),
+            'heap_entries': sum(len(b.stops) + len(b.raises) for b in self._books.values()),
+        }
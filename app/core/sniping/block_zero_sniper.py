@@ -8,6 +8,7 @@ Implements MEV protection and gas optimization strategies.
 
 import asyncio
 import time
+from collections import OrderedDict
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
 from decimal import Decimal
@@ -16,11 +17,17 @@ import json
 
 from web3 import Web3
 from eth_account import Account
-from eth_abi import encode_abi
+from eth_keys import keys
+from eth_utils import keccak
+from hexbytes import HexBytes
 import requests
 
 from app.core.mempool.mempool_scanner import LiquidityAddEvent
 from app.core.blockchain.base_chain import BaseChain
+from app.core.blockchain.chain_state import ChainStateCache
+from app.core.blockchain.confirmation_tracker import ConfirmationStatus, ConfirmationTracker
+from app.core.sniping.nonce_manager import NonceManager
+from app.core.sniping.snipe_templates import SwapCalldataTemplate
 from app.core.performance.cache_manager import cache_manager
 from app.core.performance.circuit_breaker import CircuitBreakerManager
 from app.utils.logger import setup_logger
@@ -29,6 +36,9 @@ from app.config import settings
 
 logger = setup_logger(__name__, "application")
 
+# Gas tiers, cheapest first; pre-signed sets hold one transaction per tier
+GAS_TIERS = ('conservative', 'normal', 'aggressive')
+
 
 class BlockZeroSniperError(DexSnipingException):
     """Exception raised when Block 0 sniping operations fail."""
@@ -47,6 +57,9 @@ class SnipeConfig:
     use_flashbots: bool = True    # Use Flashbots for MEV protection
     max_priority_fee_gwei: int = 10
     base_fee_multiplier: float = 1.2
+    use_hot_path: bool = True     # Local nonce, calldata template, pre-signed tiers
+    max_prepared_snipes: int = 256
+    min_deadline_remaining: int = 60  # Re-sign pre-signed sets closer to their deadline
 
 
 @dataclass
@@ -68,6 +81,44 @@ class SnipeTransaction:
     def gas_price_gwei(self) -> float:
         """Get gas price in Gwei."""
         return self.gas_price / 10**9
+    
+    @property
+    def nonce(self) -> int:
+        """Get transaction nonce."""
+        return self.raw_transaction['nonce']
+
+
+@dataclass
+class PreSignedSnipe:
+    """Snipe transactions for one token signed ahead of time, one per gas tier, sharing a nonce."""
+    token_address: str
+    router_address: str
+    eth_amount: Decimal
+    nonce: int
+    deadline: int
+    transactions: Dict[str, SnipeTransaction]
+    prepared_at: float = field(default_factory=time.time)
+    
+    def select(self, priority: str, min_max_fee: Optional[int] = None) -> Optional[SnipeTransaction]:
+        """
+        Pick the signed transaction for a priority.
+        
+        Falls back to higher tiers when the requested one cannot cover
+        min_max_fee (the predicted base fee of the next block).
+        
+        Args:
+            priority: Requested gas tier
+            min_max_fee: Lowest acceptable maxFeePerGas, if known
+            
+        Returns:
+            Signed transaction, or None if no tier is usable
+        """
+        tiers = GAS_TIERS[GAS_TIERS.index(priority):] if priority in GAS_TIERS else (priority,)
+        for tier in tiers:
+            snipe_tx = self.transactions.get(tier)
+            if snipe_tx is not None and (min_max_fee is None or snipe_tx.gas_price >= min_max_fee):
+                return snipe_tx
+        return None
 
 
 @dataclass
@@ -83,6 +134,7 @@ class SnipeResult:
     error_message: Optional[str] = None
     execution_time_ms: float = 0.0
     mev_protection_used: bool = False
+    nonce: Optional[int] = None
 
 
 @dataclass
@@ -112,7 +164,14 @@ class BlockZeroSniper:
     - Real-time execution monitoring
     """
     
-    def __init__(self, network: str, w3: Web3, private_key: str):
+    def __init__(
+        self,
+        network: str,
+        w3: Web3,
+        private_key: str,
+        chain_state: Optional[ChainStateCache] = None,
+        confirmation_tracker: Optional[ConfirmationTracker] = None
+    ):
         """
         Initialize Block 0 sniper.
         
@@ -120,9 +179,15 @@ class BlockZeroSniper:
             network: Network name
             w3: Web3 instance
             private_key: Private key for signing transactions
+            chain_state: Shared chain state cache; when fresh, base fee and
+                chain ID are read from it instead of the RPC
+            confirmation_tracker: Shared block-driven tracker; replaces
+                per-transaction receipt polling in monitor_snipe_result()
         """
         self.network = network
         self.w3 = w3
+        self.chain_state = chain_state
+        self.confirmation_tracker = confirmation_tracker
         self.account = Account.from_key(private_key)
         self.circuit_breaker_manager = CircuitBreakerManager()
         
@@ -142,10 +207,26 @@ class BlockZeroSniper:
         self.flashbots_enabled = getattr(settings, 'use_flashbots', True)
         self.flashbots_relay_url = 'https://relay.flashbots.net'
         
+        # Hot path: local nonces, calldata template, pre-signed transactions
+        self.nonce_manager = NonceManager()
+        self.swap_template = SwapCalldataTemplate(self._get_weth_address(), self.account.address)
+        self.prepared_snipes: 'OrderedDict[str, PreSignedSnipe]' = OrderedDict()
+        # Parsed once: signing with raw key bytes re-derives the public key every time
+        self._signing_key = keys.PrivateKey(bytes(self.account.key))
+        self._chain_id: Optional[int] = None
+        
         # Statistics
         self.snipe_attempts = 0
         self.successful_snipes = 0
         self.failed_snipes = 0
+        self.hot_path_stats = {
+            'prepared': 0,
+            'presigned_hits': 0,
+            'presigned_stale': 0,
+            'template_builds': 0,
+            'cold_builds': 0,
+            'last_build_us': 0.0,
+        }
         
         logger.info(f"BlockZeroSniper initialized for {network}")
     
@@ -228,13 +309,22 @@ class BlockZeroSniper:
             
             self.snipe_attempts += 1
             
-            # Validate snipe parameters
-            await self._validate_snipe_parameters(liquidity_event, eth_amount)
+            # Validate snipe parameters (balance was checked when a set was pre-signed)
+            prepared = self.prepared_snipes.get(liquidity_event.token_address.lower())
+            await self._validate_snipe_parameters(
+                liquidity_event, eth_amount, check_balance=prepared is None
+            )
             
             # Build snipe transaction
-            snipe_tx = await self._build_snipe_transaction(
-                liquidity_event, eth_amount, priority
-            )
+            if self.config.use_hot_path:
+                snipe_tx = await self._build_hot_snipe_transaction(
+                    liquidity_event, eth_amount, priority
+                )
+            else:
+                self.hot_path_stats['cold_builds'] += 1
+                snipe_tx = await self._build_snipe_transaction(
+                    liquidity_event, eth_amount, priority
+                )
             
             # Execute transaction with MEV protection if enabled
             if self.flashbots_enabled:
@@ -242,6 +332,12 @@ class BlockZeroSniper:
             else:
                 result = await self._execute_regular_snipe(snipe_tx)
             
+            result.nonce = snipe_tx.nonce
+            if result.status == 'failed' and self.config.use_hot_path:
+                # Never broadcast: hand the nonce back, or re-read it if later ones are out
+                if not self.nonce_manager.release(self.account.address, snipe_tx.nonce):
+                    self._sync_nonce(resync=True)
+            
             # Update statistics
             if result.status == 'confirmed':
                 self.successful_snipes += 1
@@ -275,7 +371,8 @@ class BlockZeroSniper:
     async def _validate_snipe_parameters(
         self,
         liquidity_event: LiquidityAddEvent,
-        eth_amount: float
+        eth_amount: float,
+        check_balance: bool = True
     ) -> None:
         """
         Validate sniping parameters before execution.
@@ -283,6 +380,7 @@ class BlockZeroSniper:
         Args:
             liquidity_event: Liquidity event to validate
             eth_amount: ETH amount to validate
+            check_balance: Query the account balance
             
         Raises:
             BlockZeroSniperError: If parameters are invalid
@@ -299,17 +397,18 @@ class BlockZeroSniper:
             )
         
         # Check account balance
-        balance = self.w3.eth.get_balance(self.account.address)
-        balance_eth = balance / 10**18
-        
-        if balance_eth < eth_amount * 1.1:  # Include gas costs
-            raise BlockZeroSniperError(
-                f"Insufficient balance: {balance_eth:.4f} ETH available, "
-                f"{eth_amount * 1.1:.4f} ETH needed"
-            )
+        if check_balance:
+            balance = self.w3.eth.get_balance(self.account.address)
+            balance_eth = balance / 10**18
+            
+            if balance_eth < eth_amount * 1.1:  # Include gas costs
+                raise BlockZeroSniperError(
+                    f"Insufficient balance: {balance_eth:.4f} ETH available, "
+                    f"{eth_amount * 1.1:.4f} ETH needed"
+                )
         
         # Validate token address
-        if not Web3.isAddress(liquidity_event.token_address):
+        if not Web3.is_address(liquidity_event.token_address):
             raise BlockZeroSniperError(f"Invalid token address: {liquidity_event.token_address}")
         
         # Check if DEX is supported
@@ -340,7 +439,7 @@ class BlockZeroSniper:
             router_address = self.routers[dex_name]
             
             # Build transaction parameters
-            token_address = Web3.toChecksumAddress(liquidity_event.token_address)
+            token_address = Web3.to_checksum_address(liquidity_event.token_address)
             weth_address = self._get_weth_address()
             
             # Create trading path
@@ -385,7 +484,7 @@ class BlockZeroSniper:
                 'maxFeePerGas': gas_strategy.max_fee,
                 'maxPriorityFeePerGas': gas_strategy.priority_fee,
                 'data': transaction_data,
-                'chainId': self.w3.eth.chain_id
+                'chainId': self._get_chain_id()
             }
             
             # Sign transaction
@@ -415,6 +514,208 @@ class BlockZeroSniper:
             logger.error(f"Error building snipe transaction: {e}")
             raise BlockZeroSniperError(f"Transaction building failed: {e}")
     
+    async def prepare_snipe(
+        self,
+        liquidity_event: LiquidityAddEvent,
+        eth_amount: float
+    ) -> Optional[PreSignedSnipe]:
+        """
+        Pre-sign snipe transactions at every gas tier for a detected token.
+        
+        Called as soon as a token is detected so that snipe_token_launch()
+        only has to pick a tier. The set is used if the wallet's next nonce
+        and the amount still match when the snipe fires.
+        
+        Args:
+            liquidity_event: Detected token / liquidity event
+            eth_amount: ETH amount the snipe will spend
+            
+        Returns:
+            PreSignedSnipe, or None if the token cannot be sniped
+        """
+        try:
+            await self._validate_snipe_parameters(liquidity_event, eth_amount)
+            
+            token_address = Web3.to_checksum_address(liquidity_event.token_address)
+            router_address = self.routers[liquidity_event.dex.lower()]
+            nonce = self._next_nonce()
+            deadline = int(time.time()) + self.config.deadline_seconds
+            
+            transactions = {}
+            for tier in GAS_TIERS:
+                gas_strategy = await self._get_gas_strategy(tier)
+                transactions[tier] = self._sign_snipe(
+                    token_address, router_address, eth_amount, gas_strategy, nonce, deadline
+                )
+            
+            prepared = PreSignedSnipe(
+                token_address=token_address,
+                router_address=router_address,
+                eth_amount=Decimal(str(eth_amount)),
+                nonce=nonce,
+                deadline=deadline,
+                transactions=transactions
+            )
+            
+            key = token_address.lower()
+            self.prepared_snipes[key] = prepared
+            self.prepared_snipes.move_to_end(key)
+            while len(self.prepared_snipes) > self.config.max_prepared_snipes:
+                self.prepared_snipes.popitem(last=False)
+            self.hot_path_stats['prepared'] += 1
+            
+            logger.info(f"Pre-signed {len(transactions)} snipe transactions for {token_address} (nonce {nonce})")
+            return prepared
+            
+        except Exception as e:
+            logger.warning(f"Could not pre-sign snipe for {liquidity_event.token_address}: {e}")
+            return None
+    
+    async def _build_hot_snipe_transaction(
+        self,
+        liquidity_event: LiquidityAddEvent,
+        eth_amount: float,
+        priority: str
+    ) -> SnipeTransaction:
+        """
+        Build a snipe transaction without RPC round-trips.
+        
+        Uses a pre-signed transaction when its nonce, amount, deadline and
+        gas tier are still valid; otherwise signs calldata rendered from the
+        swap template. The nonce comes from the local nonce manager and
+        amountOutMin is 1, as in _calculate_min_tokens_out().
+        
+        Args:
+            liquidity_event: Liquidity event
+            eth_amount: ETH amount to spend
+            priority: Gas priority strategy
+            
+        Returns:
+            SnipeTransaction ready for execution (its nonce is reserved)
+        """
+        start = time.perf_counter()
+        address = self.account.address
+        if not self.nonce_manager.is_synced(address):
+            self._sync_nonce()
+        nonce = self.nonce_manager.reserve(address)
+        
+        try:
+            snipe_tx = None
+            prepared = self.prepared_snipes.pop(liquidity_event.token_address.lower(), None)
+            if prepared is not None:
+                if (prepared.nonce == nonce
+                        and prepared.eth_amount == Decimal(str(eth_amount))
+                        and prepared.deadline - time.time() >= self.config.min_deadline_remaining):
+                    snipe_tx = prepared.select(priority, self._min_max_fee())
+                if snipe_tx is None:
+                    self.hot_path_stats['presigned_stale'] += 1
+                else:
+                    self.hot_path_stats['presigned_hits'] += 1
+            
+            if snipe_tx is None:
+                gas_strategy = await self._get_gas_strategy(priority)
+                snipe_tx = self._sign_snipe(
+                    Web3.to_checksum_address(liquidity_event.token_address),
+                    self.routers[liquidity_event.dex.lower()],
+                    eth_amount,
+                    gas_strategy,
+                    nonce,
+                    int(time.time()) + self.config.deadline_seconds
+                )
+                self.hot_path_stats['template_builds'] += 1
+            
+            self.hot_path_stats['last_build_us'] = (time.perf_counter() - start) * 1e6
+            logger.info(
+                f"Built snipe transaction: {snipe_tx.transaction_hash} "
+                f"(nonce {nonce}, {snipe_tx.gas_price_gwei:.1f} gwei, "
+                f"{self.hot_path_stats['last_build_us']:.0f}us)"
+            )
+            return snipe_tx
+            
+        except Exception as e:
+            self.nonce_manager.release(address, nonce)
+            logger.error(f"Error building snipe transaction: {e}")
+            raise BlockZeroSniperError(f"Transaction building failed: {e}")
+    
+    def _sign_snipe(
+        self,
+        token_address: str,
+        router_address: str,
+        eth_amount: float,
+        gas_strategy: GasStrategy,
+        nonce: int,
+        deadline: int,
+        min_tokens_out: int = 1
+    ) -> SnipeTransaction:
+        """
+        Sign a swapExactETHForTokens transaction from the calldata template.
+        
+        Args:
+            token_address: Checksummed token address
+            router_address: DEX router address
+            eth_amount: ETH amount to spend
+            gas_strategy: Gas prices to sign with
+            nonce: Account nonce
+            deadline: Swap deadline
+            min_tokens_out: Minimum tokens out
+            
+        Returns:
+            Signed SnipeTransaction
+        """
+        raw_transaction = {
+            'nonce': nonce,
+            'to': router_address,
+            'value': int(eth_amount * 10**18),
+            'gas': self.config.gas_limit,
+            'maxFeePerGas': gas_strategy.max_fee,
+            'maxPriorityFeePerGas': gas_strategy.priority_fee,
+            'data': self.swap_template.render(token_address, min_tokens_out, deadline),
+            'chainId': self._get_chain_id()
+        }
+        signed_tx = Account.sign_transaction(raw_transaction, self._signing_key)
+        
+        return SnipeTransaction(
+            token_address=token_address,
+            router_address=router_address,
+            eth_amount=Decimal(str(eth_amount)),
+            gas_price=gas_strategy.max_fee,
+            gas_limit=self.config.gas_limit,
+            deadline=deadline,
+            slippage_tolerance=self.config.slippage_tolerance,
+            raw_transaction=raw_transaction,
+            signed_transaction=signed_tx.rawTransaction.hex(),
+            transaction_hash=signed_tx.hash.hex()
+        )
+    
+    def _sync_nonce(self, resync: bool = False) -> None:
+        """Seed (or, after a drop, reset) the local nonce from the pending transaction count."""
+        chain_nonce = self.w3.eth.get_transaction_count(self.account.address, 'pending')
+        if resync:
+            self.nonce_manager.resync(self.account.address, chain_nonce)
+        else:
+            self.nonce_manager.sync(self.account.address, chain_nonce)
+    
+    def _next_nonce(self) -> int:
+        """Next local nonce, seeding it from the chain on first use."""
+        if not self.nonce_manager.is_synced(self.account.address):
+            self._sync_nonce()
+        return self.nonce_manager.peek(self.account.address)
+    
+    def _min_max_fee(self) -> Optional[int]:
+        """Predicted next base fee, the floor for a usable maxFeePerGas."""
+        state = self.chain_state
+        if state is not None and state.is_fresh:
+            return state.next_base_fee
+        return None
+    
+    def _get_chain_id(self) -> int:
+        """Get chain ID from the chain state cache, falling back to the RPC once."""
+        if self.chain_state is not None and self.chain_state.chain_id is not None:
+            return self.chain_state.chain_id
+        if self._chain_id is None:
+            self._chain_id = self.w3.eth.chain_id
+        return self._chain_id
+    
     def _get_weth_address(self) -> str:
         """Get WETH address for the current network."""
         weth_addresses = {
@@ -462,9 +763,13 @@ class BlockZeroSniper:
             GasStrategy with optimized gas prices
         """
         try:
-            # Get current base fee
-            latest_block = self.w3.eth.get_block('latest')
-            base_fee = latest_block.get('baseFeePerGas', 20 * 10**9)  # Fallback to 20 gwei
+            # Predicted base fee of the next block from the shared head, else RPC
+            state = self.chain_state
+            if state is not None and state.is_fresh and state.next_base_fee is not None:
+                base_fee = state.next_base_fee
+            else:
+                latest_block = self.w3.eth.get_block('latest')
+                base_fee = latest_block.get('baseFeePerGas', 20 * 10**9)  # Fallback to 20 gwei
             
             # Define priority fee strategies
             priority_fees = {
@@ -645,6 +950,9 @@ class BlockZeroSniper:
         if snipe_result.status != 'pending':
             return snipe_result
         
+        if self.confirmation_tracker is not None:
+            return await self._await_confirmation(snipe_result, timeout_seconds)
+        
         start_time = time.time()
         
         try:
@@ -657,6 +965,8 @@ class BlockZeroSniper:
                     
                     if receipt:
                         # Transaction mined
+                        if snipe_result.nonce is not None:
+                            self.nonce_manager.confirm(self.account.address, snipe_result.nonce)
                         snipe_result.status = 'confirmed' if receipt.status == 1 else 'failed'
                         snipe_result.block_number = receipt.blockNumber
                         snipe_result.gas_used = receipt.gasUsed
@@ -681,7 +991,9 @@ class BlockZeroSniper:
                     # Transaction not yet mined
                     await asyncio.sleep(1)
             
-            # Timeout reached
+            # Timeout reached: the transaction may have been dropped
+            if snipe_result.nonce is not None:
+                self._sync_nonce(resync=True)
             snipe_result.status = 'timeout'
             snipe_result.error_message = f"Transaction not confirmed within {timeout_seconds}s"
             
@@ -693,6 +1005,55 @@ class BlockZeroSniper:
             snipe_result.error_message = str(e)
             return snipe_result
     
+    async def _await_confirmation(self, snipe_result: SnipeResult, timeout_seconds: int) -> SnipeResult:
+        """
+        Wait for the shared confirmation tracker to resolve a snipe.
+        
+        Args:
+            snipe_result: Pending snipe result
+            timeout_seconds: Maximum time to wait for confirmation
+            
+        Returns:
+            Updated SnipeResult with final status
+        """
+        tracker = self.confirmation_tracker
+        confirmation = await tracker.wait(
+            snipe_result.transaction_hash,
+            timeout=timeout_seconds,
+            sender=self.account.address if snipe_result.nonce is not None else None,
+            nonce=snipe_result.nonce
+        )
+        
+        status = confirmation.status
+        if status in (ConfirmationStatus.CONFIRMED, ConfirmationStatus.FAILED):
+            snipe_result.status = status.value
+            snipe_result.block_number = confirmation.block_number
+            snipe_result.gas_used = confirmation.gas_used
+            snipe_result.effective_gas_price = confirmation.effective_gas_price
+            snipe_result.tokens_received = await self._decode_token_transfer(
+                confirmation.receipt, snipe_result.token_address
+            )
+        elif status == ConfirmationStatus.TIMEOUT:
+            tracker.untrack(snipe_result.transaction_hash)
+            snipe_result.status = 'timeout'
+            snipe_result.error_message = f"Transaction not confirmed within {timeout_seconds}s"
+        else:
+            snipe_result.status = 'failed'
+            snipe_result.error_message = confirmation.error_message
+        
+        # Reconcile the local nonce: mined or replaced consumed it; otherwise re-read
+        if snipe_result.nonce is not None:
+            if confirmation.block_number is not None or status == ConfirmationStatus.REPLACED:
+                self.nonce_manager.confirm(self.account.address, snipe_result.nonce)
+            else:
+                self._sync_nonce(resync=True)
+        
+        logger.info(
+            f"Snipe {snipe_result.status}: {snipe_result.transaction_hash} "
+            f"in block {snipe_result.block_number}"
+        )
+        return snipe_result
+    
     async def _decode_token_transfer(self, receipt, token_address: str) -> Optional[int]:
         """
         Decode token transfer amount from transaction receipt.
@@ -706,15 +1067,17 @@ class BlockZeroSniper:
         """
         try:
             # ERC-20 Transfer event signature
-            transfer_signature = self.w3.keccak(text="Transfer(address,address,uint256)")
-            
-            for log in receipt.logs:
-                if (log.address.lower() == token_address.lower() and
-                    log.topics[0] == transfer_signature and
-                    len(log.topics) >= 3):
+            transfer_signature = keccak(text="Transfer(address,address,uint256)")
+            
+            # Web3 receipts and raw JSON-RPC receipts both support item access
+            for log in receipt['logs']:
+                topics = [HexBytes(topic) for topic in log['topics']]
+                if (log['address'].lower() == token_address.lower() and
+                    len(topics) >= 3 and
+                    topics[0] == transfer_signature):
                     
                     # Decode transfer amount (third parameter)
-                    amount = int.from_bytes(log.data, byteorder='big')
+                    amount = int.from_bytes(HexBytes(log['data']), byteorder='big')
                     return amount
             
             return None
@@ -741,6 +1104,12 @@ class BlockZeroSniper:
             'failed_snipes': self.failed_snipes,
             'success_rate': round(success_rate, 2),
             'flashbots_enabled': self.flashbots_enabled,
+            'hot_path': {
+                **self.hot_path_stats,
+                'enabled': self.config.use_hot_path,
+                'prepared_pending': len(self.prepared_snipes),
+                'nonces': self.nonce_manager.get_stats()
+            },
             'supported_dexs': list(self.routers.keys()),
             'config': {
                 'max_gas_price_gwei': self.config.max_gas_price_gwei,
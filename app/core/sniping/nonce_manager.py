@@ -0,0 +1,135 @@
+"""
+Nonce Manager
+File: app/core/sniping/nonce_manager.py
+
+Locally tracked transaction nonces per wallet. The next nonce is handed
+out from memory instead of a get_transaction_count round-trip on every
+send; the chain is consulted only to seed a wallet and to reconcile after
+a transaction is dropped or a send fails out of order.
+"""
+
+from typing import Any, Dict, Set
+
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class NonceManager:
+    """
+    Per-address nonce sequence.
+
+    reserve() hands out consecutive nonces; release() returns an unused
+    one, confirm() records a mined one, and resync() resets the sequence
+    to the chain's view after a drop.
+    """
+
+    def __init__(self):
+        """Initialize nonce manager."""
+        self._next: Dict[str, int] = {}
+        self._in_flight: Dict[str, Set[int]] = {}
+        self.stats = {
+            'reserved': 0,
+            'released': 0,
+            'confirmed': 0,
+            'resyncs': 0,
+        }
+
+    @staticmethod
+    def _key(address: str) -> str:
+        return address.lower()
+
+    def is_synced(self, address: str) -> bool:
+        """Whether the address has been seeded from the chain."""
+        return self._key(address) in self._next
+
+    def sync(self, address: str, chain_nonce: int) -> None:
+        """
+        Seed or advance an address from the chain's pending transaction count.
+
+        Never moves the sequence backwards: nonces reserved locally may not
+        have reached the node yet.
+
+        Args:
+            address: Wallet address
+            chain_nonce: eth_getTransactionCount(address, 'pending')
+        """
+        key = self._key(address)
+        self._next[key] = max(self._next.get(key, 0), chain_nonce)
+        self._in_flight.setdefault(key, set())
+
+    def resync(self, address: str, chain_nonce: int) -> None:
+        """
+        Reset an address to the chain's view, e.g. after a dropped transaction.
+
+        In-flight nonces at or above chain_nonce are forgotten; transactions
+        signed with them must be re-signed.
+
+        Args:
+            address: Wallet address
+            chain_nonce: eth_getTransactionCount(address, 'pending')
+        """
+        key = self._key(address)
+        self._next[key] = chain_nonce
+        self._in_flight[key] = {n for n in self._in_flight.get(key, set()) if n < chain_nonce}
+        self.stats['resyncs'] += 1
+        logger.info(f"Nonce for {address} resynced to {chain_nonce}")
+
+    def peek(self, address: str) -> int:
+        """Next nonce that reserve() would return."""
+        key = self._key(address)
+        if key not in self._next:
+            raise KeyError(f"Nonce for {address} not synced")
+        return self._next[key]
+
+    def reserve(self, address: str) -> int:
+        """
+        Take the next nonce for a transaction about to be sent.
+
+        Raises:
+            KeyError: If the address was never synced
+        """
+        nonce = self.peek(address)
+        key = self._key(address)
+        self._next[key] = nonce + 1
+        self._in_flight[key].add(nonce)
+        self.stats['reserved'] += 1
+        return nonce
+
+    def release(self, address: str, nonce: int) -> bool:
+        """
+        Return a reserved nonce whose transaction was never broadcast.
+
+        Only the most recent reservation can be handed back without leaving
+        a gap; otherwise the caller must resync().
+
+        Returns:
+            True if the nonce will be reused
+        """
+        key = self._key(address)
+        in_flight = self._in_flight.get(key, set())
+        if nonce not in in_flight or self._next.get(key) != nonce + 1:
+            return False
+        in_flight.discard(nonce)
+        self._next[key] = nonce
+        self.stats['released'] += 1
+        return True
+
+    def confirm(self, address: str, nonce: int) -> None:
+        """Record that a transaction with this nonce was mined."""
+        key = self._key(address)
+        self._in_flight.setdefault(key, set()).discard(nonce)
+        self._next[key] = max(self._next.get(key, 0), nonce + 1)
+        self.stats['confirmed'] += 1
+
+    def in_flight(self, address: str) -> Set[int]:
+        """Nonces reserved but not yet confirmed."""
+        return set(self._in_flight.get(self._key(address), set()))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get nonce manager statistics."""
+        return {
+            **self.stats,
+            'addresses': len(self._next),
+            'in_flight': sum(len(nonces) for nonces in self._in_flight.values()),
+        }
@@ -0,0 +1,74 @@
+"""
+Snipe Transaction Templates
+File: app/core/sniping/snipe_templates.py
+
+Precomputed router calldata for swapExactETHForTokens. The template fixes
+the selector, ABI offsets, recipient and WETH leg once; building calldata
+for a launch patches only amountOutMin, deadline and the token address into
+a copy of the buffer.
+"""
+
+from eth_utils import keccak, to_bytes
+
+SWAP_EXACT_ETH_FOR_TOKENS = 'swapExactETHForTokens(uint256,address[],address,uint256)'
+
+# swapExactETHForTokens(amountOutMin, path, to, deadline) with path = [WETH, token]
+_WORD = 32
+_AMOUNT_OUT_MIN = 4
+_PATH_OFFSET = _AMOUNT_OUT_MIN + _WORD
+_RECIPIENT = _PATH_OFFSET + _WORD
+_DEADLINE = _RECIPIENT + _WORD
+_PATH_LENGTH = _DEADLINE + _WORD
+_PATH_WETH = _PATH_LENGTH + _WORD
+_PATH_TOKEN = _PATH_WETH + _WORD
+_CALLDATA_SIZE = _PATH_TOKEN + _WORD
+
+
+def _address_word(address: str) -> bytes:
+    return to_bytes(hexstr=address).rjust(_WORD, b'\x00')
+
+
+class SwapCalldataTemplate:
+    """swapExactETHForTokens calldata with WETH and recipient fixed."""
+
+    def __init__(self, weth_address: str, recipient: str):
+        """
+        Initialize calldata template.
+
+        Args:
+            weth_address: Wrapped native token (first hop of the path)
+            recipient: Address receiving the bought tokens
+        """
+        self.weth_address = weth_address
+        self.recipient = recipient
+
+        buffer = bytearray(_CALLDATA_SIZE)
+        buffer[0:4] = keccak(text=SWAP_EXACT_ETH_FOR_TOKENS)[:4]
+        buffer[_PATH_OFFSET:_RECIPIENT] = (4 * _WORD).to_bytes(_WORD, 'big')
+        buffer[_RECIPIENT:_DEADLINE] = _address_word(recipient)
+        buffer[_PATH_LENGTH:_PATH_WETH] = (2).to_bytes(_WORD, 'big')
+        buffer[_PATH_WETH:_PATH_TOKEN] = _address_word(weth_address)
+        self._template = bytes(buffer)
+
+    @property
+    def selector(self) -> bytes:
+        """Function selector."""
+        return self._template[:4]
+
+    def render(self, token_address: str, amount_out_min: int, deadline: int) -> bytes:
+        """
+        Build calldata for one swap.
+
+        Args:
+            token_address: Token being bought
+            amount_out_min: Minimum tokens out
+            deadline: Unix timestamp after which the swap reverts
+
+        Returns:
+            ABI-encoded calldata
+        """
+        buffer = bytearray(self._template)
+        buffer[_AMOUNT_OUT_MIN:_PATH_OFFSET] = amount_out_min.to_bytes(_WORD, 'big')
+        buffer[_DEADLINE:_PATH_LENGTH] = deadline.to_bytes(_WORD, 'big')
+        buffer[_PATH_TOKEN:] = _address_word(token_address)
+        return bytes(buffer)
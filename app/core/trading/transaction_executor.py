@@ -41,7 +41,7 @@ except ImportError:
     def to_wei(amount, unit): return int(amount * 10**18)
     def from_wei(amount, unit): return float(amount / 10**18)
 
-from app.utils.logger import setup_logger, get_trading_logger, get_performance_logger, get_trading_logger, get_performance_logger
+from app.utils.logger import setup_logger
 from app.core.exceptions import (
     TransactionError,
     InsufficientFundsError,
@@ -49,10 +49,15 @@ from app.core.exceptions import (
     ValidationError
 )
 from app.core.database.persistence_manager import (
-    persistence_manager,
+    get_persistence_manager,
     TradeRecord,
     TradeStatus
 )
+from app.core.blockchain.confirmation_tracker import (
+    Confirmation,
+    ConfirmationStatus,
+    ConfirmationTracker
+)
 
 logger = setup_logger(__name__, "trading")
 
@@ -210,6 +215,7 @@ class TransactionExecutor:
         self.account = None
         self.pending_transactions: Dict[str, TransactionResult] = {}
         self.confirmation_callbacks: Dict[str, List[Callable]] = {}
+        self.confirmation_tracker: Optional[ConfirmationTracker] = None
         self._monitoring_task: Optional[asyncio.Task] = None
         
         # Initialize account if private key provided
@@ -222,12 +228,19 @@ class TransactionExecutor:
         
         logger.info("[ZAP] Transaction executor initialized")
     
-    async def initialize(self, web3_provider=None) -> bool:
+    async def initialize(
+        self,
+        web3_provider=None,
+        confirmation_tracker: Optional[ConfirmationTracker] = None
+    ) -> bool:
         """
         Initialize transaction executor with Web3 provider.
         
         Args:
             web3_provider: Web3 provider instance
+            confirmation_tracker: Shared block-driven tracker; when given,
+                submitted transactions are resolved from new blocks instead
+                of the polling loop
             
         Returns:
             bool: True if initialization successful
@@ -235,6 +248,8 @@ class TransactionExecutor:
         try:
             if web3_provider:
                 self.web3 = web3_provider
+            if confirmation_tracker:
+                self.confirmation_tracker = confirmation_tracker
             
             if not WEB3_AVAILABLE:
                 logger.warning("[WARN] Web3 not available, using mock execution")
@@ -252,8 +267,8 @@ class TransactionExecutor:
                 logger.warning(f"[WARN] Web3 connection test failed, using mock mode: {e}")
                 return True  # Continue with mock mode
             
-            # Start transaction monitoring only if we have real Web3
-            if self.web3:
+            # Start transaction monitoring only if we have real Web3 and no tracker
+            if self.web3 and not self.confirmation_tracker:
                 self._monitoring_task = asyncio.create_task(self._monitor_transactions())
             
             logger.info("[OK] Transaction executor initialized successfully")
@@ -395,6 +410,12 @@ class TransactionExecutor:
         try:
             logger.info(f"[EMOJI] Monitoring transaction: {transaction_hash[:10]}...")
             
+            if self.confirmation_tracker:
+                confirmation = await self.confirmation_tracker.wait(
+                    transaction_hash, timeout=timeout_minutes * 60
+                )
+                return self._result_from_confirmation(str(uuid.uuid4()), confirmation)
+            
             if not WEB3_AVAILABLE or not self.web3:
                 # Mock monitoring for development
                 await asyncio.sleep(2)  # Simulate confirmation time
@@ -550,6 +571,13 @@ class TransactionExecutor:
             
             # Store for monitoring
             self.pending_transactions[transaction_id] = result
+            if self.confirmation_tracker:
+                self.confirmation_tracker.track(
+                    tx_hash_hex,
+                    sender=self.account.address if self.account else None,
+                    nonce=transaction_data.get('nonce'),
+                    callback=lambda confirmation: self._handle_confirmation(transaction_id, confirmation)
+                )
             
             logger.info(f"[EMOJI] Transaction submitted: {tx_hash_hex[:10]}...")
             return result
@@ -628,23 +656,57 @@ class TransactionExecutor:
                         )
                         
                         if updated_result.status in [TransactionStatus.CONFIRMED, TransactionStatus.FAILED]:
-                            # Update result and remove from pending
-                            self.pending_transactions[transaction_id] = updated_result
-                            
-                            # Call confirmation callbacks
-                            if transaction_id in self.confirmation_callbacks:
-                                for callback in self.confirmation_callbacks[transaction_id]:
-                                    try:
-                                        await callback(updated_result)
-                                    except Exception as e:
-                                        logger.error(f"[ERROR] Callback error: {e}")
-                                
-                                # Clean up callbacks
-                                del self.confirmation_callbacks[transaction_id]
+                            await self._complete_transaction(transaction_id, updated_result)
                 
             except Exception as e:
                 logger.error(f"[ERROR] Transaction monitoring error: {e}")
     
+    async def _complete_transaction(self, transaction_id: str, updated_result: TransactionResult):
+        """Record a final transaction result and run its confirmation callbacks."""
+        # Update result and remove from pending
+        self.pending_transactions[transaction_id] = updated_result
+        
+        # Call confirmation callbacks
+        if transaction_id in self.confirmation_callbacks:
+            for callback in self.confirmation_callbacks[transaction_id]:
+                try:
+                    await callback(updated_result)
+                except Exception as e:
+                    logger.error(f"[ERROR] Callback error: {e}")
+            
+            # Clean up callbacks
+            del self.confirmation_callbacks[transaction_id]
+    
+    async def _handle_confirmation(self, transaction_id: str, confirmation: Confirmation):
+        """Confirmation tracker callback for a submitted transaction."""
+        await self._complete_transaction(
+            transaction_id, self._result_from_confirmation(transaction_id, confirmation)
+        )
+    
+    def _result_from_confirmation(self, transaction_id: str, confirmation: Confirmation) -> TransactionResult:
+        """Convert a tracker Confirmation to a TransactionResult."""
+        status = {
+            ConfirmationStatus.CONFIRMED: TransactionStatus.CONFIRMED,
+            ConfirmationStatus.REPLACED: TransactionStatus.CANCELLED,
+            ConfirmationStatus.TIMEOUT: TransactionStatus.TIMEOUT,
+        }.get(confirmation.status, TransactionStatus.FAILED)
+        mined = confirmation.block_number is not None
+        
+        return TransactionResult(
+            transaction_id=transaction_id,
+            transaction_hash=confirmation.tx_hash,
+            status=status,
+            block_number=confirmation.block_number,
+            gas_used=confirmation.gas_used,
+            effective_gas_price=(
+                Decimal(confirmation.effective_gas_price) / Decimal(10**9)
+                if confirmation.effective_gas_price is not None else None
+            ),
+            confirmation_time=timedelta(seconds=confirmation.elapsed_seconds) if mined else None,
+            error_message=confirmation.error_message,
+            confirmed_at=datetime.utcnow() if mined else None
+        )
+    
     def get_execution_status(self) -> Dict[str, Any]:
         """
         Get transaction executor status.
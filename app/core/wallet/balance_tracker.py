@@ -0,0 +1,514 @@
+"""
+Event-Driven Balance Tracker
+File: app/core/wallet/balance_tracker.py
+
+In-memory native and ERC-20 balances for the tracked wallets on one
+network. Balances are seeded once with a Multicall3 batch (getEthBalance
+plus balanceOf for every held token, pinned to a block) and then kept
+current from each new head: ERC-20 deltas come from Transfer logs filtered
+by the wallet addresses, native deltas from the value of the block's
+transactions. Reads never touch the network, and the RPC cost per block is
+constant: one block fetch and two eth_getLogs calls, plus one multicall
+only when a tracked wallet sent a transaction (to pick up gas spent) or
+received a token it did not hold yet.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from eth_utils import is_address, keccak, to_checksum_address
+
+from app.core.blockchain.chain_state import ChainHead, ChainStateCache, RpcCall
+from app.core.blockchain.multicall import (
+    MULTICALL3_ADDRESS, Call, MulticallClient, decode_text, decode_uint, encode_call
+)
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# topic0 of ERC-20 Transfer(from, to, value); ERC-721 uses the same signature
+# but indexes tokenId as a fourth topic and is skipped
+TRANSFER_TOPIC = '0x' + keccak(text='Transfer(address,address,uint256)').hex()
+
+GWEI = 10**9
+
+
+def _to_int(value: Any) -> int:
+    """Parse a JSON-RPC quantity (hex string or int)."""
+    if isinstance(value, int):
+        return value
+    return int(value, 16)
+
+
+def _to_bytes(value: Any) -> bytes:
+    """Parse JSON-RPC data (hex string or bytes)."""
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    return bytes.fromhex(value[2:] if value.startswith('0x') else value)
+
+
+def _address_topic(address: str) -> str:
+    """Left-pad an address into an indexed topic."""
+    return '0x' + address[2:].lower().rjust(64, '0')
+
+
+@dataclass
+class TokenMetadata:
+    """Display metadata resolved when a token is first seeded."""
+    symbol: str
+    decimals: int
+
+
+@dataclass
+class TrackedWallet:
+    """Balances held in memory for one wallet."""
+    address: str
+    native: Optional[int] = None
+    tokens: Dict[str, int] = field(default_factory=dict)
+    block_number: Optional[int] = None
+    updated_at: float = 0.0
+
+
+class BalanceTracker:
+    """
+    Keeps wallet balances current from the head feed of one network.
+
+    Tokens held before tracking started must be passed to track_wallet()
+    or track_tokens(); tokens received afterwards are discovered from
+    their Transfer logs and seeded automatically. ETH sent to a wallet by
+    a contract in someone else's transaction leaves no log or top-level
+    value, so every reconcile_blocks the whole set is reseeded in one
+    multicall.
+    """
+
+    def __init__(
+        self,
+        chain_state: ChainStateCache,
+        rpc: Optional[RpcCall] = None,
+        multicall_address: str = MULTICALL3_ADDRESS,
+        batch_size: int = 250,
+        max_catch_up_blocks: int = 32,
+        max_reorg_depth: int = 64,
+        reconcile_blocks: Optional[int] = 900,
+        discover_tokens: bool = True
+    ):
+        """
+        Initialize balance tracker.
+
+        Args:
+            chain_state: Head feed for the network
+            rpc: JSON-RPC transport (defaults to the chain state's)
+            multicall_address: Multicall3 contract address
+            batch_size: Maximum calls per aggregate3 request
+            max_catch_up_blocks: Largest gap applied block by block; longer
+                gaps reseed every balance instead
+            max_reorg_depth: Block hashes remembered for reorg detection
+            reconcile_blocks: Reseed everything every this many blocks
+                (None to disable)
+            discover_tokens: Start tracking tokens a wallet receives or sends
+        """
+        self.chain_state = chain_state
+        self.rpc = rpc or chain_state.rpc
+        self.multicall_address = to_checksum_address(multicall_address)
+        self.batch_size = batch_size
+        self.max_catch_up_blocks = max_catch_up_blocks
+        self.max_reorg_depth = max_reorg_depth
+        self.reconcile_blocks = reconcile_blocks
+        self.discover_tokens = discover_tokens
+
+        self.token_metadata: Dict[str, TokenMetadata] = {}
+        self._wallets: Dict[str, TrackedWallet] = {}
+        self._ignored_tokens: Set[str] = set()
+        self._block_hashes: 'OrderedDict[int, str]' = OrderedDict()
+        self._last_block: Optional[int] = None
+        self._last_reseed: Optional[int] = None
+        self._lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        self.stats = {
+            'blocks_processed': 0,
+            'rpc_calls': 0,
+            'multicall_requests': 0,
+            'transfer_logs_applied': 0,
+            'native_transfers_applied': 0,
+            'wallets_reread': 0,
+            'tokens_discovered': 0,
+            'reseeds': 0,
+            'reorgs': 0,
+        }
+
+    # ==================== READS ====================
+
+    def _wallet(self, address: str) -> Optional[TrackedWallet]:
+        return self._wallets.get(address.lower())
+
+    def is_tracked(self, address: str) -> bool:
+        """Whether the wallet is tracked."""
+        return address.lower() in self._wallets
+
+    def get_native_balance(self, address: str) -> Optional[int]:
+        """Native balance in wei (None until seeded)."""
+        wallet = self._wallet(address)
+        return wallet.native if wallet else None
+
+    def get_token_balances(self, address: str) -> Dict[str, int]:
+        """Raw ERC-20 balances by checksum token address."""
+        wallet = self._wallet(address)
+        return dict(wallet.tokens) if wallet else {}
+
+    def get_wallet(self, address: str) -> Optional[TrackedWallet]:
+        """Snapshot of a tracked wallet."""
+        wallet = self._wallet(address)
+        if wallet is None:
+            return None
+        return TrackedWallet(
+            address=wallet.address,
+            native=wallet.native,
+            tokens=dict(wallet.tokens),
+            block_number=wallet.block_number,
+            updated_at=wallet.updated_at
+        )
+
+    # ==================== TRACKING ====================
+
+    async def track_wallet(self, address: str, tokens: Iterable[str] = ()) -> TrackedWallet:
+        """
+        Start tracking a wallet and seed its balances.
+
+        Args:
+            address: Wallet address
+            tokens: ERC-20 tokens the wallet already holds
+
+        Returns:
+            Snapshot of the seeded wallet
+        """
+        if not is_address(address):
+            raise ValueError(f"Invalid wallet address: {address}")
+        key = address.lower()
+        async with self._lock:
+            new = key not in self._wallets
+            wallet = self._wallets.setdefault(key, TrackedWallet(address=to_checksum_address(address)))
+            pairs = {(key, token) for token in self._normalize_tokens(tokens) if token not in wallet.tokens}
+            await self._seed(self._seed_block(), {key} if new else set(), pairs)
+        return self.get_wallet(address)
+
+    async def track_tokens(self, address: str, tokens: Iterable[str]) -> TrackedWallet:
+        """Seed additional tokens for a tracked wallet (tracks the wallet if needed)."""
+        return await self.track_wallet(address, tokens)
+
+    async def untrack_wallet(self, address: str) -> bool:
+        """Stop tracking a wallet (waits for a seed or block in flight to finish)."""
+        async with self._lock:
+            return self._wallets.pop(address.lower(), None) is not None
+
+    @property
+    def wallet_count(self) -> int:
+        """Wallets tracked."""
+        return len(self._wallets)
+
+    def _normalize_tokens(self, tokens: Iterable[str]) -> List[str]:
+        return [to_checksum_address(token) for token in tokens
+                if isinstance(token, str) and is_address(token)
+                and to_checksum_address(token) not in self._ignored_tokens]
+
+    def _seed_block(self) -> Optional[int]:
+        """Block that seeds are pinned to: the last one applied, or the head."""
+        head = self.chain_state.head
+        if self._last_block is None and head is not None:
+            self._last_block = head.number
+            self._block_hashes[head.number] = head.hash
+        return self._last_block
+
+    # ==================== SEEDING ====================
+
+    async def _eth_call(self, block_tag: str, tx: Dict[str, str]) -> bytes:
+        return _to_bytes(await self._call('eth_call', [tx, block_tag]))
+
+    async def _seed(self, block_number: Optional[int], natives: Set[str], pairs: Set[Tuple[str, str]]) -> None:
+        """
+        Read native balances and (wallet, token) balances in one multicall.
+
+        Metadata for tokens seen for the first time rides in the same batch.
+        """
+        natives = {key for key in natives if key in self._wallets}
+        pairs = {(key, token) for key, token in pairs if key in self._wallets}
+        if not natives and not pairs:
+            return
+        block_tag = hex(block_number) if block_number is not None else 'latest'
+        calls: List[Call] = []
+        native_keys = sorted(natives)
+        for key in native_keys:
+            wallet = self._wallets[key]
+            calls.append(Call(
+                self.multicall_address,
+                encode_call('getEthBalance(address)', ['address'], [wallet.address]),
+                decode_uint
+            ))
+        token_pairs = sorted(pairs)
+        for key, token in token_pairs:
+            calls.append(Call(
+                token, encode_call('balanceOf(address)', ['address'], [self._wallets[key].address]), decode_uint
+            ))
+        new_tokens = sorted({token for _, token in token_pairs if token not in self.token_metadata})
+        for token in new_tokens:
+            calls.append(Call(token, encode_call('symbol()'), decode_text))
+            calls.append(Call(token, encode_call('decimals()'), decode_uint))
+
+        multicall = MulticallClient(
+            lambda tx: self._eth_call(block_tag, tx), address=self.multicall_address, batch_size=self.batch_size
+        )
+        results = await multicall.aggregate(calls)
+        self.stats['multicall_requests'] += multicall.stats['requests']
+
+        # Wallets untracked while the multicall was in flight are skipped
+        now = time.time()
+        for key, value in zip(native_keys, results):
+            wallet = self._wallets.get(key)
+            if wallet is not None and value is not None:
+                wallet.native = value
+                wallet.block_number, wallet.updated_at = block_number, now
+
+        offset = len(native_keys)
+        for (key, token), value in zip(token_pairs, results[offset:offset + len(token_pairs)]):
+            wallet = self._wallets.get(key)
+            if wallet is None:
+                continue
+            if value is None:
+                if token in self.token_metadata:
+                    continue  # keep the last known balance
+                # No code or not an ERC-20: never retried through discovery
+                self._ignored_tokens.add(token)
+                wallet.tokens.pop(token, None)
+                continue
+            wallet.tokens[token] = value
+            wallet.block_number, wallet.updated_at = block_number, now
+
+        offset += len(token_pairs)
+        for index, token in enumerate(new_tokens):
+            symbol, decimals = results[offset + 2 * index:offset + 2 * index + 2]
+            if token not in self._ignored_tokens:
+                self.token_metadata[token] = TokenMetadata(
+                    symbol=symbol or token[:8],
+                    decimals=decimals if decimals is not None and decimals <= 255 else 18
+                )
+
+    async def reseed(self, block_number: Optional[int] = None) -> None:
+        """Re-read every tracked balance at a block (default: current head)."""
+        async with self._lock:
+            await self._reseed(block_number)
+
+    async def _reseed(self, block_number: Optional[int] = None) -> None:
+        head = self.chain_state.head
+        block_number = block_number if block_number is not None else (head.number if head else None)
+        pairs = {(key, token) for key, wallet in self._wallets.items() for token in wallet.tokens}
+        await self._seed(block_number, set(self._wallets), pairs)
+        self._block_hashes.clear()
+        if head is not None and head.number == block_number:
+            self._block_hashes[head.number] = head.hash
+        self._last_block = self._last_reseed = block_number
+        self.stats['reseeds'] += 1
+
+    # ==================== BLOCK PROCESSING ====================
+
+    async def start(self) -> 'BalanceTracker':
+        """Apply every new head from the chain state feed."""
+        self.chain_state.add_listener(self._on_head)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return self
+
+    def _on_head(self, head: ChainHead) -> None:
+        # Never block the head feed: processing happens in _run()
+        self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            try:
+                await self.process()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Balance tracking on {self.chain_state.network} failed: {e}")
+
+    async def process(self) -> int:
+        """
+        Bring balances up to the current head.
+
+        Returns:
+            Number of blocks applied
+        """
+        async with self._lock:
+            head = self.chain_state.head
+            if head is None:
+                return 0
+            if not self._wallets:
+                self._last_block = head.number
+                self._block_hashes.clear()
+                return 0
+            if self._last_block is None:
+                await self._reseed(head.number)
+                return 0
+
+            start = self._last_block + 1
+            if start > head.number:
+                known = self._block_hashes.get(head.number)
+                if known is not None and known != head.hash:
+                    await self._handle_reorg(head.number)
+                return 0
+            if (head.number - start + 1 > self.max_catch_up_blocks
+                    or (self.reconcile_blocks and self._last_reseed is not None
+                        and head.number - self._last_reseed >= self.reconcile_blocks)):
+                await self._reseed(head.number)
+                return 0
+
+            return await self._apply_range(start, head.number)
+
+    async def _call(self, method: str, params: List[Any]) -> Any:
+        self.stats['rpc_calls'] += 1
+        return await self.rpc(method, params)
+
+    def _log_filter(self, start: int, end: int, position: int) -> Dict[str, Any]:
+        """Transfer logs with a tracked wallet as sender (position 1) or recipient (2)."""
+        wallets = [_address_topic(wallet.address) for wallet in self._wallets.values()]
+        topics: List[Any] = [TRANSFER_TOPIC, None, None]
+        topics[position] = wallets
+        return {'fromBlock': hex(start), 'toBlock': hex(end), 'topics': topics[:position + 1]}
+
+    async def _apply_range(self, start: int, end: int) -> int:
+        """Fetch blocks start..end and their Transfer logs, then apply them."""
+        responses = await asyncio.gather(
+            *(self._call('eth_getBlockByNumber', [hex(number), True]) for number in range(start, end + 1)),
+            self._call('eth_getLogs', [self._log_filter(start, end, 1)]),
+            self._call('eth_getLogs', [self._log_filter(start, end, 2)]),
+        )
+        blocks, sent_logs, received_logs = responses[:-2], responses[-2] or [], responses[-1] or []
+
+        # Blocks must extend what was applied and each other; logs must come from them
+        hashes: Dict[int, str] = {}
+        parent = self._block_hashes.get(start - 1)
+        for number, block in zip(range(start, end + 1), blocks):
+            if block is None:
+                return 0  # node behind the head feed; retried on the next head
+            if parent is not None and block.get('parentHash') != parent:
+                return await self._handle_reorg(end)
+            hashes[number] = parent = block['hash']
+        logs: Dict[Tuple[str, int], Mapping[str, Any]] = {}
+        for log in list(sent_logs) + list(received_logs):
+            if log.get('removed') or hashes.get(_to_int(log['blockNumber'])) != log.get('blockHash'):
+                return await self._handle_reorg(end)
+            logs[(log['transactionHash'], _to_int(log['logIndex']))] = log
+
+        native_deltas: Dict[str, int] = {}
+        reread: Set[str] = set()
+        for block in blocks:
+            self._apply_native(block, native_deltas, reread)
+        discovered: Set[Tuple[str, str]] = set()
+        for key in sorted(logs, key=lambda k: (_to_int(logs[k]['blockNumber']), k[1])):
+            self._apply_transfer(logs[key], discovered)
+
+        # Senders paid gas we cannot see without receipts: read them (and new tokens) at `end`
+        for key, delta in native_deltas.items():
+            wallet = self._wallets.get(key)
+            if wallet is not None and key not in reread and wallet.native is not None:
+                wallet.native += delta
+                wallet.block_number, wallet.updated_at = end, time.time()
+        if reread or discovered:
+            self.stats['wallets_reread'] += len(reread)
+            self.stats['tokens_discovered'] += len(discovered)
+            await self._seed(end, reread, discovered)
+
+        for number, block_hash in hashes.items():
+            self._block_hashes[number] = block_hash
+        while len(self._block_hashes) > self.max_reorg_depth:
+            self._block_hashes.popitem(last=False)
+        self._last_block = end
+        if self._last_reseed is None:
+            self._last_reseed = end
+        self.stats['blocks_processed'] += len(blocks)
+        return len(blocks)
+
+    def _apply_native(self, block: Mapping[str, Any], deltas: Dict[str, int], reread: Set[str]) -> None:
+        """Collect native value moved to and from tracked wallets by a block."""
+        wallets = self._wallets
+        for tx in block.get('transactions', ()):
+            if not isinstance(tx, Mapping):
+                continue
+            sender = (tx.get('from') or '').lower()
+            recipient = (tx.get('to') or '').lower()
+            if sender in wallets:
+                reread.add(sender)
+            if recipient in wallets:
+                value = _to_int(tx.get('value', 0))
+                if value:
+                    deltas[recipient] = deltas.get(recipient, 0) + value
+                    self.stats['native_transfers_applied'] += 1
+        for withdrawal in block.get('withdrawals', ()) or ():
+            address = (withdrawal.get('address') or '').lower()
+            if address in wallets:
+                deltas[address] = deltas.get(address, 0) + _to_int(withdrawal.get('amount', 0)) * GWEI
+
+    def _apply_transfer(self, log: Mapping[str, Any], discovered: Set[Tuple[str, str]]) -> None:
+        """Apply one Transfer log to the tracked sides."""
+        try:
+            topics = [_to_bytes(topic) for topic in log.get('topics', [])]
+            data = _to_bytes(log.get('data', '0x'))
+            if len(topics) != 3 or len(data) < 32:
+                return
+            token = to_checksum_address(log['address'])
+            value = int.from_bytes(data[:32], 'big')
+            sender = '0x' + topics[1][12:].hex()
+            recipient = '0x' + topics[2][12:].hex()
+        except (KeyError, TypeError, ValueError) as e:
+            logger.debug(f"Skipping undecodable Transfer log: {e}")
+            return
+
+        if token in self._ignored_tokens:
+            return
+        applied = False
+        for key, delta in ((sender, -value), (recipient, value)):
+            wallet = self._wallets.get(key)
+            if wallet is None:
+                continue
+            if token in wallet.tokens:
+                wallet.tokens[token] += delta
+                applied = True
+            elif self.discover_tokens:
+                discovered.add((key, token))
+        if applied:
+            self.stats['transfer_logs_applied'] += 1
+
+    async def _handle_reorg(self, head_number: int) -> int:
+        """The applied blocks are no longer canonical: reseed at the head."""
+        self.stats['reorgs'] += 1
+        logger.info(f"[REORG] {self.chain_state.network}: reseeding balances at block {head_number}")
+        await self._reseed(head_number)
+        return 0
+
+    async def stop(self) -> None:
+        """Detach from the head feed."""
+        self.chain_state.remove_listener(self._on_head)
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get tracker statistics."""
+        blocks = max(1, self.stats['blocks_processed'])
+        return {
+            **self.stats,
+            'network': self.chain_state.network,
+            'wallets': len(self._wallets),
+            'token_balances': sum(len(wallet.tokens) for wallet in self._wallets.values()),
+            'last_block': self._last_block,
+            'rpc_calls_per_block': round(self.stats['rpc_calls'] / blocks, 2),
+        }
@@ -15,11 +15,14 @@ from enum import Enum
 import hashlib
 import secrets
 
-from app.utils.logger import setup_logger, get_trading_logger, get_performance_logger, get_trading_logger, get_performance_logger
+from app.utils.logger import setup_logger
 from app.core.exceptions import WalletError, NetworkError, ConnectionError
+from app.core.blockchain.chain_state import ChainStateCache, RpcCall
+from app.core.blockchain import network_manager as shared_network
 from app.core.blockchain.network_manager_fixed import (
     get_network_manager, NetworkType, NetworkManagerFixed
 )
+from app.core.wallet.balance_tracker import BalanceTracker
 
 logger = setup_logger(__name__, "trading")
 
@@ -102,10 +105,13 @@ class EnhancedWalletManager:
         self.network_manager = get_network_manager()
         self.active_connections: Dict[str, WalletConnection] = {}
         self.wallet_balances: Dict[str, WalletBalance] = {}
+        self.balance_trackers: Dict[NetworkType, BalanceTracker] = {}
+        self._private_chain_states: Dict[NetworkType, ChainStateCache] = {}
+        self._tracker_lock = asyncio.Lock()
         
         # Configuration
         self.connection_timeout_minutes = 60
-        self.balance_refresh_interval = 30  # seconds
+        self.balance_refresh_interval = 30  # seconds (only without a balance tracker)
         self.max_concurrent_connections = 10
         
         # Supported wallet configurations
@@ -142,7 +148,8 @@ class EnhancedWalletManager:
         self, 
         wallet_type: WalletType, 
         network_type: NetworkType,
-        address: Optional[str] = None
+        address: Optional[str] = None,
+        tokens: Optional[List[str]] = None
     ) -> Dict[str, Any]:
         """
         Connect a wallet to the specified network.
@@ -151,6 +158,8 @@ class EnhancedWalletManager:
             wallet_type: Type of wallet to connect
             network_type: Blockchain network to connect to
             address: Optional wallet address (if known)
+            tokens: ERC-20 tokens the wallet already holds (tokens it
+                receives later are picked up automatically)
             
         Returns:
             Dict containing connection result and details
@@ -186,8 +195,8 @@ class EnhancedWalletManager:
             if connection_result["success"]:
                 logger.info(f"[OK] Successfully connected {wallet_type.value} wallet")
                 
-                # Start balance monitoring
-                asyncio.create_task(self._monitor_wallet_balance(connection_result["connection_id"]))
+                # Start balance tracking
+                await self._start_balance_tracking(connection_result["connection_id"], tokens)
                 
                 return {
                     "success": True,
@@ -328,6 +337,7 @@ class EnhancedWalletManager:
             
             # Remove from active connections
             del self.active_connections[connection_id]
+            await self._stop_balance_tracking(connection)
             
             # Clean up balance tracking
             if connection_id in self.wallet_balances:
@@ -367,8 +377,8 @@ class EnhancedWalletManager:
             if connection.status != ConnectionStatus.CONNECTED:
                 raise WalletError("Wallet connection not active")
             
-            # Get fresh balance
-            balance = await self._fetch_wallet_balance(connection)
+            # Tracked balances are kept current from new blocks; poll only without a tracker
+            balance = self._balance_from_tracker(connection) or await self._fetch_wallet_balance(connection)
             
             return {
                 "success": True,
@@ -466,7 +476,137 @@ class EnhancedWalletManager:
                 
         except Exception as e:
             logger.error(f"[ERROR] Balance monitoring error for {connection_id}: {e}")
-    
+
+    @staticmethod
+    def _rpc_for(w3: Any) -> RpcCall:
+        """Raw JSON-RPC transport over a Web3 provider (for ChainStateCache/BalanceTracker)."""
+        async def rpc(method: str, params: List[Any]) -> Any:
+            response = await w3.provider.make_request(method, params)
+            if response.get('error'):
+                error = response['error']
+                message = error.get('message', error) if isinstance(error, dict) else error
+                raise NetworkError(f"{method} failed: {message}")
+            return response.get('result')
+        return rpc
+
+    async def _shared_chain_state(self, network_type: NetworkType) -> Optional[ChainStateCache]:
+        """The enhanced network manager's chain state, if it is already connected to the network."""
+        try:
+            shared_type = shared_network.NetworkType(network_type.value)
+        except ValueError:
+            return None
+        manager = shared_network.get_network_manager()
+        if shared_type not in manager.connections:
+            return None
+        try:
+            return await manager.get_chain_state(shared_type)
+        except Exception as e:
+            logger.debug(f"Shared chain state unavailable for {network_type.value}: {e}")
+            return None
+
+    async def _get_balance_tracker(self, network_type: NetworkType) -> Optional[BalanceTracker]:
+        """
+        Get or start the network's balance tracker (None without a live provider).
+
+        The tracker follows the head of the enhanced network manager's
+        shared ChainStateCache. Only when that manager is not connected to
+        the network does the tracker get a private cache polling this
+        manager's provider; that cache is owned here and stopped on shutdown.
+        """
+        async with self._tracker_lock:
+            tracker = self.balance_trackers.get(network_type)
+            if tracker is not None:
+                return tracker
+
+            chain_state = await self._shared_chain_state(network_type)
+            try:
+                if chain_state is None:
+                    w3 = self.network_manager.get_web3_instance(network_type)
+                    if w3 is None:
+                        return None
+                    chain_state = ChainStateCache(network_type.value, self._rpc_for(w3), refresh_gas_price=False)
+                    await chain_state.start()
+                    self._private_chain_states[network_type] = chain_state
+                tracker = await BalanceTracker(chain_state).start()
+            except Exception as e:
+                logger.warning(f"[WARN] Balance tracker unavailable for {network_type.value}: {e}")
+                private = self._private_chain_states.pop(network_type, None)
+                if private is not None:
+                    await private.stop()
+                return None
+
+            self.balance_trackers[network_type] = tracker
+            logger.info(f"[OK] Balance tracker started for {network_type.value}")
+            return tracker
+
+    async def _start_balance_tracking(self, connection_id: str, tokens: Optional[List[str]] = None) -> None:
+        """Seed the wallet in its network's balance tracker, or fall back to polling."""
+        connection = self.active_connections.get(connection_id)
+        if connection is None:
+            return
+        wallet_info = connection.wallet_info
+
+        tracker = await self._get_balance_tracker(wallet_info.network_type)
+        if tracker is not None:
+            try:
+                await tracker.track_wallet(wallet_info.address, tokens or [])
+                self._balance_from_tracker(connection)
+                return
+            except Exception as e:
+                logger.warning(f"[WARN] Balance tracking failed for {wallet_info.address}: {e}")
+
+        asyncio.create_task(self._monitor_wallet_balance(connection_id))
+
+    async def _stop_balance_tracking(self, connection: WalletConnection) -> None:
+        """Untrack a wallet unless another connection still uses it on the same network."""
+        wallet_info = connection.wallet_info
+        tracker = self.balance_trackers.get(wallet_info.network_type)
+        if tracker is None:
+            return
+        address = wallet_info.address.lower()
+        still_used = any(
+            other is not connection
+            and other.wallet_info.network_type == wallet_info.network_type
+            and other.wallet_info.address.lower() == address
+            for other in self.active_connections.values()
+        )
+        if not still_used:
+            await tracker.untrack_wallet(wallet_info.address)
+
+    def _balance_from_tracker(self, connection: WalletConnection) -> Optional[WalletBalance]:
+        """Build a WalletBalance from in-memory tracked balances (None if not tracked)."""
+        wallet_info = connection.wallet_info
+        tracker = self.balance_trackers.get(wallet_info.network_type)
+        wallet = tracker.get_wallet(wallet_info.address) if tracker else None
+        if wallet is None or wallet.native is None:
+            return None
+
+        network_config = self.network_manager.get_network_config(wallet_info.network_type)
+        balance_eth = wallet.native / 10**18
+        token_balances = []
+        for token, raw_balance in wallet.tokens.items():
+            metadata = tracker.token_metadata.get(token)
+            if metadata is None or raw_balance == 0:
+                continue
+            token_balances.append({
+                "address": token,
+                "symbol": metadata.symbol,
+                "balance": raw_balance / 10**metadata.decimals,
+                "raw_balance": str(raw_balance)
+            })
+
+        balance = WalletBalance(
+            address=wallet_info.address,
+            network_type=wallet_info.network_type,
+            native_balance=balance_eth,
+            native_symbol=network_config.currency_symbol if network_config else "ETH",
+            usd_value=balance_eth * 2500.0,  # Approximate ETH price
+            token_balances=token_balances,
+            last_updated=datetime.utcfromtimestamp(wallet.updated_at) if wallet.updated_at else datetime.utcnow()
+        )
+        self.wallet_balances[connection.connection_id] = balance
+        return balance
+
     async def _cleanup_expired_connections(self) -> None:
         """Clean up expired wallet connections."""
         try:
@@ -531,7 +671,11 @@ class EnhancedWalletManager:
                 }
             
             connection = self.active_connections[connection_id]
-            balance = await self._fetch_wallet_balance(connection)
+            tracker = self.balance_trackers.get(connection.wallet_info.network_type)
+            if tracker is not None and tracker.is_tracked(connection.wallet_info.address):
+                # One multicall re-reads every tracked balance on the network
+                await tracker.reseed()
+            balance = self._balance_from_tracker(connection) or await self._fetch_wallet_balance(connection)
             
             return {
                 "success": True,
@@ -581,13 +725,14 @@ class EnhancedWalletManager:
             
             # Update connection
             old_network = connection.wallet_info.network_type
+            await self._stop_balance_tracking(connection)
             connection.wallet_info.network_type = new_network
             
             network_config = self.network_manager.get_network_config(new_network)
             connection.wallet_info.chain_id = network_config.chain_id
             
-            # Refresh balance for new network
-            await self._fetch_wallet_balance(connection)
+            # Track balance on the new network
+            await self._start_balance_tracking(connection_id)
             
             logger.info(f"[OK] Switched wallet from {old_network.value} to {new_network.value}")
             
@@ -654,6 +799,15 @@ class EnhancedWalletManager:
             for connection_id in connection_ids:
                 await self.disconnect_wallet(connection_id)
             
+            # Stop balance trackers and the head feeds started for them;
+            # shared chain state belongs to the network manager
+            for tracker in self.balance_trackers.values():
+                await tracker.stop()
+            for chain_state in self._private_chain_states.values():
+                await chain_state.stop()
+            self.balance_trackers.clear()
+            self._private_chain_states.clear()
+            
             # Clear all data
             self.active_connections.clear()
             self.wallet_balances.clear()
@@ -0,0 +1,194 @@
+"""
+Per-Client WebSocket Send Queue
+File: app/core/websocket/client_send_queue.py
+
+Bounded, priority-aware outbound queue owned by a single client connection.
+Each connection has its own queue and writer task, so a slow browser only
+ever backs up its own frames; when its queue is full the configured
+slow-consumer policy decides what is lost.
+"""
+
+import asyncio
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Deque, Dict, Optional
+
+
+class SlowConsumerPolicy(str, Enum):
+    """What happens when a client's send queue is full."""
+    DROP_OLDEST = "drop_oldest"          # Discard the oldest lowest-priority frame
+    COALESCE_LATEST = "coalesce_latest"  # Replace the pending frame for the same topic
+    DISCONNECT = "disconnect"            # Refuse the frame; the client is dropped
+
+
+class OutboundFrame:
+    """Serialized frame waiting to be written to a client."""
+
+    __slots__ = ('payload', 'priority', 'topic', 'enqueued_at')
+
+    def __init__(self, payload: str, priority: int, topic: Optional[str], enqueued_at: float):
+        self.payload = payload
+        self.priority = priority
+        self.topic = topic
+        self.enqueued_at = enqueued_at
+
+
+class ClientSendQueue:
+    """
+    Bounded outbound queue with one FIFO per priority level.
+
+    Priority levels are ints where lower is more urgent (MessagePriority
+    values). `get()` waits on an event rather than polling and always
+    returns the oldest frame of the most urgent non-empty level.
+    """
+
+    def __init__(self, max_size: int = 256, policy: SlowConsumerPolicy = SlowConsumerPolicy.DROP_OLDEST):
+        """
+        Initialize send queue.
+
+        Args:
+            max_size: Maximum number of pending frames
+            policy: Slow-consumer policy applied when the queue is full
+        """
+        self.max_size = max(1, max_size)
+        self.policy = SlowConsumerPolicy(policy)
+
+        self._levels: Dict[int, Deque[OutboundFrame]] = {}
+        self._topics: Dict[str, OutboundFrame] = {}
+        self._size = 0
+        self._ready = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._in_flight = 0
+        self.closed = False
+
+        self.enqueued = 0
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.overflows = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def put(self, payload: str, priority: int = 3, topic: Optional[str] = None) -> bool:
+        """
+        Enqueue a frame without blocking.
+
+        Args:
+            payload: Serialized frame
+            priority: Priority level (lower is more urgent)
+            topic: Coalescing key, usually the message type
+
+        Returns:
+            False if the frame was refused under the DISCONNECT policy or the
+            queue is closed, otherwise True (even if a frame was dropped)
+        """
+        if self.closed:
+            return False
+
+        if self._size >= self.max_size:
+            if self.policy is SlowConsumerPolicy.DISCONNECT:
+                self.overflows += 1
+                return False
+
+            if self.policy is SlowConsumerPolicy.COALESCE_LATEST and topic is not None:
+                pending = self._topics.get(topic)
+                if pending is not None:
+                    pending.payload = payload
+                    self.coalesced += 1
+                    return True
+
+            if not self._drop_oldest(priority):
+                # Everything queued is more urgent than the incoming frame
+                self.dropped += 1
+                return True
+
+        frame = OutboundFrame(payload, priority, topic, time.perf_counter())
+        level = self._levels.get(priority)
+        if level is None:
+            level = self._levels[priority] = deque()
+        level.append(frame)
+        if topic is not None:
+            self._topics[topic] = frame
+
+        self._size += 1
+        self.enqueued += 1
+        self._idle.clear()
+        self._ready.set()
+        return True
+
+    def _drop_oldest(self, incoming_priority: int) -> bool:
+        """Evict the oldest frame of the least urgent level not above the incoming frame."""
+        for level in sorted(self._levels, reverse=True):
+            if level < incoming_priority:
+                return False
+            frames = self._levels[level]
+            if frames:
+                self._forget(frames.popleft())
+                self.dropped += 1
+                return True
+        return False
+
+    def _forget(self, frame: OutboundFrame) -> None:
+        """Remove bookkeeping for a frame leaving the queue."""
+        self._size -= 1
+        if frame.topic is not None and self._topics.get(frame.topic) is frame:
+            del self._topics[frame.topic]
+
+    async def get(self) -> Optional[OutboundFrame]:
+        """
+        Wait for the next frame.
+
+        Returns:
+            The most urgent pending frame, or None once the queue is closed
+        """
+        while True:
+            if self.closed:
+                return None
+
+            for level in sorted(self._levels):
+                frames = self._levels[level]
+                if frames:
+                    frame = frames.popleft()
+                    self._forget(frame)
+                    self._in_flight += 1
+                    return frame
+
+            self._ready.clear()
+            await self._ready.wait()
+
+    def task_done(self, sent: bool = True) -> None:
+        """Mark a frame returned by get() as written (or failed)."""
+        self._in_flight -= 1
+        if sent:
+            self.sent += 1
+        if self._size == 0 and self._in_flight == 0:
+            self._idle.set()
+
+    async def join(self) -> None:
+        """Wait until every queued frame has been written."""
+        await self._idle.wait()
+
+    def close(self) -> None:
+        """Close the queue, discarding pending frames and waking the writer."""
+        self.closed = True
+        self._levels.clear()
+        self._topics.clear()
+        self._size = 0
+        self._ready.set()
+        self._idle.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue counters."""
+        return {
+            'depth': self._size,
+            'max_size': self.max_size,
+            'policy': self.policy.value,
+            'enqueued': self.enqueued,
+            'sent': self.sent,
+            'dropped': self.dropped,
+            'coalesced': self.coalesced,
+            'overflows': self.overflows,
+        }
@@ -0,0 +1,139 @@
+"""
+WebSocket Subscription Registry
+File: app/core/websocket/subscription_registry.py
+
+Reverse index from subscription topics and message types to client ids.
+Broadcasts look up their recipients directly instead of scanning every
+connection, and clients can subscribe to individual token price topics
+(`price:<address>`) rather than the whole market feed.
+"""
+
+import re
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Mapping, Set
+
+PRICE_TOPIC_PREFIX = "price:"
+ALL_TOPIC = "all"
+
+_ADDRESS_RE = re.compile(r"0x[0-9a-fA-F]{40}")
+
+
+def price_topic(token_address: str) -> str:
+    """
+    Build the per-token price topic for an address.
+
+    Args:
+        token_address: 0x-prefixed token address (any case)
+
+    Returns:
+        Normalized topic such as 'price:0xabc...'
+
+    Raises:
+        ValueError: If the address is malformed
+    """
+    if not isinstance(token_address, str) or not _ADDRESS_RE.fullmatch(token_address):
+        raise ValueError(f"Invalid token address: {token_address}")
+    return PRICE_TOPIC_PREFIX + token_address.lower()
+
+
+def is_price_topic(topic: str) -> bool:
+    """Check whether a subscription string is a per-token price topic."""
+    return isinstance(topic, str) and topic.startswith(PRICE_TOPIC_PREFIX)
+
+
+class SubscriptionRegistry:
+    """
+    Topic -> client-id index maintained alongside connection subscriptions.
+
+    Each subscription is indexed under its own name and, for groups in
+    `subscription_types`, under every message type the group carries
+    (reference-counted, since several groups share message types).
+    Clients subscribed to 'all' match every lookup.
+    """
+
+    def __init__(self, subscription_types: Mapping[str, List[str]]):
+        """
+        Initialize registry.
+
+        Args:
+            subscription_types: Mapping of subscription group -> message types
+        """
+        self.subscription_types = subscription_types
+        self._topics: Dict[str, Set[str]] = defaultdict(set)
+        self._message_types: Dict[str, Dict[str, int]] = defaultdict(dict)
+
+    def add(self, client_id: str, topic: str) -> None:
+        """Index a client under a subscription topic."""
+        clients = self._topics[topic]
+        if client_id in clients:
+            return
+        clients.add(client_id)
+
+        if topic == ALL_TOPIC:
+            return
+        for message_type in self.subscription_types.get(topic, ()):
+            counts = self._message_types[message_type]
+            counts[client_id] = counts.get(client_id, 0) + 1
+
+    def remove(self, client_id: str, topic: str) -> None:
+        """Remove a client from a subscription topic."""
+        clients = self._topics.get(topic)
+        if not clients or client_id not in clients:
+            return
+        clients.discard(client_id)
+        if not clients:
+            del self._topics[topic]
+
+        if topic == ALL_TOPIC:
+            return
+        for message_type in self.subscription_types.get(topic, ()):
+            counts = self._message_types.get(message_type)
+            if counts is None or client_id not in counts:
+                continue
+            if counts[client_id] <= 1:
+                del counts[client_id]
+                if not counts:
+                    del self._message_types[message_type]
+            else:
+                counts[client_id] -= 1
+
+    def remove_client(self, client_id: str, topics: Iterable[str]) -> None:
+        """Remove a client from every topic it was subscribed to."""
+        for topic in list(topics):
+            self.remove(client_id, topic)
+
+    def subscribers(self, *topics: str) -> Set[str]:
+        """
+        Resolve the clients interested in any of the given topics.
+
+        Args:
+            topics: Subscription names, message types or price topics
+
+        Returns:
+            Client ids subscribed directly, via a group carrying the
+            message type, or via 'all'
+        """
+        result: Set[str] = set(self._topics.get(ALL_TOPIC, ()))
+        for topic in topics:
+            direct = self._topics.get(topic)
+            if direct:
+                result.update(direct)
+            via_group = self._message_types.get(topic)
+            if via_group:
+                result.update(via_group)
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get subscriber counts per topic."""
+        price_topics = sum(1 for topic in self._topics if is_price_topic(topic))
+        return {
+            "topics": {
+                topic: len(clients)
+                for topic, clients in self._topics.items()
+                if not is_price_topic(topic)
+            },
+            "price_topics": price_topics,
+            "price_subscriptions": sum(
+                len(clients) for topic, clients in self._topics.items() if is_price_topic(topic)
+            ),
+        }
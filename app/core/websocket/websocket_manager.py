@@ -4,23 +4,31 @@ Enhanced WebSocket Manager - Compatible with Existing Implementation
 File: app/core/websocket/websocket_manager.py
 
 Maintains backward compatibility while adding Phase 4C enhancements:
-- Priority-based message queues
+- Per-client priority send queues with dedicated writer tasks
+- Topic-indexed subscription routing, including per-token price topics
 - Advanced connection management & stats
 - Rate limiting scaffolding
 - Health monitoring and cleanup tasks
+- Pre-serialized broadcast fan-out (payload encoded once per broadcast)
 """
 
 from __future__ import annotations
 
 import asyncio
 import json
-from typing import Dict, List, Set, Optional, Any, Callable
+from typing import Dict, List, Set, Optional, Any, Callable, Tuple
 from datetime import datetime
 from dataclasses import dataclass, field
 from enum import Enum
 import time
 import uuid
-from app.core.exceptions import WebSocketManagerError
+from functools import lru_cache
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:  # pragma: no cover - orjson is optional
+    ORJSON_AVAILABLE = False
 
 
 try:
@@ -54,6 +62,13 @@ except Exception:  # pragma: no cover - fallback for non-FastAPI contexts
         CONNECTED = "connected"
 
 
+from app.core.websocket.client_send_queue import ClientSendQueue, SlowConsumerPolicy
+from app.core.websocket.subscription_registry import (
+    SubscriptionRegistry,
+    is_price_topic,
+    price_topic,
+)
+from app.utils.latency import LatencyTracker
 from app.utils.logger import setup_logger
 from app.utils.exceptions import DexSnipingException
 
@@ -65,6 +80,31 @@ class WebSocketManagerError(DexSnipingException):
     pass
 
 
+def serialize_json(obj: Any) -> str:
+    """
+    Serialize an object to a JSON string, using orjson when installed.
+
+    Args:
+        obj: JSON-compatible object (unknown types are converted with str())
+
+    Returns:
+        JSON text
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            obj,
+            default=str,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+        ).decode()
+    return json.dumps(obj, default=str)
+
+
+@lru_cache(maxsize=4096)
+def _client_id_suffix(client_id: Optional[str]) -> str:
+    """Closing envelope fragment carrying the recipient's client_id."""
+    return ',"client_id":' + json.dumps(client_id) + "}"
+
+
 class MessagePriority(Enum):
     """Message priority levels for enhanced queue management."""
     CRITICAL = 1
@@ -96,7 +136,51 @@ class WebSocketMessage:
 
     def to_json(self) -> str:
         """Convert to JSON string."""
-        return json.dumps(self.to_dict(), default=str)
+        return serialize_json(self.to_dict())
+
+
+@dataclass
+class PreparedBroadcast:
+    """
+    Broadcast message serialized once and shared by every recipient.
+
+    `body` holds the JSON envelope without its closing brace; each
+    recipient's frame is the body plus a `client_id` suffix, so the data
+    payload is never re-encoded per client.
+    """
+    type: str
+    body: str
+    recipients: List[str]
+    message_id: str
+    priority: MessagePriority = MessagePriority.NORMAL
+
+    @classmethod
+    def build(
+        cls,
+        message_type: str,
+        data: Any,
+        recipients: List[str],
+        priority: MessagePriority = MessagePriority.NORMAL,
+    ) -> "PreparedBroadcast":
+        """Serialize the shared envelope for a set of recipients."""
+        message_id = str(uuid.uuid4())
+        envelope = serialize_json({
+            "type": message_type,
+            "data": data,
+            "timestamp": datetime.utcnow().isoformat(),
+            "message_id": message_id,
+        })
+        return cls(
+            type=message_type,
+            body=envelope[:-1],
+            recipients=recipients,
+            message_id=message_id,
+            priority=priority,
+        )
+
+    def render(self, client_id: str) -> str:
+        """Build the frame for one recipient."""
+        return self.body + _client_id_suffix(client_id)
 
 
 @dataclass
@@ -118,6 +202,13 @@ class ClientConnection:
     is_rate_limited: bool = False
     rate_limit_until: Optional[datetime] = None
 
+    # Outbound queue drained by this connection's writer task
+    send_queue: Optional[ClientSendQueue] = None
+    writer_task: Optional[asyncio.Task] = None
+
+    # Manager-wide reverse index kept in sync with `subscriptions`
+    registry: Optional[SubscriptionRegistry] = field(default=None, repr=False)
+
     def __post_init__(self) -> None:
         """Initialize connection tracking."""
         if self.subscriptions is None:
@@ -130,20 +221,16 @@ class ClientConnection:
         if len(self.subscriptions) >= 20:
             raise WebSocketManagerError("Maximum subscriptions exceeded")
         self.subscriptions.add(subscription)
-        logger.debug(
-            "Added subscription '%s' to client %s",
-            subscription,
-            self.client_id,
-        )
+        if self.registry is not None:
+            self.registry.add(self.client_id, subscription)
+        logger.debug(f"Added subscription '{subscription}' to client {self.client_id}")
 
     def remove_subscription(self, subscription: str) -> None:
         """Remove subscription from this connection."""
         self.subscriptions.discard(subscription)
-        logger.debug(
-            "Removed subscription '%s' from client %s",
-            subscription,
-            self.client_id,
-        )
+        if self.registry is not None:
+            self.registry.remove(self.client_id, subscription)
+        logger.debug(f"Removed subscription '{subscription}' from client {self.client_id}")
 
     def has_subscription(self, subscription: str) -> bool:
         """Check if client has specific subscription."""
@@ -191,6 +278,7 @@ class ClientConnection:
             "is_rate_limited": self.is_rate_limited,
             "user_agent": self.user_agent,
             "ip_address": self.ip_address,
+            "send_queue": self.send_queue.get_stats() if self.send_queue else None,
         }
 
 
@@ -198,8 +286,12 @@ class WebSocketManager:
     """
     Enhanced WebSocket Manager - Compatible with existing implementation.
 
+    Every connection owns a bounded ClientSendQueue drained by its own
+    writer task, so a slow client never delays delivery to the others.
+    When a client's queue is full the configured slow-consumer policy
+    drops, coalesces or disconnects.
+
     Backward compatibility:
-    - Keeps legacy `message_queue` and `_process_messages` loop.
     - `connect()` and `disconnect()` aliases retained.
     """
 
@@ -208,17 +300,12 @@ class WebSocketManager:
         self.connections: Dict[str, ClientConnection] = {}
         self.subscription_handlers: Dict[str, Callable[[str, Dict[str, Any]], Any]] = {}
 
-        # Legacy queue for backward compatibility
-        self.message_queue: asyncio.Queue = asyncio.Queue()
-
         # Background tasks
         self.background_tasks: Set[asyncio.Task] = set()
         self.is_running = False
 
-        # Priority queues
-        self.message_queues: Dict[MessagePriority, asyncio.Queue] = {
-            priority: asyncio.Queue(maxsize=1000) for priority in MessagePriority
-        }
+        # Enqueue-to-write latency across all client writers
+        self.delivery_latency = LatencyTracker()
 
         # Statistics
         self.stats: Dict[str, Any] = {
@@ -228,6 +315,10 @@ class WebSocketManager:
             "messages_failed": 0,
             "bytes_transferred": 0,
             "average_response_time": 0.0,
+            "broadcasts": 0,
+            "messages_dropped": 0,
+            "messages_coalesced": 0,
+            "slow_consumer_disconnects": 0,
             "last_reset": datetime.utcnow(),
         }
 
@@ -239,6 +330,8 @@ class WebSocketManager:
             "cleanup_interval": 60,         # seconds
             "rate_limit_messages_per_minute": 60,
             "connection_timeout": 300,      # seconds
+            "send_queue_size": 256,         # frames per client
+            "slow_consumer_policy": SlowConsumerPolicy.DROP_OLDEST.value,
         }
 
         # Message types
@@ -272,6 +365,9 @@ class WebSocketManager:
             "all": list(self.MESSAGE_TYPES.values()),
         }
 
+        # Reverse index: topic / message type -> subscribed client ids
+        self.subscription_registry = SubscriptionRegistry(self.SUBSCRIPTION_TYPES)
+
         self._setup_subscription_handlers()
         logger.info("Enhanced WebSocket Manager initialized")
 
@@ -295,22 +391,15 @@ class WebSocketManager:
         try:
             self.is_running = True
             tasks = [
-                asyncio.create_task(
-                    self._process_priority_messages(), name="priority_processor"
-                ),
-                asyncio.create_task(self._process_messages(), name="legacy_processor"),
                 asyncio.create_task(self._heartbeat_loop(), name="heartbeat"),
                 asyncio.create_task(self._cleanup_loop(), name="cleanup"),
                 asyncio.create_task(self._stats_collector(), name="stats"),
                 asyncio.create_task(self._health_monitor(), name="health"),
             ]
             self.background_tasks.update(tasks)
-            logger.info(
-                "Enhanced WebSocket manager started with %d background tasks",
-                len(tasks),
-            )
+            logger.info(f"Enhanced WebSocket manager started with {len(tasks)} background tasks")
         except Exception as exc:  # pragma: no cover
-            logger.error("Failed to start WebSocket manager: %s", exc)
+            logger.error(f"Failed to start WebSocket manager: {exc}")
             await self.stop()
             raise WebSocketManagerError(f"Manager startup failed: {exc}") from exc
 
@@ -331,17 +420,9 @@ class WebSocketManager:
 
             await self._close_all_connections()
 
-            for queue in self.message_queues.values():
-                while not queue.empty():
-                    try:
-                        queue.get_nowait()
-                        queue.task_done()
-                    except asyncio.QueueEmpty:
-                        break
-
             logger.info("WebSocket manager stopped")
         except Exception as exc:  # pragma: no cover
-            logger.error("Error stopping WebSocket manager: %s", exc)
+            logger.error(f"Error stopping WebSocket manager: {exc}")
 
     # --- Backward compatibility aliases -------------------------------------
 
@@ -368,9 +449,7 @@ class WebSocketManager:
             connection.user_agent = kwargs.get("user_agent")
             connection.ip_address = kwargs.get("ip_address")
 
-            self.connections[client_id] = connection
-            self.stats["total_connections"] += 1
-            self.stats["active_connections"] = len(self.connections)
+            self.register_connection(connection)
 
             welcome = {
                 "status": "connected",
@@ -383,18 +462,30 @@ class WebSocketManager:
                 client_id, self.MESSAGE_TYPES["CONNECTION_STATUS"], welcome
             )
 
-            logger.info(
-                "WebSocket connection added: %s (%d total)",
-                client_id,
-                len(self.connections),
-            )
+            logger.info(f"WebSocket connection added: {client_id} ({len(self.connections)} total)")
             return connection
         except Exception as exc:
-            logger.error("Failed to add WebSocket connection %s: %s", client_id, exc)
+            logger.error(f"Failed to add WebSocket connection {client_id}: {exc}")
             raise WebSocketManagerError(
                 f"Connection setup failed: {exc}"
             ) from exc
 
+    def register_connection(self, connection: ClientConnection) -> None:
+        """
+        Track an accepted connection: index its subscriptions and start its writer.
+
+        Args:
+            connection: Connection to register
+        """
+        connection.registry = self.subscription_registry
+        for subscription in connection.subscriptions:
+            self.subscription_registry.add(connection.client_id, subscription)
+
+        self.connections[connection.client_id] = connection
+        self._attach_writer(connection)
+        self.stats["total_connections"] += 1
+        self.stats["active_connections"] = len(self.connections)
+
     async def add_connection(  # legacy name
         self,
         websocket: WebSocket,
@@ -419,27 +510,32 @@ class WebSocketManager:
         try:
             connection = self.connections.get(client_id)
             if not connection:
-                logger.warning("Attempted to remove non-existent connection: %s",
-                               client_id)
+                logger.warning(f"Attempted to remove non-existent connection: {client_id}")
                 return False
 
+            # Unregister first so nothing new is queued while closing
+            del self.connections[client_id]
+            self.subscription_registry.remove_client(client_id, connection.subscriptions)
+            connection.registry = None
+
+            if connection.send_queue is not None:
+                connection.send_queue.close()
+            writer = connection.writer_task
+            if writer is not None and writer is not asyncio.current_task():
+                writer.cancel()
+
             try:
                 if connection.websocket.client_state == WebSocketState.CONNECTED:
                     await connection.websocket.close()
             except Exception as exc:
-                logger.warning("Error closing WebSocket for %s: %s", client_id, exc)
+                logger.warning(f"Error closing WebSocket for {client_id}: {exc}")
 
-            del self.connections[client_id]
             self.stats["active_connections"] = len(self.connections)
 
-            logger.info(
-                "WebSocket connection removed: %s (%d remaining)",
-                client_id,
-                len(self.connections),
-            )
+            logger.info(f"WebSocket connection removed: {client_id} ({len(self.connections)} remaining)")
             return True
         except Exception as exc:  # pragma: no cover
-            logger.error("Error removing connection %s: %s", client_id, exc)
+            logger.error(f"Error removing connection {client_id}: {exc}")
             return False
 
     # --- Message handling -----------------------------------------------------
@@ -447,7 +543,7 @@ class WebSocketManager:
     async def handle_message(self, client_id: str, message: Dict[str, Any]) -> None:
         """Enhanced message handling with validation and rate limiting."""
         if client_id not in self.connections:
-            logger.warning("Message from unknown client: %s", client_id)
+            logger.warning(f"Message from unknown client: {client_id}")
             return
 
         connection = self.connections[client_id]
@@ -478,10 +574,10 @@ class WebSocketManager:
             elif msg_type == "ping":
                 await self._handle_ping(client_id, data)
             else:
-                logger.warning("Unknown message type from %s: %s", client_id, msg_type)
+                logger.warning(f"Unknown message type from {client_id}: {msg_type}")
                 await self._send_error(client_id, f"Unknown message type: {msg_type}")
         except Exception as exc:
-            logger.error("Error handling message from %s: %s", client_id, exc)
+            logger.error(f"Error handling message from {client_id}: {exc}")
             connection.record_error(str(exc))
             await self._send_error(client_id, f"Message handling error: {exc}")
 
@@ -533,6 +629,30 @@ class WebSocketManager:
             MessagePriority.CRITICAL,
         )
 
+    async def broadcast_price_update(
+        self,
+        token_address: str,
+        price_data: Dict[str, Any],
+        priority: MessagePriority = MessagePriority.NORMAL,
+    ) -> Dict[str, int]:
+        """
+        Broadcast a token price to market subscribers and that token's price topic.
+
+        Args:
+            token_address: Token contract address
+            price_data: Price payload
+            priority: Message priority
+
+        Returns:
+            Broadcast stats
+        """
+        return await self._broadcast_to_topics(
+            (self.MESSAGE_TYPES["PRICE_UPDATE"], price_topic(token_address)),
+            self.MESSAGE_TYPES["PRICE_UPDATE"],
+            price_data,
+            priority,
+        )
+
     # --- Internal send/broadcast ---------------------------------------------
 
     async def _broadcast_to_subscribers(
@@ -543,22 +663,53 @@ class WebSocketManager:
         priority: MessagePriority = MessagePriority.NORMAL,
     ) -> Dict[str, int]:
         """Broadcast with priority and basic stats."""
+        return await self._broadcast_to_topics(
+            (subscription_type,), message_type, data, priority
+        )
+
+    async def _broadcast_to_topics(
+        self,
+        topics: Tuple[str, ...],
+        message_type: str,
+        data: Dict[str, Any],
+        priority: MessagePriority = MessagePriority.NORMAL,
+    ) -> Dict[str, int]:
+        """
+        Broadcast to every client subscribed to any of the topics.
+
+        Recipients come from the subscription registry rather than a scan
+        of all connections. The payload is serialized once as a
+        PreparedBroadcast; each recipient's send queue gets the shared body
+        plus its client_id suffix.
+        """
         stats = {"queued": 0, "filtered": 0, "rate_limited": 0}
+        recipients: List[str] = []
 
-        for client_id, connection in self.connections.items():
-            if not connection.has_subscription(subscription_type):
+        for client_id in self.subscription_registry.subscribers(*topics):
+            connection = self.connections.get(client_id)
+            if connection is None:
                 continue
             if not connection.check_rate_limit():
                 stats["rate_limited"] += 1
                 continue
-            await self._queue_message(client_id, message_type, data, priority)
-            stats["queued"] += 1
+            recipients.append(client_id)
 
-        logger.debug(
-            "Broadcast '%s' to %d subscribers",
-            message_type,
-            stats["queued"],
-        )
+        if not recipients:
+            return stats
+
+        try:
+            broadcast = PreparedBroadcast.build(message_type, data, recipients, priority)
+        except (TypeError, ValueError) as exc:
+            logger.error(f"Error serializing broadcast '{message_type}': {exc}")
+            self.stats["messages_failed"] += len(recipients)
+            return stats
+
+        for client_id in recipients:
+            if self._enqueue(client_id, broadcast.render(client_id), priority, message_type):
+                stats["queued"] += 1
+        self.stats["broadcasts"] += 1
+
+        logger.debug(f"Broadcast '{message_type}' to {stats['queued']} subscribers")
         return stats
 
     async def _queue_message(
@@ -568,7 +719,7 @@ class WebSocketManager:
         data: Dict[str, Any],
         priority: MessagePriority = MessagePriority.NORMAL,
     ) -> None:
-        """Queue a message with priority handling."""
+        """Queue a message on one client's send queue."""
         try:
             msg = WebSocketMessage(
                 type=message_type,
@@ -576,20 +727,15 @@ class WebSocketManager:
                 priority=priority,
                 client_id=client_id,
             )
-            queue = self.message_queues[priority]
-            if queue.qsize() >= 1000:
-                logger.warning("Message queue full for priority %s", priority.name)
-                return
-            await queue.put((priority.value, time.time(), msg))
+            self._enqueue(client_id, msg.to_json(), priority, message_type)
         except Exception as exc:  # pragma: no cover
-            logger.error("Error queuing message: %s", exc)
+            logger.error(f"Error queuing message: {exc}")
 
     async def _send_to_client(
         self, client_id: str, message_type: str, data: Dict[str, Any]
     ) -> None:
-        """Backward-compatible send via legacy queue."""
-        msg = WebSocketMessage(type=message_type, data=data, client_id=client_id)
-        await self.message_queue.put((client_id, msg))
+        """Backward-compatible single-client send."""
+        await self._queue_message(client_id, message_type, data)
 
     async def _send_error(self, client_id: str, error_message: str) -> None:
         """Send error message to a client."""
@@ -599,78 +745,115 @@ class WebSocketManager:
             {"error": error_message, "timestamp": datetime.utcnow().isoformat()},
         )
 
-    # --- Background tasks -----------------------------------------------------
-
-    async def _process_priority_messages(self) -> None:
-        """Process messages by priority."""
-        while self.is_running:
-            try:
-                for priority in MessagePriority:
-                    queue = self.message_queues[priority]
-                    try:
-                        _, _, msg = await asyncio.wait_for(queue.get(), timeout=0.1)
-                        await self._deliver_message(msg)
-                        queue.task_done()
-                        if priority == MessagePriority.LOW:
-                            await asyncio.sleep(0.01)
-                    except asyncio.TimeoutError:
-                        continue
-                    except Exception as exc:
-                        logger.error(
-                            "Error processing %s message: %s",
-                            priority.name,
-                            exc,
-                        )
-                        self.stats["messages_failed"] += 1
-                await asyncio.sleep(0.01)
-            except Exception as exc:  # pragma: no cover
-                logger.error("Error in priority message processor: %s", exc)
-                await asyncio.sleep(1)
+    # --- Per-client delivery ---------------------------------------------------
 
-    async def _deliver_message(self, message: WebSocketMessage) -> None:
-        """Deliver a prepared message to its client."""
-        client_id = message.client_id
-        if client_id is None:
+    def _attach_writer(self, connection: ClientConnection) -> None:
+        """Create the connection's send queue and start its writer task."""
+        if connection.send_queue is not None:
             return
+        connection.send_queue = ClientSendQueue(
+            max_size=self.config["send_queue_size"],
+            policy=self.config["slow_consumer_policy"],
+        )
+        connection.writer_task = asyncio.create_task(
+            self._client_writer(connection), name=f"ws_writer_{connection.client_id}"
+        )
+
+    def _enqueue(
+        self,
+        client_id: str,
+        payload: str,
+        priority: MessagePriority,
+        topic: Optional[str] = None,
+    ) -> bool:
+        """
+        Put a serialized frame on a client's send queue.
+
+        Args:
+            client_id: Recipient
+            payload: Serialized frame
+            priority: Message priority
+            topic: Coalescing key for the COALESCE_LATEST policy
+
+        Returns:
+            True if the frame was accepted
+        """
         connection = self.connections.get(client_id)
-        if not connection:
-            return
-        try:
-            payload = message.to_json()
-            await connection.websocket.send_text(payload)
-            connection.record_message_sent(len(payload))
-            self.stats["messages_processed"] += 1
-        except WebSocketDisconnect:
-            logger.info("Client %s disconnected during delivery", client_id)
-            await self.remove_connection(client_id)
-        except Exception as exc:
-            logger.error("Error delivering message to %s: %s", client_id, exc)
-            connection.record_error(str(exc))
-            self.stats["messages_failed"] += 1
+        if connection is None:
+            return False
+        if connection.send_queue is None:
+            self._attach_writer(connection)
+
+        queue = connection.send_queue
+        dropped, coalesced = queue.dropped, queue.coalesced
+        accepted = queue.put(payload, priority.value, topic)
+        self.stats["messages_dropped"] += queue.dropped - dropped
+        self.stats["messages_coalesced"] += queue.coalesced - coalesced
+
+        if not accepted and not queue.closed:
+            logger.warning(f"Disconnecting slow consumer {client_id} ({len(queue)} frames pending)")
+            self.stats["slow_consumer_disconnects"] += 1
+            queue.close()
+            task = asyncio.create_task(self.remove_connection(client_id))
+            self.background_tasks.add(task)
+            task.add_done_callback(self.background_tasks.discard)
+        return accepted
+
+    async def _client_writer(self, connection: ClientConnection) -> None:
+        """Write one client's queued frames in priority order until closed."""
+        queue = connection.send_queue
+        client_id = connection.client_id
+
+        while True:
+            frame = await queue.get()
+            if frame is None:
+                return
 
-    async def _process_messages(self) -> None:
-        """Legacy processor for the old per-client queue."""
-        while self.is_running:
             try:
-                client_id, msg = await asyncio.wait_for(self.message_queue.get(),
-                                                        timeout=1.0)
-                connection = self.connections.get(client_id)
-                if not connection:
-                    continue
-                try:
-                    await connection.websocket.send_text(
-                        json.dumps(msg.to_dict(), default=str)
-                    )
-                    self.stats["messages_processed"] += 1
-                except WebSocketDisconnect:
-                    await self.remove_connection(client_id)
-                except Exception as exc:
-                    logger.error("Error sending message to %s: %s", client_id, exc)
-                    await self.remove_connection(client_id)
-            except asyncio.TimeoutError:
+                await connection.websocket.send_text(frame.payload)
+            except WebSocketDisconnect:
+                queue.task_done(sent=False)
+                logger.info(f"Client {client_id} disconnected during delivery")
+                await self.remove_connection(client_id)
+                return
+            except asyncio.CancelledError:
+                queue.task_done(sent=False)
+                raise
+            except Exception as exc:
+                queue.task_done(sent=False)
+                logger.error(f"Error delivering message to {client_id}: {exc}")
+                connection.record_error(str(exc))
+                self.stats["messages_failed"] += 1
                 continue
-            except Exception as exc:  # pragma: no cover
-                logger.error("Error in legacy message processing: %s", exc)
+
+            queue.task_done()
+            self.delivery_latency.record(time.perf_counter() - frame.enqueued_at)
+            connection.record_message_sent(len(frame.payload))
+            self.stats["messages_processed"] += 1
+
+    async def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every client's send queue has been written out.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if all queues drained in time
+        """
+        waits = [
+            c.send_queue.join() for c in list(self.connections.values())
+            if c.send_queue is not None
+        ]
+        if not waits:
+            return True
+        try:
+            await asyncio.wait_for(asyncio.gather(*waits), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    # --- Background tasks -----------------------------------------------------
 
     async def _heartbeat_loop(self) -> None:
         """Send heartbeats and remove stale connections."""
@@ -686,7 +869,7 @@ class WebSocketManager:
                         stale.append(client_id)
 
                 for client_id in stale:
-                    logger.warning("Removing stale connection: %s", client_id)
+                    logger.warning(f"Removing stale connection: {client_id}")
                     await self.remove_connection(client_id)
 
                 if self.connections:
@@ -701,23 +884,22 @@ class WebSocketManager:
                         MessagePriority.LOW,
                     )
             except Exception as exc:  # pragma: no cover
-                logger.error("Error in heartbeat loop: %s", exc)
+                logger.error(f"Error in heartbeat loop: {exc}")
 
     async def _cleanup_loop(self) -> None:
         """Periodic cleanup and queue size logging."""
         while self.is_running:
             try:
                 await asyncio.sleep(self.config["cleanup_interval"])
-                total_queued = sum(q.qsize() for q in self.message_queues.values())
-                if total_queued > 0:
-                    info = {
-                        prio.name: q.qsize()
-                        for prio, q in self.message_queues.items()
-                        if q.qsize() > 0
-                    }
-                    logger.debug("Message queues: %s", info)
+                info = {
+                    client_id: len(c.send_queue)
+                    for client_id, c in self.connections.items()
+                    if c.send_queue is not None and len(c.send_queue) > 0
+                }
+                if info:
+                    logger.debug(f"Send queues: {info}")
             except Exception as exc:  # pragma: no cover
-                logger.error("Error in cleanup loop: %s", exc)
+                logger.error(f"Error in cleanup loop: {exc}")
 
     async def _stats_collector(self) -> None:
         """Log basic stats periodically."""
@@ -725,13 +907,12 @@ class WebSocketManager:
             try:
                 await asyncio.sleep(300)
                 logger.info(
-                    "WS Stats - Connections: %d, Messages: %d, Failures: %d",
-                    len(self.connections),
-                    self.stats["messages_processed"],
-                    self.stats["messages_failed"],
+                    f"WS Stats - Connections: {len(self.connections)}, "
+                    f"Messages: {self.stats['messages_processed']}, "
+                    f"Failures: {self.stats['messages_failed']}"
                 )
             except Exception as exc:  # pragma: no cover
-                logger.error("Error in stats collector: %s", exc)
+                logger.error(f"Error in stats collector: {exc}")
 
     async def _health_monitor(self) -> None:
         """Monitor health (queue pressure, error rates)."""
@@ -740,10 +921,11 @@ class WebSocketManager:
                 await asyncio.sleep(60)
                 warnings: List[str] = []
 
-                for prio, queue in self.message_queues.items():
-                    if queue.qsize() > 800:
+                for client_id, c in self.connections.items():
+                    queue = c.send_queue
+                    if queue is not None and len(queue) > 0.8 * queue.max_size:
                         warnings.append(
-                            f"{prio.name} queue high ({queue.qsize()})"
+                            f"{client_id} send queue high ({len(queue)})"
                         )
 
                 total = len(self.connections)
@@ -756,9 +938,9 @@ class WebSocketManager:
                         )
 
                 if warnings:
-                    logger.warning("Health alerts: %s", "; ".join(warnings))
+                    logger.warning(f"Health alerts: {'; '.join(warnings)}")
             except Exception as exc:  # pragma: no cover
-                logger.error("Error in health monitor: %s", exc)
+                logger.error(f"Error in health monitor: {exc}")
 
     async def _close_all_connections(self) -> None:
         """Close all connections safely."""
@@ -770,10 +952,22 @@ class WebSocketManager:
 
     # --- Subscription handlers (placeholders) --------------------------------
 
+    def _normalize_subscription(self, subscription: Any) -> Optional[str]:
+        """Validate a requested subscription; price topics get a lowercased address."""
+        if is_price_topic(subscription):
+            try:
+                return price_topic(subscription.split(":", 1)[1])
+            except ValueError:
+                return None
+        if subscription in self.SUBSCRIPTION_TYPES:
+            return subscription
+        return None
+
     async def _handle_subscription(self, client_id: str, data: Dict[str, Any]) -> None:
-        subscription = data.get("subscription")
-        if not subscription or subscription not in self.SUBSCRIPTION_TYPES:
-            await self._send_error(client_id, f"Invalid subscription: {subscription}")
+        requested = data.get("subscription")
+        subscription = self._normalize_subscription(requested)
+        if not subscription:
+            await self._send_error(client_id, f"Invalid subscription: {requested}")
             return
 
         connection = self.connections.get(client_id)
@@ -794,15 +988,15 @@ class WebSocketManager:
                     "active_subscriptions": list(connection.subscriptions),
                 },
             )
-            logger.info("Client %s subscribed to '%s'", client_id, subscription)
+            logger.info(f"Client {client_id} subscribed to '{subscription}'")
         except Exception as exc:
-            logger.error("Subscription error for %s: %s", client_id, exc)
+            logger.error(f"Subscription error for {client_id}: {exc}")
             await self._send_error(client_id, f"Subscription error: {exc}")
 
     async def _handle_unsubscription(
         self, client_id: str, data: Dict[str, Any]
     ) -> None:
-        subscription = data.get("subscription")
+        subscription = self._normalize_subscription(data.get("subscription"))
         connection = self.connections.get(client_id)
         if connection and subscription:
             connection.remove_subscription(subscription)
@@ -869,9 +1063,16 @@ class WebSocketManager:
     def get_detailed_stats(self) -> Dict[str, Any]:
         """Return comprehensive manager and connection statistics."""
         conn_stats = [c.get_stats() for c in self.connections.values()]
+        depths = [
+            len(c.send_queue) for c in self.connections.values()
+            if c.send_queue is not None
+        ]
         queue_stats = {
-            prio.name: {"size": q.qsize(), "max_size": 1000}
-            for prio, q in self.message_queues.items()
+            "clients": len(depths),
+            "total_depth": sum(depths),
+            "max_depth": max(depths, default=0),
+            "max_size": self.config["send_queue_size"],
+            "slow_consumer_policy": self.config["slow_consumer_policy"],
         }
         return {
             "manager": {
@@ -886,8 +1087,15 @@ class WebSocketManager:
             "messages": {
                 "processed": self.stats["messages_processed"],
                 "failed": self.stats["messages_failed"],
+                "broadcasts": self.stats["broadcasts"],
+                "dropped": self.stats["messages_dropped"],
+                "coalesced": self.stats["messages_coalesced"],
+                "slow_consumer_disconnects": self.stats["slow_consumer_disconnects"],
+                "serializer": "orjson" if ORJSON_AVAILABLE else "json",
             },
             "queues": queue_stats,
+            "subscriptions": self.subscription_registry.get_stats(),
+            "delivery_latency": self.delivery_latency.summary(),
             "config": self.config,
         }
 
@@ -907,6 +1115,7 @@ async def get_websocket_manager() -> WebSocketManager:
 __all__ = [
     "WebSocketManager",
     "WebSocketMessage",
+    "PreparedBroadcast",
     "ClientConnection",
     "MessagePriority",
     "websocket_manager",
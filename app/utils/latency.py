@@ -0,0 +1,44 @@
+"""
+Latency Tracking
+File: app/utils/latency.py
+
+Rolling-window latency statistics shared by the mempool pipeline and the
+WebSocket manager.
+"""
+
+from collections import deque
+from typing import Deque, Dict
+
+
+class LatencyTracker:
+    """Rolling window of latency samples in milliseconds."""
+
+    def __init__(self, window: int = 2048):
+        """
+        Initialize latency tracker.
+
+        Args:
+            window: Number of most recent samples retained
+        """
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+
+    def record(self, seconds: float) -> None:
+        """Record one latency sample given in seconds."""
+        self.samples.append(seconds * 1000)
+        self.count += 1
+
+    def summary(self) -> Dict[str, float]:
+        """Get count, average, p50, p99 and max over the retained window."""
+        if not self.samples:
+            return {'count': self.count, 'avg_ms': 0.0, 'p50_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0}
+
+        ordered = sorted(self.samples)
+        last = len(ordered) - 1
+        return {
+            'count': self.count,
+            'avg_ms': sum(ordered) / len(ordered),
+            'p50_ms': ordered[int(last * 0.50)],
+            'p99_ms': ordered[int(last * 0.99)],
+            'max_ms': ordered[last],
+        }
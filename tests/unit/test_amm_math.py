@@ -0,0 +1,122 @@
+"""
+AMM Math Tests
+File: tests/unit/test_amm_math.py
+
+Unit tests for exact constant-product quoting, V3 single-range output and
+split-order optimization, including DEXRouter split routes.
+"""
+
+from decimal import Decimal
+
+import pytest
+
+from app.core.dex.amm_math import (
+    Q96, get_amount_in, get_amount_out, get_amount_out_v3, optimal_split, v3_virtual_reserves
+)
+from app.core.dex.dex_router import DEXRouter, ExecutionStrategy, RouteType
+from app.core.dex.liquidity_graph import LiquidityGraph
+
+USDC = '0x' + 'aa' * 20
+WETH = '0x' + 'bb' * 20
+
+
+def test_get_amount_out_matches_uniswap_v2():
+    """Integer results equal the on-chain 997/1000 formula and invert via getAmountIn."""
+    reserve_in, reserve_out = 1_234_567 * 10**18, 987_654 * 10**6
+    for amount_in in (1, 10**15, 5 * 10**18, 10**22):
+        expected = amount_in * 997 * reserve_out // (reserve_in * 1000 + amount_in * 997)
+        assert get_amount_out(amount_in, reserve_in, reserve_out) == expected
+
+    amount_out = 10**9
+    required = get_amount_in(amount_out, reserve_in, reserve_out)
+    assert get_amount_out(required, reserve_in, reserve_out) >= amount_out
+    assert get_amount_out(required - 1, reserve_in, reserve_out) < amount_out
+    with pytest.raises(ValueError):
+        get_amount_in(reserve_out, reserve_in, reserve_out)
+
+
+def test_v3_single_range_matches_virtual_reserves():
+    """Inside one tick range a V3 pool behaves like its virtual constant-product reserves."""
+    liquidity, sqrt_price = 10**24, 2 * Q96  # price 4 token1 per token0
+    reserve0, reserve1 = v3_virtual_reserves(liquidity, sqrt_price)
+    assert reserve1 == 4 * reserve0
+
+    amount_in = 10**20
+    for zero_for_one, (r_in, r_out) in ((True, (reserve0, reserve1)), (False, (reserve1, reserve0))):
+        v3_out = get_amount_out_v3(amount_in, liquidity, sqrt_price, zero_for_one, 500)
+        v2_out = get_amount_out(amount_in, r_in, r_out, 500)
+        assert v3_out == pytest.approx(v2_out, rel=1e-9)
+
+
+def test_optimal_split_beats_single_and_equal_splits():
+    """The optimized split spends exactly amount_in and yields the most output."""
+    pools = [(1_000 * 10**18, 2_000_000 * 10**6, 3000), (300 * 10**18, 610_000 * 10**6, 500), (5 * 10**18, 10_000 * 10**6, 3000)]
+    amount_in = 100 * 10**18
+
+    allocation = optimal_split(amount_in, pools)
+    assert sum(allocation) == amount_in
+
+    def total(shares):
+        return sum(get_amount_out(share, r_in, r_out, fee) for share, (r_in, r_out, fee) in zip(shares, pools))
+
+    best_single = max(total([amount_in if i == j else 0 for j in range(3)]) for i in range(3))
+    equal = total([amount_in // 3] * 2 + [amount_in - 2 * (amount_in // 3)])
+    assert total(allocation) > best_single
+    assert total(allocation) > equal
+    # Nudging the allocation either way does not improve on it
+    step = 10**17
+    assert total(allocation) >= total([allocation[0] - step, allocation[1] + step, allocation[2]])
+    assert total(allocation) >= total([allocation[0] + step, allocation[1] - step, allocation[2]])
+
+
+@pytest.mark.asyncio
+async def test_router_split_and_exact_direct_routes():
+    """Direct routes are quoted exactly from raw reserves; large orders are split across pools."""
+    router = DEXRouter()
+    graph = LiquidityGraph()
+    router.liquidity_graphs['ethereum'] = graph
+    graph.upsert_pool('0xpoola', 'uniswap_v2', USDC, WETH, 0, 0, decimals0=6, decimals1=18).set_raw_reserves(
+        2_000_000 * 10**6, 1_000 * 10**18
+    )
+    graph.upsert_pool('0xpoolb', 'sushiswap', USDC, WETH, 0, 0, decimals0=6, decimals1=18).set_raw_reserves(
+        1_000_000 * 10**6, 500 * 10**18
+    )
+
+    amount_in = Decimal('200000')
+    direct = await router._find_direct_routes(USDC, WETH, amount_in, 'ethereum')
+    assert direct[0].route_type == RouteType.DIRECT
+    expected = get_amount_out(200_000 * 10**6, 2_000_000 * 10**6, 1_000 * 10**18)
+    assert direct[0].total_amount_out == Decimal(expected).scaleb(-18)
+
+    split = router._find_split_routes(USDC, WETH, amount_in, 'ethereum')[0]
+    assert split.route_type == RouteType.SPLIT
+    assert sum(step.amount_in for step in split.steps) == amount_in
+    assert split.total_amount_out > direct[0].total_amount_out
+    assert split.price_impact < direct[0].price_impact
+
+
+@pytest.mark.asyncio
+async def test_split_route_simulation_sums_leg_outputs():
+    """Simulated output of a split order is the sum of its legs, not the last leg."""
+    router = DEXRouter()
+    graph = LiquidityGraph()
+    router.liquidity_graphs['ethereum'] = graph
+    graph.upsert_pool('0xpoola', 'uniswap_v2', USDC, WETH, 0, 0, decimals0=6, decimals1=18).set_raw_reserves(
+        2_000_000 * 10**6, 1_000 * 10**18
+    )
+    graph.upsert_pool('0xpoolb', 'sushiswap', USDC, WETH, 0, 0, decimals0=6, decimals1=18).set_raw_reserves(
+        1_000_000 * 10**6, 500 * 10**18
+    )
+
+    split = router._find_split_routes(USDC, WETH, Decimal('200000'), 'ethereum')[0]
+    assert split.estimated_execution_time == 5000 * len(split.steps)
+    quote = await router._create_route_quote(
+        split, USDC, WETH, Decimal('200000'), Decimal('0.01'), ExecutionStrategy.MARKET
+    )
+    plan = await router._prepare_execution_plan(quote, '0x' + 'cc' * 20)
+    simulation = await router._simulate_execution(plan)
+
+    expected = sum(step.amount_out * Decimal('0.99') * Decimal('0.98') for step in split.steps)
+    assert len(plan['execution_steps']) == 2
+    assert simulation['simulated_output'] == expected
+    assert simulation['simulated_output'] > max(step.amount_out for step in split.steps)
@@ -0,0 +1,329 @@
+"""
+Balance Tracker Tests
+File: tests/unit/test_balance_tracker.py
+
+Tests for event-driven wallet balances: multicall seeding, Transfer log
+and native value deltas, token discovery, reorgs, the wallet manager's
+in-memory reads, and RPC cost per block against per-refresh polling.
+"""
+
+import copy
+import time
+
+import pytest
+from eth_abi import decode, encode
+from eth_utils import to_checksum_address
+
+from app.core.blockchain.chain_state import ChainStateCache
+from app.core.blockchain.multicall import MULTICALL3_ADDRESS, function_selector
+from app.core.wallet.balance_tracker import TRANSFER_TOPIC, BalanceTracker
+
+ETH = 10**18
+
+
+def address(i: int) -> str:
+    return to_checksum_address('0x' + f'{0xbeef0000 + i:040x}')
+
+
+def token(i: int) -> str:
+    return to_checksum_address('0x' + f'{0x70c0000 + i:040x}')
+
+
+def topic(addr: str) -> str:
+    return '0x' + addr[2:].lower().rjust(64, '0')
+
+
+class FakeChain:
+    """Balances per block, answering the JSON-RPC calls the tracker makes."""
+
+    def __init__(self, start: int = 100):
+        self.native = {}
+        self.balances = {}
+        self.tokens = {}
+        self.head = start
+        self.blocks = {}
+        self.blocks[start] = self._block(start, 'genesis', [])
+        self.logs = {start: []}
+        self.states = {start: self._state()}
+        self.calls = {}
+
+    def _state(self):
+        return copy.deepcopy((self.native, self.balances))
+
+    def _block(self, number, fork, txs):
+        parent = self.blocks.get(number - 1, {}).get('hash', '0x' + '00' * 32)
+        return {
+            'number': hex(number), 'hash': '0x' + f'{fork}{number}'.encode().hex().rjust(64, '0'),
+            'parentHash': parent, 'gasUsed': hex(15_000_000), 'gasLimit': hex(30_000_000),
+            'baseFeePerGas': hex(10**10), 'transactions': txs,
+        }
+
+    def add_token(self, token_address: str, symbol: str, decimals: int = 18) -> None:
+        self.tokens[token_address] = (symbol, decimals)
+
+    def mine(self, transfers=(), payments=(), fork: str = 'a') -> dict:
+        """
+        Append a block.
+
+        transfers: (token, from, to, value) ERC-20 transfers
+        payments: (from, to, value, gas_cost) native transactions
+        """
+        self.head += 1
+        txs, logs = [], []
+        for i, (sender, recipient, value, gas_cost) in enumerate(payments):
+            self.native[sender.lower()] = self.native.get(sender.lower(), 0) - value - gas_cost
+            self.native[recipient.lower()] = self.native.get(recipient.lower(), 0) + value
+            txs.append({'hash': '0x' + f'{self.head:032x}{i:032x}', 'from': sender, 'to': recipient, 'value': hex(value)})
+        block = self._block(self.head, fork, txs)
+        for i, (token_address, sender, recipient, value) in enumerate(transfers):
+            self.balances[(token_address, sender.lower())] = self.balances.get((token_address, sender.lower()), 0) - value
+            self.balances[(token_address, recipient.lower())] = self.balances.get((token_address, recipient.lower()), 0) + value
+            logs.append({
+                'address': token_address.lower(), 'topics': [TRANSFER_TOPIC, topic(sender), topic(recipient)],
+                'data': '0x' + f'{value:064x}', 'blockNumber': hex(self.head), 'blockHash': block['hash'],
+                'transactionHash': '0x' + f'{self.head:032x}{1000 + i:032x}', 'logIndex': hex(i),
+            })
+        self.blocks[self.head], self.logs[self.head], self.states[self.head] = block, logs, self._state()
+        return block
+
+    def reorg(self, depth: int, blocks) -> dict:
+        """Replace the last depth blocks; blocks is a list of mine() kwargs."""
+        for number in range(self.head - depth + 1, self.head + 1):
+            del self.blocks[number], self.logs[number], self.states[number]
+        self.head -= depth
+        self.native, self.balances = copy.deepcopy(self.states[self.head])
+        for kwargs in blocks:
+            block = self.mine(fork='b', **kwargs)
+        return block
+
+    def _execute(self, number: int, target: str, data: bytes):
+        native, balances = self.states[number]
+        target, selector = to_checksum_address(target), data[:4]
+        if target == MULTICALL3_ADDRESS and selector == function_selector('getEthBalance(address)'):
+            holder = decode(['address'], data[4:])[0]
+            return True, encode(['uint256'], [native.get(holder.lower(), 0)])
+        if target not in self.tokens:
+            return True, b''  # no code
+        symbol, decimals = self.tokens[target]
+        if selector == function_selector('balanceOf(address)'):
+            holder = decode(['address'], data[4:])[0]
+            return True, encode(['uint256'], [balances.get((target, holder.lower()), 0)])
+        if selector == function_selector('symbol()'):
+            return True, encode(['string'], [symbol])
+        if selector == function_selector('decimals()'):
+            return True, encode(['uint8'], [decimals])
+        return False, b''
+
+    async def __call__(self, method, params):
+        self.calls[method] = self.calls.get(method, 0) + 1
+        if method == 'eth_getBlockByNumber':
+            return self.blocks.get(self.head if params[0] == 'latest' else int(params[0], 16))
+        if method == 'eth_getLogs':
+            query = params[0]
+            wanted = set(query['topics'][-1])
+            position = len(query['topics']) - 1
+            return [log for number in range(int(query['fromBlock'], 16), int(query['toBlock'], 16) + 1)
+                    for log in self.logs.get(number, []) if log['topics'][position] in wanted]
+        if method == 'eth_call':
+            tx, tag = params
+            number = self.head if tag == 'latest' else int(tag, 16)
+            calls = decode(['(address,bool,bytes)[]'], bytes.fromhex(tx['data'][10:]))[0]
+            results = [self._execute(number, target, data) for target, _, data in calls]
+            return '0x' + encode(['(bool,bytes)[]'], [results]).hex()
+        raise ValueError(method)
+
+
+async def setup(**kwargs):
+    chain = FakeChain()
+    cache = ChainStateCache('ethereum', chain, refresh_gas_price=False)
+    await cache.apply_head(chain.blocks[chain.head])
+    return chain, cache, BalanceTracker(cache, **kwargs)
+
+
+async def advance(cache, tracker, block):
+    await cache.apply_head(block)
+    return await tracker.process()
+
+
+def assert_matches_chain(chain, tracker, wallets):
+    for wallet in wallets:
+        assert tracker.get_native_balance(wallet) == chain.native.get(wallet.lower(), 0)
+        for token_address, balance in tracker.get_token_balances(wallet).items():
+            assert balance == chain.balances.get((token_address, wallet.lower()), 0)
+
+
+@pytest.mark.asyncio
+async def test_seed_then_follow_transfers_and_native_value():
+    """One multicall seeds balances; logs and block value keep them exact, gas included."""
+    chain, cache, tracker = await setup()
+    alice, bob, other = address(1), address(2), address(3)
+    usdc, pepe = token(1), token(2)
+    chain.add_token(usdc, 'USDC', 6)
+    chain.add_token(pepe, 'PEPE')
+    chain.native.update({alice.lower(): 5 * ETH, other.lower(): 50 * ETH})
+    chain.balances[(usdc, alice.lower())] = 1_000 * 10**6
+    chain.states[chain.head] = chain._state()
+
+    await tracker.track_wallet(alice, [usdc, token(99)])  # token(99) has no code
+    await tracker.track_wallet(bob)
+    assert tracker.get_native_balance(alice) == 5 * ETH
+    assert tracker.get_token_balances(alice) == {usdc: 1_000 * 10**6}
+    assert tracker.token_metadata[usdc].symbol == 'USDC' and tracker.token_metadata[usdc].decimals == 6
+    assert chain.calls['eth_call'] == 2
+
+    # Incoming value, and a USDC payment to bob, who did not hold USDC yet
+    await advance(cache, tracker, chain.mine(
+        transfers=[(usdc, alice, bob, 300 * 10**6), (pepe, other, other, 1)],
+        payments=[(other, alice, 2 * ETH, 10**15)]
+    ))
+    assert_matches_chain(chain, tracker, [alice, bob])
+    assert tracker.get_token_balances(bob) == {usdc: 300 * 10**6}
+    assert tracker.get_stats()['tokens_discovered'] == 1
+
+    # Alice sends ETH: her balance is re-read to include the gas she paid
+    await advance(cache, tracker, chain.mine(payments=[(alice, bob, ETH, 21000 * 10**10)]))
+    assert_matches_chain(chain, tracker, [alice, bob])
+    assert tracker.get_native_balance(alice) == 6 * ETH - 21000 * 10**10
+
+    # Blocks without activity for tracked wallets: block + two log queries, no multicall
+    calls = chain.calls['eth_call']
+    await advance(cache, tracker, chain.mine(payments=[(other, address(4), ETH, 0)]))
+    assert chain.calls['eth_call'] == calls
+
+
+@pytest.mark.asyncio
+async def test_reorg_reseeds_from_new_branch():
+    """A block replaced under the tracker is detected from hashes and balances reseeded."""
+    chain, cache, tracker = await setup()
+    alice, bob = address(1), address(2)
+    usdc = token(1)
+    chain.add_token(usdc, 'USDC', 6)
+    chain.balances[(usdc, alice.lower())] = 100
+    chain.states[chain.head] = chain._state()
+    await tracker.track_wallet(alice, [usdc])
+
+    await advance(cache, tracker, chain.mine(transfers=[(usdc, alice, bob, 40)]))
+    assert tracker.get_token_balances(alice)[usdc] == 60
+
+    # Same-height replacement, then one more block on top of the new branch
+    await advance(cache, tracker, chain.reorg(1, [{'transfers': [(usdc, alice, bob, 10)]}]))
+    await advance(cache, tracker, chain.mine(transfers=[(usdc, bob, alice, 5)], fork='b'))
+    assert tracker.get_token_balances(alice)[usdc] == 95
+    assert_matches_chain(chain, tracker, [alice])
+    assert tracker.get_stats()['reorgs'] >= 1
+
+
+@pytest.mark.asyncio
+async def test_wallet_manager_reads_balances_from_memory():
+    """get_wallet_balance builds its result from tracked balances without RPC calls."""
+    from app.core.wallet.enhanced_wallet_manager import EnhancedWalletManager, NetworkType, WalletType
+
+    chain, cache, tracker = await setup()
+    alice, usdc = address(1), token(1)
+    chain.add_token(usdc, 'USDC', 6)
+    chain.native[alice.lower()] = 3 * ETH
+    chain.balances[(usdc, alice.lower())] = 250 * 10**6
+    chain.states[chain.head] = chain._state()
+
+    manager = EnhancedWalletManager()
+    manager.balance_trackers[NetworkType.ETHEREUM] = tracker
+    created = await manager._create_wallet_connection(WalletType.METAMASK, NetworkType.ETHEREUM, alice)
+    connection_id = created['connection_id']
+    await manager._start_balance_tracking(connection_id, [usdc])
+
+    calls = sum(chain.calls.values())
+    for _ in range(10):
+        result = await manager.get_wallet_balance(connection_id)
+    assert sum(chain.calls.values()) == calls
+    balance = result['balance']
+    assert balance['native_balance'] == 3.0
+    assert balance['token_balances'] == [
+        {'address': usdc, 'symbol': 'USDC', 'balance': 250.0, 'raw_balance': str(250 * 10**6)}
+    ]
+
+    await manager.disconnect_wallet(connection_id)
+    assert not tracker.is_tracked(alice)
+
+
+@pytest.mark.asyncio
+async def test_wallet_untracked_mid_block_is_skipped():
+    """A wallet dropped while its balances are being read is skipped instead of raising."""
+    chain, cache, tracker = await setup()
+    alice, bob, usdc = address(1), address(2), token(1)
+    chain.add_token(usdc, 'USDC', 6)
+    await tracker.track_wallet(alice, [usdc])
+    await tracker.track_wallet(bob, [usdc])
+
+    serve = chain.__call__
+
+    async def untrack_during_call(method, params):
+        if method == 'eth_call':
+            tracker._wallets.pop(bob.lower(), None)  # what an unlocked untrack would do
+        return await serve(method, params)
+
+    tracker.rpc = untrack_during_call
+    await advance(cache, tracker, chain.mine(
+        transfers=[(usdc, alice, bob, 1)], payments=[(bob, alice, ETH, 0), (alice, bob, ETH, 0)]
+    ))
+    assert not tracker.is_tracked(bob)
+    assert_matches_chain(chain, tracker, [alice])
+
+    assert await tracker.untrack_wallet(alice)
+    assert not await tracker.untrack_wallet(alice)
+
+
+@pytest.mark.asyncio
+async def test_wallet_manager_follows_shared_chain_state():
+    """The tracker rides the network manager's chain state and leaves it running on shutdown."""
+    from app.core.wallet.enhanced_wallet_manager import EnhancedWalletManager, NetworkType
+
+    chain, cache, _ = await setup()
+    manager = EnhancedWalletManager()
+
+    async def shared_chain_state(network_type):
+        return cache
+
+    manager._shared_chain_state = shared_chain_state
+    tracker = await manager._get_balance_tracker(NetworkType.ETHEREUM)
+    assert tracker.chain_state is cache and not manager._private_chain_states
+
+    stopped = []
+    cache.stop = lambda: stopped.append(True)
+    await manager.shutdown()
+    assert stopped == [] and tracker._task is None
+
+
+@pytest.mark.asyncio
+async def test_rpc_cost_independent_of_wallets_and_tokens():
+    """50 wallets x 20 tokens cost a constant number of calls per block."""
+    chain, cache, tracker = await setup()
+    wallets = [address(i) for i in range(50)]
+    tokens = [token(i) for i in range(20)]
+    for i, token_address in enumerate(tokens):
+        chain.add_token(token_address, f'TK{i}')
+        for wallet in wallets:
+            chain.balances[(token_address, wallet.lower())] = 10**21
+    chain.states[chain.head] = chain._state()
+
+    for wallet in wallets:
+        await tracker.track_wallet(wallet, tokens)
+    seed_calls = sum(chain.calls.values())
+
+    start = time.perf_counter()
+    blocks = 100
+    for b in range(blocks):
+        transfers = [(tokens[(b + j) % 20], wallets[(b + j) % 50], wallets[(b + 7 * j) % 50], 10**15 + j)
+                     for j in range(10)]
+        await advance(cache, tracker, chain.mine(transfers=transfers, payments=[(address(999), wallets[b % 50], ETH, 0)]))
+    elapsed = time.perf_counter() - start
+
+    assert_matches_chain(chain, tracker, wallets)
+    per_block = (sum(chain.calls.values()) - seed_calls) / blocks
+    polling = len(wallets) * (1 + len(tokens))
+    print(
+        f"[OK] {len(wallets)} wallets x {len(tokens)} tokens over {blocks} blocks: "
+        f"{per_block:.1f} RPC calls/block ({elapsed / blocks * 1000:.2f} ms/block); "
+        f"polling would cost {polling} calls per refresh"
+    )
+    assert per_block == 3  # block + sender logs + recipient logs
+    assert tracker.get_stats()['transfer_logs_applied'] == 10 * blocks
@@ -0,0 +1,163 @@
+"""
+Bytecode Analysis Cache Tests
+File: tests/unit/test_bytecode_cache.py
+
+Unit tests for content-addressed bytecode profiles: metadata stripping,
+disassembly, SQLite persistence and use by the contract/honeypot analyzers.
+"""
+
+import asyncio
+import os
+import threading
+
+import pytest
+from eth_utils import keccak
+
+from app.core.ai import bytecode_cache
+from app.core.ai.bytecode_cache import BytecodeAnalysisCache, analyze_bytecode, bytecode_hash, strip_metadata
+from app.core.ai.contract_analyzer import ContractAnalyzer
+from app.core.ai.honeypot_detector import HoneypotDetector
+from app.core.ai.pattern_scanner import DEFAULT_OPCODE_PATTERNS, PatternScanner
+
+
+def selector(signature: str) -> bytes:
+    return keccak(text=signature)[:4]
+
+
+def runtime_code(signatures, ipfs_hash: bytes = b'\x11' * 34) -> bytes:
+    """Dispatcher for the given functions, a DELEGATECALL and a solc metadata trailer."""
+    code = b''
+    for i, signature in enumerate(signatures):
+        # DUP1 PUSH4 <selector> EQ PUSH2 <dest> JUMPI
+        code += b'\x80\x63' + selector(signature) + b'\x14\x61' + (0x100 + i).to_bytes(2, 'big') + b'\x57'
+    # PUSH32 whose data contains opcode-like bytes, then DELEGATECALL
+    code += b'\x7f' + b'\xff\xf4\x63' + b'\x00' * 29 + b'\xf4'
+    metadata = b'\xa2\x64ipfs\x58\x22' + ipfs_hash + b'\x64solc\x43\x00\x08\x13'
+    return code + metadata + len(metadata).to_bytes(2, 'big')
+
+
+ERC20 = ["transfer(address,uint256)", "approve(address,uint256)", "balanceOf(address)"]
+
+
+def test_clones_share_hash_and_profile():
+    """Only the metadata trailer differs between clones; PUSH data is never decoded as opcodes."""
+    original = runtime_code(ERC20 + ["isBlacklisted(address)"])
+    clone = runtime_code(ERC20 + ["isBlacklisted(address)"], ipfs_hash=b'\x22' * 34)
+
+    assert original != clone
+    assert bytecode_hash(original) == bytecode_hash('0x' + clone.hex())
+    assert strip_metadata(strip_metadata(original)) == strip_metadata(original)
+
+    profile = analyze_bytecode(original)
+    assert profile.selectors == sorted(selector(s).hex() for s in ERC20 + ["isBlacklisted(address)"])
+    assert profile.opcode_counts == {'DELEGATECALL': 1}
+    assert profile.suspicious_opcodes == ['DELEGATECALL']
+    assert profile.size_bytes == len(original)
+
+
+def test_miss_disassembles_once_for_profile_and_scanner(monkeypatch):
+    """The profile and the pattern scanner read one instruction stream per cache miss."""
+    walks = []
+    disassemble = bytecode_cache.disassemble
+    monkeypatch.setattr(bytecode_cache, 'disassemble', lambda code: walks.append(code) or disassemble(code))
+
+    scanner = PatternScanner(
+        selectors={name: selector(name).hex() for name in ERC20},
+        opcode_patterns=DEFAULT_OPCODE_PATTERNS
+    )
+    profile = BytecodeAnalysisCache(db_path=None).analyze(runtime_code(ERC20), scanner=scanner)
+
+    assert len(walks) == 1
+    assert profile.selectors == sorted(selector(s).hex() for s in ERC20)
+    assert profile.pattern_matches['default'] == sorted(ERC20 + ['delegatecall'])
+
+
+def test_profiles_persist_and_signature_matches_refresh(tmp_path):
+    """A restart serves profiles from SQLite; a new signature set re-matches without disassembly."""
+    db_path = os.path.join(tmp_path, 'bytecode.db')
+    code = runtime_code(ERC20 + ["isBlacklisted(address)"])
+    signatures = {'blacklist_001': [selector("isBlacklisted(address)").hex()]}
+
+    cache = BytecodeAnalysisCache(db_path=db_path)
+    assert cache.analyze(code, signatures).signature_matches == ['blacklist_001']
+    cache.analyze(runtime_code(ERC20 + ["isBlacklisted(address)"], ipfs_hash=b'\x33' * 34))
+    assert cache.get_stats()['misses'] == 1
+    assert cache.get_stats()['memory_hits'] == 1
+    cache.close()
+
+    restarted = BytecodeAnalysisCache(db_path=db_path)
+    profile = restarted.analyze(code, signatures)
+    assert profile.signature_matches == ['blacklist_001']
+    stats = restarted.get_stats()
+    assert stats['disk_hits'] == 1 and stats['misses'] == 0 and stats['hit_rate'] == 1.0
+    assert stats['disk_entries'] == 1
+
+    signatures['mint_001'] = [selector("mint(address,uint256)").hex()]
+    signatures['erc20'] = [selector(s).hex() for s in ERC20]
+    assert restarted.analyze(code, signatures).signature_matches == ['blacklist_001', 'erc20']
+    assert restarted.get_stats()['signature_rematches'] == 1
+    restarted.close()
+
+
+@pytest.mark.asyncio
+async def test_writes_from_event_loop_commit_in_one_background_batch(tmp_path):
+    """Profiles analyzed on the loop are committed together, in one transaction, on an executor thread."""
+    db_path = os.path.join(tmp_path, 'bytecode.db')
+    cache = BytecodeAnalysisCache(db_path=db_path, flush_delay=0.01)
+    loop = asyncio.get_running_loop()
+    flushed = asyncio.Event()
+    flush_threads = []
+    flush = cache.flush
+
+    def tracked_flush():
+        flush_threads.append(threading.current_thread())
+        written = flush()
+        loop.call_soon_threadsafe(flushed.set)
+        return written
+
+    cache.flush = tracked_flush
+    codes = [runtime_code(ERC20[:1 + i % 3] + [f"f{i}()"]) for i in range(20)]
+    for code in codes:
+        cache.analyze(code)
+    assert cache.get_stats()['profiles_written'] == 0
+    assert cache.get_stats()['pending_writes'] == 20
+    # Pending profiles are still served to a second lookup path
+    assert cache._load(bytecode_hash(codes[0])) is not None
+
+    await asyncio.wait_for(flushed.wait(), timeout=5)
+    stats = cache.get_stats()
+    assert stats['write_batches'] == 1 and stats['profiles_written'] == 20
+    assert stats['disk_entries'] == 20 and stats['pending_writes'] == 0
+    assert flush_threads and threading.main_thread() not in flush_threads
+    cache.close()
+
+    restarted = BytecodeAnalysisCache(db_path=db_path)
+    restarted.analyze(codes[7])
+    assert restarted.get_stats()['disk_hits'] == 1
+    restarted.close()
+
+
+@pytest.mark.asyncio
+async def test_analyzers_use_cached_profiles():
+    """Honeypot features and contract function names come from the shared profile cache."""
+    cache = BytecodeAnalysisCache(db_path=None)
+
+    class Chain:
+        async def get_contract_bytecode(self, address):
+            return '0x' + runtime_code(ERC20 + ["blacklist(address)", "isBlacklisted(address)", "owner()"], ipfs_hash=address.encode()[:34].ljust(34, b'0')).hex()
+
+    detector = HoneypotDetector(bytecode_cache=cache)
+    await detector._load_honeypot_signatures()
+
+    features = await detector._analyze_bytecode('0x' + 'a' * 40, 'ethereum', Chain())
+    clone = await detector._analyze_bytecode('0x' + 'b' * 40, 'ethereum', Chain())
+    assert features.has_blacklist_patterns and features.has_ownership_checks and features.has_proxy_patterns
+    assert not features.has_hidden_mint
+    assert features.function_signature_count == 6
+    assert clone.code_hash == features.code_hash
+    assert [sig.pattern_id for sig in await detector._check_signatures(features)] == ['blacklist_001']
+    assert cache.get_stats()['misses'] == 1 and cache.get_stats()['memory_hits'] == 1
+
+    analyzer = ContractAnalyzer(bytecode_cache=cache)
+    names = analyzer._extract_function_signatures(await Chain().get_contract_bytecode('0x' + 'c' * 40))
+    assert names == {'transfer', 'approve', 'balanceOf', 'owner'}
@@ -0,0 +1,192 @@
+"""
+Cache Single-Flight Tests
+File: tests/unit/test_cache_single_flight.py
+
+Unit tests for CacheManager.get_or_compute request coalescing,
+stale-while-revalidate behaviour and typed Redis serialization.
+"""
+
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.core.performance import cache_manager as cache_module
+from app.core.performance.cache_manager import CacheManager
+
+
+class FakeClock:
+    """Stand-in for the time module that only moves when told to."""
+
+    def __init__(self, now: float = 1_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+async def start_callers(count, call):
+    """Start count concurrent calls and let each reach its first suspension point."""
+    callers = [asyncio.create_task(call()) for _ in range(count)]
+    await asyncio.sleep(0)
+    return callers
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load():
+    """Fifty concurrent callers on a cold key trigger exactly one loader call."""
+    manager = CacheManager()
+    release = asyncio.Event()
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return {'price': 42}
+
+    callers = await start_callers(
+        50, lambda: manager.get_or_compute('WETH', loader, ttl=30, namespace='prices')
+    )
+    assert (await manager.get_stats())['coalesced'] == 49
+    release.set()
+    results = await asyncio.gather(*callers)
+
+    assert calls == 1
+    assert all(result == {'price': 42} for result in results)
+
+    stats = await manager.get_stats()
+    assert stats['coalesced'] == 49
+    assert stats['loads'] == 1
+    assert stats['inflight_loads'] == 0
+
+
+@pytest.mark.asyncio
+async def test_loader_errors_propagate_to_all_waiters_and_are_not_cached():
+    """A failed load raises for every coalesced caller and the next call retries."""
+    manager = CacheManager()
+    release = asyncio.Event()
+    attempts = 0
+
+    async def failing_loader():
+        nonlocal attempts
+        attempts += 1
+        await release.wait()
+        raise RuntimeError('rpc down')
+
+    callers = await start_callers(3, lambda: manager.get_or_compute('k', failing_loader, ttl=30))
+    release.set()
+    results = await asyncio.gather(*callers, return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert attempts == 1
+
+    assert await manager.get_or_compute('k', lambda: 'recovered', ttl=30) == 'recovered'
+
+
+@pytest.mark.asyncio
+async def test_stale_value_is_served_while_refreshing(monkeypatch):
+    """Past its TTL, the old value is returned at once and refreshed in the background."""
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module, 'time', clock)
+    manager = CacheManager()
+    refresh = asyncio.Event()
+    versions = iter(['v1', 'v2'])
+
+    async def loader():
+        version = next(versions)
+        if version == 'v2':
+            await refresh.wait()
+        return version
+
+    assert await manager.get_or_compute('pool', loader, ttl=5, stale_ttl=60) == 'v1'
+    clock.advance(6)
+
+    assert await manager.get('pool') is None  # plain reads treat stale values as misses
+    assert await manager.get_or_compute('pool', loader, ttl=5, stale_ttl=60) == 'v1'
+    assert await manager.get_or_compute('pool', loader, ttl=5, stale_ttl=60) == 'v1'  # refresh still running
+    refresh.set()
+    await manager._inflight['default:pool']
+    assert await manager.get_or_compute('pool', loader, ttl=5, stale_ttl=60) == 'v2'
+
+    stats = await manager.get_stats()
+    assert stats['stale_served'] == 2
+    assert stats['background_refreshes'] == 1
+    # Stale reads are neither hits nor misses, and count against the hit rate
+    assert (stats['hits'], stats['misses'], stats['stale_reads']) == (1, 1, 3)
+    assert stats['hit_rate'] == 0.2
+
+
+class DictRedis:
+    """Minimal async Redis stand-in that stores serialized strings."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value):
+        self.data[key] = value
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+
+
+@pytest.mark.asyncio
+async def test_redis_hits_keep_decimal_and_datetime_types():
+    """A (Decimal, datetime) price read back from Redis has its original types."""
+    manager = CacheManager()
+    manager.redis_client, manager.use_redis = DictRedis(), True
+    price = (Decimal('1843.120000000000001'), datetime(2026, 10, 16, 12, 30, 5, 123456))
+
+    assert await manager.get_or_compute('WETH', lambda: price, ttl=30, namespace='live_prices') == price
+    assert isinstance(manager.redis_client.data['live_prices:WETH'], str)
+
+    cached = await manager.get_or_compute('WETH', lambda: None, ttl=30, namespace='live_prices')
+    assert cached == price and isinstance(cached, tuple) and isinstance(cached[0], Decimal)
+
+    nested = {'price_usd': Decimal('0.5'), 'pools': [('0xp1', Decimal('2'))], 'plain': {'a': 1}}
+    await manager.set('pd', nested, namespace='dex_prices')
+    assert await manager.get('pd', namespace='dex_prices') == nested
+
+
+@pytest.mark.asyncio
+async def test_live_price_requests_share_one_dex_query(monkeypatch):
+    """Concurrent get_live_price calls for one token make a single DEX query."""
+    from app.core.dex import live_dex_integration
+    from app.core.dex.live_dex_integration import LiveDEXIntegration
+    from app.core.wallet.wallet_connection_manager import NetworkType
+
+    monkeypatch.setattr(live_dex_integration, 'cache_manager', CacheManager())
+    integration = LiveDEXIntegration(wallet_manager=object())
+    release = asyncio.Event()
+    queries = []
+
+    async def fetch_price(token_address, base_token, network, dex_protocol):
+        queries.append((token_address, base_token))
+        await release.wait()
+        return Decimal('1.25')
+
+    integration._fetch_price_from_dex = fetch_price
+    token = '0x' + '12' * 20
+    callers = [asyncio.create_task(integration.get_live_price(token, NetworkType.ETHEREUM)) for _ in range(20)]
+    while not queries:
+        await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*callers)
+
+    assert len(queries) == 1
+    assert queries[0][1] == integration.common_tokens[(NetworkType.ETHEREUM, 'WETH')]
+    assert all(result == results[0] for result in results)
+    assert results[0][0] == Decimal('1.25')
+
+    # Within the TTL the cached price is served without another query
+    assert await integration.get_live_price(token, NetworkType.ETHEREUM) == results[0]
+    assert len(queries) == 1
@@ -0,0 +1,126 @@
+"""
+Chain State Cache Tests
+File: tests/unit/test_chain_state.py
+
+Tests for EIP-1559 base fee prediction, head/reorg handling and the
+polling fallback of ChainStateCache, and for BlockZeroSniper reading its
+gas inputs from the cache.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.blockchain.chain_state import ChainStateCache, predict_next_base_fee
+from app.core.sniping.block_zero_sniper import BlockZeroSniper
+
+GWEI = 10**9
+
+
+def header(number: int, tag: str = 'a', base_fee: int = 10 * GWEI, gas_used: int = 15_000_000) -> dict:
+    """Minimal newHeads payload."""
+    return {
+        'number': hex(number), 'hash': '0x' + (tag * 64)[:64], 'parentHash': '0x' + '00' * 32,
+        'timestamp': hex(1_700_000_000 + number * 12), 'gasUsed': hex(gas_used),
+        'gasLimit': hex(30_000_000), 'baseFeePerGas': hex(base_fee),
+    }
+
+
+class FakeRPC:
+    """Counts calls and serves a movable head."""
+
+    def __init__(self, number: int = 100):
+        self.number = number
+        self.calls = []
+
+    async def __call__(self, method, params):
+        self.calls.append(method)
+        if method == 'eth_getBlockByNumber':
+            return header(self.number, tag=format(self.number % 16, 'x'))
+        if method == 'eth_gasPrice':
+            return hex(25 * GWEI)
+        if method == 'eth_chainId':
+            return '0x1'
+        raise ValueError(method)
+
+
+def test_predict_next_base_fee():
+    """Full blocks raise the base fee by 1/8, empty blocks lower it by 1/8."""
+    assert predict_next_base_fee(8 * GWEI, 15_000_000, 30_000_000) == 8 * GWEI
+    assert predict_next_base_fee(8 * GWEI, 30_000_000, 30_000_000) == 9 * GWEI
+    assert predict_next_base_fee(8 * GWEI, 0, 30_000_000) == 7 * GWEI
+    assert predict_next_base_fee(7, 15_000_001, 30_000_000) == 8  # minimum increase of 1 wei
+
+
+@pytest.mark.asyncio
+async def test_heads_reorgs_and_listeners():
+    """Newer heads and reorgs replace the head; repeats and stale heads do not."""
+    cache = ChainStateCache('ethereum', FakeRPC(), refresh_gas_price=False)
+    seen = []
+    cache.add_listener(lambda head: seen.append(head.number))
+
+    waiter = asyncio.create_task(cache.wait_for_block(101, timeout=1))
+    assert await cache.handle_subscription_message({'params': {'result': header(100, 'a')}})
+    assert not await cache.apply_head(header(100, 'a'))
+    assert await cache.apply_head(header(101, 'b', gas_used=30_000_000))
+    assert (await waiter).number == 101
+    assert cache.next_base_fee == 11_250_000_000
+
+    assert await cache.apply_head(header(101, 'c'))  # same height, new hash
+    assert not await cache.apply_head(header(10, 'd'))  # beyond max_reorg_depth
+    assert cache.head.hash.startswith('0xccc') and cache.stats['reorgs'] == 1
+    assert seen == [100, 101, 101]
+    assert cache.stats['rpc_calls'] == 0 and cache.is_fresh
+
+
+@pytest.mark.asyncio
+async def test_lagging_endpoint_does_not_rewind_head():
+    """Older headers are stale unless they fork off a block the cache has seen."""
+    cache = ChainStateCache('ethereum', FakeRPC(), refresh_gas_price=False)
+    blocks = {}
+    for number, tag in ((100, 'a'), (101, 'b'), (102, 'c')):
+        blocks[number] = {**header(number, tag), 'parentHash': blocks.get(number - 1, header(99))['hash']}
+        await cache.apply_head(blocks[number])
+
+    # A lagging endpoint's `latest`: a block already applied, or one with an unknown parent
+    assert not await cache.apply_head(blocks[101])
+    assert not await cache.apply_head({**header(101, 'e'), 'parentHash': '0x' + 'ff' * 32})
+    assert cache.block_number == 102 and cache.stats['reorgs'] == 0
+
+    # A sibling of block 101 on top of block 100 is a real reorg
+    assert await cache.apply_head({**header(101, 'f'), 'parentHash': blocks[100]['hash']})
+    assert cache.block_number == 101 and cache.stats['reorgs'] == 1
+    assert await cache.apply_head({**header(102, '1'), 'parentHash': cache.head.hash})
+
+
+@pytest.mark.asyncio
+async def test_polling_fallback_follows_head():
+    """Without a WebSocket URL run() polls, and reads stay off the network."""
+    rpc = FakeRPC(100)
+    cache = await ChainStateCache('ethereum', rpc, poll_interval=0.01).start()
+    try:
+        assert cache.chain_id == 1 and cache.gas_price == 25 * GWEI
+        rpc.number = 103
+        assert (await cache.wait_for_block(103, timeout=1)).number == 103
+
+        calls = len(rpc.calls)
+        for _ in range(1000):
+            assert cache.block_number == 103 and cache.next_base_fee == 10 * GWEI
+        assert len(rpc.calls) - calls <= 3  # only the background poll
+        assert cache.get_stats()['mode'] == 'polling'
+    finally:
+        await cache.stop()
+
+
+@pytest.mark.asyncio
+async def test_sniper_gas_strategy_reads_cache():
+    """BlockZeroSniper prices gas from the predicted next base fee without RPC calls."""
+    cache = ChainStateCache('ethereum', FakeRPC(), refresh_gas_price=False)
+    await cache.apply_head(header(100, 'a', base_fee=40 * GWEI, gas_used=30_000_000))
+    cache.chain_id = 1
+
+    sniper = BlockZeroSniper('ethereum', w3=None, private_key='0x' + '11' * 32, chain_state=cache)
+    strategy = await sniper._get_gas_strategy('normal')
+    assert strategy.base_fee == 45 * GWEI
+    assert strategy.priority_fee == 5 * GWEI
+    assert sniper._get_chain_id() == 1
@@ -0,0 +1,247 @@
+"""
+Confirmation Tracker Tests
+File: tests/unit/test_confirmation_tracker.py
+
+Tests for block-driven confirmation tracking: inclusion and depth,
+reorgs, replacement and drop detection, and RPC cost per block with
+thousands of transactions in flight.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.core.blockchain.chain_state import ChainStateCache
+from app.core.blockchain.confirmation_tracker import ConfirmationStatus, ConfirmationTracker
+from app.core.trading.transaction_executor import TransactionExecutor, TransactionStatus
+
+SENDER = '0x' + 'aa' * 20
+
+
+def tx_hash(i: int) -> str:
+    return '0x' + f'{i:064x}'
+
+
+class FakeChain:
+    """In-memory chain answering the JSON-RPC calls the tracker makes."""
+
+    def __init__(self, start: int = 100):
+        self.blocks = {}
+        self.receipts = {}
+        self.mempool = set()
+        self.nonces = {}
+        self.calls = {}
+        self.head = start
+        self.blocks[start] = self._block(start, 'genesis', [])
+
+    def _block(self, number: int, fork: str, txs) -> dict:
+        parent = self.blocks.get(number - 1, {}).get('hash', '0x' + '00' * 32)
+        digest = f'{fork}{number}'.encode().hex()
+        return {
+            'number': hex(number), 'hash': '0x' + digest.rjust(64, '0')[-64:], 'parentHash': parent,
+            'gasUsed': hex(15_000_000), 'gasLimit': hex(30_000_000), 'baseFeePerGas': hex(10**10),
+            'transactions': list(txs),
+        }
+
+    def mine(self, txs=(), fork: str = 'a', status: int = 1, sender_nonces=None) -> dict:
+        """Append a block containing txs; return its header."""
+        self.head += 1
+        block = self._block(self.head, fork, txs)
+        self.blocks[self.head] = block
+        for h in txs:
+            self.mempool.discard(h)
+            self.receipts[h] = {'transactionHash': h, 'blockNumber': hex(self.head), 'blockHash': block['hash'],
+                                'status': hex(status), 'gasUsed': hex(21000), 'effectiveGasPrice': hex(10**10)}
+        for sender, nonce in (sender_nonces or {}).items():
+            self.nonces[sender] = nonce
+        return block
+
+    def reorg(self, depth: int, txs_by_block) -> dict:
+        """Replace the last depth blocks with a new branch."""
+        for number in range(self.head - depth + 1, self.head + 1):
+            for h in self.blocks.pop(number)['transactions']:
+                self.receipts.pop(h, None)
+                self.mempool.add(h)
+        self.head -= depth
+        for txs in txs_by_block:
+            block = self.mine(txs, fork='b')
+        return block
+
+    async def __call__(self, method, params):
+        self.calls[method] = self.calls.get(method, 0) + 1
+        if method == 'eth_getBlockByNumber':
+            number = self.head if params[0] == 'latest' else int(params[0], 16)
+            return self.blocks.get(number)
+        if method == 'eth_getTransactionReceipt':
+            return self.receipts.get(params[0])
+        if method == 'eth_getTransactionCount':
+            return hex(self.nonces.get(params[0], 0))
+        if method == 'eth_getTransactionByHash':
+            if params[0] in self.receipts:
+                return {'hash': params[0], 'blockNumber': self.receipts[params[0]]['blockNumber']}
+            return {'hash': params[0], 'blockNumber': None} if params[0] in self.mempool else None
+        raise ValueError(method)
+
+
+async def setup(**kwargs):
+    chain = FakeChain()
+    cache = ChainStateCache('ethereum', chain, refresh_gas_price=False)
+    await cache.apply_head(chain.blocks[chain.head])
+    return chain, cache, ConfirmationTracker(cache, **kwargs)
+
+
+async def advance(chain, cache, tracker, block):
+    await cache.apply_head(block)
+    return await tracker.process()
+
+
+@pytest.mark.asyncio
+async def test_inclusion_and_confirmation_depth():
+    """Futures and callbacks resolve on inclusion, or once the requested depth is reached."""
+    chain, cache, tracker = await setup()
+    seen = []
+    fast = tracker.track(tx_hash(1), callback=seen.append)
+    deep = tracker.track(tx_hash(2), confirmations=3)
+    reverted = tracker.track(tx_hash(3))
+
+    assert await advance(chain, cache, tracker, chain.mine()) == 0
+    assert await advance(chain, cache, tracker, chain.mine([tx_hash(1), tx_hash(2), '0x' + 'ff' * 32])) == 1
+    assert fast.done() and seen[0].status == ConfirmationStatus.CONFIRMED
+    assert seen[0].block_number == chain.head and seen[0].gas_used == 21000
+
+    await advance(chain, cache, tracker, chain.mine([tx_hash(3)], status=0))
+    assert (await reverted).status == ConfirmationStatus.FAILED and not deep.done()
+    await advance(chain, cache, tracker, chain.mine())
+    assert (await deep).confirmations == 3
+    assert tracker.in_flight == 0
+
+    # Idle: heads cost nothing
+    calls = sum(chain.calls.values())
+    await advance(chain, cache, tracker, chain.mine())
+    assert sum(chain.calls.values()) == calls
+
+
+@pytest.mark.asyncio
+async def test_reorg_reverts_inclusion():
+    """An inclusion in an orphaned block returns to pending and resolves on the new branch."""
+    chain, cache, tracker = await setup()
+    future = tracker.track(tx_hash(7), confirmations=2)
+
+    await advance(chain, cache, tracker, chain.mine([tx_hash(7)]))
+    assert tracker.get_stats()['included'] == 1
+
+    # Same-height replacement without our tx, then it lands one block later
+    await advance(chain, cache, tracker, chain.reorg(1, [[]]))
+    stats = tracker.get_stats()
+    assert stats['reorgs'] == 1 and stats['reorged_transactions'] == 1 and stats['pending'] == 1
+
+    await advance(chain, cache, tracker, chain.mine([tx_hash(7)], fork='b'))
+    await advance(chain, cache, tracker, chain.mine(fork='b'))
+    confirmation = await future
+    assert confirmation.block_hash == chain.blocks[chain.head - 1]['hash']
+    assert confirmation.status == ConfirmationStatus.CONFIRMED
+
+
+@pytest.mark.asyncio
+async def test_replaced_and_dropped():
+    """A mined nonce past a pending tx marks it replaced; vanished txs are dropped."""
+    chain, cache, tracker = await setup(drop_check_blocks=2)
+    chain.mempool.update({tx_hash(1), tx_hash(2), tx_hash(3)})
+    replaced = tracker.track(tx_hash(1), sender=SENDER, nonce=5)
+    dropped = tracker.track(tx_hash(2))
+    still_pending = tracker.track(tx_hash(3))
+
+    # A different tx with nonce 5 is mined
+    chain.mempool.discard(tx_hash(2))
+    await advance(chain, cache, tracker, chain.mine(['0x' + 'ee' * 32], sender_nonces={SENDER: 6}))
+    assert (await replaced).status == ConfirmationStatus.REPLACED
+
+    await advance(chain, cache, tracker, chain.mine())
+    assert (await dropped).status == ConfirmationStatus.DROPPED
+    assert not still_pending.done()
+
+    timed_out = await tracker.wait(tx_hash(3), timeout=0.01)
+    assert timed_out.status == ConfirmationStatus.TIMEOUT and tracker.untrack(tx_hash(3))
+
+
+@pytest.mark.asyncio
+async def test_transaction_executor_uses_tracker():
+    """TransactionExecutor resolves from new blocks instead of its polling loop."""
+    chain, cache, tracker = await setup()
+    executor = TransactionExecutor()
+    assert await executor.initialize(confirmation_tracker=tracker)
+    assert executor._monitoring_task is None
+
+    chain.mempool.add(tx_hash(1))
+    waiting = asyncio.create_task(executor.monitor_transaction(tx_hash(1)))
+    await asyncio.sleep(0)
+    await advance(chain, cache, tracker, chain.mine([tx_hash(1)]))
+
+    result = await waiting
+    assert result.status == TransactionStatus.CONFIRMED
+    assert result.block_number == chain.head and result.gas_used == 21000
+    assert executor.get_execution_status()['monitoring_active'] is False
+
+
+@pytest.mark.asyncio
+async def test_constant_rpc_cost_with_thousands_in_flight():
+    """5000 tracked transactions cost one block fetch per block plus receipts for inclusions."""
+    chain, cache, tracker = await setup(drop_check_blocks=1000)
+    n = 5000
+    futures = [tracker.track(tx_hash(i), sender=SENDER if i < 10 else None, nonce=i if i < 10 else None)
+               for i in range(n)]
+
+    start = time.perf_counter()
+    per_block = 50
+    blocks = 0
+    for offset in range(0, n, per_block):
+        included = [tx_hash(i) for i in range(offset, offset + per_block)]
+        filler = ['0x' + f'{10**9 + blocks * 200 + j:064x}' for j in range(150)]
+        await advance(chain, cache, tracker, chain.mine(included + filler, sender_nonces={SENDER: min(offset + per_block, 10)}))
+        blocks += 1
+    elapsed = time.perf_counter() - start
+
+    assert all(f.done() and f.result().succeeded for f in futures)
+    stats = tracker.get_stats()
+    non_receipt = stats['rpc_calls'] - stats['receipts_fetched']
+    print(
+        f"[OK] {n} transactions over {blocks} blocks: {stats['rpc_calls']} RPC calls "
+        f"({stats['receipts_fetched']} receipts, {non_receipt / blocks:.1f} other calls/block), "
+        f"{elapsed / blocks * 1000:.2f} ms/block; per-tx polling would cost {n} calls per round"
+    )
+    assert stats['receipts_fetched'] == n
+    assert non_receipt <= 2 * blocks  # block fetch + one nonce read while the sender has pending txs
+    assert chain.calls['eth_getTransactionReceipt'] == n
+
+
+@pytest.mark.asyncio
+async def test_missing_receipt_retried_and_nonces_batched():
+    """A receipt missing from a lagging node is retried next head; nonce reads share one batch."""
+    chain, cache, _ = await setup()
+    batches = []
+
+    async def batch(calls):
+        batches.append([method for method, _ in calls])
+        return [await chain(method, params) for method, params in calls]
+
+    tracker = ConfirmationTracker(cache, batch_rpc=batch, drop_check_blocks=1000)
+    senders = ['0x' + f'{i:040x}' for i in range(1, 4)]
+    lagging = tracker.track(tx_hash(1), sender=senders[0], nonce=0)
+    for i, sender in enumerate(senders[1:], start=2):
+        tracker.track(tx_hash(i), sender=sender, nonce=0)
+
+    block = chain.mine([tx_hash(1)], sender_nonces={senders[0]: 1})
+    receipt = chain.receipts.pop(tx_hash(1))
+    await advance(chain, cache, tracker, block)
+    # The mined nonce already passed it, but it was seen in the block: not a replacement
+    assert not lagging.done() and tracker.get_stats()['pending'] == 3
+
+    chain.receipts[tx_hash(1)] = receipt
+    await advance(chain, cache, tracker, chain.mine())
+    confirmation = await lagging
+    assert confirmation.status == ConfirmationStatus.CONFIRMED
+    assert confirmation.block_number == int(block['number'], 16)
+
+    assert batches == [['eth_getTransactionCount'] * 2, ['eth_getTransactionCount'] * 2]
+    assert tracker.get_stats()['receipt_retries'] == 1
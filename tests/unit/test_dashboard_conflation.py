@@ -0,0 +1,113 @@
+"""
+Dashboard Conflation Tests
+File: tests/unit/test_dashboard_conflation.py
+
+Unit tests for latest-value conflation and delta encoding of live
+dashboard updates.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from app.core.integration.live_dashboard_service import (
+    LiveDashboardService,
+    LiveDashboardUpdate,
+    UpdatePriority,
+)
+from app.core.integration.update_conflator import UpdateConflator, compute_json_delta
+
+
+def make_update(update_type: str, value: float, entity=None) -> LiveDashboardUpdate:
+    """Build a dashboard update carrying a portfolio value."""
+    return LiveDashboardUpdate(
+        update_type=update_type,
+        timestamp=datetime.utcnow(),
+        data={'portfolio': {'total_value': value, 'positions': 3}, 'timestamp': datetime.utcnow().isoformat()},
+        entity=entity,
+    )
+
+
+def test_json_delta_reports_nested_changes_and_removals():
+    """Only changed leaves and removed keys appear in the delta."""
+    previous = {'a': 1, 'nested': {'x': 1, 'y': 2}, 'gone': True, 'timestamp': 't0'}
+    current = {'a': 1, 'nested': {'x': 1, 'y': 3, 'z': 4}, 'timestamp': 't1'}
+
+    changes, removed = compute_json_delta(previous, current, ignore_keys=('timestamp',))
+    assert changes == {'nested': {'y': 3, 'z': 4}}
+    assert removed == ['gone']
+
+
+def test_conflator_rate_limits_each_key():
+    """A key flushes at most once per interval; other keys are independent."""
+    conflator = UpdateConflator(max_rate_per_second=2.0)
+    conflator.offer(('portfolio_update', None), 'v1', 3)
+    conflator.offer(('system_health', None), 's1', 4)
+    assert len(conflator.pop_due(now=100.0)) == 2
+
+    conflator.offer(('portfolio_update', None), 'v2', 3)
+    conflator.offer(('portfolio_update', None), 'v3', 1)
+    assert conflator.pop_due(now=100.1) == []
+    assert conflator.next_due() == pytest.approx(100.5)
+    assert conflator.pop_due(now=100.5) == [(('portfolio_update', None), 'v3', 1)]
+    assert conflator.superseded == 1
+
+
+@pytest.mark.asyncio
+async def test_burst_of_snapshots_collapses_to_latest():
+    """A hundred portfolio ticks produce one queued update; trade events are never conflated."""
+    service = LiveDashboardService()
+
+    for i in range(100):
+        await service._queue_update(make_update('portfolio_update', 1000 + i), UpdatePriority.NORMAL)
+    await service._queue_update(make_update('trade_execution', 1.0), UpdatePriority.HIGH)
+    await service._queue_update(make_update('trade_execution', 2.0), UpdatePriority.HIGH)
+
+    assert service.update_queues['high'].qsize() == 2
+    assert await service.flush_conflated_updates(now=0.0) == 1
+
+    queued = service.update_queues['normal'].get_nowait()
+    assert queued.data['portfolio']['total_value'] == 1099
+    assert service.get_performance_statistics()['conflation']['superseded'] == 99
+
+
+@pytest.mark.asyncio
+async def test_deltas_against_last_sent_snapshot():
+    """With deltas on, later flushes carry only what changed; unchanged snapshots are skipped."""
+    service = LiveDashboardService()
+    service.conflator = UpdateConflator(max_rate_per_second=0, send_deltas=True, keyframe_interval=10)
+
+    await service._queue_update(make_update('portfolio_update', 1000, entity='wallet-1'), UpdatePriority.NORMAL)
+    await service.flush_conflated_updates()
+    await service._queue_update(make_update('portfolio_update', 1005, entity='wallet-1'), UpdatePriority.NORMAL)
+    await service.flush_conflated_updates()
+    await service._queue_update(make_update('portfolio_update', 1005, entity='wallet-1'), UpdatePriority.NORMAL)
+    assert await service.flush_conflated_updates() == 0
+
+    queue = service.update_queues['normal']
+    first, second = queue.get_nowait().data, queue.get_nowait().data
+    assert first['delta'] is False and first['snapshot']['portfolio']['total_value'] == 1000
+    assert second['delta'] is True
+    assert second['changes']['portfolio'] == {'total_value': 1005}
+    assert second['base_sequence'] == first['sequence']
+    assert service.conflator.unchanged_suppressed == 1
+
+
+@pytest.mark.asyncio
+async def test_full_snapshots_are_resent_and_keyed_by_entity():
+    """Without deltas an unchanged snapshot still goes out; published updates carry their entity."""
+    service = LiveDashboardService()
+    service.conflator = UpdateConflator(max_rate_per_second=0)
+
+    for _ in range(2):
+        await service._queue_update(make_update('portfolio_update', 1000, entity='wallet-1'), UpdatePriority.NORMAL)
+        assert await service.flush_conflated_updates() == 1
+    assert service.conflator.unchanged_suppressed == 0
+    assert service.get_latest_snapshot('portfolio_update', 'wallet-1')['portfolio']['total_value'] == 1000
+    assert service.get_latest_snapshot('portfolio_update', 'wallet-2') is None
+
+    await service.broadcast_system_health_update({'component': 'rpc', 'cpu_usage': 10.0})
+    await service.broadcast_system_health_update({'component': 'database', 'cpu_usage': 20.0})
+    assert service.conflator.get_stats()['pending'] == 2
+    assert await service.flush_conflated_updates() == 2
+    assert service.get_latest_snapshot('system_health', 'rpc')['system_health']['cpu_usage'] == 10.0
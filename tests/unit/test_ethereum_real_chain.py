@@ -0,0 +1,129 @@
+"""
+Real Ethereum Chain Tests
+File: tests/unit/test_ethereum_real_chain.py
+
+Tests for RealEthereumChain's batched token/liquidity reads and factory-log
+pair discovery, run against the local JSON-RPC stand-in from the multicall
+reader tests.
+"""
+
+import pytest
+from eth_abi import encode
+from web3 import AsyncWeb3
+
+from app.core.blockchain.evm_chains.ethereum_real import RealEthereumChain
+from app.core.discovery.pair_log_discovery import PAIR_CREATED_TOPIC
+from tests.unit.test_multicall_reader import (
+    EOA,
+    FACTORY,
+    WETH,
+    FakeChain,
+    pair_address,
+    start_rpc,
+    token_address,
+)
+
+
+def make_chain(url: str) -> RealEthereumChain:
+    """Chain attached to the stand-in as if connect() had succeeded."""
+    chain = RealEthereumChain('ethereum', [url], chain_id=1)
+    chain.dex_factories['ethereum'] = {'uniswap_v2': FACTORY}
+    chain._attach_async_provider(AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(url)))
+    chain._connected = True
+    return chain
+
+
+@pytest.mark.asyncio
+async def test_token_and_liquidity_reads_are_multicall_batched():
+    """Token metadata and WETH-pair reserves for many tokens take one request per round."""
+    node = FakeChain(tokens=10)
+    server = await start_rpc(node)
+    try:
+        chain = make_chain(str(server.make_url('/')))
+        infos = await chain.get_token_infos([token_address(i) for i in range(10)] + [EOA])
+        assert node.requests == 1
+
+        liquidity = await chain.get_liquidity_many([token_address(i) for i in range(10)])
+        assert node.requests == 3
+
+        single = await chain.get_token_info(token_address(1))
+        price = await chain.get_token_price(token_address(2))
+    finally:
+        await server.close()
+
+    assert infos[token_address(1)].symbol == 'TK1'
+    assert infos[token_address(9)] is None and infos[EOA] is None
+    assert single.name == 'Token 1'
+    assert liquidity[token_address(1)] == []
+    (pool,) = liquidity[token_address(2)]
+    assert pool.pool_address == pair_address(2)
+    assert price == pool.price_per_token
+
+
+@pytest.mark.asyncio
+async def test_reads_require_a_connection():
+    """Batched reads raise instead of touching a missing provider."""
+    chain = RealEthereumChain('ethereum', ['http://127.0.0.1:1'], chain_id=1)
+    assert not chain.is_connected
+    with pytest.raises(Exception, match='Not connected'):
+        await chain.get_token_infos([token_address(1)])
+
+
+class LogNode(FakeChain):
+    """Fake chain that also answers eth_getLogs with factory PairCreated logs."""
+
+    def __init__(self, tokens: int, head: int):
+        super().__init__(tokens)
+        self.head = head
+        self.logs = []
+        for i in range(tokens):
+            token0, token1 = sorted([token_address(i), WETH], key=str.lower)
+            self.logs.append({
+                'address': FACTORY.lower(),
+                'topics': [PAIR_CREATED_TOPIC, '0x' + token0[2:].lower().rjust(64, '0'),
+                           '0x' + token1[2:].lower().rjust(64, '0')],
+                'data': '0x' + encode(['address', 'uint256'], [pair_address(i), i + 1]).hex(),
+                'blockNumber': hex(100 + i),
+                'transactionHash': '0x' + f'{i:064x}',
+                'logIndex': '0x0',
+                'removed': False,
+            })
+
+    def handle(self, request: dict) -> dict:
+        method, params = request['method'], request.get('params', [])
+        if method == 'eth_blockNumber':
+            return {'jsonrpc': '2.0', 'id': request['id'], 'result': hex(self.head)}
+        if method == 'eth_getLogs':
+            start, end = int(params[0]['fromBlock'], 16), int(params[0]['toBlock'], 16)
+            logs = [log for log in self.logs if start <= int(log['blockNumber'], 16) <= end]
+            return {'jsonrpc': '2.0', 'id': request['id'], 'result': logs}
+        return super().handle(request)
+
+
+@pytest.mark.asyncio
+async def test_scan_new_tokens_reads_factory_logs(tmp_path):
+    """New tokens come from PairCreated logs plus one batched metadata read; WETH is skipped."""
+    node = LogNode(tokens=6, head=110)
+    server = await start_rpc(node)
+    try:
+        chain = make_chain(str(server.make_url('/')))
+        tokens = await chain.scan_new_tokens(100, 104)
+        requests = node.requests
+
+        seen = []
+        discovery = chain.create_pair_discovery(
+            handler=seen.append, cursor_path=str(tmp_path / 'cursors.json'), start_block=100
+        )
+        delivered = await discovery.backfill()
+    finally:
+        await server.close()
+
+    # One getLogs + one multicall; token 5 is outside the range
+    assert requests == 2
+    assert [token.address for token in tokens] == [token_address(i) for i in range(5)]
+    assert tokens[2].metadata['pair_address'] == pair_address(2)
+    assert tokens[2].metadata['dex'] == 'uniswap_v2'
+    assert tokens[2].metadata['block_number'] == 102
+
+    assert delivered == 6 and discovery.cursor == 110
+    assert {event.pair for event in seen} == {pair_address(i) for i in range(6)}
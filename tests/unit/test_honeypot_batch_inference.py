@@ -0,0 +1,129 @@
+"""
+Honeypot Batch Inference Tests
+File: tests/unit/test_honeypot_batch_inference.py
+
+Unit tests and a batch-size benchmark for vectorized ensemble inference in
+HoneypotDetector.
+"""
+
+import time
+
+import numpy as np
+import pytest
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.neural_network import MLPClassifier
+from sklearn.preprocessing import StandardScaler
+
+from app.core.ai.bytecode_cache import BytecodeAnalysisCache
+from app.core.ai.honeypot_detector import HoneypotDetector
+
+
+@pytest.fixture(scope="module")
+def detector():
+    """Detector with small ensemble models trained on the synthetic data."""
+    detector = HoneypotDetector(bytecode_cache=BytecodeAnalysisCache(db_path=None))
+    rng = np.random.RandomState(42)
+    X = rng.randn(600, 50)
+    y = ((X[:, 0] > 0.5) | (X[:, 15] > 1.0)).astype(int)
+
+    detector.feature_scaler = StandardScaler().fit(X)
+    X_scaled = detector.feature_scaler.transform(X)
+    detector.random_forest = RandomForestClassifier(n_estimators=50, max_depth=8, random_state=42).fit(X_scaled, y)
+    detector.gradient_boosting = GradientBoostingClassifier(n_estimators=30, max_depth=3, random_state=42).fit(X_scaled, y)
+    detector.neural_network = MLPClassifier(hidden_layer_sizes=(32,), max_iter=1000, random_state=42).fit(X_scaled, y)
+    detector.logistic_regression = LogisticRegression(max_iter=500).fit(X_scaled, y)
+    return detector
+
+
+def sample_vectors(count):
+    """Random feature vectors in the ensemble's input space."""
+    rng = np.random.RandomState(7)
+    return rng.rand(count, 50).tolist()
+
+
+@pytest.mark.asyncio
+async def test_batch_predictions_match_single_row(detector):
+    """The batch path returns the same per-token predictions as one-row inference."""
+    vectors = sample_vectors(20)
+    batch = await detector._predict_ensemble_batch(vectors)
+
+    assert len(batch) == len(vectors)
+    for vector, predictions in zip(vectors, batch):
+        single = (await detector._predict_ensemble_batch([vector]))[0]
+        assert set(predictions) == {"random_forest", "gradient_boosting", "neural_network", "logistic_regression"}
+        for name, prediction in predictions.items():
+            assert prediction["probability"] == pytest.approx(single[name]["probability"])
+            assert prediction["prediction"] == single[name]["prediction"]
+    assert await detector._predict_ensemble_batch([]) == []
+
+
+@pytest.mark.asyncio
+async def test_batch_detect_returns_ordered_results_and_uses_cache(detector):
+    """batch_detect runs one inference pass per chunk and serves repeats from cache."""
+    detector.cache_manager.clear()
+    detector.inference_batch_size = 4
+    addresses = [f"0x{i:040x}" for i in range(10)]
+    calls = []
+    original = detector._predict_ensemble_batch
+
+    async def counting(vectors):
+        calls.append(len(vectors))
+        return await original(vectors)
+
+    detector._predict_ensemble_batch = counting
+    try:
+        results = await detector.batch_detect(addresses, "ethereum", chain=None)
+        assert [r.token_address for r in results] == addresses
+        assert calls == [4, 4, 2]
+
+        again = await detector.batch_detect(addresses[:3], "ethereum", chain=None)
+        assert again == results[:3]
+        assert calls == [4, 4, 2]
+    finally:
+        detector._predict_ensemble_batch = original
+        detector.inference_batch_size = 256
+
+
+@pytest.mark.asyncio
+async def test_batch_is_one_model_call_regardless_of_size(detector, monkeypatch):
+    """A 256-token batch scales once and calls each model's predict_proba once."""
+    calls = {}
+
+    def counting(name, method):
+        def wrapper(matrix):
+            calls.setdefault(name, []).append(len(matrix))
+            return method(matrix)
+        return wrapper
+
+    monkeypatch.setattr(detector.feature_scaler, "transform", counting("scaler", detector.feature_scaler.transform))
+    for name, model, _ in detector._ensemble_models():
+        monkeypatch.setattr(model, "predict_proba", counting(name, model.predict_proba))
+
+    predictions = await detector._predict_ensemble_batch(sample_vectors(256))
+
+    assert len(predictions) == 256
+    assert calls == {
+        "scaler": [256], "random_forest": [256], "gradient_boosting": [256],
+        "neural_network": [256], "logistic_regression": [256],
+    }
+
+
+@pytest.mark.asyncio
+async def test_batch_inference_benchmark(detector):
+    """Report per-token inference cost at batch sizes 1, 32 and 256."""
+    vectors = sample_vectors(256)
+    per_token = {}
+    for batch_size in (1, 32, 256):
+        rounds = max(1, 256 // batch_size)
+        start = time.perf_counter()
+        for _ in range(rounds):
+            predictions = await detector._predict_ensemble_batch(vectors[:batch_size])
+            assert len(predictions) == batch_size
+        per_token[batch_size] = (time.perf_counter() - start) / (rounds * batch_size)
+
+    print(
+        "[OK] Honeypot ensemble inference per token: "
+        + ", ".join(f"batch {size}: {cost * 1e6:.0f} us" for size, cost in per_token.items())
+        + f" ({per_token[1] / per_token[256]:.0f}x faster at 256)"
+    )
@@ -0,0 +1,147 @@
+"""
+Liquidity Graph Routing Tests
+File: tests/unit/test_liquidity_graph.py
+
+Unit tests and a 10k-pool benchmark for in-process multi-hop route search
+in the liquidity graph and DEXRouter.
+"""
+
+import random
+import time
+from decimal import Decimal
+
+import pytest
+
+from app.core.dex.dex_router import DEXRouter, DexRouterException, ExecutionStrategy, RouteType
+from app.core.dex.liquidity_graph import LiquidityGraph
+from app.core.dex.uniswap_integration import LiquidityPool
+
+
+def token(name: str) -> str:
+    """Deterministic fake token address."""
+    return '0x' + name.encode().hex().ljust(40, '0')[:40]
+
+
+A, B, C, D, WETH = (token(n) for n in ('aaa', 'bbb', 'ccc', 'ddd', 'weth'))
+
+
+def sample_graph() -> LiquidityGraph:
+    """A->D is thin directly, deeper via WETH, deepest via WETH->C."""
+    graph = LiquidityGraph()
+    graph.upsert_pool('0xp1', 'uniswap_v2', A, D, 100, 100)
+    graph.upsert_pool('0xp2', 'uniswap_v2', A, WETH, 100_000, 50)
+    graph.upsert_pool('0xp3', 'sushiswap', WETH, D, 50, 90_000)
+    graph.upsert_pool('0xp4', 'uniswap_v2', WETH, C, 5_000, 10_000_000)
+    graph.upsert_pool('0xp5', 'uniswap_v2', C, D, 10_000_000, 10_000_000)
+    graph.upsert_pool('0xp6', 'uniswap_v2', B, C, 1_000, 1_000)
+    return graph
+
+
+def test_finds_three_hop_route_ranked_by_output():
+    """The best route may need three hops; max_hops bounds the search."""
+    graph = sample_graph()
+
+    routes = graph.find_routes(A, D, 100, max_hops=3, k=3)
+    assert [hop.pool.pool_address for hop in routes[0].hops] == ['0xp2', '0xp4', '0xp5']
+    assert [r.amount_out for r in routes] == sorted((r.amount_out for r in routes), reverse=True)
+    assert len(routes) == 3
+
+    two_hop = graph.find_routes(A, D, 100, max_hops=2, k=3)
+    assert all(len(route.hops) <= 2 for route in two_hop)
+    assert graph.find_routes(A, D, 100, max_hops=3, min_hops=2, k=5)[-1].hops[0].pool.pool_address != '0xp1'
+
+
+def test_pool_events_update_routes():
+    """Sync and Swap events move reserves; unknown pools are ignored."""
+    graph = sample_graph()
+    before = graph.find_routes(A, D, 100, k=1)[0].amount_out
+
+    assert graph.apply_event({'event': 'Sync', 'pool': '0xp5', 'reserve0': 10_000_000, 'reserve1': 5_000_000})
+    assert graph.find_routes(A, D, 100, k=1)[0].amount_out < before
+
+    assert graph.apply_event({'event': 'Swap', 'pool': '0xp1', 'amount0In': 0, 'amount1In': 50, 'amount0Out': 40, 'amount1Out': 0})
+    assert graph.get_pool('0xp1').reserve0 == 60
+    assert not graph.apply_event({'event': 'Sync', 'pool': '0xunknown', 'reserve0': 1, 'reserve1': 1})
+
+    graph.remove_pool('0xp6')
+    assert not graph.has_token(B)
+
+
+@pytest.mark.asyncio
+async def test_router_multi_hop_uses_graph_without_lookups():
+    """With graph coverage the router builds multi-hop routes without aggregator calls."""
+    router = DEXRouter()
+
+    async def no_lookups(*args, **kwargs):
+        raise AssertionError("graph search must not hit the aggregator")
+
+    router.dex_aggregator.get_pool_info = no_lookups
+    router.dex_aggregator.get_real_time_price = no_lookups
+
+    graph = sample_graph()
+    router.liquidity_graphs['ethereum'] = graph
+    router.update_pool(LiquidityPool(
+        address='0xp7', token0=D, token1=B, token0_symbol='D', token1_symbol='B',
+        token0_decimals=18, token1_decimals=18, fee_tier=500, pool_type='v3',
+        reserve0=Decimal(10**21), reserve1=Decimal(10**21), tvl_usd=Decimal('2000000'),
+    ), 'uniswap_v3')
+    assert graph.get_pool('0xp7').fee == pytest.approx(0.0005)
+    # Pools on DEXs the router cannot execute on never enter the graph
+    assert not router.update_pool(LiquidityPool(
+        address='0xp8', token0=A, token1=D, token0_symbol='A', token1_symbol='D',
+        token0_decimals=18, token1_decimals=18, fee_tier=3000, pool_type='v2',
+        reserve0=Decimal(10**30), reserve1=Decimal(10**30), tvl_usd=Decimal('1000000000'),
+    ), 'unlisted_dex')
+    assert graph.get_pool('0xp8') is None
+
+    routes = await router._find_multi_hop_routes(A, D, Decimal('100'), 'ethereum')
+    best = routes[0]
+    assert best.route_type == RouteType.MULTI_HOP
+    assert len(best.steps) == 3
+    assert best.steps[0].token_in == A and best.steps[-1].token_out == D
+    assert best.total_fees == pytest.approx(Decimal('100') * (1 - Decimal('0.997') ** 3))
+    assert best.total_gas == 3 * 150000
+
+    # A route through a pool added behind the router's back is refused at planning
+    graph.upsert_pool('0xp9', 'unlisted_dex', A, D, 10**9, 10**9)
+    direct = (await router._find_direct_routes(A, D, Decimal('100'), 'ethereum'))[0]
+    assert direct.steps[0].dex_name == 'unlisted_dex'
+    quote = await router._create_route_quote(direct, A, D, Decimal('100'), Decimal('0.01'), ExecutionStrategy.MARKET)
+    with pytest.raises(DexRouterException, match='unlisted_dex'):
+        await router._prepare_execution_plan(quote, WETH)
+
+
+def test_route_search_benchmark_10k_pools():
+    """Route search over a synthetic 10k-pool graph stays pruned to a few dozen paths per query."""
+    rng = random.Random(7)
+    hubs = [token(f'hub{i}') for i in range(6)]
+    tokens = [token(f't{i}') for i in range(3000)]
+    graph = LiquidityGraph()
+
+    for i in range(10_000):
+        a = rng.choice(tokens)
+        b = rng.choice(hubs) if rng.random() < 0.7 else rng.choice(tokens + hubs)
+        if a == b:
+            continue
+        graph.upsert_pool(f'0xpool{i}', 'uniswap_v2', a, b,
+                          rng.uniform(1e3, 1e7), rng.uniform(1e3, 1e7), fee=rng.choice((0.003, 0.0005, 0.01)))
+    for i, hub in enumerate(hubs[1:]):
+        graph.upsert_pool(f'0xhub{i}', 'uniswap_v2', hubs[0], hub, 1e7, 1e7)
+
+    queries = [(rng.choice(tokens), rng.choice(tokens)) for _ in range(200)]
+    found = 0
+    start = time.perf_counter()
+    for source, target in queries:
+        found += bool(graph.find_routes(source, target, 1_000, max_hops=3, k=5))
+    elapsed = time.perf_counter() - start
+
+    stats = graph.get_stats()
+    print(
+        f"[OK] {stats['pools']} pools / {stats['tokens']} tokens: {len(queries)} 3-hop searches, "
+        f"avg {elapsed / len(queries) * 1000:.2f} ms, {found} with routes, "
+        f"{stats['avg_paths_evaluated']:.0f} paths evaluated per search"
+    )
+    assert found > len(queries) * 0.8
+    # Hub-heavy tokens have hundreds of pools; distance pruning and the beam keep
+    # evaluation far below the exhaustive 3-hop fan-out
+    assert stats['avg_paths_evaluated'] < 100
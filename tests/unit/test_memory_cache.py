@@ -0,0 +1,127 @@
+"""
+Sharded Memory Cache Tests
+File: tests/unit/test_memory_cache.py
+
+Unit tests for the lock-striped in-memory cache backend and its use by
+the performance CacheManager.
+"""
+
+import time
+
+import pytest
+
+from app.core.performance import cache_manager as cache_module
+from app.core.performance import memory_cache as memory_module
+from app.core.performance.cache_manager import CacheManager
+from app.core.performance.memory_cache import MISSING, NamespaceLimits, ShardedMemoryCache
+from tests.unit.test_cache_single_flight import FakeClock
+
+
+def test_lru_eviction_respects_entry_budget():
+    """The least recently used key is evicted once the budget is exceeded."""
+    cache = ShardedMemoryCache(shards=1)
+    cache.configure_namespace('prices', max_entries=2, max_bytes=10**6)
+
+    cache.set('a', 1, namespace='prices')
+    cache.set('b', 2, namespace='prices')
+    assert cache.get('a', namespace='prices') == 1  # 'b' is now least recent
+    cache.set('c', 3, namespace='prices')
+
+    assert cache.get('b', namespace='prices') is None
+    assert cache.get('a', namespace='prices') == 1
+    assert cache.get_namespace_stats()['prices']['evictions'] == 1
+
+
+def test_byte_budget_bounds_namespace_size():
+    """Large values push older entries out when the byte budget is exceeded."""
+    cache = ShardedMemoryCache(shards=1, default_limits=NamespaceLimits(max_entries=1000, max_bytes=4096))
+
+    for i in range(20):
+        cache.set(f'k{i}', 'x' * 1000)
+
+    stats = cache.get_namespace_stats()['default']
+    assert stats['bytes'] <= 4096 + 1100
+    assert stats['evictions'] > 0
+
+
+def test_ttl_expiry_uses_heap_not_scans():
+    """Expired entries are removed by heap pops on write and by lazy checks on read."""
+    cache = ShardedMemoryCache(shards=1)
+
+    cache.set('short', 1, ttl=0.01)
+    cache.set('long', 2, ttl=60)
+    time.sleep(0.02)
+
+    assert cache.get_entry('short') is MISSING
+    cache.set('other', 3, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.purge_expired() == 1
+    assert cache.get('long') == 2
+    assert cache.get_namespace_stats()['default']['expirations'] == 2
+
+
+def test_overwrite_keeps_accounting_consistent():
+    """Re-setting a key replaces it without leaking entries or bytes."""
+    cache = ShardedMemoryCache(shards=4)
+    for _ in range(10):
+        cache.set('k', 'value', ttl=60)
+
+    stats = cache.get_namespace_stats()['default']
+    assert stats['entries'] == 1
+    assert cache.delete('k')
+    assert cache.get_namespace_stats()['default']['bytes'] == 0
+
+
+@pytest.mark.asyncio
+async def test_cache_manager_reports_namespace_stats():
+    """CacheManager delegates to the sharded backend and surfaces per-namespace stats."""
+    manager = CacheManager(shards=8)
+    await manager.set('token', {'price': 1.5}, ttl=60, namespace='discovery')
+    assert await manager.get('token', namespace='discovery') == {'price': 1.5}
+    assert await manager.get('missing', namespace='discovery') is None
+
+    stats = await manager.get_stats()
+    assert stats['shards'] == 8
+    assert stats['namespaces']['discovery']['hits'] == 1
+    assert stats['namespaces']['discovery']['misses'] == 1
+
+    await manager.clear(namespace='discovery')
+    assert not await manager.exists('token', namespace='discovery')
+
+
+@pytest.mark.asyncio
+async def test_cache_manager_sweeps_expired_entries_from_idle_shards(monkeypatch):
+    """Entries in shards that see no writes are swept once per cleanup interval."""
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module, 'time', clock)
+    monkeypatch.setattr(memory_module, 'time', clock)
+    manager = CacheManager(shards=8, cleanup_interval=30)
+    for i in range(100):
+        await manager.set(f'k{i}', i, ttl=5, namespace='quotes')
+
+    clock.advance(10)
+    assert await manager.get('absent', namespace='quotes') is None
+    assert (await manager.get_stats())['total_entries'] == 100  # expired but not yet swept
+
+    clock.advance(20)
+    assert await manager.get('absent', namespace='quotes') is None
+    stats = await manager.get_stats()
+    assert stats['total_entries'] == 0
+    assert stats['expirations'] == 100
+
+
+def test_cache_benchmark():
+    """Report set/get throughput with a bounded namespace under churn."""
+    cache = ShardedMemoryCache(shards=16)
+    cache.configure_namespace('bench', max_entries=10_000, max_bytes=64 * 1024 * 1024)
+    operations = 100_000
+
+    start = time.perf_counter()
+    for i in range(operations):
+        cache.set(f'token_{i}', i, ttl=30, namespace='bench')
+        cache.get(f'token_{i // 2}', namespace='bench')
+    elapsed = time.perf_counter() - start
+
+    stats = cache.get_namespace_stats()['bench']
+    print(f"[OK] Sharded cache: {2 * operations / elapsed:,.0f} ops/sec, {stats['entries']} entries")
+    assert stats['entries'] <= 10_000 + cache.shard_count
@@ -0,0 +1,60 @@
+"""
+Mempool Deduplication Tests
+File: tests/unit/test_mempool_dedup.py
+
+Unit tests for the cross-endpoint seen-hash set and raw frame hash extraction.
+"""
+
+import json
+
+from app.core.mempool.tx_dedup import SeenHashSet, extract_tx_hash
+
+
+TX_HASH = '0x' + 'ab' * 32
+BLOCK_HASH = '0x' + 'cd' * 32
+
+
+def test_extract_tx_hash_skips_block_hash():
+    """The transaction hash is found without confusing it with blockHash."""
+    frame = json.dumps({
+        'jsonrpc': '2.0',
+        'method': 'eth_subscription',
+        'params': {'subscription': '0x1', 'result': {'blockHash': BLOCK_HASH, 'hash': TX_HASH.upper().replace('0X', '0x')}},
+    })
+
+    assert extract_tx_hash(frame) == TX_HASH
+    assert extract_tx_hash(frame.encode()) == TX_HASH
+
+
+def test_extract_tx_hash_from_hash_only_subscription():
+    """Hash-only subscriptions carry the hash as the result string."""
+    frame = '{"method":"eth_subscription","params":{"subscription":"0x1","result":"%s"}}' % TX_HASH
+    assert extract_tx_hash(frame) == TX_HASH
+    assert extract_tx_hash('{"id":1,"result":"0x1"}') is None
+
+
+def test_first_delivery_wins_and_is_credited():
+    """Only the first endpoint to deliver a hash passes and gets credit."""
+    seen = SeenHashSet(capacity=10, window_seconds=60)
+
+    assert seen.check_and_add(TX_HASH, 'wss://a', now=0.0)
+    assert not seen.check_and_add(TX_HASH, 'wss://b', now=0.1)
+    assert seen.first_source(TX_HASH) == 'wss://a'
+
+    ranking = seen.get_endpoint_ranking()
+    assert ranking['wss://a']['first_deliveries'] == 1
+    assert ranking['wss://b']['duplicate_deliveries'] == 1
+
+
+def test_capacity_and_window_bound_memory():
+    """Old hashes are forgotten once capacity or the time window is exceeded."""
+    seen = SeenHashSet(capacity=2, window_seconds=10)
+
+    seen.check_and_add('0x1', 'a', now=0.0)
+    seen.check_and_add('0x2', 'a', now=1.0)
+    seen.check_and_add('0x3', 'a', now=2.0)
+    assert '0x1' not in seen and len(seen) == 2
+    assert seen.evictions == 1
+
+    assert seen.check_and_add('0x2', 'b', now=20.0)
+    assert len(seen) == 1
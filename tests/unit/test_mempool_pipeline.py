@@ -0,0 +1,88 @@
+"""
+Mempool Pipeline Tests
+File: tests/unit/test_mempool_pipeline.py
+
+Unit tests for the staged mempool ingest/decode/dispatch pipeline.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.mempool.message_pipeline import BackpressurePolicy, MempoolMessagePipeline
+
+
+@pytest.mark.asyncio
+async def test_slow_dispatcher_does_not_block_reader():
+    """Submitting frames returns immediately even while handlers are slow."""
+    handled = []
+    release = asyncio.Event()
+
+    async def decoder(frame):
+        return frame.payload
+
+    async def dispatcher(event):
+        await release.wait()
+        handled.append(event)
+
+    pipeline = MempoolMessagePipeline(decoder, dispatcher, decode_workers=2)
+    await pipeline.start()
+    try:
+        for i in range(50):
+            assert await asyncio.wait_for(pipeline.submit(i, 'wss://a'), timeout=0.1)
+
+        release.set()
+        await asyncio.wait_for(pipeline.drain(), timeout=2)
+
+        assert sorted(handled) == list(range(50))
+        stats = pipeline.get_stats()
+        assert stats['events_dispatched'] == 50
+        assert stats['latency']['end_to_end']['count'] == 50
+    finally:
+        await pipeline.stop()
+
+
+@pytest.mark.asyncio
+async def test_drop_policies_bound_the_ingest_queue():
+    """Full queues drop the oldest or the newest frame depending on policy."""
+    async def decoder(frame):
+        return None
+
+    async def dispatcher(event):
+        return None
+
+    oldest = MempoolMessagePipeline(decoder, dispatcher, ingest_queue_size=2, policy=BackpressurePolicy.DROP_OLDEST)
+    for i in range(3):
+        await oldest.submit(i, 'wss://a')
+    assert [oldest.ingest_queue.get_nowait().payload for _ in range(2)] == [1, 2]
+    assert oldest.frames_dropped == 1
+
+    newest = MempoolMessagePipeline(decoder, dispatcher, ingest_queue_size=2, policy=BackpressurePolicy.DROP_NEWEST)
+    results = [await newest.submit(i, 'wss://a') for i in range(3)]
+    assert results == [True, True, False]
+    assert [newest.ingest_queue.get_nowait().payload for _ in range(2)] == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_decode_errors_are_counted_not_raised():
+    """A failing decoder does not kill the worker."""
+    async def decoder(frame):
+        if frame.payload == 'bad':
+            raise ValueError('boom')
+        return frame.payload
+
+    handled = []
+
+    async def dispatcher(event):
+        handled.append(event)
+
+    pipeline = MempoolMessagePipeline(decoder, dispatcher, decode_workers=1)
+    await pipeline.start()
+    try:
+        await pipeline.submit('bad', 'wss://a')
+        await pipeline.submit('good', 'wss://a')
+        await asyncio.wait_for(pipeline.drain(), timeout=2)
+        assert handled == ['good']
+        assert pipeline.get_stats()['decode_errors'] == 1
+    finally:
+        await pipeline.stop()
@@ -0,0 +1,100 @@
+"""
+Mempool Prefilter Tests
+File: tests/unit/test_mempool_prefilter.py
+
+Unit tests and replay micro-benchmark for the compiled mempool prefilter.
+Set MEMPOOL_REPLAY_FILE to a JSONL file of recorded eth_subscribe pending
+transaction objects to benchmark against real traffic.
+"""
+
+import json
+import os
+import random
+import time
+from typing import Any, Dict, List
+
+from app.core.mempool.tx_prefilter import MempoolPrefilter
+
+
+UNISWAP_V2_ROUTER = '0x7a250d5630B4cF539739dF2C5dAcb4c659F2488D'
+UNISWAP_V2_FACTORY = '0x5C69bEe701ef814a2B6a3EDD4B1652CB9cc5aA6f'
+
+DEX_CONTRACTS = {
+    'uniswap_v2_router': UNISWAP_V2_ROUTER,
+    'uniswap_v2_factory': UNISWAP_V2_FACTORY,
+}
+
+LIQUIDITY_SIGNATURES = {
+    'addLiquidity': '0xe8e33700',
+    'addLiquidityETH': '0xf305d719',
+    'createPair': '0xc9c65396',
+}
+
+
+def make_tx(to: str, selector: str, rng: random.Random) -> Dict[str, Any]:
+    """Build a pending transaction object shaped like eth_subscribe output."""
+    return {
+        'hash': '0x' + rng.randbytes(32).hex(),
+        'from': '0x' + rng.randbytes(20).hex(),
+        'to': to,
+        'value': hex(rng.randrange(10**18)),
+        'gas': hex(rng.randrange(21000, 500000)),
+        'gasPrice': hex(rng.randrange(10**9, 200 * 10**9)),
+        'input': selector + rng.randbytes(192).hex(),
+    }
+
+
+def load_replay_stream(count: int = 20000) -> List[Dict[str, Any]]:
+    """Load a recorded stream, or synthesize one with ~1% liquidity calls."""
+    replay_file = os.environ.get('MEMPOOL_REPLAY_FILE')
+    if replay_file and os.path.exists(replay_file):
+        with open(replay_file) as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    rng = random.Random(42)
+    stream = []
+    for i in range(count):
+        if i % 100 == 0:
+            stream.append(make_tx(UNISWAP_V2_ROUTER, '0xf305d719', rng))
+        elif i % 10 == 0:
+            stream.append(make_tx(UNISWAP_V2_ROUTER, '0x7ff36ab5', rng))  # swapExactETHForTokens
+        else:
+            stream.append(make_tx('0x' + rng.randbytes(20).hex(), '0xa9059cbb', rng))
+    return stream
+
+
+def test_prefilter_matches_known_router_and_selector():
+    """Liquidity calls to a known router pass, regardless of address case."""
+    prefilter = MempoolPrefilter('ethereum', DEX_CONTRACTS, LIQUIDITY_SIGNATURES)
+
+    assert prefilter.match(UNISWAP_V2_ROUTER.lower(), '0xf305d719' + '00' * 32) == 'addLiquidityETH'
+    assert prefilter.match(UNISWAP_V2_FACTORY, '0xC9C65396' + '00' * 64) == 'createPair'
+    assert prefilter.identify_dex(UNISWAP_V2_ROUTER.upper().replace('0X', '0x')) == 'uniswap_v2'
+
+
+def test_prefilter_rejects_other_traffic():
+    """Unknown destinations, unknown selectors and malformed fields are rejected."""
+    prefilter = MempoolPrefilter('ethereum', DEX_CONTRACTS, LIQUIDITY_SIGNATURES)
+
+    assert prefilter.match(UNISWAP_V2_ROUTER, '0x7ff36ab5' + '00' * 32) is None
+    assert prefilter.match('0x' + '11' * 20, '0xf305d719' + '00' * 32) is None
+    assert prefilter.match(None, '0xf305d719') is None
+    assert prefilter.match(UNISWAP_V2_ROUTER, '0x') is None
+    assert prefilter.match('0xnothex', '0xf305d719' + '00' * 32) is None
+    assert prefilter.get_stats()['matched'] == 0
+
+
+def test_prefilter_replay_throughput():
+    """Replay a pending-tx stream through the prefilter and report txs/sec."""
+    prefilter = MempoolPrefilter('ethereum', DEX_CONTRACTS, LIQUIDITY_SIGNATURES)
+    stream = load_replay_stream()
+
+    start = time.perf_counter()
+    matched = sum(1 for tx in stream if prefilter.match_tx(tx) is not None)
+    elapsed = time.perf_counter() - start
+
+    txs_per_sec = len(stream) / max(elapsed, 1e-9)
+    print(f"[OK] Prefilter: {len(stream)} txs, {matched} matched, {txs_per_sec:,.0f} txs/sec")
+
+    assert prefilter.checked == len(stream)
+    assert matched == prefilter.matched
@@ -0,0 +1,217 @@
+"""
+Multicall Batched Reader Tests
+File: tests/unit/test_multicall_reader.py
+
+Unit tests and round-trip benchmark for Multicall3-batched token metadata
+and liquidity reads, run against a local JSON-RPC stand-in.
+"""
+
+import time
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from eth_abi import decode, encode
+from eth_utils import to_checksum_address
+from web3 import AsyncWeb3
+
+from app.core.blockchain.multicall import (
+    MULTICALL3_ADDRESS,
+    BatchedChainReader,
+    Call,
+    MulticallClient,
+    decode_uint,
+    encode_call,
+    function_selector,
+)
+
+WETH = to_checksum_address('0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2')
+FACTORY = to_checksum_address('0x5c69bee701ef814a2b6a3edd4b1652cb9cc5aa6f')
+EOA = to_checksum_address('0x' + 'ee' * 20)
+
+
+def token_address(i: int) -> str:
+    """Deterministic fake token address."""
+    return to_checksum_address('0x' + f'{i + 1:040x}')
+
+
+def pair_address(i: int) -> str:
+    """Deterministic fake pair address."""
+    return to_checksum_address('0x' + f'{0xa0000 + i:040x}')
+
+
+class FakeChain:
+    """In-memory token/factory/pair state answering eth_call like a node."""
+
+    def __init__(self, tokens: int):
+        self.tokens = {token_address(i): i for i in range(tokens)}
+        self.pairs = {pair_address(i): i for i in range(tokens) if i % 2 == 0}
+        self.requests = 0
+
+    def execute(self, target: str, data: bytes):
+        """Return (success, return data) for a call."""
+        target = to_checksum_address(target)
+        selector, args = data[:4], data[4:]
+
+        if target in self.tokens:
+            i = self.tokens[target]
+            if i % 10 == 9:
+                return False, b''  # reverting token
+            if selector == function_selector('name()'):
+                return True, encode(['string'], [f'Token {i}'])
+            if selector == function_selector('symbol()'):
+                # Every third token returns bytes32 like MKR
+                if i % 3 == 0:
+                    return True, f'TK{i}'.encode().ljust(32, b'\x00')
+                return True, encode(['string'], [f'TK{i}'])
+            if selector == function_selector('decimals()'):
+                return True, encode(['uint8'], [18 if i % 2 else 6])
+            if selector == function_selector('totalSupply()'):
+                return True, encode(['uint256'], [10**24 + i])
+        if target == FACTORY and selector == function_selector('getPair(address,address)'):
+            token, _ = decode(['address', 'address'], args)
+            i = self.tokens.get(to_checksum_address(token))
+            pair = pair_address(i) if i is not None and i % 2 == 0 else '0x' + '00' * 20
+            return True, encode(['address'], [pair])
+        if target in self.pairs and selector == function_selector('getReserves()'):
+            i = self.pairs[target]
+            return True, encode(['uint112', 'uint112', 'uint32'], [10**21 * (i + 1), 5 * 10**18, 0])
+        return True, b''  # EOA or unknown function: empty success, like a real node
+
+    def handle(self, request: dict) -> dict:
+        method, params = request['method'], request.get('params', [])
+        if method == 'eth_chainId':
+            return {'jsonrpc': '2.0', 'id': request['id'], 'result': '0x1'}
+        if method == 'eth_getCode':
+            code = '0x60' if to_checksum_address(params[0]) in self.tokens else '0x'
+            return {'jsonrpc': '2.0', 'id': request['id'], 'result': code}
+
+        tx = params[0]
+        data = bytes.fromhex(tx['data'][2:])
+        if to_checksum_address(tx['to']) == MULTICALL3_ADDRESS:
+            calls = decode(['(address,bool,bytes)[]'], data[4:])[0]
+            results = [self.execute(target, call_data) for target, _, call_data in calls]
+            result = encode(['(bool,bytes)[]'], [results])
+        else:
+            success, result = self.execute(tx['to'], data)
+            if not success:
+                return {'jsonrpc': '2.0', 'id': request['id'], 'error': {'code': 3, 'message': 'execution reverted'}}
+        return {'jsonrpc': '2.0', 'id': request['id'], 'result': '0x' + result.hex()}
+
+
+async def start_rpc(chain: FakeChain) -> TestServer:
+    """Serve the fake chain over HTTP JSON-RPC."""
+    async def rpc(request):
+        body = await request.json()
+        if body['method'] != 'eth_chainId':  # provider handshake, not a data read
+            chain.requests += 1
+        return web.json_response(chain.handle(body))
+
+    app = web.Application()
+    app.router.add_post('/', rpc)
+    server = TestServer(app)
+    await server.start_server()
+    return server
+
+
+def make_reader(url: str, batch_size: int = 250) -> BatchedChainReader:
+    """Build a reader on an async provider pointed at the stand-in."""
+    w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(url))
+    client = MulticallClient(lambda tx: w3.eth.call(tx, 'latest'), batch_size=batch_size)
+    return BatchedChainReader(client, factories={'uniswap_v2': FACTORY}, wrapped_native=WETH)
+
+
+@pytest.mark.asyncio
+async def test_token_infos_decode_strings_bytes32_and_failures():
+    """Valid tokens decode; reverting tokens and EOAs map to None."""
+    chain = FakeChain(tokens=12)
+    server = await start_rpc(chain)
+    try:
+        reader = make_reader(str(server.make_url('/')))
+        infos = await reader.get_token_infos([token_address(i) for i in range(12)] + [EOA, 'not-an-address'])
+    finally:
+        await server.close()
+
+    assert chain.requests == 1
+    assert infos[token_address(1)].name == 'Token 1'
+    assert infos[token_address(1)].decimals == 18
+    assert infos[token_address(3)].symbol == 'TK3'  # bytes32 symbol
+    assert infos[token_address(9)] is None
+    assert infos[EOA] is None
+    assert 'not-an-address' not in infos
+
+
+@pytest.mark.asyncio
+async def test_liquidity_many_uses_two_rounds():
+    """Pair lookup and reserves take one request each, with token0 derived by address order."""
+    chain = FakeChain(tokens=10)
+    server = await start_rpc(chain)
+    try:
+        reader = make_reader(str(server.make_url('/')))
+        liquidity = await reader.get_liquidity_many([token_address(i) for i in range(10)])
+    finally:
+        await server.close()
+
+    assert chain.requests == 2
+    assert liquidity[token_address(1)] == []
+    (pool,) = liquidity[token_address(2)]
+    assert pool.pool_address == pair_address(2)
+    assert pool.token0 == token_address(2)  # 0x00..03 sorts below WETH
+    assert pool.reserves0 == 3 * 10**21
+
+
+@pytest.mark.asyncio
+async def test_failed_batches_are_split():
+    """A batch the node rejects is bisected until the bad call is isolated."""
+    async def flaky_eth_call(tx):
+        data = bytes.fromhex(tx['data'][2:])
+        calls = decode(['(address,bool,bytes)[]'], data[4:])[0]
+        if any(target.lower() == EOA.lower() for target, _, _ in calls):
+            raise ValueError('gas cap exceeded')
+        return encode(['(bool,bytes)[]'], [[(True, encode(['uint256'], [7])) for _ in calls]])
+
+    client = MulticallClient(flaky_eth_call)
+    targets = [token_address(i) for i in range(3)] + [EOA]
+    results = await client.aggregate([Call(t, encode_call('totalSupply()'), decode_uint) for t in targets])
+
+    assert results == [7, 7, 7, None]
+    assert client.stats['batch_splits'] == 2
+
+
+@pytest.mark.asyncio
+async def test_batched_reads_benchmark():
+    """Compare sequential per-token calls with multicall batching for 300 tokens."""
+    tokens = 300
+    chain = FakeChain(tokens=tokens)
+    server = await start_rpc(chain)
+    addresses = [token_address(i) for i in range(tokens)]
+    try:
+        url = str(server.make_url('/'))
+        w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(url))
+
+        start = time.perf_counter()
+        for address in addresses:
+            await w3.eth.get_code(address)
+            for signature in ('name()', 'symbol()', 'decimals()', 'totalSupply()'):
+                try:
+                    await w3.eth.call({'to': address, 'data': '0x' + encode_call(signature).hex()})
+                except Exception:
+                    pass
+        sequential_time, sequential_requests = time.perf_counter() - start, chain.requests
+
+        chain.requests = 0
+        reader = make_reader(url)
+        start = time.perf_counter()
+        infos = await reader.get_token_infos(addresses)
+        liquidity = await reader.get_liquidity_many(addresses)
+        batched_time, batched_requests = time.perf_counter() - start, chain.requests
+    finally:
+        await server.close()
+
+    print(
+        f"[OK] {tokens} tokens metadata: sequential {sequential_requests} requests / {sequential_time * 1000:.0f} ms, "
+        f"multicall {batched_requests} requests (incl. liquidity) / {batched_time * 1000:.0f} ms"
+    )
+    assert sum(1 for info in infos.values() if info) == tokens - tokens // 10
+    assert sum(len(pools) for pools in liquidity.values()) == tokens // 2
+    assert batched_requests < 12
@@ -0,0 +1,224 @@
+"""
+Pair Log Discovery Tests
+File: tests/unit/test_pair_log_discovery.py
+
+Unit tests for factory-log based pair discovery: log decoding, adaptive
+eth_getLogs chunking, cursor resume and live subscription handling.
+"""
+
+import pytest
+from eth_abi import encode
+
+from app.core.discovery.pair_log_discovery import (
+    PAIR_CREATED_TOPIC,
+    POOL_CREATED_TOPIC,
+    BlockCursorStore,
+    PairLogDiscovery,
+    decode_pair_created_log,
+    is_range_too_large,
+    is_rate_limited,
+)
+
+V2_FACTORY = '0x5C69bEe701ef814a2B6a3EDD4B1652CB9cc5aA6f'
+V3_FACTORY = '0x1F98431c8aD98523631AE4a59f267346ea31F984'
+FACTORIES = {'uniswap_v2': V2_FACTORY, 'uniswap_v3': V3_FACTORY}
+
+
+def word(value: int) -> str:
+    """32-byte hex topic."""
+    return '0x' + f'{value:064x}'
+
+
+def v2_log(block: int, index: int = 0) -> dict:
+    """PairCreated log for token pair (block, block + 1)."""
+    return {
+        'address': V2_FACTORY.lower(),
+        'topics': [PAIR_CREATED_TOPIC, word(block * 2), word(block * 2 + 1)],
+        'data': '0x' + encode(['address', 'uint256'], ['0x' + f'{0xbeef00 + block:040x}', block]).hex(),
+        'blockNumber': hex(block),
+        'transactionHash': word(block),
+        'logIndex': hex(index),
+        'removed': False,
+    }
+
+
+class FakeNode:
+    """Answers eth_blockNumber/eth_getLogs, rejecting spans that return too many logs."""
+
+    def __init__(self, head: int, pair_blocks, max_results: int = 50):
+        self.head = head
+        self.logs = [v2_log(block) for block in pair_blocks]
+        self.max_results = max_results
+        self.ranges = []
+        self.rejected = 0
+
+    async def rpc(self, method, params):
+        if method == 'eth_blockNumber':
+            return hex(self.head)
+        assert method == 'eth_getLogs'
+        start, end = int(params[0]['fromBlock'], 16), int(params[0]['toBlock'], 16)
+        matched = [log for log in self.logs if start <= int(log['blockNumber'], 16) <= end]
+        if len(matched) > self.max_results:
+            self.rejected += 1
+            raise ValueError(f"query returned more than {self.max_results} results")
+        self.ranges.append((start, end))
+        return matched
+
+
+def test_decodes_v2_and_v3_creation_logs():
+    """Both factory event shapes decode; unknown factories are ignored."""
+    factories = {addr.lower(): dex for dex, addr in FACTORIES.items()}
+    event = decode_pair_created_log(v2_log(100, index=3), factories)
+    assert event.dex == 'uniswap_v2'
+    assert event.pair.lower() == '0x' + f'{0xbeef00 + 100:040x}'
+    assert (event.block_number, event.log_index, event.fee) == (100, 3, None)
+
+    v3_log = {
+        'address': V3_FACTORY,
+        'topics': [POOL_CREATED_TOPIC, word(1), word(2), word(3000)],
+        'data': '0x' + encode(['int24', 'address'], [60, '0x' + 'ab' * 20]).hex(),
+        'blockNumber': '0x10', 'transactionHash': word(7), 'logIndex': '0x0',
+    }
+    pool = decode_pair_created_log(v3_log, factories)
+    assert (pool.dex, pool.fee, pool.pair.lower()) == ('uniswap_v3', 3000, '0x' + 'ab' * 20)
+
+    assert decode_pair_created_log({**v3_log, 'address': '0x' + '11' * 20}, factories) is None
+
+
+@pytest.mark.asyncio
+async def test_chunk_size_shrinks_on_too_many_results():
+    """Dense ranges are split until the provider accepts them; no block is missed."""
+    node = FakeNode(head=10_000, pair_blocks=range(5_000, 5_400))
+    discovery = PairLogDiscovery('ethereum', node.rpc, FACTORIES, initial_chunk_size=5_000)
+
+    events = await discovery.fetch_logs(1, 10_000)
+
+    assert [event.block_number for event in events] == list(range(5_000, 5_400))
+    assert node.rejected > 0 and discovery.stats['chunk_shrinks'] == node.rejected
+    covered = sorted(node.ranges)
+    assert covered[0][0] == 1 and covered[-1][1] == 10_000
+    assert all(prev[1] + 1 == nxt[0] for prev, nxt in zip(covered, covered[1:]))
+
+
+def test_rate_limit_errors_are_not_range_errors():
+    """Throttling never shrinks the range; provider range errors do."""
+    for error in (
+        ValueError("rate limit exceeded"),
+        ValueError({'code': -32005, 'message': 'daily request count exceeded, request rate limited'}),
+        ValueError("429 Client Error: Too Many Requests"),
+        ValueError({'code': 429, 'message': 'Your app has exceeded its compute units per second capacity'}),
+    ):
+        assert is_rate_limited(error) and not is_range_too_large(error)
+
+    for error in (
+        ValueError({'code': -32005, 'message': 'query returned more than 10000 results'}),
+        ValueError("Log response size exceeded. You can make eth_getLogs requests with up to a 2K block range"),
+        ValueError("exceed maximum block range: 5000"),
+        ValueError("block range is too wide"),
+    ):
+        assert is_range_too_large(error) and not is_rate_limited(error)
+
+    assert not is_range_too_large(ValueError("execution reverted: limit exceeded"))
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_chunk_backs_off_without_shrinking():
+    """A throttled getLogs is retried after a backoff at the same span."""
+    node = FakeNode(head=1_000, pair_blocks=[500])
+    rpc, failures = node.rpc, [ValueError("429 Too Many Requests")] * 2
+
+    async def throttled(method, params):
+        if method == 'eth_getLogs' and failures:
+            raise failures.pop()
+        return await rpc(method, params)
+
+    discovery = PairLogDiscovery('ethereum', throttled, FACTORIES, initial_chunk_size=1_000,
+                                 rate_limit_backoff=0)
+    events = await discovery.fetch_logs(1, 1_000)
+
+    assert [event.block_number for event in events] == [500]
+    assert node.ranges == [(1, 1_000)]
+    assert discovery.stats['rate_limit_backoffs'] == 2 and discovery.stats['chunk_shrinks'] == 0
+
+
+@pytest.mark.asyncio
+async def test_cursor_resume_never_rescans(tmp_path):
+    """A restarted discovery resumes after the persisted cursor."""
+    store_path = tmp_path / 'cursors.json'
+    node = FakeNode(head=1_000, pair_blocks=range(100, 1_500, 10))
+    seen = []
+
+    store = BlockCursorStore(str(store_path))
+    first = PairLogDiscovery('ethereum', node.rpc, FACTORIES, handler=seen.append,
+                             cursor_store=store, start_block=1, initial_chunk_size=250)
+    assert await first.backfill() == 91
+    assert store.writes == first.stats['get_logs_requests']  # one write per chunk, not per pair
+    assert BlockCursorStore(str(store_path)).load('ethereum') == 1_000
+
+    node.head = 1_600
+    scanned_before = list(node.ranges)
+
+    async def async_handler(event):
+        seen.append(event)
+
+    second = PairLogDiscovery('ethereum', node.rpc, FACTORIES, handler=async_handler,
+                              cursor_store=BlockCursorStore(str(store_path)), start_block=1)
+    assert await second.backfill() == 49
+
+    new_ranges = node.ranges[len(scanned_before):]
+    assert min(start for start, _ in new_ranges) == 1_001
+    assert len({event.key for event in seen}) == len(seen) == 140
+
+
+@pytest.mark.asyncio
+async def test_subscription_messages_advance_cursor_and_skip_duplicates():
+    """Live logs are delivered once; reorged and already-covered logs are skipped."""
+    node = FakeNode(head=500, pair_blocks=[])
+    seen = []
+    discovery = PairLogDiscovery('ethereum', node.rpc, FACTORIES, handler=seen.append)
+    await discovery.backfill()
+    assert discovery.cursor == 500
+
+    def notification(log):
+        return {'method': 'eth_subscription', 'params': {'subscription': '0x1', 'result': log}}
+
+    assert await discovery.handle_subscription_message(notification(v2_log(500))) == 0
+    assert await discovery.handle_subscription_message(notification(v2_log(503))) == 1
+    assert await discovery.handle_subscription_message(notification(v2_log(503))) == 0
+    assert await discovery.handle_subscription_message(notification({**v2_log(504), 'removed': True})) == 0
+
+    assert [event.block_number for event in seen] == [503]
+    assert discovery.cursor == 502
+    assert discovery.get_stats()['removed_logs_skipped'] == 1
+
+
+@pytest.mark.asyncio
+async def test_restart_does_not_redeliver_last_live_block(tmp_path):
+    """Pairs delivered live from a block are skipped by the backfill after a restart."""
+    store_path = str(tmp_path / 'cursors.json')
+    node = FakeNode(head=500, pair_blocks=[])
+    seen = []
+    store = BlockCursorStore(store_path)
+    first = PairLogDiscovery('ethereum', node.rpc, FACTORIES, handler=seen.append,
+                             cursor_store=store, persist_interval=60)
+    await first.backfill()
+
+    def notification(log):
+        return {'method': 'eth_subscription', 'params': {'subscription': '0x1', 'result': log}}
+
+    assert await first.handle_subscription_message(notification(v2_log(503, index=0))) == 1
+    assert await first.handle_subscription_message(notification(v2_log(503, index=4))) == 1
+    assert store.writes == 1  # live events wait for the persist interval
+    await first.flush()
+    assert store.writes == 2
+    assert BlockCursorStore(store_path).load_delivered('ethereum') == {0, 4}
+
+    # Block 503 also holds a pair the first process never saw
+    node.head = 504
+    node.logs = [v2_log(503, index=0), v2_log(503, index=4), v2_log(503, index=7)]
+    second = PairLogDiscovery('ethereum', node.rpc, FACTORIES, handler=seen.append,
+                              cursor_store=BlockCursorStore(store_path))
+    assert await second.backfill() == 1
+    assert [event.log_index for event in seen] == [0, 4, 7]
+    assert BlockCursorStore(store_path).load('ethereum') == 504
+    assert BlockCursorStore(store_path).load_delivered('ethereum') == set()
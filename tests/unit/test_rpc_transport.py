@@ -0,0 +1,207 @@
+"""
+Pooled RPC Transport Tests
+File: tests/unit/test_rpc_transport.py
+
+Tests for latency-weighted endpoint selection, hedging, failover and
+in-flight limits in RPCTransport, run against local stub JSON-RPC servers.
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+from aiohttp import web
+
+from app.core.blockchain.network_manager import EnhancedNetworkManager, NetworkType
+from app.core.blockchain.rpc_transport import RPCTransport
+from app.core.exceptions import RPCError
+
+
+class StubRPC:
+    """Local JSON-RPC server with a configurable delay, or held until a gate opens."""
+
+    def __init__(self, delay: float = 0.0, chain_id: int = 1, gate: asyncio.Event = None):
+        self.delay = delay
+        self.gate = gate
+        self.chain_id = chain_id
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.peers = set()
+        self.url = ''
+        self._runner = None
+
+    async def handle(self, request: web.Request) -> web.Response:
+        payload = json.loads(await request.read())
+        self.requests += 1
+        self.peers.add(request.transport.get_extra_info('peername'))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.gate is not None:
+                await self.gate.wait()
+        finally:
+            self.in_flight -= 1
+        results = {
+            'eth_chainId': hex(self.chain_id),
+            'net_version': str(self.chain_id),
+            'eth_blockNumber': '0x112a880',
+            'eth_gasPrice': hex(20 * 10**9),
+            'web3_clientVersion': 'stub/1.0',
+            'eth_getBlockByNumber': {
+                'number': '0x112a880', 'hash': '0x' + 'ab' * 32, 'parentHash': '0x' + 'cd' * 32,
+                'timestamp': '0x65000000', 'gasUsed': '0xe4e1c0', 'gasLimit': '0x1c9c380',
+                'baseFeePerGas': hex(10 * 10**9),
+            },
+        }
+        if isinstance(payload, list):  # JSON-RPC batch, answered in reverse order
+            return web.json_response([
+                {'jsonrpc': '2.0', 'id': item['id'], 'result': results.get(item['method'], self.url)}
+                if item['method'] != 'eth_fail' else
+                {'jsonrpc': '2.0', 'id': item['id'], 'error': {'code': -32601, 'message': 'not found'}}
+                for item in reversed(payload)
+            ])
+        return web.json_response({
+            'jsonrpc': '2.0', 'id': payload['id'], 'result': results.get(payload['method'], self.url),
+        })
+
+    async def start(self) -> 'StubRPC':
+        app = web.Application()
+        app.router.add_post('/', self.handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f'http://127.0.0.1:{port}/'
+        return self
+
+    async def stop(self) -> None:
+        await self._runner.cleanup()
+
+
+class FirstChoice:
+    """Deterministic rng: always picks the lowest-latency endpoint."""
+
+    def choices(self, population, weights):
+        return [population[0]]
+
+
+DEAD_URL = 'http://127.0.0.1:9/'
+
+
+@pytest.mark.asyncio
+async def test_latency_weighted_selection_and_keep_alive():
+    """Traffic concentrates on the faster endpoint over a few pooled connections."""
+    fast, slow = await StubRPC(0.002).start(), await StubRPC(0.06).start()
+    transport = RPCTransport([(fast.url, 'fast'), (slow.url, 'slow')])
+    try:
+        for _ in range(5):  # warm up both
+            await transport.request('eth_blockNumber', hedge=False)
+            await transport._post(transport.endpoints[1], b'{"jsonrpc":"2.0","id":1,"method":"eth_blockNumber","params":[]}')
+        before = fast.requests
+        for _ in range(60):
+            assert (await transport.request('eth_blockNumber'))['result'] == '0x112a880'
+
+        assert fast.requests - before > 50
+        assert len(fast.peers) <= 2  # keep-alive reuses connections
+        assert transport.get_stats()['endpoints'][0]['median_latency_ms'] < 50
+    finally:
+        await transport.close()
+        await fast.stop()
+        await slow.stop()
+
+
+@pytest.mark.asyncio
+async def test_hedged_request_takes_first_answer():
+    """A stalled primary is hedged after its p95 latency; the backup's answer wins and the primary is cancelled."""
+    stalled = asyncio.Event()
+    primary, backup = await StubRPC(gate=stalled).start(), await StubRPC().start()
+    history = [{'rpc_url': primary.url, 'success': True, 'response_time_ms': 10.0}] * 20 + \
+              [{'rpc_url': backup.url, 'success': True, 'response_time_ms': 30.0}] * 20
+    transport = RPCTransport([(primary.url, 'a'), (backup.url, 'b')], hedge=True,
+                             history=lambda: history, on_result=lambda *args: None, rng=FirstChoice())
+    attempts = []
+    post = transport._post
+
+    async def tracked_post(endpoint, body):
+        attempts.append((endpoint.url, asyncio.current_task()))
+        return await post(endpoint, body)
+
+    transport._post = tracked_post
+    try:
+        response = await transport.request('eth_call', [{'to': '0x' + '00' * 20}, 'latest'])
+
+        assert response['result'] == backup.url
+        assert [url for url, _ in attempts] == [primary.url, backup.url]
+        primary_attempt = attempts[0][1]
+        await asyncio.wait([primary_attempt])
+        assert primary_attempt.cancelled()
+        assert transport.endpoints[0].in_flight == 0
+        assert transport.stats['hedges_sent'] == 1 and transport.stats['hedges_won'] == 1
+        stalled.set()
+
+        # Methods outside the hedged set, including sends, wait for the primary
+        assert (await transport.request('eth_getLogs', [{}]))['result'] == primary.url
+        assert (await transport.request('eth_sendRawTransaction', ['0x00']))['result'] == primary.url
+        assert transport.stats['hedges_sent'] == 1
+    finally:
+        await transport.close()
+        await primary.stop()
+        await backup.stop()
+
+
+@pytest.mark.asyncio
+async def test_failover_and_in_flight_limit():
+    """Dead endpoints fail over and cool down; concurrency per endpoint is capped."""
+    stub = await StubRPC(0.03).start()
+    transport = RPCTransport([(DEAD_URL, 'dead'), (stub.url, 'live')], max_in_flight=2,
+                             failure_threshold=2, rng=FirstChoice())
+    try:
+        results = await asyncio.gather(*(transport.request('eth_blockNumber') for _ in range(10)))
+        assert all(r['result'] == '0x112a880' for r in results)
+        assert stub.max_in_flight <= 2
+
+        dead = transport.endpoints[0]
+        assert dead.failures >= 2 and dead.unhealthy_until > time.monotonic()
+
+        # A batch is one request; results come back in call order, errors in place
+        requests = stub.requests
+        chain_id, failed, block = await transport.batch([('eth_chainId', []), ('eth_fail', []), ('eth_blockNumber', [])])
+        assert (chain_id, block) == ('0x1', '0x112a880') and isinstance(failed, RPCError)
+        assert stub.requests == requests + 1
+        assert transport.rank_endpoints()[0].url == stub.url
+        assert [e.url for e in await transport.probe(chain_id=1)] == [stub.url]
+    finally:
+        await transport.close()
+        await stub.stop()
+
+
+@pytest.mark.asyncio
+async def test_network_manager_connects_through_pooled_transport():
+    """Connecting probes endpoints concurrently and records per-endpoint latency."""
+    stub = await StubRPC(0.001).start()
+    manager = EnhancedNetworkManager()
+    manager.network_configs[NetworkType.ETHEREUM].rpc_urls = [DEAD_URL, stub.url]
+    manager.api_keys = {}
+    try:
+        assert await manager.connect_to_network(NetworkType.ETHEREUM)
+        connection = manager.connections[NetworkType.ETHEREUM]
+        assert connection.current_rpc_url == stub.url
+
+        web3 = await manager.get_web3_instance(NetworkType.ETHEREUM)
+        assert await web3.eth.block_number == 0x112a880
+        assert any(r['rpc_url'] == stub.url and r['success'] for r in manager.request_history[NetworkType.ETHEREUM])
+        assert len(stub.peers) <= 3  # concurrent startup reads, then reused
+
+        # A forced reconnect tears the old connection down before replacing it
+        tracker = await manager.get_confirmation_tracker(NetworkType.ETHEREUM)
+        assert await manager.connect_to_network(NetworkType.ETHEREUM, force_reconnect=True)
+        assert manager.connections[NetworkType.ETHEREUM] is not connection
+        assert connection.transport is None and connection.chain_state is None
+        assert connection.confirmation_tracker is None and tracker._task is None
+    finally:
+        await manager.disconnect_all()
+        await stub.stop()
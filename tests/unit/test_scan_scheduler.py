@@ -0,0 +1,189 @@
+"""
+Multi-Chain Scan Scheduler Tests
+File: tests/unit/test_scan_scheduler.py
+
+Unit tests for per-chain RPC budgets, block-time driven polling and
+concurrent multi-chain scanning in TokenScanner and TokenDiscovery.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.blockchain.base_chain import TokenInfo
+from app.core.blockchain.multi_chain_manager import MultiChainManager
+from app.core.blockchain.rpc_budget import BudgetedChain, TokenBucket
+from app.core.discovery.scan_scheduler import ChainScanScheduler
+from app.core.discovery.token_discovery import TokenDiscovery
+from app.core.discovery.token_scanner import TokenScanner
+
+
+class FakeChain:
+    """Chain with a moving head that finds one token per scanned block."""
+
+    def __init__(self, head: int, gate: asyncio.Event = None):
+        self.head = head
+        self.gate = gate
+        self.ranges = []
+        self.scanned = asyncio.Event()
+
+    async def get_latest_block_number(self) -> int:
+        return self.head
+
+    async def scan_new_tokens(self, from_block: int, to_block: int):
+        if self.gate is not None:
+            await asyncio.wait_for(self.gate.wait(), timeout=5)
+        self.ranges.append((from_block, to_block))
+        self.scanned.set()
+        return [
+            TokenInfo(address=f"0x{block:040x}", symbol=f"T{block}", name=f"Token {block}", decimals=18)
+            for block in range(from_block, to_block + 1)
+        ]
+
+
+class FakeManager:
+    """MultiChainManager stand-in serving fake chains."""
+
+    def __init__(self, chains):
+        self.chains = chains
+
+    async def get_enabled_networks(self):
+        return set(self.chains)
+
+    async def get_chain(self, network):
+        return self.chains.get(network)
+
+
+class FakeClock:
+    """Clock that only moves when the bucket sleeps on it."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.now += seconds
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_limits_call_rate():
+    """Calls beyond the burst capacity are paced at the refill rate."""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=200, capacity=5, clock=clock, sleep=clock.sleep)
+    calls = []
+
+    class Chain:
+        async def ping(self):
+            calls.append(clock())
+
+    chain = BudgetedChain(Chain(), bucket)
+    await asyncio.gather(*(chain.ping() for _ in range(25)))
+
+    assert chain.rpc_calls == 25
+    # The burst goes out at once, then one call per 1/200 s
+    assert calls[:5] == [0.0] * 5
+    assert calls[5:] == pytest.approx([i / 200 for i in range(1, 21)])
+    assert bucket.get_stats()['waits'] == 20
+
+
+def test_poll_interval_follows_block_time_and_lag():
+    """Behind: run at once; caught up: one block; idle: half a block; errors back off."""
+    scheduler = ChainScanScheduler(scan_fn=None, min_interval=0.01)
+    stats = scheduler.register('ethereum', confirmations=2)
+    assert stats.block_time == 12 and scheduler.register('arbitrum').block_time == 0.25
+
+    assert scheduler.record_scan('ethereum', 1_000, 950, 10, 3, 0.5) == 0.01
+    assert scheduler.record_scan('ethereum', 1_000, 998, 10, 1, 0.5) == 12
+    assert scheduler.record_scan('ethereum', 1_000, None, 0, 0, 0.1) == 6
+    assert scheduler.record_error('ethereum') == 12
+    assert scheduler.record_error('ethereum') == 24
+
+    chain_stats = scheduler.get_stats()['ethereum']
+    assert chain_stats['lag_blocks'] == 2
+    assert chain_stats['blocks_scanned'] == 20
+    assert chain_stats['errors'] == 2
+
+
+def test_scanner_shares_manager_rpc_budget():
+    """The scanner meters calls through the manager's bucket, not a second one."""
+    manager = MultiChainManager()
+    scanner = TokenScanner(multi_chain_manager=manager)
+    scanner.scheduler.register('ethereum')
+    budget = manager.get_rpc_budget('ethereum')
+
+    assert scanner.scheduler.budgets['ethereum'] is budget
+    assert len(manager.rpc_budgets) == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_chain_does_not_delay_fast_chains():
+    """Chains scan concurrently and report per-chain throughput, lag and RPC cost."""
+    fast_chains_done = asyncio.Event()
+    chains = {
+        'ethereum': FakeChain(head=1_000, gate=fast_chains_done),
+        'arbitrum': FakeChain(head=50_000),
+        'base': FakeChain(head=20_000),
+        'polygon': FakeChain(head=40_000),
+    }
+    scanner = TokenScanner(multi_chain_manager=FakeManager(chains))
+
+    async def release_slow_chain():
+        await asyncio.gather(*(chains[name].scanned.wait() for name in ('arbitrum', 'base', 'polygon')))
+        fast_chains_done.set()
+
+    # Ethereum's scan only finishes once the other chains have finished theirs,
+    # which can only happen if they are not queued behind it
+    release = asyncio.create_task(release_slow_chain())
+    results = await scanner.scan_all_networks(block_offset=5)
+    await release
+
+    assert set(results) == set(chains)
+    assert chains['arbitrum'].ranges == [(49_995, 49_998)]
+
+    # A second pass continues after the last scanned block
+    chains['arbitrum'].head += 3
+    await scanner.scan_network('arbitrum', block_offset=5)
+    assert chains['arbitrum'].ranges[-1] == (49_999, 50_001)
+
+    stats = (await scanner.get_discovery_stats())['chains']
+    assert set(stats) == set(chains)
+    arbitrum = stats['arbitrum']
+    assert arbitrum['blocks_scanned'] == 7
+    assert arbitrum['lag_blocks'] == 2
+    assert arbitrum['rpc_calls'] == 4
+    assert arbitrum['rpc_calls_per_token'] == pytest.approx(4 / 7, abs=0.01)
+    assert arbitrum['poll_interval'] == 0.25
+
+
+@pytest.mark.asyncio
+async def test_token_discovery_scans_dex_sources_concurrently():
+    """Every DEX source is in flight at once; a failing source does not drop the others."""
+    discovery = TokenDiscovery()
+    discovery.dex_sources['ethereum'] = ['uniswap_v2', 'uniswap_v3', 'sushiswap', 'balancer']
+    started = []
+    all_started = asyncio.Event()
+
+    def source(dex_name, tokens):
+        async def scan(*args):
+            started.append(dex_name)
+            if len(started) == 4:
+                all_started.set()
+            # Only completes if every other source was started before it finished
+            await asyncio.wait_for(all_started.wait(), timeout=5)
+            if tokens is None:
+                raise RuntimeError(f"{dex_name} unavailable")
+            return [{'address': address, 'dex_source': dex_name} for address in tokens]
+        return scan
+
+    discovery._scan_uniswap_v2 = source('uniswap_v2', ['0xAA', '0xBB'])
+    discovery._scan_uniswap_v3 = source('uniswap_v3', None)
+    discovery._scan_sushiswap = source('sushiswap', ['0xbb', '0xCC'])
+    discovery._scan_generic_dex = lambda dex_name, network: source(dex_name, [])()
+
+    tokens = await discovery._scan_network_for_new_tokens('ethereum')
+
+    assert sorted(started) == ['balancer', 'sushiswap', 'uniswap_v2', 'uniswap_v3']
+    assert [token['address'] for token in tokens] == ['0xAA', '0xBB', '0xCC']
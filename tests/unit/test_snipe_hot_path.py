@@ -0,0 +1,251 @@
+"""
+Snipe Hot Path Tests
+File: tests/unit/test_snipe_hot_path.py
+
+Tests for the swap calldata template, the local nonce manager and
+pre-signed snipe transactions in BlockZeroSniper, their wiring in
+MempoolManager, plus an event-to-signed-bytes latency benchmark.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from eth_abi import encode
+from eth_account import Account
+from web3 import Web3
+
+from app.core.blockchain import network_manager as shared_network
+from app.core.blockchain.chain_state import ChainStateCache
+from app.core.mempool import mempool_manager
+from app.core.mempool.mempool_scanner import LiquidityAddEvent, PendingTransaction
+from app.core.sniping.block_zero_sniper import BlockZeroSniper
+from app.core.sniping.nonce_manager import NonceManager
+from app.core.sniping.snipe_templates import SwapCalldataTemplate
+
+GWEI = 10**9
+PRIVATE_KEY = '0x' + '11' * 32
+WETH = '0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2'
+
+
+def launch(i: int) -> LiquidityAddEvent:
+    """addLiquidityETH event for a fake token."""
+    token = Web3.to_checksum_address('0x' + f'{i + 1:040x}')
+    pending = PendingTransaction(
+        hash='0x' + f'{i:064x}', from_address='0x' + 'aa' * 20, to_address='0x' + 'bb' * 20,
+        value=10**18, gas=300000, gas_price=20 * GWEI, input_data='0x', timestamp=time.time()
+    )
+    return LiquidityAddEvent(
+        token_address=token, pair_address='0x' + 'cc' * 20, dex='uniswap_v2',
+        token0=token, token1=WETH, amount0=10**24, amount1=10**18, liquidity=0, pending_tx=pending
+    )
+
+
+class FakeEth:
+    """Account reads for pre-sign validation; counts every RPC-backed call."""
+
+    def __init__(self, nonce: int):
+        self.nonce = nonce
+        self.calls = 0
+
+    def get_balance(self, address):
+        self.calls += 1
+        return 10 * 10**18
+
+    def get_transaction_count(self, address, block_identifier):
+        self.calls += 1
+        return self.nonce
+
+
+class FakeWeb3:
+    def __init__(self, nonce: int):
+        self.eth = FakeEth(nonce)
+
+
+async def make_sniper(nonce: int = 7) -> BlockZeroSniper:
+    """Sniper with fresh chain state; its nonce is seeded on first use."""
+    cache = ChainStateCache('ethereum', rpc=None, refresh_gas_price=False)
+    await cache.apply_head({
+        'number': '0x64', 'hash': '0x' + 'ab' * 32, 'gasUsed': hex(15_000_000),
+        'gasLimit': hex(30_000_000), 'baseFeePerGas': hex(10 * GWEI),
+    })
+    cache.chain_id = 1
+    return BlockZeroSniper('ethereum', w3=FakeWeb3(nonce), private_key=PRIVATE_KEY, chain_state=cache)
+
+
+def test_calldata_template_matches_abi_encoding():
+    """Patched template bytes equal a full ABI encode of swapExactETHForTokens."""
+    recipient = Account.from_key(PRIVATE_KEY).address
+    template = SwapCalldataTemplate(WETH, recipient)
+    token = launch(3).token_address
+
+    expected = template.selector + encode(
+        ['uint256', 'address[]', 'address', 'uint256'], [12345, [WETH, token], recipient, 1_700_000_300]
+    )
+    assert template.selector.hex() == '7ff36ab5'
+    assert template.render(token, 12345, 1_700_000_300) == expected
+    assert template.render(token, 1, 1) != expected
+
+
+def test_nonce_manager_reserve_release_confirm():
+    """Nonces are handed out locally and reconciled on release, confirmation and drops."""
+    nonces = NonceManager()
+    address = '0x' + 'ab' * 20
+    nonces.sync(address, 5)
+
+    assert [nonces.reserve(address) for _ in range(3)] == [5, 6, 7]
+    assert nonces.release(address, 7) and nonces.peek(address) == 7
+    assert not nonces.release(address, 5)  # would leave a gap
+
+    nonces.sync(address, 4)  # node has not seen our reservations yet
+    assert nonces.peek(address) == 7
+    nonces.confirm(address, 5)
+    assert nonces.in_flight(address) == {6}
+
+    nonces.resync(address.upper().replace('0X', '0x'), 6)  # nonce 6 dropped
+    assert nonces.peek(address) == 6 and nonces.in_flight(address) == set()
+
+
+@pytest.mark.asyncio
+async def test_presigned_snipe_is_used_until_stale():
+    """A pre-signed tier is used when its nonce still matches; otherwise the template re-signs."""
+    sniper = await make_sniper(nonce=7)
+    address = sniper.account.address
+
+    first, second = launch(1), launch(2)
+    prepared = await sniper.prepare_snipe(first, 0.05)
+    await sniper.prepare_snipe(second, 0.05)
+    assert set(prepared.transactions) == {'conservative', 'normal', 'aggressive'}
+    assert sniper.nonce_manager.peek(address) == 7  # pre-signing does not consume nonces
+
+    tx = await sniper._build_hot_snipe_transaction(first, 0.05, 'normal')
+    assert tx is prepared.transactions['normal']
+    signed = Account.recover_transaction(tx.signed_transaction)
+    assert signed == address and tx.nonce == 7
+
+    # The second set was signed with nonce 7, now taken: re-signed from the template
+    tx = await sniper._build_hot_snipe_transaction(second, 0.05, 'normal')
+    assert tx.nonce == 8 and Account.recover_transaction(tx.signed_transaction) == address
+    assert tx.raw_transaction['data'][-20:] == bytes.fromhex(second.token_address[2:])
+
+    # A base fee jump above the requested tier escalates to a higher one
+    prepared = await sniper.prepare_snipe(launch(3), 0.05)
+    sniper.chain_state.head.base_fee = prepared.transactions['conservative'].gas_price + 1
+    tx = await sniper._build_hot_snipe_transaction(launch(3), 0.05, 'conservative')
+    assert tx is prepared.transactions['normal']
+
+    stats = sniper.get_stats()['hot_path']
+    assert stats['presigned_hits'] == 2 and stats['presigned_stale'] == 1
+    assert stats['nonces']['in_flight'] == 3
+
+    # Only pre-signing queried the node: one nonce seed, one balance check per prepared token
+    assert sniper.w3.eth.calls == 1 + 3
+
+
+class FakeNetworkManager:
+    """EnhancedNetworkManager stand-in serving one network's shared services."""
+
+    def __init__(self, chain_state, tracker):
+        self.chain_state = chain_state
+        self.tracker = tracker
+
+    async def get_chain_state(self, network_type):
+        return self.chain_state
+
+    async def get_confirmation_tracker(self, network_type):
+        return self.tracker
+
+
+class FakeChainManager:
+    async def get_chain(self, network):
+        return SimpleNamespace(w3=FakeWeb3(nonce=0))
+
+
+@pytest.mark.asyncio
+async def test_mempool_manager_gives_sniper_shared_chain_state(monkeypatch):
+    """Snipers read gas and confirmations from the network's shared head-driven state."""
+    chain_state, tracker = ChainStateCache('ethereum', rpc=None), object()
+    monkeypatch.setattr(shared_network, 'get_network_manager', lambda: FakeNetworkManager(chain_state, tracker))
+    monkeypatch.setattr(mempool_manager, 'settings', SimpleNamespace(ethereum_trading_private_key=PRIVATE_KEY))
+
+    manager = mempool_manager.MempoolManager(FakeChainManager())
+    await manager._initialize_network_sniper('ethereum')
+
+    sniper = manager.block_zero_snipers['ethereum']
+    assert sniper.chain_state is chain_state
+    assert sniper.confirmation_tracker is tracker
+
+
+@pytest.mark.asyncio
+async def test_detection_presigns_in_background_only_with_auto_snipe(monkeypatch):
+    """Pre-signing never runs with auto-snipe off and never delays the detection handler."""
+    manager = mempool_manager.MempoolManager(FakeChainManager())
+    manager.block_zero_snipers['ethereum'] = sniper = await make_sniper()
+    manager._should_auto_snipe = manager._cache_token_discovery = lambda event: asyncio.sleep(0, False)
+    prepared = []
+
+    async def prepare_snipe(event, eth_amount):
+        await asyncio.sleep(0.05)
+        prepared.append(event.token_address)
+
+    sniper.prepare_snipe = prepare_snipe
+
+    monkeypatch.setattr(mempool_manager, 'settings', SimpleNamespace(enable_auto_sniping=False))
+    await manager._handle_new_token_detected(launch(1))
+    await asyncio.sleep(0.1)
+    assert prepared == []
+
+    monkeypatch.setattr(mempool_manager, 'settings', SimpleNamespace(enable_auto_sniping=True))
+    await manager._handle_new_token_detected(launch(2))
+    assert prepared == [] and len(manager._prepare_tasks) == 1
+    await asyncio.gather(*manager._prepare_tasks)
+    assert prepared == [launch(2).token_address] and not manager._prepare_tasks
+
+
+@pytest.mark.asyncio
+@pytest.mark.filterwarnings('ignore:encodeABI is deprecated:DeprecationWarning')
+async def test_event_to_signed_bytes_benchmark():
+    """Pre-signed and template paths beat ABI-encoding and signing on the event."""
+    sniper = await make_sniper()
+    router = sniper.routers['uniswap_v2']
+    contract = Web3().eth.contract(address=router, abi=sniper.router_abis['uniswap_v2'])
+    n = 200
+    events = [launch(i) for i in range(3 * n)]
+
+    # Baseline: the original build without its RPC round-trips (nonce, chain ID, block)
+    start = time.perf_counter()
+    for event in events[:n]:
+        gas = await sniper._get_gas_strategy('normal')
+        data = contract.encodeABI(fn_name='swapExactETHForTokens', args=[
+            1, [WETH, event.token_address], sniper.account.address, int(time.time()) + 300
+        ])
+        Account.sign_transaction({
+            'nonce': 0, 'to': router, 'value': 5 * 10**16, 'gas': 300000, 'maxFeePerGas': gas.max_fee,
+            'maxPriorityFeePerGas': gas.priority_fee, 'data': data, 'chainId': 1,
+        }, PRIVATE_KEY)
+    baseline = (time.perf_counter() - start) / n
+
+    start = time.perf_counter()
+    for event in events[n:2 * n]:
+        await sniper._build_hot_snipe_transaction(event, 0.05, 'normal')
+    template = (time.perf_counter() - start) / n
+
+    # Pre-signed on detection; only the launch-to-bytes step is timed
+    elapsed = 0.0
+    for event in events[2 * n:]:
+        await sniper.prepare_snipe(event, 0.05)
+        start = time.perf_counter()
+        await sniper._build_hot_snipe_transaction(event, 0.05, 'normal')
+        elapsed += time.perf_counter() - start
+    presigned = elapsed / n
+    hits = sniper.hot_path_stats['presigned_hits']
+
+    assert sniper.w3.eth.calls == 1 + n  # nonce seed + pre-sign balance checks
+    print(
+        f"[OK] event-to-signed-bytes: encodeABI+sign {baseline * 1e6:.0f} us (plus 3 RPC round-trips), "
+        f"template+sign {template * 1e6:.0f} us, pre-signed {presigned * 1e6:.0f} us"
+    )
+    assert hits == n
+    assert template < baseline
+    assert presigned * 5 < template
@@ -0,0 +1,210 @@
+"""
+Stop-Loss Trigger Book Tests
+File: tests/unit/test_stop_loss_trigger_book.py
+
+Unit tests and a 10k-order benchmark for the price-indexed trigger book
+behind StopLossManager.update_price_feed().
+"""
+
+import asyncio
+import random
+import time
+from decimal import Decimal
+
+import pytest
+
+from app.core.risk.stop_loss_manager import StopLossManager, StopLossStatus, StopLossType
+
+
+def token(name: str) -> str:
+    """Deterministic fake token address."""
+    return '0x' + name.encode().hex().ljust(40, '0')[:40]
+
+
+A, B = token('aaa'), token('bbb')
+
+
+@pytest.mark.asyncio
+async def test_tick_touches_only_crossed_stops():
+    """A tick triggers exactly the orders whose stop it crosses, on its own token only."""
+    manager = StopLossManager()
+    try:
+        ids = {}
+        for stop in ('0.90', '0.95', '0.98'):
+            ids[stop] = await manager.set_stop_loss(A, Decimal('10'), Decimal('1.00'), stop_price=Decimal(stop))
+        other = await manager.set_stop_loss(B, Decimal('10'), Decimal('1.00'), stop_price=Decimal('0.99'))
+        assert len(set(ids.values()) | {other}) == 4
+
+        assert manager.update_price_feed(A, Decimal('0.99')) == []
+        assert sorted(manager.update_price_feed(A, Decimal('0.95'))) == sorted([ids['0.98'], ids['0.95']])
+        assert await manager.process_pending_triggers() == 2
+
+        assert manager.get_order_status(ids['0.95'])['status'] == StopLossStatus.TRIGGERED.value
+        assert ids['0.90'] in manager.active_orders and other in manager.active_orders
+        assert manager.trigger_book.get_stats()['orders'] == 2
+    finally:
+        await manager.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_trailing_stop_follows_new_highs():
+    """Trailing stops move only above the activation price, then trigger on the pullback."""
+    manager = StopLossManager()
+    try:
+        order_id = await manager.set_stop_loss(
+            A, Decimal('10'), Decimal('1.00'), stop_price=Decimal('0.90'),
+            stop_type=StopLossType.TRAILING, trail_distance=Decimal('0.10')
+        )
+        order = manager.active_orders[order_id]
+
+        manager.update_price_feed(A, Decimal('1.05'))  # below activation (1.10)
+        assert order.stop_price == Decimal('0.90')
+
+        manager.update_price_feed(A, Decimal('1.20'))
+        assert order.stop_price == Decimal('1.080')
+        manager.update_price_feed(A, Decimal('1.15'))
+        assert order.stop_price == Decimal('1.080')
+        manager.update_price_feed(A, Decimal('1.30'))
+        assert order.highest_price == Decimal('1.30')
+
+        assert manager.update_price_feed(A, Decimal('1.17')) == [order_id]
+        await manager.process_pending_triggers()
+        assert order_id not in manager.active_orders
+        assert order.status == StopLossStatus.TRIGGERED
+    finally:
+        await manager.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_ticks_during_execution_are_drained():
+    """Triggers that fire while earlier ones execute run in the same task, not on the next monitoring pass."""
+    manager = StopLossManager()
+    try:
+        first = await manager.set_stop_loss(A, Decimal('10'), Decimal('1.00'), stop_price=Decimal('0.95'))
+        second = await manager.set_stop_loss(B, Decimal('10'), Decimal('1.00'), stop_price=Decimal('0.95'))
+        await manager.stop_monitoring()  # only the tick-scheduled task may execute
+
+        execute = manager.execute_stop_loss
+
+        async def slow_execute(order_id, *args):
+            if order_id == first:
+                manager.update_price_feed(B, Decimal('0.90'))  # fires while this one executes
+            await asyncio.sleep(0)
+            return await execute(order_id, *args)
+
+        manager.execute_stop_loss = slow_execute
+        assert manager.update_price_feed(A, Decimal('0.90')) == [first]
+        await manager._trigger_task
+
+        assert first not in manager.active_orders and second not in manager.active_orders
+        assert manager._pending_triggers == []
+    finally:
+        await manager.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_failed_trigger_does_not_drop_the_rest():
+    """An execution error loses only its own order; the triggers queued behind it still run."""
+    manager = StopLossManager()
+    try:
+        ids = [await manager.set_stop_loss(A, Decimal('10'), Decimal('1.00'), stop_price=Decimal(stop))
+               for stop in ('0.95', '0.94', '0.93')]
+        await manager.stop_monitoring()
+
+        execute = manager.execute_stop_loss
+        attempted = []
+
+        async def flaky_execute(order_id, *args):
+            attempted.append(order_id)
+            if len(attempted) == 1:
+                raise RuntimeError("router unavailable")
+            return await execute(order_id, *args)
+
+        manager.execute_stop_loss = flaky_execute
+        assert sorted(manager.update_price_feed(A, Decimal('0.90'))) == sorted(ids)
+        await manager._trigger_task
+
+        assert sorted(attempted) == sorted(ids)
+        assert [order_id in manager.active_orders for order_id in attempted] == [True, False, False]
+        assert manager._pending_triggers == []
+    finally:
+        await manager.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_external_changes_stay_indexed():
+    """Manual adjustments re-key the book; cancelled orders never trigger."""
+    manager = StopLossManager()
+    try:
+        trailing_id = await manager.set_stop_loss(
+            A, Decimal('10'), Decimal('1.00'), stop_price=Decimal('0.90'),
+            stop_type=StopLossType.TRAILING, trail_distance=Decimal('0.05')
+        )
+        cancelled_id = await manager.set_stop_loss(A, Decimal('10'), Decimal('1.00'), stop_price=Decimal('0.95'))
+
+        assert await manager.adjust_trailing_stop(trailing_id, Decimal('1.20'))
+        assert await manager.cancel_stop_loss(cancelled_id)
+
+        assert manager.update_price_feed(A, Decimal('1.14')) == [trailing_id]
+        assert cancelled_id not in manager.trigger_book
+        assert await manager.process_pending_triggers() == 1
+        assert manager._orders_to_poll() == []
+    finally:
+        await manager.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_trigger_book_benchmark_10k_orders():
+    """Price ticks over 10k orders on 500 tokens cost only the crossed orders."""
+    rng = random.Random(11)
+    tokens = [token(f't{i}') for i in range(500)]
+    manager = StopLossManager()
+    try:
+        for i in range(10_000):
+            entry = Decimal(str(round(rng.uniform(0.5, 2.0), 4)))
+            trailing = i % 3 == 0
+            await manager.set_stop_loss(
+                tokens[i % len(tokens)], Decimal('100'), entry,
+                stop_price=entry * Decimal(str(round(rng.uniform(0.7, 0.97), 3))),
+                stop_type=StopLossType.TRAILING if trailing else StopLossType.FIXED,
+                trail_distance=Decimal('0.08') if trailing else None
+            )
+        assert len(manager.trigger_book) == 10_000
+
+        prices = {t: Decimal('1.25') for t in tokens}
+        ticks = [rng.choice(tokens) for _ in range(50_000)]
+        moves = [Decimal(str(round(rng.gauss(0, 0.01), 4))) for _ in ticks]
+
+        triggered = 0
+        start = time.perf_counter()
+        for token_address, move in zip(ticks, moves):
+            prices[token_address] = max(Decimal('0.01'), prices[token_address] * (1 + move))
+            triggered += len(manager.update_price_feed(token_address, prices[token_address]))
+        elapsed = time.perf_counter() - start
+        executed = await manager.process_pending_triggers()
+
+        # Baseline: one polling pass of the old loop over the surviving orders
+        book = manager.trigger_book
+        poll_start = time.perf_counter()
+        for order in list(manager.active_orders.values()):
+            await manager._check_trigger_conditions(order, await manager._get_current_price(order.token_address))
+        poll_elapsed = time.perf_counter() - poll_start
+
+        stats = book.get_stats()
+        print(
+            f"[OK] 10000 orders / 500 tokens: {len(ticks)} ticks in {elapsed:.2f}s "
+            f"({elapsed / len(ticks) * 1e6:.1f} us/tick), {triggered} triggered, "
+            f"{stats['trailing_adjustments']} trailing adjustments; "
+            f"one full polling pass over {len(manager.active_orders)} orders took {poll_elapsed * 1000:.1f} ms"
+        )
+
+        assert executed == triggered
+        assert len(manager.active_orders) + triggered == 10_000
+        assert all(order.stop_price < manager.price_feeds[order.token_address]
+                   for order in manager.active_orders.values())
+        # Work per tick is bounded by what the tick changed: every heap entry skipped
+        # as stale was left behind by an earlier trailing move or trigger
+        assert stats['ticks'] == len(ticks) and stats['orders_triggered'] == triggered
+        assert stats['stale_entries_skipped'] <= stats['trailing_adjustments'] + triggered
+    finally:
+        await manager.cleanup()
@@ -0,0 +1,120 @@
+"""
+Trade Persistence Write-Behind Tests
+File: tests/unit/test_trade_persistence_batching.py
+
+Unit tests and a throughput check for batched, write-behind trade
+persistence in PersistenceManager.
+"""
+
+import sqlite3
+import time
+from decimal import Decimal
+
+import pytest
+
+from app.core.database.persistence_manager import PersistenceManager, TradeRecord, TradeStatus
+
+
+def trade(i: int, wallet: str = '0xwallet') -> TradeRecord:
+    """Minimal executed trade."""
+    return TradeRecord(
+        trade_id=f'trade_{i}', wallet_address=wallet, token_in='WETH', token_out='USDC',
+        amount_in=Decimal('1'), amount_out=Decimal('3000'), price_usd=Decimal('3000'),
+        dex_protocol='uniswap_v2', network='ethereum', transaction_hash=f'0x{i:064x}',
+        status=TradeStatus.EXECUTED, gas_used=150000, gas_price_gwei=Decimal('20'),
+        slippage_percent=Decimal('0.5'), created_at=f'2024-01-01T00:00:{i % 60:02d}',
+    )
+
+
+def count_rows(db_path) -> int:
+    """Rows committed to the trades table, read through a separate connection."""
+    with sqlite3.connect(str(db_path)) as connection:
+        return connection.execute("SELECT COUNT(*) FROM trades").fetchone()[0]
+
+
+@pytest.mark.asyncio
+async def test_trades_are_committed_in_batches(tmp_path):
+    """Queued trades are grouped into transactions and visible to reads."""
+    manager = PersistenceManager(str(tmp_path / 'trades.db'), batch_size=50, flush_interval=0.05)
+    await manager.initialize()
+    try:
+        for i in range(120):
+            assert await manager.save_trade(trade(i))
+
+        history = await manager.get_trade_history('0xwallet', limit=500)
+        assert len(history) == 120
+
+        status = manager.get_database_status()
+        assert status['journal_mode'] == 'wal'
+        assert status['write_queue_depth'] == 0
+        assert status['trades_written'] == 120
+        assert status['flushes'] <= 4
+        assert status['avg_flush_ms'] > 0
+    finally:
+        await manager.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_shutdown_flushes_queue(tmp_path):
+    """Trades still waiting for their batch are written on shutdown."""
+    db_path = tmp_path / 'trades.db'
+    manager = PersistenceManager(str(db_path), batch_size=1000, flush_interval=60)
+    await manager.initialize()
+
+    for i in range(25):
+        await manager.save_trade(trade(i))
+    assert count_rows(db_path) == 0
+
+    await manager.shutdown()
+    assert count_rows(db_path) == 25
+
+
+@pytest.mark.asyncio
+async def test_wait_returns_after_commit(tmp_path):
+    """save_trade(wait=True) resolves once its batch is durable."""
+    db_path = tmp_path / 'trades.db'
+    manager = PersistenceManager(str(db_path), batch_size=100, flush_interval=0.01)
+    await manager.initialize()
+    try:
+        assert await manager.save_trade(trade(1), wait=True)
+        assert count_rows(db_path) == 1
+        assert manager.get_database_status()['trades_queued'] == 1
+    finally:
+        await manager.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_write_behind_throughput(tmp_path):
+    """Batched writes sustain far more trades per second than commit-per-trade."""
+    manager = PersistenceManager(str(tmp_path / 'trades.db'), batch_size=500, flush_interval=0.02)
+    await manager.initialize()
+    try:
+        n = 5000
+        start = time.perf_counter()
+        for i in range(n):
+            await manager.save_trade(trade(i))
+        enqueue_elapsed = time.perf_counter() - start
+        await manager.flush()
+        elapsed = time.perf_counter() - start
+
+        # Baseline: one INSERT + commit per trade on a default (rollback journal) connection
+        baseline = sqlite3.connect(str(tmp_path / 'baseline.db'))
+        baseline.execute("CREATE TABLE trades (trade_id TEXT PRIMARY KEY, payload TEXT)")
+        baseline_n = 300
+        baseline_start = time.perf_counter()
+        for i in range(baseline_n):
+            baseline.execute("INSERT OR REPLACE INTO trades VALUES (?, ?)", (f'trade_{i}', 'x' * 200))
+            baseline.commit()
+        baseline_rate = baseline_n / (time.perf_counter() - baseline_start)
+        baseline.close()
+
+        status = manager.get_database_status()
+        print(
+            f"[OK] {n} trades: enqueue {n / enqueue_elapsed:.0f}/s, durable {n / elapsed:.0f}/s "
+            f"in {status['flushes']} flushes (avg {status['avg_flush_ms']:.1f} ms, "
+            f"max {status['max_flush_ms']:.1f} ms); commit-per-trade baseline {baseline_rate:.0f}/s"
+        )
+        assert status['trades_written'] == n
+        assert status['flushes'] < n / 10
+    finally:
+        await manager.shutdown()
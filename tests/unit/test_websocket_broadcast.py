@@ -0,0 +1,125 @@
+"""
+WebSocket Broadcast Tests
+File: tests/unit/test_websocket_broadcast.py
+
+Unit tests and fan-out benchmark for pre-serialized WebSocketManager
+broadcasts.
+"""
+
+import json
+import time
+
+import pytest
+
+from app.core.websocket.websocket_manager import (
+    ClientConnection,
+    MessagePriority,
+    PreparedBroadcast,
+    WebSocketManager,
+    WebSocketMessage,
+)
+
+
+class FakeWebSocket:
+    """Minimal websocket that records sent frames."""
+
+    client_state = "connected"
+
+    def __init__(self):
+        self.frames = []
+
+    async def send_text(self, payload: str) -> None:
+        self.frames.append(payload)
+
+    async def close(self) -> None:
+        self.client_state = "closed"
+
+
+def make_manager(clients: int, subscription: str = "dashboard") -> WebSocketManager:
+    """Build a manager with N subscribed fake connections."""
+    manager = WebSocketManager()
+    for i in range(clients):
+        client_id = f"client_{i}"
+        connection = ClientConnection(websocket=FakeWebSocket(), client_id=client_id)
+        connection.subscriptions.add(subscription)
+        manager.register_connection(connection)
+    return manager
+
+
+SAMPLE_DATA = {
+    "portfolio_value": 125_000.5,
+    "positions": [{"symbol": f"TKN{i}", "amount": i * 1.5, "pnl": -i} for i in range(20)],
+}
+
+
+@pytest.mark.asyncio
+async def test_broadcast_is_rendered_per_client():
+    """Every subscriber gets one frame carrying its own client_id."""
+    manager = make_manager(3)
+    manager.connections["client_2"].remove_subscription("dashboard")
+    manager.connections["client_2"].add_subscription("trading")
+
+    stats = await manager._broadcast_to_subscribers(
+        "dashboard", "portfolio_update", SAMPLE_DATA, MessagePriority.HIGH
+    )
+    assert stats["queued"] == 2
+    assert await manager.flush(timeout=1)
+
+    frames = {
+        cid: [json.loads(f) for f in conn.websocket.frames]
+        for cid, conn in manager.connections.items()
+    }
+    assert frames["client_2"] == []
+    for cid in ("client_0", "client_1"):
+        (message,) = frames[cid]
+        assert message["client_id"] == cid
+        assert message["type"] == "portfolio_update"
+        assert message["data"] == SAMPLE_DATA
+    assert frames["client_0"][0]["message_id"] == frames["client_1"][0]["message_id"]
+    assert manager.stats["messages_processed"] == 2
+    await manager._close_all_connections()
+
+
+def test_prepared_broadcast_matches_per_client_envelope():
+    """The templated frame decodes to the same envelope as WebSocketMessage."""
+    broadcast = PreparedBroadcast.build("price_update", {"price": 1.25, 7: "x"}, ["a\"b"])
+    rendered = json.loads(broadcast.render('a"b'))
+
+    legacy = WebSocketMessage(
+        type="price_update",
+        data={"price": 1.25, 7: "x"},
+        client_id='a"b',
+        message_id=broadcast.message_id,
+    ).to_dict()
+    rendered.pop("timestamp")
+    legacy.pop("timestamp")
+    assert rendered == json.loads(json.dumps(legacy))
+
+
+@pytest.mark.asyncio
+async def test_broadcast_benchmark():
+    """Compare per-client serialization with pre-serialized fan-out at 10/100/1000 clients."""
+    rounds = 20
+
+    for clients in (10, 100, 1000):
+        manager = make_manager(clients)
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for client_id, connection in manager.connections.items():
+                msg = WebSocketMessage(type="portfolio_update", data=SAMPLE_DATA, client_id=client_id)
+                await connection.websocket.send_text(json.dumps(msg.to_dict(), default=str))
+        legacy = (time.perf_counter() - start) / rounds
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            await manager._broadcast_to_subscribers("dashboard", "portfolio_update", SAMPLE_DATA)
+            await manager.flush()
+        shared = (time.perf_counter() - start) / rounds
+
+        print(
+            f"[OK] Broadcast to {clients} clients: per-client {legacy * 1000:.2f} ms, "
+            f"pre-serialized {shared * 1000:.2f} ms ({legacy / shared:.1f}x)"
+        )
+        assert manager.stats["messages_processed"] == clients * rounds
+        await manager._close_all_connections()
@@ -0,0 +1,131 @@
+"""
+WebSocket Send Queue Tests
+File: tests/unit/test_websocket_send_queue.py
+
+Unit tests for per-client send queues, slow-consumer policies and
+isolation of slow clients in WebSocketManager.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from app.core.websocket.client_send_queue import ClientSendQueue, SlowConsumerPolicy
+from app.core.websocket.websocket_manager import (
+    ClientConnection,
+    MessagePriority,
+    WebSocketManager,
+    WebSocketState,
+)
+
+
+class FakeWebSocket:
+    """Websocket stub with an optional per-send delay."""
+
+    client_state = WebSocketState.CONNECTED
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.frames = []
+        self.closed = False
+
+    async def send_text(self, payload: str) -> None:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.frames.append(payload)
+
+    async def close(self) -> None:
+        self.closed = True
+        self.client_state = WebSocketState.DISCONNECTED
+
+
+def add_client(manager: WebSocketManager, client_id: str, delay: float = 0.0) -> ClientConnection:
+    """Register a fake connection subscribed to the dashboard."""
+    connection = ClientConnection(websocket=FakeWebSocket(delay), client_id=client_id)
+    connection.subscriptions.add("dashboard")
+    manager.register_connection(connection)
+    return connection
+
+
+@pytest.mark.asyncio
+async def test_get_returns_most_urgent_frame_first():
+    """Frames come out by priority level, FIFO within a level."""
+    queue = ClientSendQueue(max_size=10)
+    queue.put("low", priority=4)
+    queue.put("normal-1", priority=3)
+    queue.put("critical", priority=1)
+    queue.put("normal-2", priority=3)
+
+    order = []
+    for _ in range(4):
+        frame = await queue.get()
+        order.append(frame.payload)
+        queue.task_done()
+    assert order == ["critical", "normal-1", "normal-2", "low"]
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_never_evicts_more_urgent_frames():
+    """A full queue evicts its oldest least-urgent frame, or drops a less urgent arrival."""
+    queue = ClientSendQueue(max_size=2, policy=SlowConsumerPolicy.DROP_OLDEST)
+    queue.put("a", priority=3)
+    queue.put("b", priority=1)
+    queue.put("c", priority=3)   # evicts "a"
+    queue.put("d", priority=4)   # less urgent than everything queued -> dropped
+
+    assert (await queue.get()).payload == "b"
+    assert (await queue.get()).payload == "c"
+    assert queue.dropped == 2
+
+
+def test_coalesce_latest_replaces_pending_topic():
+    """Under COALESCE_LATEST a full queue overwrites the pending frame of the same topic."""
+    queue = ClientSendQueue(max_size=2, policy=SlowConsumerPolicy.COALESCE_LATEST)
+    queue.put("price-1", topic="price_update")
+    queue.put("trade-1", topic="trade_execution")
+    queue.put("price-2", topic="price_update")
+
+    assert len(queue) == 2
+    assert queue.coalesced == 1
+    assert queue._topics["price_update"].payload == "price-2"
+
+
+@pytest.mark.asyncio
+async def test_slow_client_does_not_block_others():
+    """A stalled client backs up only its own queue while others receive promptly."""
+    manager = WebSocketManager()
+    manager.config["send_queue_size"] = 5
+    fast = add_client(manager, "fast")
+    slow = add_client(manager, "slow", delay=10)
+
+    for i in range(20):
+        await manager._broadcast_to_subscribers("dashboard", "portfolio_update", {"seq": i})
+        await asyncio.sleep(0)
+    await asyncio.wait_for(fast.send_queue.join(), timeout=1)
+
+    assert [json.loads(f)["data"]["seq"] for f in fast.websocket.frames] == list(range(20))
+    assert len(slow.send_queue) == 5
+    assert manager.stats["messages_dropped"] > 0
+
+    stats = manager.get_detailed_stats()
+    assert stats["delivery_latency"]["count"] == 20
+    assert stats["delivery_latency"]["p99_ms"] >= stats["delivery_latency"]["p50_ms"]
+    await manager._close_all_connections()
+
+
+@pytest.mark.asyncio
+async def test_disconnect_policy_removes_slow_consumer():
+    """Under DISCONNECT an overflowing client is closed and unregistered."""
+    manager = WebSocketManager()
+    manager.config["send_queue_size"] = 2
+    manager.config["slow_consumer_policy"] = SlowConsumerPolicy.DISCONNECT.value
+    slow = add_client(manager, "slow", delay=10)
+
+    for i in range(5):
+        await manager._queue_message("slow", "price_update", {"seq": i}, MessagePriority.NORMAL)
+    await asyncio.sleep(0.01)
+
+    assert "slow" not in manager.connections
+    assert slow.websocket.closed
+    assert manager.stats["slow_consumer_disconnects"] == 1
@@ -0,0 +1,92 @@
+"""
+WebSocket Subscription Registry Tests
+File: tests/unit/test_websocket_subscriptions.py
+
+Unit tests for topic-indexed subscription routing and per-token price
+topics in WebSocketManager.
+"""
+
+import json
+
+import pytest
+
+from app.core.websocket.subscription_registry import SubscriptionRegistry, price_topic
+from app.core.websocket.websocket_manager import ClientConnection, WebSocketManager, WebSocketState
+
+PEPE = "0x6982508145454Ce325dDbE47a25d4ec3d2311933"
+WETH = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+
+
+class FakeWebSocket:
+    """Minimal websocket that records sent frames."""
+
+    client_state = WebSocketState.CONNECTED
+
+    def __init__(self):
+        self.frames = []
+
+    async def send_text(self, payload: str) -> None:
+        self.frames.append(json.loads(payload))
+
+    async def close(self) -> None:
+        self.client_state = WebSocketState.DISCONNECTED
+
+
+def test_group_message_types_are_reference_counted():
+    """A message type stays routed while any subscribed group still carries it."""
+    registry = SubscriptionRegistry({
+        "dashboard": ["portfolio_update", "trading_status"],
+        "trading": ["trade_execution", "trading_status"],
+    })
+    registry.add("c1", "dashboard")
+    registry.add("c1", "trading")
+    registry.add("c2", "all")
+
+    assert registry.subscribers("trading_status") == {"c1", "c2"}
+    registry.remove("c1", "trading")
+    assert registry.subscribers("trading_status") == {"c1", "c2"}
+    assert registry.subscribers("trade_execution") == {"c2"}
+
+    registry.remove_client("c1", ["dashboard"])
+    assert registry.subscribers("portfolio_update") == {"c2"}
+    assert registry.get_stats()["topics"] == {"all": 1}
+
+
+def test_price_topic_normalizes_and_validates_addresses():
+    """Price topics are case-insensitive and reject malformed addresses."""
+    assert price_topic(PEPE) == price_topic(PEPE.lower())
+    with pytest.raises(ValueError):
+        price_topic("0x1234")
+
+
+@pytest.mark.asyncio
+async def test_price_updates_reach_only_interested_clients():
+    """Token watchers get only their token; market subscribers get every price."""
+    manager = WebSocketManager()
+    clients = {}
+    for client_id in ("market", "pepe", "weth", "trading"):
+        clients[client_id] = ClientConnection(websocket=FakeWebSocket(), client_id=client_id)
+        manager.register_connection(clients[client_id])
+
+    await manager._handle_subscription("market", {"subscription": "market"})
+    await manager._handle_subscription("pepe", {"subscription": f"price:{PEPE.upper().replace('0X', '0x')}"})
+    await manager._handle_subscription("weth", {"subscription": f"price:{WETH}"})
+    await manager._handle_subscription("trading", {"subscription": "trading"})
+    await manager._handle_subscription("trading", {"subscription": "price:not-an-address"})
+
+    stats = await manager.broadcast_price_update(PEPE, {"price": 0.000012})
+    assert stats["queued"] == 2
+    await manager.flush(timeout=1)
+
+    def price_frames(client_id):
+        return [f for f in clients[client_id].websocket.frames if f["type"] == "price_update"]
+
+    assert len(price_frames("market")) == 1
+    assert len(price_frames("pepe")) == 1
+    assert price_frames("weth") == []
+    assert price_frames("trading") == []
+    assert clients["trading"].websocket.frames[-1]["type"] == "error"
+
+    await manager.remove_connection("pepe")
+    assert manager.subscription_registry.get_stats()["price_subscriptions"] == 1
+    await manager._close_all_connections()